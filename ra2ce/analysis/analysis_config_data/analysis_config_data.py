@@ -44,6 +44,7 @@ from ra2ce.common.configuration.config_data_protocol import ConfigDataProtocol
 from ra2ce.network.network_config_data.enums.aggregate_wl_enum import AggregateWlEnum
 from ra2ce.network.network_config_data.enums.part_of_day_enum import PartOfDayEnum
 from ra2ce.network.network_config_data.network_config_data import (
+    HazardSection,
     NetworkSection,
     OriginsDestinationsSection,
 )
@@ -74,6 +75,8 @@ class AnalysisSectionBase:
     name: str = ""
     save_gpkg: bool = False
     save_csv: bool = False
+    save_parquet: bool = False
+    save_feather: bool = False
 
 
 @dataclass
@@ -147,6 +150,16 @@ class AnalysisSectionDirect(AnalysisSectionBase):
         default_factory=lambda: RiskCalculationModeEnum.NONE
     )
     risk_calculation_year: int = 0
+    # several cutoff / triangle years to calculate the risk for at once
+    risk_calculation_years: list[int] = field(default_factory=list)
+    # Monte Carlo ensemble for the damage uncertainty (0 samples: no ensemble),
+    # coefficients of variation of the max damages and of the damage curve ordinates
+    uncertainty_samples: int = 0
+    uncertainty_max_damage_cv: float = 0.0
+    uncertainty_curve_cv: float = 0.0
+    uncertainty_seed: Optional[int] = None
+    # number of road segments per batch, 0 to calculate the damage of the whole network at once
+    chunk_size: int = 0
     create_table: bool = False
     file_name: Optional[Path] = None
 
@@ -168,6 +181,7 @@ class AnalysisConfigData(ConfigDataProtocol):
         default_factory=OriginsDestinationsSection
     )
     network: NetworkSection = field(default_factory=NetworkSection)
+    hazard: HazardSection = field(default_factory=HazardSection)
     hazard_names: list[str] = field(default_factory=list)
 
     @property
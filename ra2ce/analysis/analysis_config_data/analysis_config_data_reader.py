@@ -118,6 +118,12 @@ class AnalysisConfigDataReader(ConfigDataReaderProtocol):
         _section.save_csv = self._parser.getboolean(
             section_name, "save_csv", fallback=_section.save_csv
         )
+        _section.save_parquet = self._parser.getboolean(
+            section_name, "save_parquet", fallback=_section.save_parquet
+        )
+        _section.save_feather = self._parser.getboolean(
+            section_name, "save_feather", fallback=_section.save_feather
+        )
         _weighing = self._parser.get(section_name, "weighing", fallback=None)
         # Map distance -> length
         if _weighing == "distance":
@@ -206,6 +212,12 @@ class AnalysisConfigDataReader(ConfigDataReaderProtocol):
         _section.save_csv = self._parser.getboolean(
             section_name, "save_csv", fallback=_section.save_csv
         )
+        _section.save_parquet = self._parser.getboolean(
+            section_name, "save_parquet", fallback=_section.save_parquet
+        )
+        _section.save_feather = self._parser.getboolean(
+            section_name, "save_feather", fallback=_section.save_feather
+        )
         # adaptation/effectiveness measures
         _section.return_period = self._parser.getfloat(
             section_name,
@@ -249,9 +261,41 @@ class AnalysisConfigDataReader(ConfigDataReaderProtocol):
             "risk_calculation_year",
             fallback=_section.risk_calculation_year,
         )
+        _section.risk_calculation_years = [
+            int(_year)
+            for _year in self._parser.getlist(
+                section_name, "risk_calculation_years", fallback=[]
+            )
+            if _year
+        ]
         _section.damage_curve = DamageCurveEnum.get_enum(
             self._parser.get(section_name, "damage_curve", fallback=None)
         )
+        _section.uncertainty_samples = self._parser.getint(
+            section_name,
+            "uncertainty_samples",
+            fallback=_section.uncertainty_samples,
+        )
+        _section.uncertainty_max_damage_cv = self._parser.getfloat(
+            section_name,
+            "uncertainty_max_damage_cv",
+            fallback=_section.uncertainty_max_damage_cv,
+        )
+        _section.uncertainty_curve_cv = self._parser.getfloat(
+            section_name,
+            "uncertainty_curve_cv",
+            fallback=_section.uncertainty_curve_cv,
+        )
+        _section.uncertainty_seed = self._parser.getint(
+            section_name,
+            "uncertainty_seed",
+            fallback=_section.uncertainty_seed,
+        )
+        _section.chunk_size = self._parser.getint(
+            section_name,
+            "chunk_size",
+            fallback=_section.chunk_size,
+        )
         _section.create_table = self._parser.getboolean(
             section_name,
             "create_table",
@@ -26,6 +26,9 @@ from ra2ce.analysis.analysis_config_data.analysis_config_data import (
     DirectAnalysisNameList,
     IndirectAnalysisNameList,
 )
+from ra2ce.analysis.analysis_config_data.enums.analysis_direct_enum import (
+    AnalysisDirectEnum,
+)
 from ra2ce.common.validation.ra2ce_validator_protocol import Ra2ceIoValidator
 from ra2ce.common.validation.validation_report import ValidationReport
 from ra2ce.configuration.ra2ce_enum_base import Ra2ceEnumBase
@@ -108,9 +111,24 @@ class AnalysisConfigDataValidator(Ra2ceIoValidator):
 
         return _report
 
+    def _validate_overlay_base_network_in_analysis(self) -> ValidationReport:
+        # Only the direct damage analysis overlays the base network with the hazard itself.
+        _report = ValidationReport()
+        if not self._config.hazard.overlay_base_network_in_analysis:
+            return _report
+        for _analysis in self._config.direct:
+            if _analysis.analysis == AnalysisDirectEnum.DIRECT:
+                continue
+            _report.error(
+                f"Analysis [ {_analysis.name} ] requires the base network overlaid with the hazard, "
+                "set [ overlay_base_network_in_analysis ] to False in the network.ini file."
+            )
+        return _report
+
     def validate(self) -> ValidationReport:
         _report = ValidationReport()
         _required_headers = ["project", "analyses"]
 
         _report.merge(self._validate_headers(_required_headers))
+        _report.merge(self._validate_overlay_base_network_in_analysis())
         return _report
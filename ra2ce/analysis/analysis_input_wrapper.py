@@ -12,6 +12,7 @@ from ra2ce.analysis.analysis_config_wrapper import AnalysisConfigWrapper
 from ra2ce.network.graph_files.graph_files_protocol import GraphFileProtocol
 from ra2ce.network.hazard.hazard_names import HazardNames
 from ra2ce.network.network_config_data.network_config_data import (
+    HazardSection,
     OriginsDestinationsSection,
 )
 
@@ -27,6 +28,7 @@ class AnalysisInputWrapper:
     hazard_names: Optional[HazardNames]
     origins_destinations: Optional[OriginsDestinationsSection]
     file_id: Optional[str]
+    hazard: Optional[HazardSection] = None
 
     @classmethod
     def from_input(
@@ -46,4 +48,5 @@ class AnalysisInputWrapper:
             hazard_names=HazardNames.from_config(analysis_config),
             origins_destinations=analysis_config.config_data.origins_destinations,
             file_id=analysis_config.config_data.network.file_id,
+            hazard=analysis_config.config_data.hazard,
         )
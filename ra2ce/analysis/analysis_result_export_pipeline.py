@@ -0,0 +1,126 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from types import TracebackType
+
+from ra2ce.analysis.analysis_result_wrapper import AnalysisResultWrapper
+from ra2ce.analysis.analysis_result_wrapper_exporter import (
+    AnalysisResultWrapperExporter,
+)
+
+
+class AnalysisResultExportPipeline:
+    """
+    Exports analysis results on a background (writer) thread, so writing the result of
+    an analysis overlaps with the computation of the next one.
+
+    The results wait in a bounded queue: submitting blocks while `max_pending` results
+    are waiting, which bounds the memory held by results which are not yet written.
+    Export failures do not stop the writer, they are raised by `wait` once all the
+    submitted results are processed.
+    """
+
+    max_pending: int
+
+    def __init__(
+        self,
+        exporter: AnalysisResultWrapperExporter | None = None,
+        max_pending: int = 1,
+    ) -> None:
+        """
+        Args:
+            exporter (AnalysisResultWrapperExporter | None, optional): Exporter of the results. Defaults to None (a new exporter).
+            max_pending (int, optional): Maximum number of results waiting to be exported. Defaults to 1.
+        """
+        self._exporter = exporter or AnalysisResultWrapperExporter()
+        self.max_pending = max_pending
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._errors: list[Exception] = []
+        self._writer = threading.Thread(
+            target=self._write, name="analysis-result-writer", daemon=True
+        )
+        self._writer.start()
+        self._closed = False
+
+    def _write(self) -> None:
+        while True:
+            _result_wrapper = self._queue.get()
+            if _result_wrapper is None:
+                self._queue.task_done()
+                return
+            try:
+                self._exporter.export_result(_result_wrapper)
+            except Exception as _error:
+                logging.error("Exporting an analysis result failed: %s", _error)
+                self._errors.append(_error)
+            finally:
+                self._queue.task_done()
+
+    def submit(self, result_wrapper: AnalysisResultWrapper) -> None:
+        """
+        Hands a result over to the writer, blocks while the queue is full.
+
+        Args:
+            result_wrapper (AnalysisResultWrapper): The result to export.
+
+        Raises:
+            ValueError: When the pipeline is already closed.
+        """
+        if self._closed:
+            raise ValueError("Results cannot be submitted to a closed export pipeline.")
+        self._queue.put(result_wrapper)
+
+    def wait(self) -> None:
+        """
+        Closes the pipeline and waits until all submitted results are exported.
+
+        Raises:
+            Exception: The first export failure (all failures are logged).
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+        self._writer.join()
+        if self._errors:
+            raise self._errors[0]
+
+    def __enter__(self) -> AnalysisResultExportPipeline:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.wait()
+            return
+        # Do not hide the original error behind an export failure.
+        try:
+            self.wait()
+        except Exception:
+            pass
@@ -20,9 +20,9 @@
 """
 
 import logging
-from copy import deepcopy
 from pathlib import Path
 
+import pyarrow
 from geopandas import GeoDataFrame
 
 from ra2ce.analysis.analysis_result_wrapper import AnalysisResultWrapper
@@ -34,7 +34,8 @@ class AnalysisResultWrapperExporter:
         result_wrapper: AnalysisResultWrapper,
     ):
         """
-        Exports the given result into the analysis requested formats ( `.gpkg` and / or `.csv`).
+        Exports the given result into the analysis requested formats ( `.gpkg`, `.csv`,
+        `.parquet` and / or `.feather`).
 
         Args:
             result_wrapper (AnalysisResultWrapper): The result to export.
@@ -58,6 +59,23 @@ class AnalysisResultWrapperExporter:
                 result_wrapper.analysis_result,
                 _output_path.joinpath(_analysis_name + ".csv"),
             )
+        if _analysis.analysis.save_parquet:
+            self._export_columnar(
+                result_wrapper.analysis_result,
+                _output_path.joinpath(_analysis_name + ".parquet"),
+            )
+        if _analysis.analysis.save_feather:
+            self._export_columnar(
+                result_wrapper.analysis_result,
+                _output_path.joinpath(_analysis_name + ".feather"),
+            )
+
+    @staticmethod
+    def _prepare_export_path(export_path: Path):
+        if export_path.exists():
+            export_path.unlink()
+        if not export_path.parent.exists():
+            export_path.parent.mkdir(parents=True)
 
     def _export_gdf(self, gdf: GeoDataFrame, export_path: Path):
         """Takes in a geodataframe object and outputs shapefiles at the paths indicated by edge_shp and node_shp
@@ -69,22 +87,62 @@ class AnalysisResultWrapperExporter:
         # save to shapefile
         gdf.crs = "epsg:4326"  # TODO: decide if this should be variable with e.g. an output_crs configured
 
-        for col in gdf.columns:
-            if gdf[col].dtype == object and col != gdf.geometry.name:
-                gdf[col] = gdf[col].astype(str)
-
-        if export_path.exists():
-            export_path.unlink()
-        if not export_path.parent.exists():
-            export_path.parent.mkdir(parents=True)
+        # GPKG has no list columns, the object columns are written as text
+        # (without changing the result, which may be exported to other formats).
+        _export_gdf = gdf.astype(
+            {
+                col: str
+                for col in gdf.columns
+                if gdf[col].dtype == object and col != gdf.geometry.name
+            }
+        )
 
-        gdf.to_file(export_path, driver="GPKG")
+        self._prepare_export_path(export_path)
+        _export_gdf.to_file(export_path, driver="GPKG")
         logging.info("Results saved to: %s", export_path)
 
     def _export_csv(self, result_gdf: GeoDataFrame, export_path: Path):
-        if not export_path.parent.exists():
-            export_path.parent.mkdir(parents=True)
+        self._prepare_export_path(export_path)
+
+        # Write all columns but the geometry, without copying the result.
+        result_gdf.to_csv(
+            export_path,
+            columns=[_col for _col in result_gdf.columns if _col != "geometry"],
+            index=False,
+        )
+        logging.info("Results saved to: %s", export_path)
+
+    @staticmethod
+    def _get_columnar_gdf(gdf: GeoDataFrame) -> GeoDataFrame:
+        # Object columns are written as native (list or struct) columns, only those
+        # which cannot be converted (e.g. mixed types) are written as text.
+        _text_columns = []
+        for _col in gdf.columns:
+            if gdf[_col].dtype != object or _col == gdf.geometry.name:
+                continue
+            try:
+                pyarrow.array(gdf[_col], from_pandas=True)
+            except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError):
+                _text_columns.append(_col)
+        if not _text_columns:
+            return gdf
+        return gdf.astype({_col: str for _col in _text_columns})
+
+    def _export_columnar(self, gdf: GeoDataFrame, export_path: Path):
+        """Exports a geodataframe to GeoParquet (`.parquet`) or Feather (`.feather`),
+        keeping the list and struct columns (such as paths) as native columns.
 
-        _result_copy = deepcopy(result_gdf)
-        del _result_copy["geometry"]
-        _result_copy.to_csv(export_path, index=False)
+        Args:
+            gdf (GeoDataFrame): Result to export.
+            export_path (Path): Path to save, its suffix determines the format.
+        """
+        _export_gdf = self._get_columnar_gdf(gdf)
+        if _export_gdf.crs is None:
+            _export_gdf = _export_gdf.set_crs("epsg:4326")
+
+        self._prepare_export_path(export_path)
+        if export_path.suffix == ".feather":
+            _export_gdf.to_feather(export_path, index=False)
+        else:
+            _export_gdf.to_parquet(export_path, index=False)
+        logging.info("Results saved to: %s", export_path)
@@ -0,0 +1,137 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import re
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+
+
+class DamageCurveRegistry:
+    """
+    Keeps compiled damage functions (curve breakpoints and values, max damage tables) as
+    plain arrays in `.npz` files, keyed by the checksum of the source files they were
+    compiled from (and the cache format version). As long as the source files do not
+    change, the compiled arrays are loaded instead of re-reading and re-compiling the
+    (CSV) files. The cache files only contain arrays, so they are read without unpickling.
+    """
+
+    # Increase when the arrays stored for a compiled entry change.
+    format_version: int = 1
+    cache_dir: Optional[Path]
+
+    def __init__(self, cache_dir: Optional[Path] = None) -> None:
+        """
+        Args:
+            cache_dir (Optional[Path], optional): Folder to store the compiled arrays in.
+                When not given nothing is cached. Defaults to None.
+        """
+        self.cache_dir = cache_dir
+
+    @classmethod
+    def get_checksum(cls, source_files: list[Path]) -> str:
+        """
+        Gets the checksum of the (names and content of the) given files and the cache
+        format version.
+
+        Args:
+            source_files (list[Path]): Files to include in the checksum.
+
+        Returns:
+            str: Hexadecimal checksum.
+        """
+        _hash = hashlib.sha256(f"format_version={cls.format_version}".encode())
+        for _source_file in sorted(map(Path, source_files)):
+            _hash.update(_source_file.name.encode())
+            _hash.update(_source_file.read_bytes())
+        return _hash.hexdigest()
+
+    def _get_cache_file(self, name: str) -> Path:
+        return self.cache_dir.joinpath(re.sub(r"[^\w\-]", "_", name) + ".npz")
+
+    def _read_cache(self, name: str, checksum: str) -> Optional[dict[str, np.ndarray]]:
+        _cache_file = self._get_cache_file(name)
+        if not _cache_file.is_file():
+            return None
+        try:
+            with np.load(_cache_file, allow_pickle=False) as _cache:
+                _arrays = {_key: _cache[_key] for _key in _cache.files}
+        except Exception as exc:
+            logging.warning(
+                "Could not read damage functions cache %s (%s), it will be rebuilt.",
+                _cache_file,
+                exc,
+            )
+            return None
+        if str(_arrays.pop("checksum", "")) != checksum:
+            return None
+        return _arrays
+
+    def _write_cache(
+        self, name: str, checksum: str, arrays: dict[str, np.ndarray]
+    ) -> None:
+        _cache_file = self._get_cache_file(name)
+        _tmp_file = _cache_file.with_suffix(".tmp.npz")
+        try:
+            _cache_file.parent.mkdir(parents=True, exist_ok=True)
+            np.savez(_tmp_file, checksum=np.array(checksum), **arrays)
+            _tmp_file.replace(_cache_file)
+        except OSError as exc:
+            logging.warning(
+                "Could not write damage functions cache %s (%s).", _cache_file, exc
+            )
+
+    def get_compiled(
+        self,
+        name: str,
+        source_files: list[Path],
+        compile_func: Callable[[], dict[str, np.ndarray]],
+    ) -> dict[str, np.ndarray]:
+        """
+        Gets the compiled arrays of the given source files, compiling (and caching) them
+        only when there are no cached arrays for the current content of the files.
+
+        Args:
+            name (str): Name of the compiled entry, e.g. the damage function name.
+            source_files (list[Path]): Files the entry is compiled from.
+            compile_func (Callable[[], dict[str, np.ndarray]]): Compiles the arrays of
+                the entry from the source files.
+
+        Returns:
+            dict[str, np.ndarray]: The compiled arrays by name.
+        """
+        if not self.cache_dir:
+            return compile_func()
+
+        _checksum = self.get_checksum(source_files)
+        _cached_arrays = self._read_cache(name, _checksum)
+        if _cached_arrays is not None:
+            logging.info("Loaded compiled damage function '%s' from cache.", name)
+            return _cached_arrays
+
+        _arrays = {_key: np.asarray(_value) for _key, _value in compile_func().items()}
+        self._write_cache(name, _checksum, _arrays)
+        return _arrays
@@ -25,6 +25,8 @@ from pathlib import Path
 
 import pandas as pd
 
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+
 
 class DamageFractionUniform:
     """
@@ -122,22 +124,13 @@ class DamageFractionUniform:
 
     def create_interpolator(self):
         """Create interpolator object from loaded data
-        sets result to self.interpolator (Scipy interp1d)
+        sets result to self.interpolator (PiecewiseLinearCurve)
         """
-        from scipy.interpolate import interp1d
-
         x_values = self.data.index.values
         y_values = self.data.values[:, 0]
 
-        self.interpolator = interp1d(
-            x=x_values,
-            y=y_values,
-            fill_value=(
-                y_values[0],
-                y_values[-1],
-            ),  # fraction damage (y) if hazard severity (x) is outside curve range
-            bounds_error=False,
-        )
+        # fraction damage (y) if hazard severity (x) is outside curve range is the first / last value
+        self.interpolator = PiecewiseLinearCurve.from_points(x_values, y_values)
 
         return None
 
@@ -147,7 +140,7 @@ class DamageFractionUniform:
                 "DamageFractionUniform with name: "
                 + self.name
                 + " interpolator: {}".format(
-                    list(zip(self.interpolator.y, self.interpolator.x))
+                    list(zip(self.interpolator.values, self.interpolator.breakpoints))
                 )
             )
         else:
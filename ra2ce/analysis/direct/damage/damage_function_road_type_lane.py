@@ -19,13 +19,18 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __future__ import annotations
+
 import logging
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 from ra2ce.analysis.direct.damage.damage_fraction_uniform import DamageFractionUniform
 from ra2ce.analysis.direct.damage.max_damage import MaxDamageByRoadTypeByLane
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+from ra2ce.analysis.direct.direct_lookup import RoadTypeLanesLookUp
 
 
 class DamageFunctionByRoadTypeByLane:
@@ -110,6 +115,63 @@ class DamageFunctionByRoadTypeByLane:
 
         damage_fraction.create_interpolator()
 
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Gets the compiled max damages and damage fraction curve as plain arrays (e.g. to
+        cache them), from which the damage function can be restored with `from_arrays`.
+
+        Returns:
+            dict[str, np.ndarray]: The arrays by name.
+        """
+        return dict(
+            max_damage_name=np.array(str(self.max_damage.name)),
+            damage_unit=np.array(str(self.max_damage.damage_unit)),
+            road_types=np.array(list(map(str, self.max_damage.data.index))),
+            lanes=self.max_damage.data.columns.to_numpy(dtype=int),
+            max_damages=self.max_damage.data.to_numpy(dtype=float),
+            damage_fraction_name=np.array(str(self.damage_fraction.name)),
+            hazard_unit=np.array(str(self.damage_fraction.hazard_unit)),
+            breakpoints=self.damage_fraction.interpolator.breakpoints,
+            values=self.damage_fraction.interpolator.values,
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, name: str, arrays: dict[str, np.ndarray]
+    ) -> DamageFunctionByRoadTypeByLane:
+        """
+        Restores a damage function from the arrays of `to_arrays`.
+
+        Args:
+            name (str): Name of the damage function.
+            arrays (dict[str, np.ndarray]): The arrays by name.
+
+        Returns:
+            DamageFunctionByRoadTypeByLane: The damage function.
+        """
+        max_damage = MaxDamageByRoadTypeByLane(
+            name=str(arrays["max_damage_name"]),
+            damage_unit=str(arrays["damage_unit"]),
+        )
+        max_damage.data = pd.DataFrame(
+            arrays["max_damages"],
+            index=arrays["road_types"].tolist(),
+            columns=arrays["lanes"].tolist(),
+        )
+        max_damage.road_types = list(max_damage.data.index)
+
+        damage_fraction = DamageFractionUniform(
+            name=str(arrays["damage_fraction_name"]),
+            hazard_unit=str(arrays["hazard_unit"]),
+        )
+        damage_fraction.data = pd.DataFrame(
+            arrays["values"], index=arrays["breakpoints"]
+        )
+        damage_fraction.interpolator = PiecewiseLinearCurve(
+            breakpoints=arrays["breakpoints"], values=arrays["values"]
+        )
+        return cls(max_damage=max_damage, damage_fraction=damage_fraction, name=name)
+
     # Todo: these two below functions are maybe better implemented at a lower level?
     def add_max_damage(self, df: pd.DataFrame, prefix: str = None):
         """ "Ads the max damage value to the dataframe"""
@@ -117,12 +179,55 @@ class DamageFunctionByRoadTypeByLane:
         assert "road_type" in cols, "no column 'road type' in df"
         assert "lanes" in cols, "no column 'lanes in df"
 
-        max_damage_data = self.max_damage.data
-        df["{}_temp_max_dam".format(prefix)] = max_damage_data.lookup(
+        max_damage_lookup = RoadTypeLanesLookUp.from_dataframe(self.max_damage.data)
+        df["{}_temp_max_dam".format(prefix)] = max_damage_lookup.get_values(
             df["road_type"], df["lanes"]
         )
         return df
 
+    def get_max_damages(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Gets the max damage (euro/m) of every road segment, without modifying the dataframe.
+
+        Args:
+            df (pd.DataFrame): dataframe with the columns 'road_type' and 'lanes'.
+
+        Returns:
+            np.ndarray: max damage per road segment.
+        """
+        max_damage_lookup = RoadTypeLanesLookUp.from_dataframe(self.max_damage.data)
+        return np.asarray(
+            max_damage_lookup.get_values(df["road_type"], df["lanes"]), dtype=float
+        )
+
+    def get_damage(
+        self,
+        max_damages: np.ndarray,
+        lengths: np.ndarray,
+        hazard_severity: np.ndarray,
+        hazard_fraction: np.ndarray,
+    ) -> np.ndarray:
+        """
+        Calculates the (rounded) damage of one event as an array, independent of any
+        dataframe, so the damage of several events can be calculated concurrently.
+
+        Args:
+            max_damages (np.ndarray): max damage per road segment (euro/m).
+            lengths (np.ndarray): length per road segment (m).
+            hazard_severity (np.ndarray): hazard severity per road segment.
+            hazard_fraction (np.ndarray): fraction of each road segment that is affected.
+
+        Returns:
+            np.ndarray: damage per road segment.
+        """
+        return np.round(
+            max_damages
+            * self.damage_fraction.interpolator(hazard_severity)
+            * lengths
+            * hazard_fraction,
+            0,
+        )
+
     def calculate_damage(
         self,
         df: pd.DataFrame,
@@ -143,25 +248,58 @@ class DamageFunctionByRoadTypeByLane:
             pd.DataFrame: dataframe data with the damage calculation added as new column
         """
 
+        return self.calculate_damages(
+            df, damage_function_prefix, hazard_prefix, [event_prefix]
+        )
+
+    def calculate_damages(
+        self,
+        df: pd.DataFrame,
+        damage_function_prefix: str,
+        hazard_prefix: str,
+        event_prefixes: list[str],
+    ) -> pd.DataFrame:
+        """
+        Calculates the damage for many events at once, evaluating the damage curve only
+        once for all road segments and events.
+
+        Args:
+            df (pd.DataFrame): dataframe with road network data.
+            damage_function_prefix (str): prefix to identify the right damage function e.g. 'A'.
+            hazard_prefix (str): prefix to identify the right hazard e.g. 'F'.
+            event_prefixes (list[str]): prefixes to identify the events, e.g. ['EV1', 'EV2']
+
+        Returns:
+            pd.DataFrame: dataframe data with the damage calculation added as new columns
+        """
         interpolator = (
             self.damage_fraction.interpolator
         )  # get the interpolator function
 
         # Find correct columns in dataframe
-        result_col = "dam_{}_{}".format(event_prefix, damage_function_prefix)
+        result_cols = [
+            "dam_{}_{}".format(event_prefix, damage_function_prefix)
+            for event_prefix in event_prefixes
+        ]
         max_dam_col = "{}_temp_max_dam".format(damage_function_prefix)
-        hazard_severity_col = "{}_{}_me".format(
-            hazard_prefix, event_prefix
-        )  # mean is hardcoded now
-        hazard_fraction_col = "{}_{}_fr".format(
-            hazard_prefix, event_prefix
-        )  # fraction column is hardcoded
-
-        df[result_col] = round(
-            df[max_dam_col].astype(float)  # max damage (euro/m)
-            * interpolator(df[hazard_severity_col].astype(float))  # damage curve  (-)
-            * df["length"]  # segment length (m)
-            * df[hazard_fraction_col],
+        hazard_severity_cols = [
+            "{}_{}_me".format(hazard_prefix, event_prefix)
+            for event_prefix in event_prefixes
+        ]  # mean is hardcoded now
+        hazard_fraction_cols = [
+            "{}_{}_fr".format(hazard_prefix, event_prefix)
+            for event_prefix in event_prefixes
+        ]  # fraction column is hardcoded
+
+        # arrays with shape (events, road segments)
+        _damages = np.round(
+            df[max_dam_col].to_numpy(dtype=float)[None, :]  # max damage (euro/m)
+            * interpolator(
+                df[hazard_severity_cols].to_numpy(dtype=float).T
+            )  # damage curve  (-)
+            * df["length"].to_numpy(dtype=float)[None, :]  # segment length (m)
+            * df[hazard_fraction_cols].to_numpy(dtype=float).T,
             0,
         )  # round to whole numbers
+        df[result_cols] = pd.DataFrame(_damages.T, index=df.index, columns=result_cols)
         return df
@@ -21,7 +21,11 @@
 
 import logging
 from pathlib import Path
+from typing import Optional
 
+import numpy as np
+
+from ra2ce.analysis.direct.damage.damage_curve_registry import DamageCurveRegistry
 from ra2ce.analysis.direct.damage.damage_function_road_type_lane import (
     DamageFunctionByRoadTypeByLane,
 )
@@ -57,11 +61,27 @@ class ManualDamageFunctions:
         )
         return None
 
-    def load_damage_functions(self):
-        """ "Load damage functions in Ra2Ce"""
+    def load_damage_functions(self, cache_dir: Optional[Path] = None):
+        """ "Load damage functions in Ra2Ce
+
+        Arguments:
+            *cache_dir* (Path) : Optional folder where the compiled damage functions are cached (as arrays),
+                                 a damage function is only read again when its csv files change
+        """
+        _registry = DamageCurveRegistry(cache_dir)
         for name, damage_dir in self.available.items():
-            damage_function = DamageFunctionByRoadTypeByLane(name=name)
-            damage_function.from_input_folder(damage_dir)
+
+            def compile_damage_function() -> dict[str, np.ndarray]:
+                _damage_function = DamageFunctionByRoadTypeByLane(name=name)
+                _damage_function.from_input_folder(damage_dir)
+                return _damage_function.to_arrays()
+
+            damage_function = DamageFunctionByRoadTypeByLane.from_arrays(
+                name,
+                _registry.get_compiled(
+                    name, list(damage_dir.glob("*.csv")), compile_damage_function
+                ),
+            )
             damage_function.set_prefix()
             self.loaded.append(damage_function)
             logging.info(
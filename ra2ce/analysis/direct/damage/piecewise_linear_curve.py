@@ -0,0 +1,103 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class PiecewiseLinearCurve:
+    """
+    Compiled (damage) curve: a table of breakpoints (e.g. hazard severity) and values
+    (e.g. damage fraction), evaluated with linear interpolation. Outside the range of the
+    breakpoints the first / last value is returned, `nan` inputs return `nan`.
+    """
+
+    breakpoints: np.ndarray
+    values: np.ndarray
+
+    @classmethod
+    def from_points(cls, x_values, y_values) -> PiecewiseLinearCurve:
+        """
+        Compiles the curve from (unsorted) points.
+
+        Args:
+            x_values (array-like): Breakpoints of the curve.
+            y_values (array-like): Value of the curve at each breakpoint.
+
+        Returns:
+            PiecewiseLinearCurve: The compiled curve.
+        """
+        _x_values = np.asarray(x_values, dtype=float)
+        _y_values = np.asarray(y_values, dtype=float)
+        if _x_values.shape != _y_values.shape or _x_values.ndim != 1:
+            raise ValueError(
+                "The x and y values of a curve should be 1D and of equal length."
+            )
+        _order = np.argsort(_x_values, kind="stable")
+        return cls(breakpoints=_x_values[_order], values=_y_values[_order])
+
+    def __call__(self, x) -> np.ndarray:
+        """
+        Evaluates the curve at once for any array (e.g. road segments x events).
+        """
+        return np.interp(
+            np.asarray(x, dtype=float),
+            self.breakpoints,
+            self.values,
+            left=self.values[0],
+            right=self.values[-1],
+        )
+
+    def evaluate_samples(self, x, values: np.ndarray) -> np.ndarray:
+        """
+        Evaluates several variations of the curve at once, all with the same breakpoints
+        but their own values (e.g. Monte Carlo samples of the curve ordinates).
+
+        Args:
+            x (array-like): Where to evaluate the curves, of any shape.
+            values (np.ndarray): Values of every curve at the breakpoints, shape (curves, breakpoints).
+
+        Returns:
+            np.ndarray: The values of all curves, shape (curves, *x.shape).
+        """
+        _x = np.asarray(x, dtype=float)
+        _values = np.asarray(values, dtype=float)
+        if len(self.breakpoints) == 1:
+            # constant curves, only `nan` inputs remain `nan`
+            return _values[:, 0].reshape((-1,) + (1,) * _x.ndim) + 0 * _x
+
+        # The interpolation weights only depend on the breakpoints, so they are shared by all curves.
+        _idx = np.clip(
+            np.searchsorted(self.breakpoints, _x, side="right") - 1,
+            0,
+            len(self.breakpoints) - 2,
+        )
+        _widths = self.breakpoints[_idx + 1] - self.breakpoints[_idx]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _weights = np.where(
+                _widths > 0, (_x - self.breakpoints[_idx]) / _widths, 1.0
+            )
+        _weights = np.clip(_weights, 0.0, 1.0)
+        return _values[:, _idx] * (1 - _weights) + _values[:, _idx + 1] * _weights
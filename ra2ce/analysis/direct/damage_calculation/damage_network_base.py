@@ -21,27 +21,39 @@
 
 import logging
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 
 from ra2ce.analysis.analysis_config_data.enums.damage_curve_enum import DamageCurveEnum
 from ra2ce.analysis.direct.direct_lookup import LookUp as lookup
-from ra2ce.analysis.direct.direct_lookup import dataframe_lookup
-from ra2ce.analysis.direct.direct_utils import (
-    clean_lane_data,
-    create_summary_statistics,
-    scale_damage_using_lanes,
-)
+from ra2ce.analysis.direct.direct_lookup import RoadTypeLanesLookUp
+from ra2ce.analysis.direct.direct_utils import scale_damage_using_lanes
+from ra2ce.analysis.direct.lane_normalizer import LaneNormalizer
 
 
 class DamageNetworkBase(ABC):
     """A road network gdf with hazard data stored in it, and for which damages can be calculated"""
 
+    # percentiles of the construction costs for which the OSdaMage damages are calculated
+    osdamage_percentiles = [0, 25, 50, 75, 100]
+    # minimum number of damage values (road segments x events x damage functions) to
+    # calculate the damage of the manual damage functions concurrently
+    parallel_min_size = 1_000_000
+    # maximum number of threads for the concurrent calculation, `None` for the default
+    max_workers = None
+
     def __init__(self, road_gdf, val_cols):
         """Construct the Data"""
         self.val_cols = val_cols
         self.gdf = road_gdf
+        # mode of the lanes per road type, used to fill in missing lane data. When the gdf is
+        # only a batch of the network, these should be derived from the complete network.
+        self.lane_stats = None
+        # optional Monte Carlo ensemble to derive the uncertainty of the damages
+        self.uncertainty = None
         # set of hazard info per event
         self.stats = set([x.split("_")[-1] for x in val_cols])
         # TODO: also track the damage cols after the dam calculation, that is useful for the risk calc. module
@@ -73,54 +85,75 @@ class DamageNetworkBase(ABC):
     ### Generic cleanup functionality
     def fix_extraordinary_lanes(self):
         """Remove exceptionally high/low lane numbers in self.gdf"""
-        # fixing lanes
-        df = self.gdf
-        df["lanes_copy"] = df["lanes"].copy()
-        df["lanes"] = df["lanes_copy"].where(
-            df["lanes_copy"].astype(float) >= 1.0, other=1.0
-        )
-        df["lanes"] = df["lanes_copy"].where(
-            df["lanes_copy"].astype(float) <= 6.0, other=6.0
+        self.gdf["lanes"] = LaneNormalizer.clip(self.gdf["lanes"])
+
+    @staticmethod
+    def get_clean_lanes(lanes: pd.Series) -> pd.Series:
+        """
+        Converts the lane data to (rounded) floats, cleaning it up when needed.
+
+        Args:
+            lanes (pd.Series): raw lane data
+
+        Returns:
+            pd.Series: number of lanes as float, nan when unknown
+        """
+        # round to nearest integer, but save as float format (ints cannot be nan)
+        return LaneNormalizer.parse(lanes).round(0)
+
+    @staticmethod
+    def get_lane_statistics(road_df: pd.DataFrame) -> dict:
+        """
+        Gets the mode of the (cleaned) lanes per (remapped) road type. Only the columns
+        'highway' and 'lanes' are needed, so this can be done in a cheap first pass over a
+        network that is too large to be processed at once.
+
+        Args:
+            road_df (pd.DataFrame): road network with the columns 'highway' and 'lanes'
+
+        Returns:
+            dict: keys = road types; values = lanes
+        """
+        return LaneNormalizer.get_lane_statistics(
+            road_df["highway"].replace(lookup.road_mapping()),
+            DamageNetworkBase.get_clean_lanes(road_df["lanes"]),
         )
-        df = self.gdf
 
     def clean_and_interpolate_missing_lane_data(self):
         # cleanup and complete the lane data.
-        ### Try to convert all data to floats
-        try:
-            self.gdf.lanes = self.gdf.lanes.astype(
-                "float"
-            )  # floats instead of ints because ints cannot be nan.
-        except Exception:
-            logging.warning(
-                "Available lane data cannot simply be converted to float/int, RA2CE will try a clean-up."
-            )
-            self.gdf.lanes = clean_lane_data(self.gdf.lanes)
-
-        # round to nearest integer, but save as float format
-        self.gdf.lanes = self.gdf.lanes.round(0)
+        self.gdf["lanes"] = self.get_clean_lanes(self.gdf["lanes"])
 
         # boolean with trues for all nans, i.e. all road segements without lane data
-        nans = self.gdf.lanes.isnull()
-        if nans.sum() > 0:
+        nans = self.gdf["lanes"].isnull()
+        if nans.any():
             logging.warning(
                 """Of the {} road segments, only {} had lane data, so for {} the '
                                     lane data will be interpolated from the existing data""".format(
-                    len(self.gdf.lanes), (~nans).sum(), nans.sum()
+                    len(nans), (~nans).sum(), nans.sum()
                 )
             )
-            lane_stats = create_summary_statistics(self.gdf)
+            lane_stats = self.lane_stats
+            if lane_stats is None:
+                lane_stats = LaneNormalizer.get_lane_statistics(
+                    self.gdf["road_type"], self.gdf["lanes"]
+                )
 
-            # Replace the missing lane data the neat way (without pandas SettingWithCopyWarning)
-            lane_nans_mask = self.gdf.lanes.isnull()
-            self.gdf.loc[lane_nans_mask, "lanes"] = self.gdf.loc[
-                lane_nans_mask, "road_type"
-            ].replace(lane_stats)
+            self.gdf["lanes"] = LaneNormalizer.impute(
+                self.gdf["road_type"], self.gdf["lanes"], lane_stats
+            )
             logging.warning(
                 "Interpolated the missing lane data as follows: {}".format(lane_stats)
             )
-            # all nans should be replaced
-            assert np.nan not in self.gdf.lanes.unique()
+            if self.gdf["lanes"].isnull().any():
+                logging.warning(
+                    "No lane data could be interpolated for road types: {}".format(
+                        list(
+                            self.gdf.loc[
+                                self.gdf["lanes"].isnull(), "road_type"
+                            ].unique()
+                        )
+                    )
+                )
 
         # TODO: think about if this is the best option
         self.gdf.loc[self.gdf["lanes"] == 0, "lanes"] = 1
@@ -163,6 +196,10 @@ class DamageNetworkBase(ABC):
     ### Damage handlers
     def calculate_damage_manual_functions(self, events, manual_damage_functions):
         """
+        Calculates the damage of every (manual damage function, event) combination into
+        one preallocated matrix, which is added to `self.gdf` at once. For large inputs
+        the combinations are calculated concurrently.
+
         Arguments:
             *events* (list) : list of events (or return periods) to iterate over, these should match the hazard column names
             *manual_damage_functions* (RA2CE ManualDamageFunctions object) :
@@ -176,19 +213,46 @@ class DamageNetworkBase(ABC):
 
         assert manual_damage_functions is not None, "No damage functions were loaded"
 
-        for _loaded_func in manual_damage_functions.loaded:
-            # Add max damage values to df
-            df = _loaded_func.add_max_damage(df, _loaded_func.prefix)
-            for event in events:
-                # Add apply interpolator objects
-                event_prefix = event
-                df = _loaded_func.calculate_damage(
-                    df, _loaded_func.prefix, hazard_prefix, event_prefix
-                )
+        events = list(events)
+        _loaded_funcs = list(manual_damage_functions.loaded)
+        _lengths = df["length"].to_numpy(dtype=float)
+        _max_damages = [_func.get_max_damages(df) for _func in _loaded_funcs]
+        _tasks = [
+            (_func_idx, _event)
+            for _func_idx in range(len(_loaded_funcs))
+            for _event in events
+        ]
+        dam_cols = [
+            "dam_{}_{}".format(_event, _loaded_funcs[_func_idx].prefix)
+            for _func_idx, _event in _tasks
+        ]
+        _damages = np.empty((len(df), len(_tasks)), dtype=float)
+
+        def calculate_damage(task_idx: int) -> None:
+            _func_idx, _event = _tasks[task_idx]
+            _damages[:, task_idx] = _loaded_funcs[_func_idx].get_damage(
+                _max_damages[_func_idx],
+                _lengths,
+                df["{}_{}_me".format(hazard_prefix, _event)].to_numpy(dtype=float),
+                df["{}_{}_fr".format(hazard_prefix, _event)].to_numpy(dtype=float),
+            )
 
-        # Only transfer the final results to the damage column
-        dam_cols = [c for c in df.columns if c.startswith("dam_")]
-        self.gdf[dam_cols] = df[dam_cols]
+        if len(_tasks) > 1 and _damages.size >= self.parallel_min_size:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as _executor:
+                list(_executor.map(calculate_damage, range(len(_tasks))))
+        else:
+            for _task_idx in range(len(_tasks)):
+                calculate_damage(_task_idx)
+
+        # Only transfer the final results to the damage columns, all at once
+        _damages_df = pd.DataFrame(_damages, index=df.index, columns=dam_cols)
+        self.gdf = pd.concat(
+            [
+                self.gdf.drop(columns=[c for c in dam_cols if c in self.gdf.columns]),
+                _damages_df.reindex(self.gdf.index),
+            ],
+            axis=1,
+        )
         logging.info(
             "Damage calculation with the manual damage functions was succesfull."
         )
@@ -221,20 +285,14 @@ class DamageNetworkBase(ABC):
         # Load the Huizinga damage functions
         curve_name = "HZ"
 
-        df_max_damages_huizinga = pd.DataFrame.from_dict(
-            lookup.get_max_damages_huizinga()
-        )
+        max_damages_huizinga = RoadTypeLanesLookUp(lookup.get_max_damages_huizinga())
         interpolator = lookup.get_flood_curves()[
             "HZ"
         ]  # input: water depth (cm); output: damage (fraction road construction costs)
 
         df = self._gdf_mask
         df["lanes"] = df["lanes"].astype(int)
-        df["max_dam_hz"] = df.apply(
-            dataframe_lookup,
-            args=(df_max_damages_huizinga, ["lanes", "road_type"]),
-            axis=1,
-        )
+        df["max_dam_hz"] = max_damages_huizinga.get_values(df["road_type"], df["lanes"])
 
         for event in events:
             df["dam_{}_{}".format(event, curve_name)] = round(
@@ -291,7 +349,6 @@ class DamageNetworkBase(ABC):
 
         # Prepare the output files
         df = self._gdf_mask
-        df["tuple"] = [tuple([0] * 5)] * len(df["lanes"])
 
         # CALCULATE MINIMUM AND MAXIMUM CONSTRUCTION COST PER ROAD TYPE
         # pre-calculation of max damages per percentage (same for each C1-C6 category)
@@ -306,81 +363,157 @@ class DamageNetworkBase(ABC):
         cols_to_scale = ["lower_damage", "upper_damage"]
         df = scale_damage_using_lanes(lane_scale_factors, df, cols_to_scale)
 
-        # create separate column for each percentile of construction costs (is faster then tuple)
-        for percentage in [
-            0,
-            25,
-            50,
-            75,
-            100,
-        ]:  # So this interpolates the min to the max damage
-            df["damage_{}".format(percentage)] = (
-                df["upper_damage"] * percentage / 100
-            ) + (df["lower_damage"] * (100 - percentage) / 100)
-
-        for curve_name, interpolator in interpolators.items():
-            # print(curve_name, interpolator)
-            for event in events:
-                for percentage in [0, 25, 50, 75, 100]:
-                    df["dam_{}_{}_{}".format(percentage, curve_name, event)] = round(
-                        df["damage_{}".format(percentage)].astype(
-                            float
-                        )  # max damage (in euro/km)
-                        * interpolator(
-                            df["{}_{}_{}".format(hazard_prefix, event, end)]
-                        ).astype(
-                            float
-                        )  # damage curve: fraction f(depth-cm) #Todo check units
-                        * df["{}_{}_{}".format(hazard_prefix, event, "fr")].astype(
-                            float
-                        )  # inundated fraction of the segment
-                        * df["length"].astype(float),
-                        2,
-                    )
-
-                # This wraps it all in tuple again
-                df["dam_{}_{}".format(curve_name, event)] = tuple(
-                    zip(
-                        df["dam_0_{}_{}".format(curve_name, event)],
-                        df["dam_25_{}_{}".format(curve_name, event)],
-                        df["dam_50_{}_{}".format(curve_name, event)],
-                        df["dam_75_{}_{}".format(curve_name, event)],
-                        df["dam_100_{}_{}".format(curve_name, event)],
-                    )
-                )
-
-                # And throw way all intermediate results (that are not in the tuple)
-                df = df.drop(
-                    columns=[
-                        "dam_{}_{}_{}".format(percentage, curve_name, event)
-                        for percentage in [0, 25, 50, 75, 100]
-                    ]
-                )
-
-        df = df.drop(columns=[c for c in df.columns if c.startswith("damage_")])
+        # All damages are calculated at once as an array with shape
+        # (curves, events, road segments, percentiles).
+        _events = list(events)
+        _curve_names = list(interpolators.keys())
+        _percentages = np.array(self.osdamage_percentiles, dtype=float)
+
+        # max damage (in euro/km) per percentile, this interpolates the min to the max damage
+        _max_damages = (
+            df["upper_damage"].to_numpy(dtype=float)[:, None] * _percentages / 100
+        ) + (
+            df["lower_damage"].to_numpy(dtype=float)[:, None]
+            * (100 - _percentages)
+            / 100
+        )
+        _depths = np.stack(
+            [
+                df[f"{hazard_prefix}_{event}_{end}"].to_numpy(dtype=float)
+                for event in _events
+            ]
+        )
+        _fractions = np.stack(
+            [
+                df[f"{hazard_prefix}_{event}_fr"].to_numpy(dtype=float)
+                for event in _events
+            ]
+        )
+        _damage_fractions = np.stack(
+            [
+                interpolators[curve_name](_depths).astype(float)
+                for curve_name in _curve_names
+            ]
+        )  # damage curve: fraction f(depth-cm) #Todo check units
+        _damages = np.round(
+            _max_damages[None, None, :, :]
+            * _damage_fractions[:, :, :, None]
+            * _fractions[None, :, :, None]  # inundated fraction of the segment
+            * df["length"].to_numpy(dtype=float)[None, None, :, None],
+            2,
+        )
 
         # drop invalid combinations of damage curves and road types (C1-C4 for motorways; C5,C6 for other)
-        all_dam_cols = [c for c in df.columns if c.startswith("dam_")]
-        motorway_curves = [
-            c for c in all_dam_cols if int(c.split("_")[1][-1]) <= 4
-        ]  # C1-C4
-        other_curves = [
-            c for c in all_dam_cols if int(c.split("_")[1][-1]) > 4
-        ]  # C5, C6
+        _is_motorway = df["road_type"].isin(["motorway", "trunk"]).to_numpy()
+        _is_motorway_curve = np.array(
+            [int(curve_name[-1]) <= 4 for curve_name in _curve_names]
+        )
+        _is_valid = _is_motorway_curve[:, None] == _is_motorway[None, :]
+        _damages[~np.broadcast_to(_is_valid[:, None, :, None], _damages.shape)] = np.nan
+
+        # Add the new columns, one per curve, event and percentile, at once to the df
+        all_dam_cols = [
+            self.get_osdamage_column_name(curve_name, event, percentage)
+            for curve_name in _curve_names
+            for event in _events
+            for percentage in self.osdamage_percentiles
+        ]
+        self.gdf[all_dam_cols] = pd.DataFrame(
+            _damages.transpose(2, 0, 1, 3).reshape(len(df), -1),
+            index=df.index,
+            columns=all_dam_cols,
+        )
+        logging.info(
+            "calculate_damage_OSdaMage(): Damage calculation with the OSdaMage functions was succesfull"
+        )
 
-        is_motorway_mask = df["road_type"].isin(["motorway", "trunk"])
+    def calculate_damage_uncertainty(
+        self,
+        events,
+        damage_function: DamageCurveEnum,
+        manual_damage_functions,
+        return_periods: Optional[list[float]] = None,
+    ) -> dict[str, np.ndarray]:
+        """
+        Calculates the damage of all samples of the uncertainty ensemble (`self.uncertainty`)
+        and adds their quantiles per event and curve, e.g. 'unc_dam_EV1_HZ_q50'.
+        The samples are evaluated per chunk of road segments, only their quantiles are kept.
 
-        for curve in other_curves:
-            df.loc[is_motorway_mask, curve] = np.nan
+        Arguments:
+            *events* (list) : list of events (or return periods), these should match the hazard column names
+            *damage_function* (DamageCurveEnum) : damage function key name that is to be used
+            *manual_damage_functions* (RA2CE ManualDamageFunctions object) :
+            *return_periods* (list[float]) : return period of each event, to also derive the risk quantiles
 
-        for curve in motorway_curves:
-            df.loc[~is_motorway_mask, curve] = np.nan
+        Returns:
+            dict[str, np.ndarray] : per curve, the risk quantiles with shape (quantiles, segments of the mask),
+                empty without return periods
+        """
+        # Todo: Dirty fixes, these should be read from the init
+        hazard_prefix = "F"
 
-        # Add the new columns add the right location to the df
-        self.gdf[all_dam_cols] = df[all_dam_cols]
+        df = self._gdf_mask
+        _events = list(events)
+        if damage_function == DamageCurveEnum.HZ:
+            _curves = {
+                "HZ": (
+                    lookup.get_flood_curves()["HZ"],
+                    RoadTypeLanesLookUp(lookup.get_max_damages_huizinga()),
+                )
+            }
+        elif damage_function == DamageCurveEnum.MAN:
+            _curves = {
+                _loaded_func.prefix: (
+                    _loaded_func.damage_fraction.interpolator,
+                    RoadTypeLanesLookUp.from_dataframe(_loaded_func.max_damage.data),
+                )
+                for _loaded_func in manual_damage_functions.loaded
+            }
+        else:
+            logging.warning(
+                "The uncertainty of the damages can not be derived for damage function %s.",
+                damage_function,
+            )
+            return {}
+
+        _severity = df[[f"{hazard_prefix}_{event}_me" for event in _events]]
+        _fraction = df[[f"{hazard_prefix}_{event}_fr" for event in _events]]
+        _risk_quantiles_per_curve = {}
+        _quantile_columns = {}
+        for _curve_name, (_curve, _max_damage) in _curves.items():
+            _quantiles, _risk_quantiles = self.uncertainty.get_damage_quantiles(
+                _curve,
+                _max_damage.get_values(df["road_type"], df["lanes"].astype(int)),
+                _severity.to_numpy(dtype=float).T,
+                _fraction.to_numpy(dtype=float).T,
+                df["length"].to_numpy(dtype=float),
+                return_periods,
+            )
+            if _risk_quantiles is not None:
+                _risk_quantiles_per_curve[_curve_name] = _risk_quantiles
+            for _e_idx, _event in enumerate(_events):
+                for _q_idx, _quantile in enumerate(self.uncertainty.quantiles):
+                    _quantile_columns[
+                        f"unc_dam_{_event}_{_curve_name}_q{_quantile * 100:g}"
+                    ] = _quantiles[_q_idx, _e_idx]
+
+        self.gdf[list(_quantile_columns)] = pd.DataFrame(
+            _quantile_columns, index=df.index
+        )
         logging.info(
-            "calculate_damage_OSdaMage(): Damage calculation with the OSdaMage functions was succesfull"
+            "Damage uncertainty calculated with an ensemble of %s samples.",
+            self.uncertainty.n_samples,
         )
+        return _risk_quantiles_per_curve
+
+    @staticmethod
+    def get_osdamage_column_name(curve_name: str, event: str, percentile: int) -> str:
+        """
+        Gets the name of the column with the OSdaMage damage of a curve, event and
+        construction costs percentile (0 for the lowest, 100 for the highest costs).
+        E.g. 'dam_C1_EV1_0'.
+        """
+        return f"dam_{curve_name}_{event}_{percentile}"
 
     ### Utils handlers
     def create_mask(self):
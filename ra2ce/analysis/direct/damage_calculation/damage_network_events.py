@@ -64,6 +64,11 @@ class DamageNetworkEvents(DamageNetworkBase):
                 events=self.events, manual_damage_functions=manual_damage_functions
             )
 
+        if self.uncertainty:
+            self.calculate_damage_uncertainty(
+                self.events, damage_function, manual_damage_functions
+            )
+
 
 # class DamageNetworkEventsBuilder:
 #     @staticmethod
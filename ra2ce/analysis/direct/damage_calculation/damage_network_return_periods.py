@@ -21,6 +21,7 @@
 
 import logging
 from pathlib import Path
+from typing import Optional
 
 import numpy as np
 import pandas as pd
@@ -86,9 +87,46 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
 
         if damage_function == DamageCurveEnum.MAN:
             self.calculate_damage_manual_functions(
-                events=self.events, manual_damage_functions=manual_damage_functions
+                events=self.return_periods,
+                manual_damage_functions=manual_damage_functions,
             )
 
+        if self.uncertainty:
+            self.calculate_risk_uncertainty(damage_function, manual_damage_functions)
+
+    def calculate_risk_uncertainty(
+        self, damage_function: DamageCurveEnum, manual_damage_functions
+    ):
+        """
+        Calculates the damage and ('default' mode) risk of all samples of the uncertainty
+        ensemble (per chunk of road segments) and adds their quantiles, e.g. 'unc_dam_RP100_HZ_q50' and 'unc_risk_q50'
+        (prefixed with the damage curve when there is more than one, e.g. 'unc_risk_HZ_q50').
+        """
+        _return_periods = list(self.return_periods)
+        _rps = [float(_rp.replace("RP", "")) for _rp in _return_periods]
+        _risk_quantiles_per_curve = self.calculate_damage_uncertainty(
+            _return_periods, damage_function, manual_damage_functions, _rps
+        )
+        _quantile_columns = {}
+        for _curve_name, _quantiles in _risk_quantiles_per_curve.items():
+            _prefix = (
+                "unc_risk"
+                if len(_risk_quantiles_per_curve) == 1
+                else f"unc_risk_{_curve_name}"
+            )
+            for _q_idx, _quantile in enumerate(self.uncertainty.quantiles):
+                _quantile_columns[f"{_prefix}_q{_quantile * 100:g}"] = _quantiles[
+                    _q_idx
+                ]
+        if not _quantile_columns:
+            return
+        # road segments without hazard have no risk
+        self.gdf[list(_quantile_columns)] = (
+            pd.DataFrame(_quantile_columns, index=self._gdf_mask.index)
+            .reindex(self.gdf.index)
+            .fillna(0)
+        )
+
     def control_risk_calculation(
         self,
         mode: RiskCalculationModeEnum = RiskCalculationModeEnum.DEFAULT,
@@ -104,21 +142,193 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
         """
         self.verify_damage_data_for_risk_calculation()
 
-        # prepare the parameters of the risk calculation
+        # prepare the parameters of the risk calculation, one per damage curve
+        # (and construction costs percentile in case of OSdaMage)
         dam_cols = [c for c in self.gdf.columns if c.startswith("dam")]
-        _to_integrate = self.gdf[dam_cols]
-        _to_integrate.columns = [
-            float(c.split("_")[1].replace("RP", "")) for c in _to_integrate.columns
-        ]
-        _to_integrate = _to_integrate.sort_index(
-            axis="columns", ascending=False
-        )  # from large to small RP
+        _damage_columns_per_curve = self.get_damage_columns_per_curve(dam_cols)
+        for _curve, _rp_columns in _damage_columns_per_curve.items():
+            _to_integrate = self.gdf[list(_rp_columns.values())]
+            _to_integrate.columns = list(_rp_columns.keys())
+            _to_integrate = _to_integrate.sort_index(
+                axis="columns", ascending=False
+            )  # from large to small RP
+
+            _risk = self.calculate_risk(_to_integrate, mode, year)
+            if _risk is None:
+                continue
+            if len(_damage_columns_per_curve) == 1:
+                self.gdf["risk"] = _risk
+            else:
+                self.gdf["risk_{}".format(_curve)] = _risk
+
+    def control_risk_calculation_sweep(
+        self,
+        mode: RiskCalculationModeEnum,
+        years: list[int],
+    ):
+        """
+        Controler of a risk calculation for several protection levels (cutoff years) or
+        triangle years at once, e.g. to derive the risk as function of the protection standard.
+        Adds one column per year, 'risk_cut_<year>' or 'risk_triangle_<year>'
+        (prefixed with the damage curve when there is more than one, e.g. 'risk_C1_25_cut_<year>').
 
+        Arguments:
+            *mode* (RiskCalculationModeEnum) : ‘cut_from_YYYY_year’ or ‘triangle_to_null_YYYY_year’
+            *years* (list[int]) : the cutoff years/return periods of the risk calculation
+        """
+        self.verify_damage_data_for_risk_calculation()
+        _years = list(dict.fromkeys(years))
+        _mode_name = {
+            RiskCalculationModeEnum.CUT_FROM_YEAR: "cut",
+            RiskCalculationModeEnum.TRIANGLE_TO_NULL_YEAR: "triangle",
+        }.get(mode, None)
+        if not _mode_name:
+            raise ValueError(
+                "A risk calculation sweep is not possible in mode {}.".format(mode)
+            )
+
+        dam_cols = [c for c in self.gdf.columns if c.startswith("dam")]
+        _damage_columns_per_curve = self.get_damage_columns_per_curve(dam_cols)
+        _risk_columns = {}
+        for _curve, _rp_columns in _damage_columns_per_curve.items():
+            _to_integrate = self.gdf[list(_rp_columns.values())]
+            _to_integrate.columns = list(_rp_columns.keys())
+            _to_integrate = _to_integrate.sort_index(
+                axis="columns", ascending=False
+            )  # from large to small RP
+
+            _risks = self.calculate_risk_sweep(_to_integrate, mode, _years)
+            _prefix = (
+                "risk" if len(_damage_columns_per_curve) == 1 else f"risk_{_curve}"
+            )
+            for _year, _risk in zip(_years, _risks.T):
+                _risk_columns[f"{_prefix}_{_mode_name}_{_year}"] = _risk
+
+        self.gdf[list(_risk_columns)] = pd.DataFrame(
+            _risk_columns, index=self.gdf.index
+        )
+
+    def calculate_risk_sweep(
+        self,
+        to_integrate: pd.DataFrame,
+        mode: RiskCalculationModeEnum,
+        years: list[int],
+    ) -> np.ndarray:
+        """
+        Calculates the risk of one set of damages per return period for several cutoff or
+        triangle years at once, reusing the same (sorted) damages and frequencies.
+
+        Arguments:
+            *to_integrate* (pd.DataFrame) : damages with the return periods as columns, from large to small RP
+            *mode* (RiskCalculationModeEnum) : ‘cut_from_YYYY_year’ or ‘triangle_to_null_YYYY_year’
+            *years* (list[int]) : the cutoff years/return periods of the risk calculation
+
+        Returns:
+            np.ndarray : risk per row and year
+        """
+        _rps = list(to_integrate.columns)
+        if mode == RiskCalculationModeEnum.CUT_FROM_YEAR:
+            if min(years) <= min(_rps):
+                raise ValueError(
+                    """
+                RA2CE cannot calculate risk in 'cut_from' mode if 
+                Return period of the cutoff ({}) <= smallest available return period ({})
+                Use 'default' mode or 'triangle_to_null_mode' instead.
+                                    """.format(
+                        min(years), min(_rps)
+                    )
+                )
+            _to_integrate, _cutoff_damages = self.rework_damage_data_cut_from_years(
+                to_integrate, years
+            )
+            # Integrate once up to every known return period (from large to small RP),
+            # then add the last (partial) trapezoid up to each of the cutoffs.
+            _known_rps = sorted(_to_integrate.columns, reverse=True)
+            _known_frequencies = np.array([1 / _rp for _rp in _known_rps])
+            _known_damages = _to_integrate[_known_rps].to_numpy()
+            _cumulative_risks = self.integrate_df_trapezoidal(
+                _to_integrate, limits=_known_rps
+            )
+            _cutoff_frequencies = np.array([1 / year for year in years])
+            _idx = (
+                np.searchsorted(_known_frequencies, _cutoff_frequencies, side="right")
+                - 1
+            )
+            return (
+                _cumulative_risks[:, _idx]
+                + (_cutoff_frequencies - _known_frequencies[_idx])
+                * (_known_damages[:, _idx] + _cutoff_damages[years].to_numpy())
+                / 2
+            )
+
+        if mode == RiskCalculationModeEnum.TRIANGLE_TO_NULL_YEAR:
+            if max(years) >= min(_rps):
+                raise ValueError(
+                    """
+                RA2CE cannot calculate risk in 'triangle_to_null' mode if 
+                Return period of the triangle ({}) >= smallest available return period ({})
+                Use 'default' mode or 'cut_from' instead.
+                                    """.format(
+                        max(years), min(_rps)
+                    )
+                )
+            # The triangles only add an area beyond the smallest return period,
+            # so the integral up to it is shared by all triangle years.
+            _to_integrate = self.rework_damage_data_default(to_integrate.copy())
+            _risk = self.integrate_df_trapezoidal(_to_integrate.copy())
+            _triangle_bases = np.array([1 / year for year in years]) - 1 / min(_rps)
+            return (
+                _risk[:, None]
+                + _to_integrate[min(_rps)].to_numpy()[:, None] * _triangle_bases / 2
+            )
+
+        raise ValueError(
+            "A risk calculation sweep is not possible in mode {}.".format(mode)
+        )
+
+    @staticmethod
+    def get_damage_columns_per_curve(
+        dam_cols: list[str],
+    ) -> dict[str, dict[float, str]]:
+        """
+        Groups the damage columns per damage curve, e.g. 'dam_RP100_HZ' -> 'HZ' or
+        'dam_C1_RP100_25' -> 'C1_25'.
+
+        Arguments:
+            *dam_cols* (list[str]) : names of the damage columns
+
+        Returns:
+            dict[str, dict[float, str]] : per curve, the damage column of each return period
+        """
+        _damage_columns_per_curve = {}
+        for _dam_col in dam_cols:
+            _parts = _dam_col.split("_")[1:]
+            _rp_part = next((p for p in _parts if p.startswith("RP")), _parts[0])
+            _parts.remove(_rp_part)
+            _damage_columns_per_curve.setdefault("_".join(_parts), {})[
+                float(_rp_part.replace("RP", ""))
+            ] = _dam_col
+        return _damage_columns_per_curve
+
+    def calculate_risk(
+        self, to_integrate: pd.DataFrame, mode: RiskCalculationModeEnum, year: int
+    ):
+        """
+        Calculates the risk of one set of damages per return period
+
+        Arguments:
+            *to_integrate* (pd.DataFrame) : damages with the return periods as columns, from large to small RP
+            *mode* (RiskCalculationModeEnum) : the sort of risk calculation
+            *year* (int) : the cutoff year/return period of the risk calculation
+
+        Returns:
+            np.array : risk per row, None if the mode is not supported
+        """
+        _to_integrate = to_integrate
         if mode == RiskCalculationModeEnum.DEFAULT:
 
             _to_integrate = self.rework_damage_data_default(_to_integrate)
-            _risk = self.integrate_df_trapezoidal(_to_integrate.copy())
-            self.gdf["risk"] = _risk
+            return self.integrate_df_trapezoidal(_to_integrate.copy())
 
         elif mode == RiskCalculationModeEnum.CUT_FROM_YEAR:
             """
@@ -141,18 +351,13 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
                 min(_rps) < year < max(_rps)
             ):  # if protection level is between min and max RP
                 _to_integrate = self.rework_damage_data_cut_from(_to_integrate, year)
-                _risk = self.integrate_df_trapezoidal(_to_integrate.copy())
+                return self.integrate_df_trapezoidal(_to_integrate.copy())
 
-            elif year >= max(
-                _rps
-            ):  # cutoff is larger or equal than largest return period
-                # risk is return frequency of cutoff
-                # times the damage of the most extreme event
-                _to_integrate = _to_integrate.fillna(0)
-                _risk = _to_integrate[_rps[0]] / year
-                # _max_RP = max(_to_integrate.columns)
-
-            self.gdf["risk"] = _risk
+            # cutoff is larger or equal than largest return period
+            # risk is return frequency of cutoff
+            # times the damage of the most extreme event
+            _to_integrate = _to_integrate.fillna(0)
+            return _to_integrate[_rps[0]] / year
 
         elif mode == RiskCalculationModeEnum.TRIANGLE_TO_NULL_YEAR:
             """
@@ -176,9 +381,9 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
             _to_integrate = self.rework_damage_data_triangle_to_null(
                 _to_integrate, year
             )
-            _risk = self.integrate_df_trapezoidal(_to_integrate.copy())
+            return self.integrate_df_trapezoidal(_to_integrate.copy())
 
-            self.gdf["risk"] = _risk
+        return None
 
     def verify_damage_data_for_risk_calculation(self):
         """
@@ -191,15 +396,19 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
         pass
 
     @staticmethod
-    def integrate_df_trapezoidal(df: pd.DataFrame) -> np.array:
+    def integrate_df_trapezoidal(
+        df: pd.DataFrame, limits: Optional[list[float]] = None
+    ) -> np.array:
         """
         Arguments:
             *df* (pd.DataFrame) :
                 Column names should contain return periods (years)
                 Each row should contain a set of damages for one object
+            *limits* (list[float]) : optional return periods (years) to end the integration at,
+                each of them should be a column of df. All limits are integrated at once.
 
         Returns:
-            np.array : integrated result per row
+            np.array : integrated result per row, or per row and limit when limits are given
 
         """
         # convert return periods to frequencies
@@ -208,7 +417,22 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
         df = df.sort_index(axis="columns")
         values = df.values
         frequencies = df.columns
-        return np.trapz(values, frequencies, axis=1)
+        if limits is None:
+            return np.trapz(values, frequencies, axis=1)
+
+        # integrate from the lowest frequency up to every column, then select the limits
+        _areas = np.diff(frequencies) * (values[:, 1:] + values[:, :-1]) / 2.0
+        _cumulative_areas = np.hstack(
+            [np.zeros((len(values), 1)), np.cumsum(_areas, axis=1)]
+        )
+        _limit_idx = frequencies.get_indexer([1 / rp for rp in limits])
+        if (_limit_idx < 0).any():
+            raise ValueError(
+                "All integration limits ({}) should be return periods of the damage data.".format(
+                    limits
+                )
+            )
+        return _cumulative_areas[:, _limit_idx]
 
     @staticmethod
     def rework_damage_data_default(to_integrate: pd.DataFrame) -> pd.DataFrame:
@@ -293,6 +517,58 @@ class DamageNetworkReturnPeriods(DamageNetworkBase):
 
         return to_integrate
 
+    @staticmethod
+    def rework_damage_data_cut_from_years(
+        to_integrate: pd.DataFrame, cutoff_rps: list[int]
+    ) -> tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Rework the damage data to make it suitable for integration (risk calculation) in cut_from mode
+        for several cutoffs at once: the damages at all cutoffs are (linearly) interpolated from the
+        known damages in one go.
+
+        :param to_integrate: damages with the return periods as columns, from large to small RP
+                cutoff_rps : the return periods at which to make the cutoffs, aka the flood protection levels
+        :return: _to_integrate, the known damages (with an infinitely high return period)
+                 _cutoff_damages, the damages at the cutoffs (one column per cutoff)
+        """
+        _rps = list(to_integrate.columns)
+        _max_return_period = max(_rps)
+
+        _new_rps = [_rp for _rp in dict.fromkeys(cutoff_rps) if _rp not in _rps]
+        _frequencies = to_integrate.copy()
+        _frequencies.columns = [1 / c for c in _frequencies.columns]
+        for _cutoff_rp in _new_rps:
+            _frequencies[1 / _cutoff_rp] = np.nan
+        _frequencies = _frequencies.interpolate(method="index", axis=1)
+        _frequencies.columns = _rps + _new_rps
+        _frequencies = _frequencies.fillna(0)
+
+        # Cutoffs beyond the maximum return period get the damage of the maximum return period
+        _cutoff_damages = pd.DataFrame(
+            {
+                _cutoff_rp: _frequencies[min(_cutoff_rp, _max_return_period)]
+                for _cutoff_rp in cutoff_rps
+            },
+            index=to_integrate.index,
+        )
+
+        to_integrate = _frequencies[_rps].copy()
+        # Copy the maximum return period with an infinitely high damage
+        to_integrate[float("inf")] = to_integrate[_max_return_period]
+
+        logging.info(
+            """Risk calculation runs in 'cut_from' mode for cutoffs {}. 
+                                Assumptions:
+                                    - for all return periods > max RP{}, damage = dam_RP{}
+                                    - damage at cutoff is linearly interpolated from known damages
+                                    - no damage for al RPs > RP_cutoff
+
+                                """.format(
+                cutoff_rps, _max_return_period, _max_return_period
+            )
+        )
+        return to_integrate, _cutoff_damages
+
     @staticmethod
     def rework_damage_data_triangle_to_null(
         to_integrate: pd.DataFrame, triangle_end: float
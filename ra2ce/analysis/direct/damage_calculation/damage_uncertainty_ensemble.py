@@ -0,0 +1,201 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+
+
+@dataclass
+class DamageUncertaintyEnsemble:
+    """
+    Monte Carlo ensemble of the uncertain damage parameters: the max damages and the
+    ordinates of the damage curves. Every sample multiplies them with a factor drawn from
+    a normal distribution with mean 1 and the given coefficient of variation (truncated at 0).
+    The max damage factor applies to the whole network, the curve factors to each ordinate.
+    Only this truncated normal distribution is supported, other distributions can not be configured.
+
+    The road segments are evaluated in chunks of `chunk_size` segments, so only the summary
+    quantiles per road segment are kept. The largest arrays hold n_samples * events * chunk_size
+    float64 values (8 bytes each), e.g. 80 MB for 1000 samples, 10 events and 1000 segments.
+    """
+
+    n_samples: int
+    max_damage_cv: float = 0.0
+    curve_cv: float = 0.0
+    quantiles: list[float] = field(default_factory=lambda: [0.05, 0.5, 0.95])
+    seed: Optional[int] = None
+    chunk_size: int = 1000
+
+    def __post_init__(self) -> None:
+        if self.n_samples < 1:
+            raise ValueError("The uncertainty ensemble needs at least one sample.")
+        if self.chunk_size < 1:
+            raise ValueError(
+                "The uncertainty ensemble needs at least one road segment per chunk."
+            )
+        self._rng = np.random.default_rng(self.seed)
+
+    def _get_factors(self, cv: float, size: tuple[int, ...]) -> np.ndarray:
+        return np.clip(self._rng.normal(1.0, cv, size=size), 0.0, None)
+
+    def get_samples(self, curve: PiecewiseLinearCurve) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Draws the samples of the uncertain parameters of a damage curve.
+
+        Args:
+            curve (PiecewiseLinearCurve): Damage curve, damage fraction as function of the hazard severity.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The curve ordinates with shape (samples, breakpoints)
+                and the max damage factors with shape (samples,).
+        """
+        _curve_values = curve.values[None, :] * self._get_factors(
+            self.curve_cv, (self.n_samples, len(curve.values))
+        )
+        _max_damage_factors = self._get_factors(self.max_damage_cv, (self.n_samples,))
+        return _curve_values, _max_damage_factors
+
+    def get_damages(
+        self,
+        curve: PiecewiseLinearCurve,
+        max_damage: np.ndarray,
+        severity: np.ndarray,
+        fraction: np.ndarray,
+        length: np.ndarray,
+        samples: Optional[tuple[np.ndarray, np.ndarray]] = None,
+    ) -> np.ndarray:
+        """
+        Gets the damage samples of all events and the given road segments.
+
+        Args:
+            curve (PiecewiseLinearCurve): Damage curve, damage fraction as function of the hazard severity.
+            max_damage (np.ndarray): Max damage (per meter) per road segment, shape (segments,).
+            severity (np.ndarray): Hazard severity, shape (events, segments).
+            fraction (np.ndarray): Fraction of the segment exposed to the hazard, shape (events, segments).
+            length (np.ndarray): Length of the road segments, shape (segments,).
+            samples (Optional[tuple[np.ndarray, np.ndarray]]): Samples of the curve (see `get_samples`),
+                drawn when not given.
+
+        Returns:
+            np.ndarray: Damages with shape (samples, events, segments).
+        """
+        _curve_values, _max_damage_factors = (
+            samples if samples is not None else self.get_samples(curve)
+        )
+        return (
+            _max_damage_factors[:, None, None]
+            * max_damage[None, None, :]
+            * curve.evaluate_samples(severity, _curve_values)
+            * fraction[None, :, :]
+            * length[None, None, :]
+        )
+
+    def get_damage_quantiles(
+        self,
+        curve: PiecewiseLinearCurve,
+        max_damage: np.ndarray,
+        severity: np.ndarray,
+        fraction: np.ndarray,
+        length: np.ndarray,
+        return_periods: Optional[list[float]] = None,
+    ) -> tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Gets the quantiles of the damages and, for return periods, of the ('default' mode) risks.
+        The samples are drawn once for the whole network, the damages are evaluated per chunk
+        of `chunk_size` road segments.
+
+        Args:
+            curve (PiecewiseLinearCurve): Damage curve, damage fraction as function of the hazard severity.
+            max_damage (np.ndarray): Max damage (per meter) per road segment, shape (segments,).
+            severity (np.ndarray): Hazard severity, shape (events, segments).
+            fraction (np.ndarray): Fraction of the segment exposed to the hazard, shape (events, segments).
+            length (np.ndarray): Length of the road segments, shape (segments,).
+            return_periods (Optional[list[float]]): Return period of each event, no risks when not given.
+
+        Returns:
+            tuple[np.ndarray, Optional[np.ndarray]]: Damage quantiles with shape
+                (quantiles, events, segments) and risk quantiles with shape (quantiles, segments).
+        """
+        _samples = self.get_samples(curve)
+        _n_segments = len(length)
+        _damage_quantiles = np.empty(
+            (len(self.quantiles), severity.shape[0], _n_segments)
+        )
+        _risk_quantiles = (
+            np.empty((len(self.quantiles), _n_segments))
+            if return_periods is not None
+            else None
+        )
+        for _start in range(0, _n_segments, self.chunk_size):
+            _chunk = slice(_start, _start + self.chunk_size)
+            _damages = self.get_damages(
+                curve,
+                max_damage[_chunk],
+                severity[:, _chunk],
+                fraction[:, _chunk],
+                length[_chunk],
+                _samples,
+            )
+            _damage_quantiles[:, :, _chunk] = self.get_quantiles(_damages)
+            if _risk_quantiles is not None:
+                _risk_quantiles[:, _chunk] = self.get_quantiles(
+                    self.get_risks(_damages, return_periods)
+                )
+        return _damage_quantiles, _risk_quantiles
+
+    @staticmethod
+    def get_risks(damages: np.ndarray, return_periods: list[float]) -> np.ndarray:
+        """
+        Gets the risk samples ('default' mode: damage of the largest return period for all
+        larger return periods, no damage below the smallest return period).
+
+        Args:
+            damages (np.ndarray): Damages with shape (samples, return periods, segments).
+            return_periods (list[float]): Return period of each damage.
+
+        Returns:
+            np.ndarray: Risks with shape (samples, segments).
+        """
+        _order = np.argsort(return_periods)[::-1]  # ascending frequency
+        _frequencies = np.concatenate(
+            [[0.0], 1 / np.asarray(return_periods, dtype=float)[_order]]
+        )
+        _damages = np.nan_to_num(damages[:, _order, :], nan=0.0)
+        _damages = np.concatenate([_damages[:, :1, :], _damages], axis=1)
+        return np.trapz(_damages, _frequencies, axis=1)
+
+    def get_quantiles(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Summarizes the samples (first axis) into the quantiles of the ensemble.
+
+        Args:
+            samples (np.ndarray): Samples with shape (samples, ...).
+
+        Returns:
+            np.ndarray: Quantiles with shape (quantiles, ...).
+        """
+        return np.quantile(samples, self.quantiles, axis=0)
@@ -1,6 +1,13 @@
+from __future__ import annotations
+
+import json
 import logging
 from pathlib import Path
+from typing import Callable, Optional
 
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+import pyproj
 from geopandas import GeoDataFrame
 
 from ra2ce.analysis.analysis_config_data.analysis_config_data import (
@@ -18,7 +25,21 @@ from ra2ce.analysis.direct.damage_calculation import (
     DamageNetworkEvents,
     DamageNetworkReturnPeriods,
 )
+from ra2ce.analysis.direct.damage_calculation.damage_network_base import (
+    DamageNetworkBase,
+)
+from ra2ce.analysis.direct.damage_calculation.damage_uncertainty_ensemble import (
+    DamageUncertaintyEnsemble,
+)
+from ra2ce.analysis.direct.geoparquet_batch_writer import GeoParquetBatchWriter
+from ra2ce.analysis.direct.network_batch_reader import NetworkBatchReader
 from ra2ce.network.graph_files.network_file import NetworkFile
+from ra2ce.network.hazard.hazard_files import HazardFiles
+from ra2ce.network.hazard.hazard_intersect.hazard_intersect_builder_for_tif import (
+    HazardIntersectBuilderForTif,
+)
+from ra2ce.network.hazard.hazard_names import HazardNames
+from ra2ce.network.network_config_data.network_config_data import HazardSection
 
 
 class DirectDamage(AnalysisDirectProtocol):
@@ -26,63 +47,94 @@ class DirectDamage(AnalysisDirectProtocol):
     graph_file: NetworkFile
     graph_file_hazard: NetworkFile
     input_path: Path
+    static_path: Optional[Path]
     output_path: Path
+    hazard: Optional[HazardSection]
+    hazard_names: Optional[HazardNames]
+    # batch size of the hazard overlay when no `chunk_size` is given
+    overlay_batch_size: int = 10000
 
     def __init__(
         self,
         analysis_input: AnalysisInputWrapper,
     ) -> None:
         self.analysis = analysis_input.analysis
-        self.graph_file = None
+        self.graph_file = analysis_input.graph_file
         self.graph_file_hazard = analysis_input.graph_file_hazard
         self.input_path = analysis_input.input_path
+        self.static_path = analysis_input.static_path
         self.output_path = analysis_input.output_path
+        self.hazard = analysis_input.hazard
+        self.hazard_names = analysis_input.hazard_names
 
-    def execute(self) -> GeoDataFrame:
-        def _rename_road_gdf_to_conventions(road_gdf_columns: list[str]) -> list[str]:
-            """
-            Rename the columns in the road_gdf to the conventions of the ra2ce documentation
+    @staticmethod
+    def _rename_road_gdf_to_conventions(road_gdf_columns: list[str]) -> list[str]:
+        """
+        Rename the columns in the road_gdf to the conventions of the ra2ce documentation
 
-            'eg' RP100_fr -> F_RP100_me
-                        -> F_EV1_mi
+        'eg' RP100_fr -> F_RP100_me
+                    -> F_EV1_mi
 
-            """
-            cs = road_gdf_columns
-            ### Handle return period columns
-            new_cols = []
-            for c in cs:
-                if c.startswith("RP") or c.startswith("EV"):
-                    new_cols.append("F_" + c)
-                else:
-                    new_cols.append(c)
-
-            ### Todo add handling of events if this gives a problem
-            return new_cols
+        """
+        cs = road_gdf_columns
+        ### Handle return period columns
+        new_cols = []
+        for c in cs:
+            if c.startswith("RP") or c.startswith("EV"):
+                new_cols.append("F_" + c)
+            else:
+                new_cols.append(c)
 
-        # Open the network with hazard data
-        road_gdf = self.graph_file_hazard.get_graph()
-        road_gdf.columns = _rename_road_gdf_to_conventions(road_gdf.columns)
+        ### Todo add handling of events if this gives a problem
+        return new_cols
 
+    @staticmethod
+    def _get_hazard_columns(road_gdf_columns: list[str]) -> list[str]:
         # Find the hazard columns; these may be events or return periods
-        val_cols = [
-            col for col in road_gdf.columns if (col[0].isupper() and col[1] == "_")
-        ]
-
-        # Read the desired damage function
-        damage_function = self.analysis.damage_curve
+        return [col for col in road_gdf_columns if (col[0].isupper() and col[1] == "_")]
 
+    def _get_manual_damage_functions(self) -> ManualDamageFunctions | None:
         # If you want to use manual damage functions, these need to be loaded first
-        manual_damage_functions = None
-        if self.analysis.damage_curve == DamageCurveEnum.MAN:
-            manual_damage_functions = ManualDamageFunctions()
-            manual_damage_functions.find_damage_functions(
-                folder=(self.input_path.joinpath("damage_functions"))
+        if self.analysis.damage_curve != DamageCurveEnum.MAN:
+            return None
+        manual_damage_functions = ManualDamageFunctions()
+        manual_damage_functions.find_damage_functions(
+            folder=(self.input_path.joinpath("damage_functions"))
+        )
+        manual_damage_functions.load_damage_functions(
+            cache_dir=(
+                self.static_path.joinpath("compiled_damage_functions")
+                if self.static_path
+                else None
             )
-            manual_damage_functions.load_damage_functions()
+        )
+        return manual_damage_functions
+
+    def _get_uncertainty_ensemble(self) -> DamageUncertaintyEnsemble | None:
+        if self.analysis.uncertainty_samples < 1:
+            return None
+        return DamageUncertaintyEnsemble(
+            n_samples=self.analysis.uncertainty_samples,
+            max_damage_cv=self.analysis.uncertainty_max_damage_cv,
+            curve_cv=self.analysis.uncertainty_curve_cv,
+            seed=self.analysis.uncertainty_seed,
+        )
+
+    def _calculate_damage(
+        self,
+        road_gdf: GeoDataFrame,
+        val_cols: list[str],
+        manual_damage_functions: ManualDamageFunctions | None,
+        lane_stats: dict | None = None,
+    ) -> GeoDataFrame:
+        # Read the desired damage function
+        damage_function = self.analysis.damage_curve
 
         # Choose between event or return period based analysis
         if self.analysis.event_type == EventTypeEnum.EVENT:
             event_gdf = DamageNetworkEvents(road_gdf, val_cols)
+            event_gdf.lane_stats = lane_stats
+            event_gdf.uncertainty = self._get_uncertainty_ensemble()
             event_gdf.main(
                 damage_function=damage_function,
                 manual_damage_functions=manual_damage_functions,
@@ -92,6 +144,8 @@ class DirectDamage(AnalysisDirectProtocol):
 
         elif self.analysis.event_type == EventTypeEnum.RETURN_PERIOD:
             return_period_gdf = DamageNetworkReturnPeriods(road_gdf, val_cols)
+            return_period_gdf.lane_stats = lane_stats
+            return_period_gdf.uncertainty = self._get_uncertainty_ensemble()
             return_period_gdf.main(
                 damage_function=damage_function,
                 manual_damage_functions=manual_damage_functions,
@@ -100,9 +154,24 @@ class DirectDamage(AnalysisDirectProtocol):
             if (
                 self.analysis.risk_calculation_mode != RiskCalculationModeEnum.INVALID
             ):  # Check if risk_calculation is demanded
-                if self.analysis.risk_calculation_mode != RiskCalculationModeEnum.NONE:
+                if self.analysis.risk_calculation_years and (
+                    self.analysis.risk_calculation_mode
+                    in [
+                        RiskCalculationModeEnum.CUT_FROM_YEAR,
+                        RiskCalculationModeEnum.TRIANGLE_TO_NULL_YEAR,
+                    ]
+                ):
+                    # One risk column per protection level, calculated at once
+                    return_period_gdf.control_risk_calculation_sweep(
+                        mode=self.analysis.risk_calculation_mode,
+                        years=self.analysis.risk_calculation_years,
+                    )
+                elif (
+                    self.analysis.risk_calculation_mode != RiskCalculationModeEnum.NONE
+                ):
                     return_period_gdf.control_risk_calculation(
-                        mode=self.analysis.risk_calculation_mode
+                        mode=self.analysis.risk_calculation_mode,
+                        year=self.analysis.risk_calculation_year,
                     )
 
             else:
@@ -118,3 +187,192 @@ class DirectDamage(AnalysisDirectProtocol):
                 self.analysis.event_type
             )
         )
+
+    def _overlays_hazard(self) -> bool:
+        # The base network is only overlaid here when it was deferred by the hazard overlay.
+        if not self.hazard or not self.hazard.overlay_base_network_in_analysis:
+            return False
+        if not HazardFiles.from_hazard_map(self.hazard.hazard_map).tif:
+            return False
+        if self.graph_file_hazard and (
+            self.graph_file_hazard.graph is not None
+            or (self.graph_file_hazard.file and self.graph_file_hazard.file.is_file())
+        ):
+            return False
+        return self.graph_file is not None
+
+    def execute(self) -> GeoDataFrame | None:
+        # In batch mode the result is not returned, it is written to the output folder.
+        if self._overlays_hazard():
+            self._export_batch_results(
+                self.execute_with_hazard_overlay(
+                    self.analysis.chunk_size
+                    if self.analysis.chunk_size > 0
+                    else self.overlay_batch_size
+                )
+            )
+            return None
+
+        if self.analysis.chunk_size > 0:
+            self._export_batch_results(
+                self.execute_in_batches(self.analysis.chunk_size)
+            )
+            return None
+
+        # Open the network with hazard data
+        road_gdf = self.graph_file_hazard.get_graph()
+        road_gdf.columns = self._rename_road_gdf_to_conventions(road_gdf.columns)
+
+        return self._calculate_damage(
+            road_gdf,
+            self._get_hazard_columns(road_gdf.columns),
+            self._get_manual_damage_functions(),
+        )
+
+    def _get_hazard_intersect_builder(self) -> HazardIntersectBuilderForTif:
+        _tif_files = HazardFiles.from_hazard_map(self.hazard.hazard_map).tif
+        return HazardIntersectBuilderForTif(
+            hazard_aggregate_wl=self.hazard.aggregate_wl.config_value,
+            hazard_names=[_tif.stem for _tif in _tif_files],
+            ra2ce_names=[
+                self.hazard_names.get_name(_tif.stem)[:-3] for _tif in _tif_files
+            ],
+            hazard_tif_files=_tif_files,
+        )
+
+    def _overlay_hazard(
+        self, road_gdf: GeoDataFrame, builder: HazardIntersectBuilderForTif
+    ) -> GeoDataFrame:
+        _hazard_crs = pyproj.CRS.from_user_input(self.hazard.hazard_crs)
+        if (
+            road_gdf.crs is None
+            or pyproj.CRS.from_user_input(road_gdf.crs) == _hazard_crs
+        ):
+            return builder.get_intersection(road_gdf)
+
+        # Temporarily reproject the batch to the CRS of the hazard
+        _original_geometries = road_gdf.geometry
+        _overlaid = builder.get_intersection(road_gdf.to_crs(_hazard_crs))
+        return _overlaid.set_geometry(_original_geometries)
+
+    def _calculate_damage_in_batches(
+        self,
+        batches: NetworkBatchReader,
+        overlay: Callable[[GeoDataFrame], GeoDataFrame] | None = None,
+    ) -> Path:
+        manual_damage_functions = self._get_manual_damage_functions()
+
+        # First pass: statistics of the complete network
+        _lane_stats = DamageNetworkBase.get_lane_statistics(
+            batches.read_columns(["highway", "lanes"])
+        )
+
+        _export_path = self.output_path.joinpath(
+            self.analysis.analysis.config_value,
+            self.analysis.name.replace(" ", "_") + ".parquet",
+        )
+        with GeoParquetBatchWriter(_export_path) as _writer:
+            for road_gdf in batches:
+                if overlay:
+                    road_gdf = overlay(road_gdf)
+                road_gdf.columns = self._rename_road_gdf_to_conventions(
+                    road_gdf.columns
+                )
+                _writer.write(
+                    self._calculate_damage(
+                        road_gdf,
+                        self._get_hazard_columns(road_gdf.columns),
+                        manual_damage_functions,
+                        _lane_stats,
+                    )
+                )
+        return _export_path
+
+    def _export_batch_results(self, export_path: Path) -> None:
+        # The requested formats are written from the GeoParquet file, row group by row group.
+        _parquet_file = pq.ParquetFile(export_path)
+        _schema = _parquet_file.schema_arrow
+        _geo_metadata = json.loads(_schema.metadata[b"geo"])
+        _export_paths = {
+            _suffix: export_path.with_suffix(_suffix)
+            for _suffix, _save in [
+                (".gpkg", self.analysis.save_gpkg),
+                (".csv", self.analysis.save_csv),
+                (".feather", self.analysis.save_feather),
+            ]
+            if _save
+        }
+        for _path in _export_paths.values():
+            if _path.exists():
+                _path.unlink()
+        if ".feather" in _export_paths:
+            _feather_writer = ipc.new_file(str(_export_paths[".feather"]), _schema)
+
+        for _idx in range(_parquet_file.num_row_groups):
+            _table = _parquet_file.read_row_group(_idx)
+            if ".feather" in _export_paths:
+                _feather_writer.write_table(_table)
+            if ".gpkg" not in _export_paths and ".csv" not in _export_paths:
+                continue
+            _gdf = NetworkBatchReader.to_geodataframe(_table, _geo_metadata)
+            if ".gpkg" in _export_paths:
+                _gdf.to_file(
+                    _export_paths[".gpkg"], driver="GPKG", mode="a" if _idx else "w"
+                )
+            if ".csv" in _export_paths:
+                _gdf.to_csv(
+                    _export_paths[".csv"],
+                    columns=[
+                        _col for _col in _gdf.columns if _col != _gdf.geometry.name
+                    ],
+                    mode="a",
+                    header=_idx == 0,
+                    index=False,
+                )
+
+        if ".feather" in _export_paths:
+            _feather_writer.close()
+        for _path in _export_paths.values():
+            logging.info("Results saved to: %s", _path)
+
+    def execute_in_batches(self, batch_size: int) -> Path:
+        """
+        Calculates the damage (and risk) of the network with hazard data batch by batch,
+        so the peak memory depends on the batch size rather than on the network size.
+        The lane statistics, which need the complete network, are derived in a first pass
+        that only reads the road type and lanes. The results of all batches are appended
+        to one GeoParquet file in the output folder of the analysis.
+
+        Args:
+            batch_size (int): Maximum number of road segments per batch.
+
+        Returns:
+            Path: The GeoParquet file with the results.
+        """
+        return self._calculate_damage_in_batches(
+            NetworkBatchReader.from_network_file(self.graph_file_hazard, batch_size)
+        )
+
+    def execute_with_hazard_overlay(self, batch_size: int) -> Path:
+        """
+        Overlays the base network (without hazard data) with the hazard maps and calculates
+        the damage (and risk) of each batch of road segments right away, so the network
+        with hazard data is never materialized as a whole nor written to disk.
+        The batches are ordered spatially (along a Hilbert curve), so each batch only
+        reads a compact window of the hazard maps instead of windows spanning the network.
+        The results of all batches are appended to one GeoParquet file in the output
+        folder of the analysis, as done by `execute_in_batches`.
+
+        Args:
+            batch_size (int): Maximum number of road segments per batch.
+
+        Returns:
+            Path: The GeoParquet file with the results.
+        """
+        _builder = self._get_hazard_intersect_builder()
+        return self._calculate_damage_in_batches(
+            NetworkBatchReader.from_network_file(
+                self.graph_file, batch_size, spatially_ordered=True
+            ),
+            lambda road_gdf: self._overlay_hazard(road_gdf, _builder),
+        )
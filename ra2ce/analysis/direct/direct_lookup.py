@@ -20,20 +20,90 @@
 """
 
 
+from __future__ import annotations
+
 import os
 from collections import OrderedDict
+from copy import deepcopy
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
 
 import numpy as np
 import pandas as pd
 from pandas import DataFrame
-from scipy.interpolate import interp1d
 
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+
+
+class RoadTypeLanesLookUp:
+    """
+    Lookup table with a value per road type and number of lanes (e.g. max damages or
+    lane scale factors). The table is compiled once into a 2D array, so that the values
+    of all road segments are resolved at once with a vectorized indexer.
+    """
 
-def dataframe_lookup(row: pd.Series, lookup_df: DataFrame, columns: list) -> Any:
-    row_values = [row[column] for column in columns]
-    return lookup_df.loc[tuple(row_values)]
+    road_types: pd.Index
+    lanes: pd.Index
+    values: np.ndarray
+
+    def __init__(self, table: dict[str, dict[int, float]]) -> None:
+        """
+        Args:
+            table (dict[str, dict[int, float]]): Values per road type and number of lanes.
+        """
+        self.road_types = pd.Index(list(table.keys()))
+        self.lanes = pd.Index(
+            sorted(set(_lanes for _values in table.values() for _lanes in _values))
+        )
+        self.values = np.full((len(self.road_types), len(self.lanes)), np.nan)
+        for _road_type_idx, _values in enumerate(table.values()):
+            _lanes_idx = self.lanes.get_indexer(list(_values.keys()))
+            self.values[_road_type_idx, _lanes_idx] = list(_values.values())
+
+    @classmethod
+    def from_dataframe(cls, lookup_df: DataFrame) -> RoadTypeLanesLookUp:
+        """
+        Creates the lookup table from a dataframe with the road types in the rows and the number of lanes in the columns.
+        """
+        return cls(
+            {
+                _road_type: _values.to_dict()
+                for _road_type, _values in lookup_df.iterrows()
+            }
+        )
+
+    def get_values(self, road_types: pd.Series, lanes: pd.Series) -> np.ndarray:
+        """
+        Gets the values of the given combinations of road type and number of lanes.
+
+        Args:
+            road_types (pd.Series): Road type of each road segment.
+            lanes (pd.Series): Number of lanes of each road segment.
+
+        Raises:
+            KeyError: When a combination of road type and number of lanes is not in the table
+                (or its value is NaN).
+
+        Returns:
+            np.ndarray: The value of each road segment.
+        """
+        _road_type_idx = self.road_types.get_indexer(road_types)
+        _lanes_idx = self.lanes.get_indexer(lanes)
+        _found = (_road_type_idx >= 0) & (_lanes_idx >= 0)
+        _values = np.full(len(_found), np.nan)
+        _values[_found] = self.values[_road_type_idx[_found], _lanes_idx[_found]]
+        # empty (NaN) cells of the table are missing as well
+        _missing = np.isnan(_values)
+        if _missing.any():
+            _missing_keys = set(
+                zip(np.asarray(road_types)[_missing], np.asarray(lanes)[_missing])
+            )
+            raise KeyError(
+                "No lookup value for (road type, lanes): {}".format(
+                    sorted(_missing_keys, key=str)
+                )
+            )
+        return _values
 
 
 class LookUp:
@@ -688,9 +758,16 @@ class LookUp:
         )
 
     @staticmethod
-    def get_max_damages_osd():
-        """Lookup table for max damages of the OSdaMage damage functions"""
+    def get_max_damages_osd() -> OrderedDict[str, OrderedDict[str, int]]:
+        """Lookup table for max damages of the OSdaMage damage functions
+
+        The table is compiled only once, a new (deep) copy of it is returned on each call.
+        """
+        return deepcopy(LookUp._get_compiled_max_damages_osd())
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_compiled_max_damages_osd() -> OrderedDict[str, OrderedDict[str, int]]:
         # Note that these values have been converted to euro/m road length
         return OrderedDict(
             [
@@ -734,8 +811,14 @@ class LookUp:
         Output: dict:
          - road types are keys
          - max damages in euro / m road length
+
+        The table is compiled only once, a new (deep) copy of it is returned on each call.
         """
+        return deepcopy(LookUp._get_compiled_max_damages_huizinga())
 
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_compiled_max_damages_huizinga() -> dict[str, dict[int, float]]:
         # Note, these values are in euro/km; while RA2CE standard unit is euro/m length
 
         lookup_dict = OrderedDict(
@@ -786,8 +869,14 @@ class LookUp:
     def get_flood_curves() -> dict:
         """Lookup flood curve values and create interpolator around it
 
-        Units of the interpolator objects: water depth in cm on x-axis; damage fraction (unitless) on y-axis
+        Units of the interpolator objects: water depth in m on x-axis; damage fraction (unitless) on y-axis
+        The curves are compiled only once, a new dictionary (of the same curves) is returned on each call.
         """
+        return OrderedDict(LookUp._get_compiled_flood_curves())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def _get_compiled_flood_curves() -> OrderedDict[str, PiecewiseLinearCurve]:
         _depth_cm_str = "depth (cm)"
         _damage_str = "damage (% of total construction costs)"
         lookup_dict = {
@@ -971,20 +1060,25 @@ class LookUp:
         flood_curves.loc[1:, depth_cols] = flood_curves.loc[1:, depth_cols] / 100
         flood_curves.loc[0, depth_cols] = "depth (m)"
 
-        curve_name = [0] * int(len(headers) / 2)  # create empty arrays
-        interpolators = [0] * int(len(headers) / 2)
-
-        for i in range(0, int(len(headers) / 2)):  # iterate over the damage curves
-            curve_name[i] = headers[i * 2]
-            curve = flood_curves.iloc[:, 2 * i : 2 * i + 2].dropna()
-            # curve x-values in the even; and y-values in the uneven columns
-            interpolators[i] = interp1d(
-                curve.values[1:, 0],
-                curve.values[1:, 1],
-                fill_value=(curve.values[1, 1], curve.values[-1, 1]),
-                bounds_error=False,
-            )
-        return OrderedDict(zip(curve_name, interpolators))
+        return get_compiled_flood_curves(flood_curves)
+
+
+def get_compiled_flood_curves(
+    flood_curves: DataFrame,
+) -> OrderedDict[str, PiecewiseLinearCurve]:
+    """
+    Compiles the flood curves of a table with, per curve, a column with the curve name as header and
+    x-values and a column with the y-values (the first row contains the units).
+    """
+    headers = flood_curves.columns
+    compiled_curves = OrderedDict()
+    for i in range(0, int(len(headers) / 2)):  # iterate over the damage curves
+        curve = flood_curves.iloc[:, 2 * i : 2 * i + 2].dropna()
+        # curve x-values in the even; and y-values in the uneven columns
+        compiled_curves[headers[i * 2]] = PiecewiseLinearCurve.from_points(
+            curve.values[1:, 0], curve.values[1:, 1]
+        )
+    return compiled_curves
 
 
 class CreateLookupTables:
@@ -1110,20 +1204,4 @@ class CreateLookupTables:
         )  # removed skip-footer; gave unexpected results
         flood_new = flood_curves_old.to_dict()
         flood_curves = pd.DataFrame.from_dict(flood_new)
-
-        headers = flood_curves.columns
-        curve_name = [0] * int(len(headers) / 2)  # create empty arrays
-        interpolators = [0] * int(len(headers) / 2)
-        for i in range(
-            0, int(len(headers) / 2)
-        ):  # iterate over the damage curves in the Excel file
-            curve_name[i] = headers[i * 2]
-            curve = flood_curves.iloc[:, 2 * i : 2 * i + 2].dropna()
-            # curve x-values in the even; and y-values in the uneven columns
-            interpolators[i] = interp1d(
-                curve.values[1:, 0],
-                curve.values[1:, 1],
-                fill_value=(curve.values[1, 1], curve.values[-1, 1]),
-                bounds_error=False,
-            )
-        return OrderedDict(zip(curve_name, interpolators))
+        return get_compiled_flood_curves(flood_curves)
@@ -27,6 +27,9 @@ import numpy as np
 import pandas as pd
 from geopandas import GeoDataFrame
 
+from ra2ce.analysis.direct.direct_lookup import RoadTypeLanesLookUp
+from ra2ce.analysis.direct.lane_normalizer import LaneNormalizer
+
 
 def clean_lane_data(lane_col: pd.Series) -> pd.Series:
     """
@@ -41,14 +44,7 @@ def clean_lane_data(lane_col: pd.Series) -> pd.Series:
         *new_lane_col* (Panda Series) : idem, but cleaned
                                     each value is already a float
     """
-
-    # Todo: drawback of this approach is that you cannot easily see which lanes have the erratic lanedata,
-    # The upside is that it is probably faster...
-    # for index, cell in lane_col.iteritems():
-    #    print(cell, type(cell))
-    new_lane_col = lane_col.apply(lambda x: lane_cleaner(x))
-
-    return new_lane_col
+    return LaneNormalizer.parse(lane_col)
 
 
 def lane_cleaner(cell: Any) -> float:
@@ -120,21 +116,7 @@ def create_summary_statistics(gdf: GeoDataFrame) -> dict:
 
     """
     # Todo: in the future we can make it more generic, so that we can easily get the mode/mean/whatever
-
-    dictionary = dict(gdf.groupby("road_type")["lanes"].agg(pd.Series.mode))
-
-    # get a default value if any key of the dictionary became empty (because the mode operation on the 'lanes' column
-    # for a road type results in an empty array
-    non_empty_modes = [
-        value for value in dictionary.values() if isinstance(value, float) and value > 0
-    ]
-    default_value = np.mean(non_empty_modes)
-
-    # Replace empty arrays with the calculated average
-    for key, value in dictionary.items():
-        if isinstance(value, np.ndarray) and len(value) == 0:
-            dictionary[key] = default_value
-    return dictionary
+    return LaneNormalizer.get_lane_statistics(gdf["road_type"], gdf["lanes"])
 
 
 def scale_damage_using_lanes(lane_scale_factors, df, cols_to_scale) -> pd.DataFrame:
@@ -151,13 +133,11 @@ def scale_damage_using_lanes(lane_scale_factors, df, cols_to_scale) -> pd.DataFr
     """
     assert "road_type" in df.columns, "Road type data is missing"
     assert "lanes" in df.columns, "Lane number data is missing"
-    df["road_type_scale_factors"] = df.apply(
-        lambda x: lane_scale_factors[x.road_type][x.lanes], axis=1
+    _scale_factors = RoadTypeLanesLookUp(lane_scale_factors).get_values(
+        df["road_type"], df["lanes"]
     )
 
     for col in cols_to_scale:
-        df[col] = df[col] * df["road_type_scale_factors"]
-
-    df = df.drop(columns=["road_type_scale_factors"])
+        df[col] = df[col] * _scale_factors
 
     return df
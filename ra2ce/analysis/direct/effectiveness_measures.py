@@ -11,6 +11,11 @@ from ra2ce.analysis.analysis_config_data.analysis_config_data import (
 )
 from ra2ce.analysis.analysis_input_wrapper import AnalysisInputWrapper
 from ra2ce.analysis.direct.analysis_direct_protocol import AnalysisDirectProtocol
+from ra2ce.analysis.direct.effectiveness_strategies import (
+    EFFECTIVENESS_COLUMNS,
+    STANDARD_COLUMNS,
+    EffectivenessStrategies,
+)
 from ra2ce.network.graph_files.network_file import NetworkFile
 
 
@@ -36,6 +41,7 @@ class EffectivenessMeasures(AnalysisDirectProtocol):
         self.repair_costs = self.analysis.repair_costs  # euro
         self.evaluation_period = self.analysis.evaluation_period  # years
         self.interest_rate = self.analysis.interest_rate / 100  # interest rate
+        self.climate_factor = self.analysis.climate_factor
         self.btw = 1.21  # VAT multiplication factor to include taxes
         self._measures_csv = self.input_path.joinpath(
             "direct", "effectiveness_measures.csv"
@@ -215,18 +221,16 @@ class EffectivenessMeasures(AnalysisDirectProtocol):
         self, df: pd.DataFrame, effectiveness_dict: dict
     ) -> pd.DataFrame:
         """This function calculates the efficacy for each strategy"""
-
-        columns = [
-            "dichtbij",
-            "ver_hoger",
-            "hwa_afw_ho",
-            "gw_hwa",
-            "slope_0015",
-            "slope_001",
-        ]
-
-        # calculate standard effectiveness without factors
-        df_total = self._calculate_effectiveness(df, name="standard")
+        logging.info(
+            "Calculating effectiveness of strategies: {}".format(
+                ", ".join(effectiveness_dict)
+            )
+        )
+        df_effectiveness = EffectivenessStrategies(
+            effectiveness_dict
+        ).get_effectiveness(df)
+        # standard effectiveness without factors
+        df_total = df_effectiveness[STANDARD_COLUMNS]
 
         df_blockage = pd.read_csv(self.input_path / "direct" / "blockage_costs.csv")
         df_total = df_total.merge(df_blockage, how="left", on="LinkNr")
@@ -234,154 +238,75 @@ class EffectivenessMeasures(AnalysisDirectProtocol):
             "afstand"
         ]  # TODO Remove this line as this is probably incorrect, just as a check
 
-        # start iterating over different strategies in lookup dictionary
-        for strategy in effectiveness_dict:
-            logging.info("Calculating effectiveness of strategy: {}".format(strategy))
-            lookup_dict = effectiveness_dict[strategy]
-            df_temp = df.copy()
-
-            # apply the effectiveness factor as read from the lookup table on each column:
-            for col in columns:
-                df_temp[col + "_m"] = df_temp[col + "_m"] * (1 - lookup_dict[col])
-
-            # calculate the effectiveness and add as a new column to total dataframe
-            df_new = self._calculate_effectiveness(df_temp, name=strategy)
-            df_new = df_new.drop(
-                columns={
-                    "length",
-                    "dichtbij_m",
-                    "ver_hoger_m",
-                    "hwa_afw_ho_m",
-                    "gw_hwa_m",
-                    "verweg_max",
-                    "verkant_max",
-                }
-            )
-            df_total = df_total.merge(df_new, how="left", on="LinkNr")
-
-        return df_total
+        # add the effectiveness of all strategies at once
+        return df_total.join(
+            df_effectiveness.drop(columns=STANDARD_COLUMNS[1:]).set_index("LinkNr"),
+            on="LinkNr",
+        )
 
     def _calculate_cost_reduction(
         self, df: pd.DataFrame, effectiveness_dict: dict
     ) -> pd.DataFrame:
         """This function calculates the yearly costs and possible reduction"""
-
-        strategies = [strategy for strategy in effectiveness_dict]
-        strategies.insert(0, "standard")
-
-        # calculate costs
-        for strategy in strategies:
-            if strategy != "standard":
-                df["max_effectiveness_{}".format(strategy)] = 1 - (
-                    df["{}_gevoelig_sum".format(strategy)] / df["standard_gevoelig_sum"]
-                )
-            df["return_period"] = self.return_period * df["coefficient"]
-            df["repair_costs_{}".format(strategy)] = (
-                df["{}_gevoelig_max".format(strategy)] * self.repair_costs
-            )
-            # Keys definition to avoid code duplication.
-            _blockage_costs_strategy = "blockage_costs_{}".format(strategy)
-            _yearly_blockage_costs_strategy = "yearly_blockage_costs_{}".format(
-                strategy
-            )
-            _yearly_repair_costs_strategy = "yearly_repair_costs_{}".format(strategy)
-            _total_costs_strategy = "total_costs_{}".format(strategy)
-
-            df[_blockage_costs_strategy] = df["blockage_costs"]
-            df[_yearly_repair_costs_strategy] = (
-                df["repair_costs_{}".format(strategy)] / df["return_period"]
-            )
-            if strategy == "standard":
-                df[_yearly_blockage_costs_strategy] = (
-                    df[_blockage_costs_strategy] / df["return_period"]
-                )
-            else:
-                df[_yearly_blockage_costs_strategy] = (
-                    df[_blockage_costs_strategy]
-                    / df["return_period"]
-                    * (1 - df["max_effectiveness_{}".format(strategy)])
-                )
-            df[_total_costs_strategy] = (
-                df[_yearly_repair_costs_strategy] + df[_yearly_blockage_costs_strategy]
-            )
-            if strategy != "standard":
-                df["reduction_repair_costs_{}".format(strategy)] = (
-                    df["yearly_repair_costs_standard"]
-                    - df[_yearly_repair_costs_strategy]
-                )
-                df["reduction_blockage_costs_{}".format(strategy)] = (
-                    df["yearly_blockage_costs_standard"]
-                    - df[_yearly_blockage_costs_strategy]
-                )
-                df["reduction_costs_{}".format(strategy)] = (
-                    df["total_costs_standard"] - df[_total_costs_strategy]
-                )
-                df["effectiveness_{}".format(strategy)] = 1 - (
-                    df[_total_costs_strategy] / df["total_costs_standard"]
-                )
-        return df
+        df_costs = EffectivenessStrategies(effectiveness_dict).get_cost_reduction(
+            df, self.return_period, self.repair_costs
+        )
+        _existing_columns = [col for col in df_costs.columns if col in df.columns]
+        df[_existing_columns] = df_costs[_existing_columns]
+        return pd.concat([df, df_costs.drop(columns=_existing_columns)], axis=1)
 
     def _cost_benefit_analysis(self, effectiveness_dict) -> tuple[pd.DataFrame, dict]:
         """This method performs cost benefit analysis"""
-
-        def _calc_npv(x: pd.DataFrame, cols: list[str]) -> float:
-            pv = np.npv(self.interest_rate, [0] + list(x[cols]))
-            return pv
-
-        def _calc_npv_factor(factor: float) -> float:
-            cols = np.linspace(
-                1,
-                1 + (factor * self.evaluation_period),
-                self.evaluation_period,
-                endpoint=False,
-            )
-            return np.npv(self.interest_rate, [0] + list(cols))
-
-        def _calc_cash_flow(x, cols):
-            cash_flow = x[cols].sum() + x["investment"]
-            return cash_flow
+        _evaluation_period = int(self.evaluation_period)
+        _discount_factors = EffectivenessStrategies.get_discount_factors(
+            self.interest_rate, _evaluation_period
+        )
 
         df_cba = pd.DataFrame.from_dict(effectiveness_dict).transpose()
         df_cba["strategy"] = df_cba.index
-        df_cba = df_cba.drop(
-            columns=[
-                "dichtbij",
-                "ver_hoger",
-                "hwa_afw_ho",
-                "gw_hwa",
-                "slope_0015",
-                "slope_001",
-            ]
-        )
+        df_cba = df_cba.drop(columns=EFFECTIVENESS_COLUMNS)
         df_cba["investment"] = df_cba["investment"] * -1
 
         df_cba["lifespan"] = df_cba["lifespan"].astype(int)
-        for col in ["om_pv", "pv", "cash_flow"]:
-            df_cba.insert(0, col, 0)
 
-        # add years
-        for year in range(1, self.evaluation_period + 1):
-            df_cba[str(year)] = df_cba["investment"].where(
-                np.mod(year, df_cba["lifespan"]) == 0, other=0
-            )
-        year_cols = [str(year) for year in range(1, self.evaluation_period + 1)]
-
-        df_cba["om_pv"] = df_cba.apply(lambda x: _calc_npv(x, year_cols), axis=1)
-        df_cba["pv"] = df_cba["om_pv"] + df_cba["investment"]
-        df_cba["cash_flow"] = df_cba.apply(
-            lambda x: _calc_cash_flow(x, year_cols), axis=1
+        # investments of all strategies (rows) in all years (columns)
+        _investments = EffectivenessStrategies.get_yearly_investments(
+            df_cba["investment"].to_numpy(),
+            df_cba["lifespan"].to_numpy(),
+            _evaluation_period,
+        )
+        _om_pv = _investments @ _discount_factors
+        df_cba.insert(0, "om_pv", _om_pv)
+        df_cba.insert(0, "pv", df_cba["om_pv"] + df_cba["investment"])
+        df_cba.insert(0, "cash_flow", _investments.sum(axis=1) + df_cba["investment"])
+        df_cba = pd.concat(
+            [
+                df_cba,
+                pd.DataFrame(
+                    _investments,
+                    index=df_cba.index,
+                    columns=[str(year) for year in range(1, _evaluation_period + 1)],
+                ),
+            ],
+            axis=1,
         )
         df_cba["costs"] = df_cba["pv"] * self.btw
         df_cba["costs_pmt"] = (
-            np.pmt(
-                self.interest_rate, df_cba["lifespan"], df_cba["investment"], when="end"
+            EffectivenessStrategies.get_payments(
+                self.interest_rate, df_cba["lifespan"], df_cba["investment"]
             )
             * self.btw
         )
         df_cba = df_cba.round(2)
 
         costs_dict = df_cba[["costs", "on_column"]].to_dict()
-        costs_dict["npv_factor"] = _calc_npv_factor(self.climate_factor)
+        _climate_cash_flow = np.linspace(
+            1,
+            1 + (self.climate_factor * _evaluation_period),
+            _evaluation_period,
+            endpoint=False,
+        )
+        costs_dict["npv_factor"] = _climate_cash_flow @ _discount_factors
 
         return df_cba, costs_dict
 
@@ -457,7 +382,7 @@ class EffectivenessMeasures(AnalysisDirectProtocol):
 
         df = self._calculate_strategy_effectiveness(df, effectiveness_dict)
         df = self._knmi_correction(df)
-        df_cba, costs_dict = em.cost_benefit_analysis(effectiveness_dict)
+        df_cba, costs_dict = self._cost_benefit_analysis(effectiveness_dict)
         df_cba.round(2).to_csv(
             self.output_path.joinpath(
                 self.analysis.analysis.config_value,
@@ -0,0 +1,269 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+# Columns (without the "_m" suffix) the effectiveness factors of a strategy apply to.
+EFFECTIVENESS_COLUMNS = [
+    "dichtbij",
+    "ver_hoger",
+    "hwa_afw_ho",
+    "gw_hwa",
+    "slope_0015",
+    "slope_001",
+]
+# Lengths of the feature table that are aggregated per link.
+AGGREGATED_COLUMNS = [
+    "length",
+    "dichtbij_m",
+    "ver_hoger_m",
+    "hwa_afw_ho_m",
+    "gw_hwa_m",
+]
+# Columns of the effectiveness per link for the standard situation (without measures).
+STANDARD_COLUMNS = (
+    ["LinkNr"]
+    + AGGREGATED_COLUMNS
+    + [
+        "verweg_max",
+        "verkant_max",
+        "standard_gevoelig_max",
+        "standard_gevoelig_sum",
+    ]
+)
+
+
+class EffectivenessStrategies:
+    """
+    Evaluates all strategies of the effectiveness measures at once, treating the
+    strategies as an extra axis instead of repeating the calculation per strategy.
+    The effectiveness factors form a (strategies x columns) matrix that is broadcast
+    over the line elements, the results are aggregated per `LinkNr` in one go and the
+    costs are computed as (links x strategies) and (strategies x years) arrays.
+    """
+
+    strategies: list[str]
+    factors: np.ndarray
+
+    def __init__(self, effectiveness_dict: dict) -> None:
+        """
+        Args:
+            effectiveness_dict (dict): Effectiveness factors (and costs) per strategy,
+                as read from the `effectiveness_measures.csv` lookup table.
+        """
+        self.strategies = list(effectiveness_dict)
+        self.factors = np.array(
+            [
+                [
+                    float(effectiveness_dict[_strategy][_col])
+                    for _col in EFFECTIVENESS_COLUMNS
+                ]
+                for _strategy in self.strategies
+            ],
+            dtype=float,
+        ).reshape(len(self.strategies), len(EFFECTIVENESS_COLUMNS))
+
+    @property
+    def all_strategies(self) -> list[str]:
+        """
+        The strategies, preceded by the "standard" situation (without measures).
+        """
+        return ["standard"] + self.strategies
+
+    def _get_element_sensitivity(
+        self, df: pd.DataFrame
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        # Lengths per element (rows) for the standard situation and every strategy (columns).
+        _remaining = np.vstack([np.zeros(len(EFFECTIVENESS_COLUMNS)), self.factors])
+        _remaining = 1 - _remaining
+        _lengths = {
+            _col: df[_col + "_m"].to_numpy(dtype=float)[:, None] * _remaining[:, _i]
+            for _i, _col in enumerate(EFFECTIVENESS_COLUMNS)
+        }
+        _verweg_max = np.maximum(
+            np.maximum(_lengths["ver_hoger"], _lengths["hwa_afw_ho"]),
+            _lengths["gw_hwa"],
+        ).round(0)
+        _verkant_max = np.maximum(
+            _lengths["slope_0015"] / 2, _lengths["slope_001"]
+        ).round(0)
+        _gevoelig_max = np.maximum(
+            np.maximum(_verweg_max, _verkant_max), _lengths["dichtbij"]
+        ).round(0)
+        _gevoelig_sum = _verweg_max + _verkant_max + _lengths["dichtbij"]
+        return _verweg_max, _verkant_max, _gevoelig_max, _gevoelig_sum
+
+    def get_effectiveness(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Calculates the sensitive lengths per link for the standard situation and all
+        strategies, as `_calculate_effectiveness` does for a single strategy.
+
+        Args:
+            df (pd.DataFrame): Feature table with the lengths per line element.
+
+        Returns:
+            pd.DataFrame: Table per `LinkNr` with the `STANDARD_COLUMNS` (the aggregated
+                lengths of the standard situation) and the `<strategy>_gevoelig_max` and
+                `<strategy>_gevoelig_sum` of every strategy.
+        """
+        (
+            _verweg_max,
+            _verkant_max,
+            _gevoelig_max,
+            _gevoelig_sum,
+        ) = self._get_element_sensitivity(df)
+
+        # One aggregation over the (sorted) links for all strategies.
+        _link_codes, _links = pd.factorize(df["LinkNr"], sort=True)
+        _order = np.argsort(_link_codes, kind="stable")
+        _order = _order[_link_codes[_order] >= 0]  # elements without link are dropped
+        _starts = np.flatnonzero(np.diff(_link_codes[_order], prepend=-1) != 0)
+
+        def sum_per_link(values: np.ndarray) -> np.ndarray:
+            if not len(_order):
+                return np.zeros((0,) + values.shape[1:])
+            return np.add.reduceat(values[_order], _starts, axis=0)
+
+        _columns = {"LinkNr": np.asarray(_links)}
+        _base_sums = sum_per_link(df[AGGREGATED_COLUMNS].to_numpy())
+        _columns.update(
+            {_col: _base_sums[:, _i] for _i, _col in enumerate(AGGREGATED_COLUMNS)}
+        )
+        _columns["verweg_max"] = sum_per_link(_verweg_max[:, 0])
+        _columns["verkant_max"] = sum_per_link(_verkant_max[:, 0])
+        _gevoelig_max_sums = sum_per_link(_gevoelig_max)
+        _gevoelig_sum_sums = sum_per_link(_gevoelig_sum)
+        for _i, _strategy in enumerate(self.all_strategies):
+            _columns[f"{_strategy}_gevoelig_max"] = _gevoelig_max_sums[:, _i]
+            _columns[f"{_strategy}_gevoelig_sum"] = _gevoelig_sum_sums[:, _i]
+        return pd.DataFrame(_columns)
+
+    def get_cost_reduction(
+        self, df: pd.DataFrame, return_period: float, repair_costs: float
+    ) -> pd.DataFrame:
+        """
+        Calculates the yearly costs of the standard situation and every strategy and
+        the reduction of the costs by each strategy, for all links and strategies at once.
+
+        Args:
+            df (pd.DataFrame): Table per link with the `coefficient`, `blockage_costs`
+                and the `<strategy>_gevoelig_max` / `<strategy>_gevoelig_sum` columns.
+            return_period (float): Return period (years) of the blockage.
+            repair_costs (float): Repair costs per meter (euro).
+
+        Returns:
+            pd.DataFrame: The cost columns, in the order of the per-strategy calculation.
+        """
+        _strategies = self.all_strategies
+        _gevoelig_max = df[[f"{_s}_gevoelig_max" for _s in _strategies]].to_numpy(
+            dtype=float
+        )
+        _gevoelig_sum = df[[f"{_s}_gevoelig_sum" for _s in _strategies]].to_numpy(
+            dtype=float
+        )
+        _return_period = return_period * df["coefficient"].to_numpy(dtype=float)
+        _blockage_costs = df["blockage_costs"].to_numpy(dtype=float)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _max_effectiveness = 1 - _gevoelig_sum / _gevoelig_sum[:, :1]
+            _repair_costs = _gevoelig_max * repair_costs
+            _yearly_repair_costs = _repair_costs / _return_period[:, None]
+            _yearly_blockage_costs = np.repeat(
+                (_blockage_costs / _return_period)[:, None], len(_strategies), axis=1
+            )
+            _yearly_blockage_costs[:, 1:] *= 1 - _max_effectiveness[:, 1:]
+            _total_costs = _yearly_repair_costs + _yearly_blockage_costs
+            _effectiveness = 1 - _total_costs / _total_costs[:, :1]
+
+        _columns = {}
+        for _i, _strategy in enumerate(_strategies):
+            if _i > 0:
+                _columns[f"max_effectiveness_{_strategy}"] = _max_effectiveness[:, _i]
+            _columns["return_period"] = _return_period
+            _columns[f"repair_costs_{_strategy}"] = _repair_costs[:, _i]
+            _columns[f"blockage_costs_{_strategy}"] = _blockage_costs
+            _columns[f"yearly_repair_costs_{_strategy}"] = _yearly_repair_costs[:, _i]
+            _columns[f"yearly_blockage_costs_{_strategy}"] = _yearly_blockage_costs[
+                :, _i
+            ]
+            _columns[f"total_costs_{_strategy}"] = _total_costs[:, _i]
+            if _i > 0:
+                _columns[f"reduction_repair_costs_{_strategy}"] = (
+                    _yearly_repair_costs[:, 0] - _yearly_repair_costs[:, _i]
+                )
+                _columns[f"reduction_blockage_costs_{_strategy}"] = (
+                    _yearly_blockage_costs[:, 0] - _yearly_blockage_costs[:, _i]
+                )
+                _columns[f"reduction_costs_{_strategy}"] = (
+                    _total_costs[:, 0] - _total_costs[:, _i]
+                )
+                _columns[f"effectiveness_{_strategy}"] = _effectiveness[:, _i]
+        return pd.DataFrame(_columns, index=df.index)
+
+    @staticmethod
+    def get_discount_factors(interest_rate: float, n_years: int) -> np.ndarray:
+        """
+        Gets the discount factors of the years 1 to `n_years` (the present value of 1
+        paid at the end of each year).
+        """
+        return (1 + interest_rate) ** -np.arange(1, n_years + 1, dtype=float)
+
+    @staticmethod
+    def get_yearly_investments(
+        investment: np.ndarray, lifespan: np.ndarray, evaluation_period: int
+    ) -> np.ndarray:
+        """
+        Gets the (re)investments of every strategy in every year of the evaluation period,
+        which are made in each year that is a multiple of the lifespan of the strategy.
+
+        Args:
+            investment (np.ndarray): Investment per strategy.
+            lifespan (np.ndarray): Lifespan (years) per strategy.
+            evaluation_period (int): Number of years to evaluate.
+
+        Returns:
+            np.ndarray: Investments with shape (strategies, years).
+        """
+        _years = np.arange(1, evaluation_period + 1)
+        _lifespan = np.asarray(lifespan, dtype=int)[:, None]
+        return np.where(
+            np.mod(_years[None, :], _lifespan) == 0,
+            np.asarray(investment, dtype=float)[:, None],
+            0.0,
+        )
+
+    @staticmethod
+    def get_payments(
+        interest_rate: float, periods: np.ndarray, present_value: np.ndarray
+    ) -> np.ndarray:
+        """
+        Gets the (end of period) payments that pay off the present value in the given
+        number of periods (the former `numpy.pmt`).
+        """
+        _periods = np.asarray(periods, dtype=float)
+        _present_value = np.asarray(present_value, dtype=float)
+        if interest_rate == 0:
+            return -_present_value / _periods
+        _growth = (1 + interest_rate) ** _periods
+        return -_present_value * _growth * interest_rate / (_growth - 1)
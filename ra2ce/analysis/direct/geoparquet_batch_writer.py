@@ -0,0 +1,170 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from geopandas import GeoDataFrame
+
+
+class GeoParquetBatchWriter:
+    """
+    Appends GeoDataFrames (batches of a network) to a single GeoParquet file, so the
+    complete result never needs to be held in memory. The batches are staged in
+    temporary files until the file is completed, so the types of the columns can be
+    promoted to fit all batches (e.g. integers to floats, or to text when the values
+    of the batches are not compatible). Columns missing in a batch are left empty.
+    Object columns are written as text, as it is done for the GeoPackage results.
+
+    Use it as a context manager to ensure the file is completed:
+
+        with GeoParquetBatchWriter(export_path) as _writer:
+            for _gdf in batches:
+                _writer.write(_gdf)
+    """
+
+    export_path: Path
+
+    def __init__(self, export_path: Path) -> None:
+        self.export_path = export_path
+        self._tmp_dir: Optional[tempfile.TemporaryDirectory] = None
+        self._batch_files: list[Path] = []
+        self._schema: Optional[pa.Schema] = None
+        self._geo_metadata: Optional[dict] = None
+
+    def __enter__(self) -> GeoParquetBatchWriter:
+        if self.export_path.exists():
+            self.export_path.unlink()
+        if not self.export_path.parent.exists():
+            self.export_path.parent.mkdir(parents=True)
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @staticmethod
+    def _get_geo_metadata(gdf: GeoDataFrame) -> dict:
+        _crs = gdf.crs.to_json_dict() if gdf.crs else None
+        return {
+            "version": "1.0.0",
+            "primary_column": gdf.geometry.name,
+            "columns": {
+                gdf.geometry.name: {
+                    "encoding": "WKB",
+                    "crs": _crs,
+                    "geometry_types": [],
+                }
+            },
+        }
+
+    def _to_table(self, gdf: GeoDataFrame) -> pa.Table:
+        def to_column(col: str) -> pd.Series:
+            if col == gdf.geometry.name:
+                return gdf.geometry.to_wkb()
+            if gdf[col].dtype == object:
+                return gdf[col].astype(str)
+            return gdf[col]
+
+        _df = pd.DataFrame({_col: to_column(_col) for _col in gdf.columns})
+        return pa.Table.from_pandas(_df, preserve_index=False).replace_schema_metadata()
+
+    @staticmethod
+    def _get_common_type(left: pa.DataType, right: pa.DataType) -> pa.DataType:
+        # Smallest type both types can be cast to.
+        if left == right or pa.types.is_null(right):
+            return left
+        if pa.types.is_null(left):
+            return right
+        if pa.types.is_integer(left) and pa.types.is_integer(right):
+            return pa.int64()
+        if all(
+            pa.types.is_integer(_type) or pa.types.is_floating(_type)
+            for _type in (left, right)
+        ):
+            return pa.float64()
+        return pa.string()
+
+    def _update_schema(self, schema: pa.Schema) -> None:
+        if self._schema is None:
+            self._schema = schema
+            return
+        _fields = {_field.name: _field.type for _field in self._schema}
+        for _field in schema:
+            _fields[_field.name] = self._get_common_type(
+                _fields.get(_field.name, pa.null()), _field.type
+            )
+        self._schema = pa.schema(list(_fields.items()))
+
+    def _conform(self, table: pa.Table) -> pa.Table:
+        # Adds the missing columns and casts the columns to the (promoted) schema.
+        for _field in self._schema:
+            if _field.name not in table.column_names:
+                table = table.append_column(
+                    _field.name, pa.nulls(len(table), type=_field.type)
+                )
+        return table.select(self._schema.names).cast(self._schema)
+
+    def write(self, gdf: GeoDataFrame) -> None:
+        """
+        Appends the rows of the given GeoDataFrame to the file.
+
+        Args:
+            gdf (GeoDataFrame): Batch to append.
+        """
+        _table = self._to_table(gdf)
+        if self._tmp_dir is None:
+            self._tmp_dir = tempfile.TemporaryDirectory(dir=self.export_path.parent)
+            self._geo_metadata = self._get_geo_metadata(gdf)
+        self._update_schema(_table.schema)
+        _batch_file = Path(self._tmp_dir.name).joinpath(
+            f"batch_{len(self._batch_files)}.parquet"
+        )
+        pq.write_table(_table, _batch_file)
+        self._batch_files.append(_batch_file)
+
+    def close(self) -> None:
+        """
+        Completes the file, with the types of the columns promoted to fit all batches.
+        """
+        if self._tmp_dir is None:
+            return
+        _schema = self._schema.with_metadata(
+            {b"geo": json.dumps(self._geo_metadata).encode()}
+        )
+        with pq.ParquetWriter(self.export_path, _schema) as _writer:
+            for _batch_file in self._batch_files:
+                _writer.write_table(
+                    self._conform(pq.read_table(_batch_file)).replace_schema_metadata(
+                        _schema.metadata
+                    )
+                )
+        self._tmp_dir.cleanup()
+        self._tmp_dir = None
+        self._batch_files = []
+        logging.info("Results saved to: %s", self.export_path)
@@ -0,0 +1,147 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+
+class LaneNormalizer:
+    """
+    Normalizes the (OSM) lane data of a road network: parses the raw values into a
+    number of lanes, imputes the missing ones from the mode per road type and clips
+    exceptional values. All steps work on complete columns at once; malformed values
+    are reported with one (aggregated) log line instead of one per value.
+    """
+
+    # separators of list-like lane values, like "2;3" or "2,3".
+    list_separators = [";", ","]
+    min_lanes = 1.0
+    max_lanes = 6.0
+
+    @classmethod
+    def parse(cls, lanes: pd.Series) -> pd.Series:
+        """
+        Parses the raw lane data into floats. List-like texts (e.g. "2;3") get their
+        maximum value, values that cannot be parsed (completely) become `nan`.
+
+        Args:
+            lanes (pd.Series): Raw lane data.
+
+        Returns:
+            pd.Series: Number of lanes as float (`nan` when unknown).
+        """
+        _lanes = lanes.reset_index(drop=True)
+        _parsed = pd.to_numeric(_lanes, errors="coerce").astype(float)
+
+        # Texts that are not a number might be a list of numbers.
+        _texts = _lanes[_parsed.isna()]
+        _texts = _texts[_texts.map(type) == str].astype(str)
+        _is_list = pd.Series(False, index=_texts.index)
+        for _separator in cls.list_separators:
+            _has_separator = ~_is_list & _texts.str.contains(_separator, regex=False)
+            if not _has_separator.any():
+                continue
+            _parts = pd.to_numeric(
+                _texts[_has_separator].str.split(_separator).explode(), errors="coerce"
+            )
+            _invalid = _parts.isna().groupby(level=0).any()
+            _parsed.loc[_invalid.index] = (
+                _parts.groupby(level=0).max().where(~_invalid).astype(float)
+            )
+            _is_list |= _has_separator
+
+        _n_missing = (_lanes.notna() & _parsed.isna()).sum()
+        if _is_list.any():
+            logging.warning(
+                "Lane data of %s road segments is a list, the maximum number of lanes is used.",
+                _is_list.sum(),
+            )
+        if _n_missing:
+            logging.warning(
+                "Lane data of %s road segments could not be converted to a number and is removed, e.g. %s.",
+                _n_missing,
+                list(_lanes[_lanes.notna() & _parsed.isna()].astype(str).unique()[:5]),
+            )
+        return pd.Series(_parsed.to_numpy(), index=lanes.index, name=lanes.name)
+
+    @staticmethod
+    def get_lane_statistics(road_types: pd.Series, lanes: pd.Series) -> dict:
+        """
+        Gets the mode (most frequent number) of the lanes per road type. When several
+        numbers are equally frequent the smallest one is taken, road types without any
+        lane data get the mean of the (positive) modes of the other road types.
+
+        Args:
+            road_types (pd.Series): Road type of each road segment.
+            lanes (pd.Series): (Parsed) number of lanes of each road segment.
+
+        Returns:
+            dict: keys = road types; values = lanes
+        """
+        _counts = (
+            pd.DataFrame(
+                {"road_type": road_types.to_numpy(), "lanes": lanes.to_numpy()}
+            )
+            .dropna()
+            .value_counts()
+            .reset_index(name="count")
+            .sort_values(["road_type", "count", "lanes"], ascending=[True, False, True])
+            .drop_duplicates("road_type")
+        )
+        _modes = dict(zip(_counts["road_type"], _counts["lanes"].astype(float)))
+
+        _positive_modes = [_mode for _mode in _modes.values() if _mode > 0]
+        _default = np.mean(_positive_modes) if _positive_modes else np.nan
+        return {
+            _road_type: _modes.get(_road_type, _default)
+            for _road_type in road_types.dropna().unique()
+        }
+
+    @staticmethod
+    def impute(road_types: pd.Series, lanes: pd.Series, lane_stats: dict) -> pd.Series:
+        """
+        Fills in the missing lanes with the lanes of their road type. The road types are
+        mapped as categories, so every road type is only looked up once.
+
+        Args:
+            road_types (pd.Series): Road type of each road segment.
+            lanes (pd.Series): Number of lanes of each road segment.
+            lane_stats (dict): Lanes per road type, see `get_lane_statistics`.
+
+        Returns:
+            pd.Series: Number of lanes of each road segment.
+        """
+        _missing = lanes.isna()
+        if not _missing.any():
+            return lanes
+        _imputed = road_types[_missing].astype("category").map(lane_stats).astype(float)
+        return lanes.fillna(_imputed)
+
+    @classmethod
+    def clip(cls, lanes: pd.Series) -> pd.Series:
+        """
+        Clips exceptionally low/high numbers of lanes to the supported range.
+        """
+        return lanes.astype(float).clip(lower=cls.min_lanes, upper=cls.max_lanes)
@@ -0,0 +1,293 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+from pathlib import Path
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.ipc as ipc
+from geopandas import GeoDataFrame, GeoSeries, points_from_xy
+from pyproj import CRS
+
+from ra2ce.network.graph_files.network_file import NetworkFile
+
+
+class NetworkBatchReader:
+    """
+    Reads a (geo)feather network file, such as `base_network_hazard.feather`, in batches of
+    rows instead of loading it at once. The file is read record batch by record batch,
+    so only the batch being processed (or the requested columns) are read into memory.
+    A network that is only available in memory is split in batches as well.
+    The batches are either consecutive rows or, when spatially ordered, rows that are
+    close to each other (along a Hilbert curve), so each batch covers a compact area.
+    For the latter the rows of the file are first staged per batch in a temporary
+    (uncompressed) file next to it, from which every batch is read on its own.
+    """
+
+    network_file: Optional[Path]
+    batch_size: int
+    network: Optional[GeoDataFrame]
+    spatially_ordered: bool
+
+    def __init__(
+        self,
+        network_file: Optional[Path],
+        batch_size: int,
+        network: Optional[GeoDataFrame] = None,
+        spatially_ordered: bool = False,
+    ) -> None:
+        """
+        Args:
+            network_file (Optional[Path]): The feather file to read.
+            batch_size (int): Maximum number of rows per batch.
+            network (Optional[GeoDataFrame], optional): The network, when it has not been
+                written to a file. Defaults to None.
+            spatially_ordered (bool, optional): Whether the batches contain rows close to
+                each other instead of consecutive rows. Defaults to False.
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size should be a positive number of rows.")
+        if network_file is None and network is None:
+            raise ValueError("No network (file) is given to read.")
+        self.network_file = Path(network_file) if network_file else None
+        self.batch_size = batch_size
+        self.network = network
+        self.spatially_ordered = spatially_ordered
+
+    @classmethod
+    def from_network_file(
+        cls,
+        network_file: NetworkFile,
+        batch_size: int,
+        spatially_ordered: bool = False,
+    ) -> NetworkBatchReader:
+        """
+        Creates a reader for the file of the given network or, when it has no file
+        (yet), for its graph in memory.
+
+        Args:
+            network_file (NetworkFile): The network to read.
+            batch_size (int): Maximum number of rows per batch.
+            spatially_ordered (bool, optional): Whether the batches contain rows close to
+                each other instead of consecutive rows. Defaults to False.
+
+        Returns:
+            NetworkBatchReader: The reader.
+        """
+        if network_file.file and network_file.file.is_file():
+            return cls(
+                network_file.file, batch_size, spatially_ordered=spatially_ordered
+            )
+        return cls(
+            None,
+            batch_size,
+            network=network_file.graph,
+            spatially_ordered=spatially_ordered,
+        )
+
+    def _open(self) -> ipc.RecordBatchFileReader:
+        return ipc.open_file(pa.memory_map(str(self.network_file), "r"))
+
+    @property
+    def column_names(self) -> list[str]:
+        """
+        The names of the columns in the network file.
+        """
+        if self.network is not None:
+            return list(self.network.columns)
+        return self._open().schema.names
+
+    def read_columns(self, columns: list[str]) -> pd.DataFrame:
+        """
+        Reads only the given (non-geometry) columns of the whole network, which is
+        cheap compared to reading the complete network.
+
+        Args:
+            columns (list[str]): Names of the columns to read.
+
+        Returns:
+            pd.DataFrame: The columns of all rows in the network.
+        """
+        if self.network is not None:
+            return pd.DataFrame(self.network[columns])
+        return feather.read_table(
+            self.network_file, columns=columns, memory_map=True
+        ).to_pandas()
+
+    def get_spatial_order(self) -> np.ndarray:
+        """
+        Gets the row numbers of the network ordered by the Hilbert distance of the
+        centers of their geometries. Only the geometries are read, batch by batch.
+
+        Returns:
+            np.ndarray: The row numbers in spatial order.
+        """
+        if self.network is not None:
+            _centers = [self._get_centers(self.network.geometry)]
+        else:
+            _geo_metadata = self._get_geo_metadata()
+            _reader = self._open()
+            _centers = [
+                self._get_centers(
+                    self.to_geodataframe(
+                        pa.Table.from_batches([_reader.get_batch(_batch_idx)]).select(
+                            [_geo_metadata["primary_column"]]
+                        ),
+                        _geo_metadata,
+                    ).geometry
+                )
+                for _batch_idx in range(_reader.num_record_batches)
+            ]
+        _x, _y = np.concatenate(_centers, axis=1) if _centers else np.empty((2, 0))
+        # the rows without geometry are put at the end
+        _has_center = ~(np.isnan(_x) | np.isnan(_y))
+        _distances = np.full(len(_x), np.iinfo(np.int64).max)
+        if _has_center.any():
+            _distances[_has_center] = GeoSeries(
+                points_from_xy(_x[_has_center], _y[_has_center])
+            ).hilbert_distance()
+        return np.argsort(_distances, kind="stable")
+
+    @staticmethod
+    def _get_centers(geometries: GeoSeries) -> np.ndarray:
+        _bounds = geometries.bounds.to_numpy()
+        return np.array(
+            [
+                (_bounds[:, 0] + _bounds[:, 2]) / 2,
+                (_bounds[:, 1] + _bounds[:, 3]) / 2,
+            ]
+        )
+
+    def _get_geo_metadata(self) -> dict:
+        return json.loads((self._open().schema.metadata or {}).get(b"geo", b"{}"))
+
+    def _iter_spatially_ordered(self) -> Iterator[GeoDataFrame]:
+        _order = self.get_spatial_order()
+        if self.network is not None:
+            for _start in range(0, len(_order), self.batch_size):
+                yield self.network.iloc[
+                    _order[_start : _start + self.batch_size]
+                ].copy()
+            return
+
+        _geo_metadata = self._get_geo_metadata()
+        _output_batch = np.empty(len(_order), dtype=np.int64)
+        _output_batch[_order] = np.arange(len(_order)) // self.batch_size
+        with tempfile.TemporaryDirectory(dir=self.network_file.parent) as _tmp_dir:
+            _staged_file = Path(_tmp_dir).joinpath("spatially_ordered.arrow")
+            _pieces = self._stage_spatially_ordered(_staged_file, _output_batch)
+            with pa.memory_map(str(_staged_file), "r") as _source:
+                _staged = ipc.open_file(_source)
+                for _batch_idx, _start in enumerate(
+                    range(0, len(_order), self.batch_size)
+                ):
+                    _rows = _order[_start : _start + self.batch_size]
+                    # the staged pieces hold the rows of the batch in file order
+                    _table = pa.Table.from_batches(
+                        [_staged.get_batch(_piece) for _piece in _pieces[_batch_idx]],
+                        schema=_staged.schema,
+                    ).take(pa.array(np.searchsorted(np.sort(_rows), _rows)))
+                    _gdf = self.to_geodataframe(_table, _geo_metadata)
+                    if isinstance(_gdf.index, pd.RangeIndex):
+                        # keep the row numbers of the complete network
+                        _gdf.index = pd.Index(_rows)
+                    yield _gdf
+
+    def _stage_spatially_ordered(
+        self, staged_file: Path, output_batch: np.ndarray
+    ) -> list[list[int]]:
+        # Splits every record batch of the file in pieces per output batch and writes
+        # them to the staged file, returns the staged pieces of every output batch.
+        _n_output_batches = output_batch.max() + 1 if output_batch.size else 0
+        _pieces = [[] for _ in range(_n_output_batches)]
+        _n_pieces = 0
+        _reader = self._open()
+        _offset = 0
+        with ipc.new_file(str(staged_file), _reader.schema) as _writer:
+            for _batch_idx in range(_reader.num_record_batches):
+                _batch = _reader.get_batch(_batch_idx)
+                _batch_ids = output_batch[_offset : _offset + _batch.num_rows]
+                _offset += _batch.num_rows
+                _local_order = np.argsort(_batch_ids, kind="stable")
+                _sorted_batch = _batch.take(pa.array(_local_order))
+                _ids, _starts, _counts = np.unique(
+                    _batch_ids[_local_order], return_index=True, return_counts=True
+                )
+                for _id, _start, _count in zip(_ids, _starts, _counts):
+                    _writer.write_batch(_sorted_batch.slice(_start, _count))
+                    _pieces[_id].append(_n_pieces)
+                    _n_pieces += 1
+        return _pieces
+
+    def __iter__(self) -> Iterator[GeoDataFrame]:
+        if self.spatially_ordered:
+            yield from self._iter_spatially_ordered()
+            return
+
+        if self.network is not None:
+            for _start in range(0, len(self.network), self.batch_size):
+                yield self.network.iloc[_start : _start + self.batch_size].copy()
+            return
+
+        _reader = self._open()
+        _geo_metadata = self._get_geo_metadata()
+        _offset = 0
+        for _batch_idx in range(_reader.num_record_batches):
+            _table = pa.Table.from_batches([_reader.get_batch(_batch_idx)])
+            for _batch in _table.to_batches(max_chunksize=self.batch_size):
+                _gdf = self.to_geodataframe(
+                    pa.Table.from_batches([_batch]), _geo_metadata
+                )
+                if isinstance(_gdf.index, pd.RangeIndex):
+                    # keep the row numbers of the complete network
+                    _gdf.index = pd.RangeIndex(_offset, _offset + len(_gdf))
+                _offset += len(_gdf)
+                yield _gdf
+
+    @staticmethod
+    def to_geodataframe(table: pa.Table, geo_metadata: dict) -> GeoDataFrame:
+        """
+        Converts a table with WKB geometry columns, as written to (geo)feather and
+        GeoParquet files, to a GeoDataFrame.
+
+        Args:
+            table (pa.Table): The table to convert.
+            geo_metadata (dict): The `geo` metadata of the file.
+
+        Returns:
+            GeoDataFrame: The converted table.
+        """
+        _df = table.to_pandas()
+        for _column, _column_metadata in geo_metadata.get("columns", {}).items():
+            if _column not in _df.columns:
+                continue
+            _crs = _column_metadata.get("crs", "OGC:CRS84")
+            if isinstance(_crs, dict):
+                _crs = CRS.from_json_dict(_crs)
+            _df[_column] = GeoSeries.from_wkb(_df[_column], crs=_crs)
+        return GeoDataFrame(_df, geometry=geo_metadata.get("primary_column", None))
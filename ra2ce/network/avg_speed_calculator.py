@@ -0,0 +1,290 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+from pathlib import Path
+from typing import Any, Optional
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+
+MPH_TO_KMH = 1.609344
+
+
+class AvgSpeedCalculator:
+    """
+    Derives the average speed of the edges of a graph from their `maxspeed` attribute.
+
+    The edges are collected once in an edge table, every distinct raw `maxspeed` value
+    is parsed only once and the average speed per road type as well as the `avgspeed`
+    and `time` attributes of the edges are computed over that table at once.
+    """
+
+    graph: nx.Graph
+    road_type_col_name: str
+
+    def __init__(self, graph: nx.Graph, road_type_col_name: str) -> None:
+        self.graph = graph
+        self.road_type_col_name = road_type_col_name
+        self._edges = self._get_edges_table()
+
+    @staticmethod
+    def _parse_maxspeed_text(maxspeed: str) -> list[float]:
+        """
+        Parses a single `maxspeed` text (like "50", "50;70", "30 mph") into the speeds (km/h) it contains.
+        """
+        try:
+            if not any(c.isalpha() for c in maxspeed):
+                for _separator in [";", "|", "-"]:
+                    if _separator in maxspeed:
+                        return [
+                            int(x) for x in maxspeed.split(_separator) if x.isnumeric()
+                        ]
+                return [int(maxspeed)]
+            if " mph" in maxspeed:
+                return [int(maxspeed.split(" mph")[0]) * MPH_TO_KMH]
+        except ValueError:
+            logging.warning("Could not parse 'maxspeed' value '%s'.", maxspeed)
+        return []
+
+    @staticmethod
+    def parse_maxspeed(maxspeed: Any) -> float:
+        """
+        Parses a raw `maxspeed` value (a text or a list of texts) into a single speed, being
+        the mean of all the speeds it contains.
+
+        Args:
+            maxspeed (Any): Raw `maxspeed` attribute value.
+
+        Returns:
+            float: The speed (km/h), `np.nan` when it could not be derived.
+        """
+        if isinstance(maxspeed, str):
+            _speeds = AvgSpeedCalculator._parse_maxspeed_text(maxspeed)
+        elif isinstance(maxspeed, (list, tuple)):
+            _speeds = [
+                _speed
+                for _text in maxspeed
+                if isinstance(_text, str)
+                for _speed in AvgSpeedCalculator._parse_maxspeed_text(_text)
+            ]
+        else:
+            _speeds = []
+        if not _speeds:
+            return np.nan
+        return sum(_speeds) / len(_speeds)
+
+    def _get_edges_table(self) -> pd.DataFrame:
+        def to_hashable(value: Any) -> Any:
+            if isinstance(value, list):
+                return tuple(value)
+            return value
+
+        if self.graph.is_multigraph():
+            _edges_data = self.graph.edges(keys=True, data=True)
+        else:
+            _edges_data = self.graph.edges(data=True)
+
+        _edge_ids, _road_types, _maxspeeds, _lengths = [], [], [], []
+        for *_edge_id, _edata in _edges_data:
+            _edge_ids.append(tuple(_edge_id))
+            _road_types.append(_edata.get(self.road_type_col_name, None))
+            _maxspeeds.append(to_hashable(_edata.get("maxspeed", None)))
+            _lengths.append(_edata.get("length", np.nan))
+
+        _edges = pd.DataFrame(
+            {
+                "road_type": pd.Series(_road_types, dtype=object).map(str),
+                "is_list_type": [isinstance(_rt, list) for _rt in _road_types],
+                "is_str_type": [isinstance(_rt, str) for _rt in _road_types],
+                "has_maxspeed": [_ms is not None for _ms in _maxspeeds],
+                "maxspeed": pd.Series(_maxspeeds, dtype=object),
+                "length": pd.Series(_lengths, dtype=float),
+            }
+        )
+        _edges.index = pd.Index(_edge_ids, tupleize_cols=False)
+
+        # Parse every distinct raw value only once.
+        _distinct_maxspeeds = _edges.loc[_edges["has_maxspeed"], "maxspeed"].unique()
+        _parsed_maxspeeds = dict(
+            zip(_distinct_maxspeeds, map(self.parse_maxspeed, _distinct_maxspeeds))
+        )
+        _edges["speed"] = _edges["maxspeed"].map(_parsed_maxspeeds).astype(float)
+        return _edges
+
+    def get_avg_speed_per_road_type(
+        self, save_csv: bool = False, save_path: Optional[Path] = None
+    ) -> pd.DataFrame:
+        """
+        Calculates the length-weighted average speed per road type. Road types without any
+        valid `maxspeed` get the speed of a related road type (when possible).
+
+        Args:
+            save_csv (bool, optional): To save a csv or not. Defaults to False.
+            save_path (Optional[Path], optional): Path to save the csv to. Defaults to None.
+
+        Returns:
+            pd.DataFrame: Dataframe with the "road_types" and their "avg_speed".
+        """
+        exceptions = list(
+            self._edges.loc[self._edges["is_list_type"], "road_type"].unique()
+        )
+        types = list(self._edges.loc[self._edges["is_str_type"], "road_type"].unique())
+
+        _valid_edges = self._edges[
+            self._edges["has_maxspeed"] & self._edges["speed"].notna()
+        ]
+        _sums = (
+            _valid_edges.assign(
+                weighted_speed=_valid_edges["speed"] * _valid_edges["length"]
+            )
+            .groupby("road_type")[["weighted_speed", "length"]]
+            .sum()
+        )
+        _avg_speeds = (_sums["weighted_speed"] / _sums["length"]).replace(
+            [np.inf, -np.inf], np.nan
+        )
+
+        df = pd.DataFrame({"road_types": exceptions + types})
+        df["avg_speed"] = df["road_types"].map(_avg_speeds).fillna(0.0)
+        self._set_missing_avg_speeds(df, exceptions, save_path)
+
+        if save_csv:
+            df.to_csv(save_path)
+            logging.info(
+                "Saved the average speeds per road type to: {}".format(save_path)
+            )
+
+        return df
+
+    @staticmethod
+    def _set_missing_avg_speeds(
+        df: pd.DataFrame, exceptions: list[str], save_path: Optional[Path]
+    ) -> None:
+        # For all types without an average speed, take one that is closest. E.g. for the links take the one of the same type
+        # of the main roads
+        if df.loc[df["avg_speed"] == 0].empty:
+            return
+        logging.info(
+            f"Not all of the edges contain a 'maxspeed' attribute. RA2CE will guess the right average maximum "
+            f"speed per road type that does not contain a 'maxspeed' attribute. Please check the average speed CSV to ensure correct speeds here: {save_path}"
+        )
+        for i in df.loc[df["avg_speed"] == 0].index:
+            _road_type = df.at[i, "road_types"]
+            if _road_type in exceptions:
+                _related_speeds = [
+                    avg_s
+                    for rt, avg_s in zip(df["road_types"], df["avg_speed"])
+                    if rt in _road_type and avg_s != 0
+                ]
+                if _related_speeds:
+                    df.at[i, "avg_speed"] = _related_speeds[0]
+                    continue
+            elif "link" in _road_type:
+                _main_speeds = df.loc[
+                    df["road_types"] == _road_type.split("_link")[0], "avg_speed"
+                ].values
+                if _main_speeds.size:
+                    df.at[i, "avg_speed"] = _main_speeds[0]
+                    continue
+            else:
+                continue
+            logging.warning(
+                f"Road type '{_road_type}' cannot be assigned any average speed. Please check the average speed CSV ({save_path}), enter the right average speed for this road type, and run RA2CE again."
+            )
+
+    def get_edges_avg_speed(self, avg_road_speed: pd.DataFrame) -> pd.Series:
+        """
+        Gets the average speed of every edge: the (rounded) speed derived from its own
+        `maxspeed` or, when not available, the average speed of its road type.
+
+        Args:
+            avg_road_speed (pd.DataFrame): a Dataframe with columns "road_types" and "avg_speed"
+
+        Returns:
+            pd.Series: Average speed per edge (indexed by the edge ids).
+        """
+        _road_types = avg_road_speed["road_types"].astype(str)
+        _avg_speed_per_type = pd.Series(
+            avg_road_speed["avg_speed"].values, index=_road_types.values
+        )
+        _avg_speed_per_type = _avg_speed_per_type[
+            ~_avg_speed_per_type.index.duplicated()
+        ]
+
+        def as_set(road_type: str) -> frozenset:
+            return frozenset(road_type[2:-2].split("', '"))
+
+        # List road types (without maxspeed) are matched regardless of their order.
+        _avg_speed_per_type_set = {}
+        for _road_type, _avg_speed in _avg_speed_per_type.items():
+            _avg_speed_per_type_set.setdefault(as_set(_road_type), _avg_speed)
+
+        _edges = self._edges
+        _type_speed = _edges["road_type"].map(_avg_speed_per_type)
+        _is_set_type = ~_edges["has_maxspeed"] & _edges["road_type"].str.contains(
+            "]", regex=False
+        )
+        if _is_set_type.any():
+            _type_speed[_is_set_type] = np.trunc(
+                _edges.loc[_is_set_type, "road_type"]
+                .map(lambda x: _avg_speed_per_type_set.get(as_set(x), np.nan))
+                .astype(float)
+            )
+
+        _missing_types = _edges.loc[_type_speed.isna(), "road_type"].unique()
+        _own_speed = _edges["speed"].where(_edges["has_maxspeed"])
+        if any(_own_speed.isna() & _type_speed.isna()):
+            logging.warning(
+                "No average speed found for road types: {}".format(
+                    ", ".join(_missing_types)
+                )
+            )
+        return _own_speed.fillna(_type_speed).round(0)
+
+    def assign_avg_speed(
+        self, avg_road_speed: pd.DataFrame, with_time: bool = False
+    ) -> nx.Graph:
+        """
+        Assigns the average speed ('avgspeed' in km/h) to all edges of the graph and,
+        optionally, the derived travel 'time' (in seconds, requires the 'length' in meters).
+
+        Args:
+            avg_road_speed (pd.DataFrame): a Dataframe with columns "road_types" and "avg_speed"
+            with_time (bool, optional): Whether to also assign the 'time'. Defaults to False.
+
+        Returns:
+            nx.Graph: The graph with the additional edge attributes.
+        """
+        _avg_speeds = self.get_edges_avg_speed(avg_road_speed)
+        _attributes = pd.DataFrame({"avgspeed": _avg_speeds})
+        if with_time:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                _hours = (self._edges["length"] / 1000) / _avg_speeds
+            _attributes["time"] = (
+                (_hours * 3600).round(0).where(_avg_speeds > 0).astype(object)
+            )
+            _attributes.loc[_attributes["time"].isna(), "time"] = None
+        nx.set_edge_attributes(self.graph, _attributes.to_dict(orient="index"))
+        return self.graph
@@ -0,0 +1,462 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Hashable
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import shapely
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+
+class GraphSimplifier:
+    """
+    Topologically simplifies a (directed) graph: chains of interstitial nodes (nodes which
+    only connect two other nodes, like the vertices of a curved road) are replaced by a
+    single edge between the endpoints of the chain.
+
+    The rules to identify the endpoints, to build the chains and to merge the attributes
+    of their edges are those of `osmnx.simplify_graph` (version 1.7), but the endpoints are
+    derived from degree arrays, all chains are traversed at once and their geometries are
+    built from concatenated coordinate arrays. The links between the simplified edges and
+    the edges they were created from are collected during the same traversal.
+    """
+
+    strict: bool
+    remove_rings: bool
+    track_merged: bool
+
+    # Edge attributes which are summed (instead of listed) when merging edges.
+    attrs_to_sum = {"length", "travel_time"}
+
+    def __init__(
+        self, strict: bool = True, remove_rings: bool = True, track_merged: bool = False
+    ) -> None:
+        """
+        Args:
+            strict (bool, optional): When False, nodes whose incident edges have different
+                `osmid` values are also endpoints. Defaults to True.
+            remove_rings (bool, optional): Whether to remove the isolated rings without any
+                endpoint. Defaults to True.
+            track_merged (bool, optional): Whether to add a `merged_edges` attribute, with
+                all the merged (u, v) pairs, to the simplified edges. Defaults to False.
+        """
+        self.strict = strict
+        self.remove_rings = remove_rings
+        self.track_merged = track_merged
+
+    @staticmethod
+    def _to_hashable(value: Any) -> Any:
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    @staticmethod
+    def _get_unique(values: list[Any]) -> list[Any]:
+        try:
+            return list(dict.fromkeys(values))
+        except TypeError:
+            _unique = []
+            for _value in values:
+                if not any(_value == _u for _u in _unique):
+                    _unique.append(_value)
+            return _unique
+
+    def get_endpoints(
+        self,
+        n_nodes: int,
+        u_idx: np.ndarray,
+        v_idx: np.ndarray,
+        osmids: list[Any] | None = None,
+    ) -> np.ndarray:
+        """
+        Identifies the endpoints among the nodes of a graph given as arrays. An endpoint
+        is a node that has a self-loop, has no incoming or no outgoing edges, or does not
+        have exactly two neighbors and a degree of 2 or 4 (or, when not `strict`, whose
+        edges have different `osmid` values).
+
+        Args:
+            n_nodes (int): Number of nodes.
+            u_idx (np.ndarray): Index of the start node of every edge.
+            v_idx (np.ndarray): Index of the end node of every edge.
+            osmids (list[Any] | None, optional): `osmid` of every edge, only required when
+                not `strict`. Defaults to None.
+
+        Returns:
+            np.ndarray: Whether every node is an endpoint.
+        """
+        _out_degree = np.bincount(u_idx, minlength=n_nodes)
+        _in_degree = np.bincount(v_idx, minlength=n_nodes)
+        _degree = _out_degree + _in_degree
+        _is_loop = u_idx == v_idx
+        _has_loop = np.bincount(u_idx[_is_loop], minlength=n_nodes) > 0
+
+        # Distinct neighbors, regardless of the direction of the edges.
+        _pairs = np.unique(
+            np.sort(np.column_stack([u_idx, v_idx])[~_is_loop], axis=1), axis=0
+        )
+        _n_neighbors = np.bincount(_pairs.ravel(), minlength=n_nodes)
+
+        _is_endpoint = (
+            _has_loop
+            | (_out_degree == 0)
+            | (_in_degree == 0)
+            | ~((_n_neighbors == 2) & np.isin(_degree, [2, 4]))
+        )
+        if not self.strict and osmids is not None:
+            _incident_osmids = pd.DataFrame(
+                {
+                    "node": np.concatenate([u_idx, v_idx]),
+                    "osmid": [self._to_hashable(_osmid) for _osmid in osmids] * 2,
+                }
+            )
+            _n_osmids = _incident_osmids.groupby("node")["osmid"].nunique(dropna=False)
+            _is_endpoint[_n_osmids.index[_n_osmids > 1]] = True
+        return _is_endpoint
+
+    def _get_chains(
+        self,
+        nodes: list[Hashable],
+        u_idx: np.ndarray,
+        v_idx: np.ndarray,
+        is_endpoint: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Traverses all chains at once, starting from every (endpoint, non-endpoint) pair of
+        nodes and following the non-endpoint nodes until reaching an endpoint.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The node indices of all chains (concatenated) and
+                the offsets of every chain within them.
+        """
+        _n_nodes = len(nodes)
+        # Distinct successors of every node, in the order of the adjacency.
+        _codes = u_idx.astype(np.int64) * _n_nodes + v_idx
+        _pair_idx = np.sort(np.unique(_codes, return_index=True)[1])
+        _pair_u, _pair_v = u_idx[_pair_idx], v_idx[_pair_idx]
+
+        _is_inner = ~is_endpoint[_pair_u] & (_pair_u != _pair_v)
+        _inner_u, _inner_v = _pair_u[_is_inner], _pair_v[_is_inner]
+        _order = np.argsort(_inner_u, kind="stable")
+        _inner_u, _inner_v = _inner_u[_order], _inner_v[_order]
+        _is_first = np.diff(_inner_u, prepend=-1) != 0
+        _first_successor = np.full(_n_nodes, -1)
+        _second_successor = np.full(_n_nodes, -1)
+        _first_successor[_inner_u[_is_first]] = _inner_v[_is_first]
+        _is_second = np.zeros_like(_is_first)
+        _is_second[1:] = ~_is_first[1:] & _is_first[:-1]
+        _second_successor[_inner_u[_is_second]] = _inner_v[_is_second]
+
+        # Chains start in the (set) order of the endpoints and then their successors.
+        _is_start = is_endpoint[_pair_u] & ~is_endpoint[_pair_v]
+        _start_u, _start_v = _pair_u[_is_start], _pair_v[_is_start]
+        _endpoint_rank = np.zeros(_n_nodes, dtype=int)
+        _node_idx = {_node: _idx for _idx, _node in enumerate(nodes)}
+        _endpoint_set = {nodes[_idx] for _idx in np.flatnonzero(is_endpoint)}
+        _endpoint_rank[[_node_idx[_node] for _node in _endpoint_set]] = np.arange(
+            len(_endpoint_set)
+        )
+        _order = np.argsort(_endpoint_rank[_start_u], kind="stable")
+        _start_u, _start_v = _start_u[_order], _start_v[_order]
+
+        _n_chains = len(_start_u)
+        _chain_ids = [np.arange(_n_chains), np.arange(_n_chains)]
+        _chain_nodes = [_start_u, _start_v]
+        _active = np.arange(_n_chains)
+        _previous, _current = _start_u, _start_v
+        for _ in range(_n_nodes):
+            if not len(_active):
+                break
+            _next = np.where(
+                _first_successor[_current] != _previous,
+                _first_successor[_current],
+                _second_successor[_current],
+            )
+            # Without any other successor the chain ends at the current node.
+            _has_next = _next >= 0
+            _active, _previous, _next = (
+                _active[_has_next],
+                _current[_has_next],
+                _next[_has_next],
+            )
+            _chain_ids.append(_active)
+            _chain_nodes.append(_next)
+            _continues = ~is_endpoint[_next]
+            _active, _previous, _current = (
+                _active[_continues],
+                _previous[_continues],
+                _next[_continues],
+            )
+
+        _chain_ids = np.concatenate(_chain_ids)
+        _order = np.argsort(_chain_ids, kind="stable")
+        _offsets = np.r_[0, np.cumsum(np.bincount(_chain_ids, minlength=_n_chains))]
+        return np.concatenate(_chain_nodes)[_order], _offsets
+
+    @staticmethod
+    def _get_node_coordinates(nodes_data: list[dict]) -> np.ndarray:
+        # From the `geometry` of the nodes, or their `x` and `y` otherwise (`nan` if none).
+        _geometries = np.array(
+            [_data.get("geometry", None) for _data in nodes_data], dtype=object
+        )
+        _coordinates = np.full((len(nodes_data), 2), np.nan)
+        _has_geometry = ~shapely.is_missing(_geometries)
+        _coordinates[_has_geometry] = shapely.get_coordinates(
+            _geometries[_has_geometry]
+        )
+        for _idx in np.flatnonzero(~_has_geometry):
+            _coordinates[_idx] = (
+                nodes_data[_idx].get("x", np.nan),
+                nodes_data[_idx].get("y", np.nan),
+            )
+        return _coordinates
+
+    def _merge_attributes(self, edges_data: list[dict]) -> dict:
+        _path_attributes: dict[str, list] = {}
+        for _edge_data in edges_data:
+            for _attr, _value in _edge_data.items():
+                _path_attributes.setdefault(_attr, []).append(_value)
+        for _attr, _values in _path_attributes.items():
+            if _attr in self.attrs_to_sum:
+                _path_attributes[_attr] = sum(_values)
+            elif _attr != "geometry":
+                _unique_values = self._get_unique(_values)
+                _path_attributes[_attr] = (
+                    _unique_values[0] if len(_unique_values) == 1 else _unique_values
+                )
+        return _path_attributes
+
+    def _simplify(
+        self, graph: nx.MultiDiGraph
+    ) -> tuple[nx.MultiDiGraph, list[tuple], list[np.ndarray]]:
+        """
+        Simplifies the graph.
+
+        Returns:
+            tuple[nx.MultiDiGraph, list[tuple], list[np.ndarray]]: The simplified graph, all
+                edges of the original graph (u, v, key, data) and, for every edge of the
+                simplified graph, the indices of the original edges it represents.
+        """
+        if graph.graph.get("simplified", False):
+            raise ValueError(
+                "This graph has already been simplified, cannot simplify it again."
+            )
+        if not graph.is_directed():
+            raise ValueError("Only directed graphs can be simplified.")
+        logging.info("Begin topologically simplifying the graph...")
+
+        _nodes = list(graph.nodes)
+        _nodes_data = [_data for _, _data in graph.nodes(data=True)]
+        _n_nodes = len(_nodes)
+        _node_idx = {_node: _idx for _idx, _node in enumerate(_nodes)}
+        _edges = list(graph.edges(keys=True, data=True))
+        _u_idx = np.fromiter((_node_idx[_e[0]] for _e in _edges), dtype=int)
+        _v_idx = np.fromiter((_node_idx[_e[1]] for _e in _edges), dtype=int)
+        _is_endpoint = self.get_endpoints(
+            _n_nodes,
+            _u_idx,
+            _v_idx,
+            None if self.strict else [_e[3].get("osmid", None) for _e in _edges],
+        )
+        _chain_nodes, _offsets = self._get_chains(_nodes, _u_idx, _v_idx, _is_endpoint)
+        _n_chains = len(_offsets) - 1
+        _chain_lengths = np.diff(_offsets)
+
+        # Edges between consecutive chain nodes (the first one of parallel edges).
+        _codes = _u_idx.astype(np.int64) * _n_nodes + _v_idx
+        _unique_codes, _first_edge = np.unique(_codes, return_index=True)
+        _is_chain_edge = np.ones(len(_chain_nodes), dtype=bool)
+        _is_chain_edge[_offsets[1:] - 1] = False
+        _segment_codes = (
+            _chain_nodes[:-1].astype(np.int64) * _n_nodes + _chain_nodes[1:]
+        )[_is_chain_edge[:-1]]
+        _chain_edges = _first_edge[np.searchsorted(_unique_codes, _segment_codes)]
+        _edge_offsets = _offsets - np.arange(_n_chains + 1)
+
+        # Geometry of every chain through the coordinates of its nodes.
+        _path_nodes, _path_node_idx = np.unique(_chain_nodes, return_inverse=True)
+        _coordinates = self._get_node_coordinates(
+            [_nodes_data[_idx] for _idx in _path_nodes]
+        )[_path_node_idx]
+        if np.isnan(_coordinates).any():
+            raise ValueError(
+                "All nodes in the path must have 'geometry' or 'x' and 'y' attributes."
+            )
+        _chain_geometries = shapely.linestrings(
+            _coordinates,
+            indices=np.repeat(np.arange(_n_chains), _chain_lengths),
+        )
+
+        # Interstitial nodes are removed, together with all their edges.
+        _is_interior = np.ones(len(_chain_nodes), dtype=bool)
+        _is_interior[_offsets[:-1]] = False
+        _is_interior[_offsets[1:] - 1] = False
+        _is_kept = np.ones(_n_nodes, dtype=bool)
+        _is_kept[_chain_nodes[_is_interior]] = False
+        _chain_u = _chain_nodes[_offsets[:-1]]
+        _chain_v = _chain_nodes[_offsets[1:] - 1]
+        _kept_edges = np.flatnonzero(_is_kept[_u_idx] & _is_kept[_v_idx])
+        _kept_chains = np.flatnonzero(_is_kept[_chain_u] & _is_kept[_chain_v])
+
+        if self.remove_rings:
+            _new_u = np.concatenate([_u_idx[_kept_edges], _chain_u[_kept_chains]])
+            _new_v = np.concatenate([_v_idx[_kept_edges], _chain_v[_kept_chains]])
+            _is_new_endpoint = self.get_endpoints(_n_nodes, _new_u, _new_v) & _is_kept
+            _components = connected_components(
+                coo_matrix(
+                    (np.ones(len(_new_u), dtype=bool), (_new_u, _new_v)),
+                    shape=(_n_nodes, _n_nodes),
+                ),
+                directed=True,
+                connection="weak",
+            )[1]
+            _has_endpoint = np.bincount(_components, weights=_is_new_endpoint) > 0
+            _is_kept &= _has_endpoint[_components]
+            _kept_edges = _kept_edges[_is_kept[_u_idx[_kept_edges]]]
+            _kept_chains = _kept_chains[_is_kept[_chain_u[_kept_chains]]]
+
+        _simple_graph = nx.MultiDiGraph()
+        _simple_graph.graph = dict(graph.graph)
+        _simple_graph.add_nodes_from(
+            (_nodes[_idx], _nodes_data[_idx]) for _idx in np.flatnonzero(_is_kept)
+        )
+        _links = [np.array([_idx]) for _idx in _kept_edges]
+        _new_edges = [_edges[_idx] for _idx in _kept_edges]
+        for _chain in _kept_chains:
+            _edge_idx = _chain_edges[_edge_offsets[_chain] : _edge_offsets[_chain + 1]]
+            _path_attributes = self._merge_attributes(
+                [_edges[_i][3] for _i in _edge_idx]
+            )
+            _path_attributes["geometry"] = _chain_geometries[_chain]
+            if self.track_merged:
+                _path_attributes["merged_edges"] = [_edges[_i][:2] for _i in _edge_idx]
+            _links.append(_edge_idx)
+            _new_edges.append(
+                (_nodes[_chain_u[_chain]], _nodes[_chain_v[_chain]], _path_attributes)
+            )
+        _keys = _simple_graph.add_edges_from(_new_edges)
+        _edge_links = dict(
+            zip(((_e[0], _e[1], _k) for _e, _k in zip(_new_edges, _keys)), _links)
+        )
+        _simple_graph.graph["simplified"] = True
+
+        logging.info(
+            f"Simplified graph: {_n_nodes:,} to {len(_simple_graph):,} nodes, "
+            f"{len(_edges):,} to {len(_simple_graph.edges):,} edges"
+        )
+        return (
+            _simple_graph,
+            _edges,
+            [_edge_links[_edge] for _edge in _simple_graph.edges(keys=True)],
+        )
+
+    def simplify(self, graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+        """
+        Simplifies the topology of the graph.
+
+        Args:
+            graph (nx.MultiDiGraph): Graph to simplify, it is not modified.
+
+        Returns:
+            nx.MultiDiGraph: The simplified graph, with a new `geometry` on every merged edge.
+        """
+        return self._simplify(graph)[0]
+
+    def simplify_with_link_tables(
+        self,
+        graph: nx.MultiDiGraph,
+        simple_id: str = "rfid",
+        complex_id: str = "rfid_c",
+    ) -> tuple[nx.MultiDiGraph, np.ndarray]:
+        """
+        Simplifies the topology of the graph and links the edges of both graphs: the edges
+        of the simplified graph get a new (1-based) `simple_id`, which is also set to the
+        edges of the original graph they represent (or `None` when they are not represented).
+
+        Args:
+            graph (nx.MultiDiGraph): Graph to simplify, with a unique `complex_id` per edge.
+            simple_id (str, optional): Name of the id of the simplified edges. Defaults to "rfid".
+            complex_id (str, optional): Name of the id of the original edges. Defaults to "rfid_c".
+
+        Returns:
+            tuple[nx.MultiDiGraph, np.ndarray]: The simplified graph and the link table, with
+                the simple id (first column) and complex id (second column) of every link.
+        """
+        _simple_graph, _edges, _links = self._simplify(graph)
+
+        _n_links = np.fromiter(map(len, _links), dtype=int, count=len(_links))
+        _simple_ids = np.arange(1, len(_links) + 1)
+        for _id, (*_, _data) in zip(
+            _simple_ids.tolist(), _simple_graph.edges(keys=True, data=True)
+        ):
+            _data[simple_id] = _id
+        _complex_idx = np.concatenate(_links) if _links else np.empty(0, dtype=int)
+        _link_simple_ids = np.repeat(_simple_ids, _n_links)
+
+        # Set the simple ids to the edges of the original graph.
+        _complex_simple_ids = np.zeros(len(_edges), dtype=int)
+        _complex_simple_ids[_complex_idx] = _link_simple_ids
+        for (*_, _data), _id in zip(_edges, _complex_simple_ids.tolist()):
+            _data[simple_id] = _id if _id else None
+        if not _complex_simple_ids.all():
+            logging.error(
+                "Could not find the simple ID belonging to %s complex edges; value set to None.",
+                np.count_nonzero(_complex_simple_ids == 0),
+            )
+
+        _complex_ids = np.array(
+            [_edges[_idx][3].get(complex_id, None) for _idx in _complex_idx]
+        )
+        if not len(_complex_ids):
+            _complex_ids = _complex_ids.astype(int)
+        return _simple_graph, np.column_stack([_link_simple_ids, _complex_ids])
+
+    @staticmethod
+    def get_id_tables(link_table: np.ndarray) -> tuple[dict, dict]:
+        """
+        Gets the lookup tables between the simple and the complex ids from a link table.
+
+        Args:
+            link_table (np.ndarray): Simple id (first column) and complex id (second column)
+                of every link, the links of one simple id are consecutive.
+
+        Returns:
+            tuple[dict, dict]: The complex id (or list of ids) per simple id and the simple
+                id per complex id.
+        """
+        _simple_ids, _complex_ids = link_table[:, 0].tolist(), link_table[:, 1].tolist()
+        _simple_to_complex = {}
+        for _simple_id, _complex_id in zip(_simple_ids, _complex_ids):
+            if _simple_id not in _simple_to_complex:
+                _simple_to_complex[_simple_id] = _complex_id
+            elif isinstance(_simple_to_complex[_simple_id], list):
+                _simple_to_complex[_simple_id].append(_complex_id)
+            else:
+                _simple_to_complex[_simple_id] = [
+                    _simple_to_complex[_simple_id],
+                    _complex_id,
+                ]
+        return _simple_to_complex, dict(zip(_complex_ids, _simple_ids))
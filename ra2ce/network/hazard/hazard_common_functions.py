@@ -20,8 +20,13 @@
 """
 
 import logging
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator
 
+import numpy as np
+import pyproj
+import shapely
 from networkx import Graph
 from osgeo import gdal
 
@@ -64,3 +69,39 @@ def get_edges_geoms(graph: Graph) -> list:
         for u, v, k, edata in graph.edges.data(keys=True)
         if "geometry" in edata
     ]
+
+
+@contextmanager
+def reprojected_edge_geometries(
+    graph: Graph, crs_in: pyproj.CRS, crs_out: pyproj.CRS
+) -> Iterator[Graph]:
+    """
+    Temporarily replaces the edge geometries of a graph by their reprojection, so the
+    graph can be overlaid in another CRS without copying it. Only the coordinates of the
+    geometries are transformed (all at once); the original geometries are restored when
+    leaving the context, whereas any other edge attribute set meanwhile is kept.
+
+    Args:
+        graph (Graph): Graph whose edges have a (shapely) `geometry` attribute.
+        crs_in (pyproj.CRS): CRS of the graph.
+        crs_out (pyproj.CRS): CRS to reproject the edge geometries to.
+
+    Yields:
+        Graph: The same graph, with the reprojected edge geometries.
+    """
+    _edges_data = [edata for *_, edata in get_edges_geoms(graph)]
+    _original_geometries = [edata["geometry"] for edata in _edges_data]
+    _transformer = pyproj.Transformer.from_crs(crs_in, crs_out, always_xy=True)
+    _reprojected_geometries = shapely.transform(
+        np.array(_original_geometries, dtype=object),
+        lambda coords: np.column_stack(
+            _transformer.transform(coords[:, 0], coords[:, 1])
+        ),
+    )
+    for edata, _geometry in zip(_edges_data, _reprojected_geometries):
+        edata["geometry"] = _geometry
+    try:
+        yield graph
+    finally:
+        for edata, _geometry in zip(_edges_data, _original_geometries):
+            edata["geometry"] = _geometry
@@ -27,7 +27,7 @@ import networkx as nx
 import numpy as np
 import pandas as pd
 import pyproj
-from rasterstats import point_query, zonal_stats
+from rasterstats import zonal_stats
 from tqdm import tqdm
 
 from ra2ce.network import networks_utils as ntu
@@ -35,6 +35,7 @@ from ra2ce.network.exporters.network_exporter_factory import NetworkExporterFact
 from ra2ce.network.graph_files.graph_files_collection import GraphFilesCollection
 from ra2ce.network.hazard.hazard_common_functions import (
     get_edges_geoms,
+    reprojected_edge_geometries,
     validate_extent_graph,
 )
 from ra2ce.network.hazard.hazard_files import HazardFiles
@@ -47,6 +48,8 @@ from ra2ce.network.hazard.hazard_intersect.hazard_intersect_builder_for_table im
 from ra2ce.network.hazard.hazard_intersect.hazard_intersect_builder_for_tif import (
     HazardIntersectBuilderForTif,
 )
+from ra2ce.network.hazard.hazard_point_sampler import HazardPointSampler
+from ra2ce.network.hazard.hazard_propagator import HazardPropagator
 from ra2ce.network.network_config_data.network_config_data import NetworkConfigData
 
 
@@ -86,8 +89,13 @@ class HazardOverlay:
         self._hazard_id = config.hazard.hazard_id
         self._hazard_map = config.hazard.hazard_map
         self._hazard_crs = config.hazard.hazard_crs
+        self._graph_crs = pyproj.CRS.from_user_input(config.crs)
         self._hazard_aggregate_wl = config.hazard.aggregate_wl.config_value
         self._hazard_directory = config.static_path.joinpath("hazard")
+        self._overlay_base_network_in_analysis = (
+            config.hazard.overlay_base_network_in_analysis
+        )
+        self._overlay_once = config.hazard.overlay_once
 
         # graph files
         self.graph_files = graph_files
@@ -206,12 +214,17 @@ class HazardOverlay:
         return graph
 
     def od_hazard_intersect(
-        self, graph: nx.classes.graph.Graph, ods: gpd.GeoDataFrame
+        self,
+        graph: nx.classes.graph.Graph,
+        ods: gpd.GeoDataFrame,
+        ods_geometry: gpd.GeoSeries | None = None,
     ) -> tuple[nx.classes.graph.Graph, gpd.GeoDataFrame]:
         """Overlays the origin and destination locations and edges with the hazard maps
 
         Args:
             graph (NetworkX graph): The origin-destination graph that should be overlayed with the hazard raster(s)
+            ods (GeoDataFrame): The origin and destination locations
+            ods_geometry (GeoSeries, optional): The geometry of the locations in the CRS of the hazard, when it differs from the one of `ods`.
 
         Returns:
             graph (NetworkX graph): The origin-destination graph hazard raster(s) data joined to both the origin- and
@@ -222,9 +235,8 @@ class HazardOverlay:
         assert isinstance(graph, nx.classes.graph.Graph)
         extent_graph = ntu.get_graph_edges_extent(graph)
 
-        # Get all node geometries
-        od_nodes = [(n, ndata) for n, ndata in graph.nodes.data() if "od_id" in ndata]
-        od_ids = [n[0] for n in od_nodes]
+        # Read the hazard values at the nodes
+        ods = self.od_nodes_hazard_intersect(graph, ods, ods_geometry)
 
         # Get all edge geometries
         edges_geoms = get_edges_geoms(graph)
@@ -232,25 +244,7 @@ class HazardOverlay:
         for i, (hn, rn) in enumerate(zip(self.hazard_names, self.ra2ce_names)):
             # Check if the hazard and graph extents overlap
             validate_extent_graph(extent_graph, self.hazard_files.tif[i])
-
-            # Read the hazard values at the nodes and write to the nodes.
-            tqdm.pandas(desc="Destinations hazard overlay with " + hn)
             _tif_hazard_files = str(self.hazard_files.tif[i])
-            flood_stats = ods.geometry.progress_apply(
-                lambda x, _file_values=_tif_hazard_files: point_query(x, _file_values)
-            )
-
-            flood_stats = flood_stats.apply(lambda x: x[0] if x[0] else 0)
-
-            # Update the ODs GeoDataFrame
-            ods[rn + "_" + self._hazard_aggregate_wl[:2]] = flood_stats
-
-            # Update the graph
-            attribute_dict = {
-                od: {rn + "_" + self._hazard_aggregate_wl[:2]: wl}
-                for od, wl in zip(od_ids, flood_stats)
-            }
-            nx.set_node_attributes(graph, attribute_dict)
 
             # Read the hazard values at the edges and write to the edges.
             # Add a no-data value for the edges that do not have a geometry
@@ -315,6 +309,36 @@ class HazardOverlay:
 
         return graph, ods
 
+    def od_nodes_hazard_intersect(
+        self,
+        graph: nx.classes.graph.Graph,
+        ods: gpd.GeoDataFrame,
+        ods_geometry: gpd.GeoSeries | None = None,
+    ) -> gpd.GeoDataFrame:
+        """Overlays the origin and destination locations with the hazard maps
+
+        Args:
+            graph (NetworkX graph): The origin-destination graph, its OD nodes get the hazard values
+            ods (GeoDataFrame): The origin and destination locations
+            ods_geometry (GeoSeries, optional): The geometry of the locations in the CRS of the hazard, when it differs from the one of `ods`.
+
+        Returns:
+            ods (GeoDataFrame): The origin and destination locations with the hazard raster(s) data joined
+        """
+        od_ids = [n for n, ndata in graph.nodes.data() if "od_id" in ndata]
+
+        # Read the hazard values at the nodes, one bulk sample of each raster.
+        od_hazard = self._sample_points_hazard(
+            ods.geometry if ods_geometry is None else ods_geometry
+        )
+
+        # Update the ODs GeoDataFrame and the graph, all hazard columns at once
+        ods[list(od_hazard.columns)] = od_hazard
+        nx.set_node_attributes(
+            graph, dict(zip(od_ids, od_hazard.to_dict(orient="records")))
+        )
+        return ods
+
     def point_hazard_intersect(self, gdf: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
         """Overlays the point locations with hazard maps
 
@@ -324,20 +348,30 @@ class HazardOverlay:
             gdf (GeoDataFrame): the point geodataframe with hazard raster(s) data joined
         """
 
-        ## Intersect the origin and destination nodes with the hazard map (now only geotiff possible)
-        for i, (hn, rn) in enumerate(zip(self.hazard_names, self.ra2ce_names)):
-            # Read the hazard values at the nodes and write to the nodes.
-            tqdm.pandas(desc="Potentially isolated locations hazard overlay with " + hn)
-            _tif_hazard_files = str(self.hazard_files.tif[i])
-            flood_stats = gdf.geometry.progress_apply(
-                lambda x, _file_values=_tif_hazard_files: point_query(x, _file_values)
-            )
-            gdf[rn + "_" + self._hazard_aggregate_wl[:2]] = flood_stats.apply(
-                lambda x: x[0] if x[0] else 0
-            )
-
+        ## Intersect the points with the hazard map (now only geotiff possible)
+        _point_hazard = self._sample_points_hazard(gdf.geometry)
+        gdf[list(_point_hazard.columns)] = _point_hazard
         return gdf
 
+    def _sample_points_hazard(self, points: gpd.GeoSeries) -> pd.DataFrame:
+        """Samples all hazard rasters at the given points (0 where there is no data).
+
+        Args:
+            points (GeoSeries): the point locations
+        Returns:
+            pd.DataFrame: the hazard value of every point, a column per hazard map
+        """
+        _hazard_values = {}
+        for i, (hn, rn) in enumerate(zip(self.hazard_names, self.ra2ce_names)):
+            logging.info("Points hazard overlay with %s.", hn)
+            _hazard_values[
+                rn + "_" + self._hazard_aggregate_wl[:2]
+            ] = HazardPointSampler(self.hazard_files.tif[i]).sample(points)
+        return pd.DataFrame(
+            {_col: _values.filled(0) for _col, _values in _hazard_values.items()},
+            index=points.index,
+        )
+
     def get_point_hazard_from_network(
         self, points: gpd.GeoDataFrame, network: gpd.GeoDataFrame
     ) -> gpd.GeoDataFrame:
@@ -453,28 +487,6 @@ class HazardOverlay:
             f"Please check your input data."
         )
 
-    def get_reproject_graph(
-        self,
-        original_graph: nx.classes.graph.Graph,
-        in_crs: pyproj.CRS,
-        out_crs: pyproj.CRS,
-    ) -> nx.classes.graph.Graph:
-        """Reproject networkX graph"""
-        extent_graph = ntu.get_graph_edges_extent(original_graph)
-        logging.info("Graph extent before reprojecting: {}".format(extent_graph))
-        graph_reprojected = ntu.reproject_graph(original_graph, in_crs, out_crs)
-        extent_graph_reprojected = ntu.get_graph_edges_extent(graph_reprojected)
-        logging.info(
-            "Graph extent after reprojecting: {}".format(extent_graph_reprojected)
-        )
-        return graph_reprojected
-
-    def get_original_geoms_graph(self, graph_original, graph_new):
-        original_geometries = nx.get_edge_attributes(graph_original, "geometry")
-        _graph_new = graph_new.copy()
-        nx.set_edge_attributes(_graph_new, original_geometries, "geometry")
-        return _graph_new.copy()
-
     def _export_network_files(self, graph_type: str, types_to_export: list[str]):
         _exporter = NetworkExporterFactory()
         _exporter.export(
@@ -526,6 +538,74 @@ class HazardOverlay:
 
         return gdf_output
 
+    def _overlay_base_network(self) -> None:
+        """Overlays the base network (GeoPandas Dataframe) with the hazard data."""
+        logging.info("Iterating overlay of GeoPandas Dataframe.")
+        # Check if the graph needs to be reprojected
+        hazard_crs = pyproj.CRS.from_user_input(self._hazard_crs)
+        gdf_crs = pyproj.CRS.from_user_input(
+            self.graph_files.base_network.get_graph().crs
+        )
+
+        if (
+            hazard_crs != gdf_crs
+        ):  # Temporarily reproject the graph to the CRS of the hazard
+            logging.warning(
+                """Hazard crs {} and gdf crs {} are inconsistent,
+                                            we try to reproject the gdf crs""".format(
+                    hazard_crs, gdf_crs
+                )
+            )
+            extent_gdf = self.graph_files.base_network.get_graph().total_bounds
+            logging.info("Gdf extent before reprojecting: {}".format(extent_gdf))
+            gdf_reprojected = self.graph_files.base_network.graph.to_crs(hazard_crs)
+            extent_gdf_reprojected = gdf_reprojected.total_bounds
+            logging.info(
+                "Gdf extent after reprojecting: {}".format(extent_gdf_reprojected)
+            )
+
+            # Do the actual hazard intersect
+            gdf_reprojected = self.hazard_intersect(gdf_reprojected)
+
+            # Assign the original geometries to the reprojected raster
+            original_geometries = self.graph_files.base_network.get_graph()["geometry"]
+            gdf_reprojected["geometry"] = original_geometries
+            self.graph_files.base_network_hazard.graph = gdf_reprojected
+        else:
+            # read previously created file
+            logging.info("Setting 'base_network_hazard' graph.")
+            if not self.graph_files.base_network_hazard.file:
+                self.graph_files.base_network_hazard.graph = self.hazard_intersect(
+                    self.graph_files.base_network.get_graph()
+                )
+
+    def _get_hazard_propagator(self) -> HazardPropagator | None:
+        """Overlays the base network once, to propagate its hazard to the graphs.
+
+        Returns:
+            HazardPropagator | None: The propagator, None when the hazard cannot be propagated.
+        """
+        if not self.hazard_files.tif or not self.graph_files.base_network.file:
+            logging.warning(
+                "The hazard is overlaid on every graph, as overlaying it once is only supported for tif hazard maps and a base network."
+            )
+            return None
+        if (
+            not self.graph_files.base_network_hazard.file
+            and self.graph_files.base_network_hazard.graph is None
+        ):
+            self._overlay_base_network()
+        _network_hazard = self.graph_files.base_network_hazard.get_graph()
+        if _network_hazard is None:
+            return None
+        if _network_hazard.crs and self._graph_crs != _network_hazard.crs:
+            _network_hazard = _network_hazard.to_crs(self._graph_crs)
+        return HazardPropagator(
+            network_hazard=_network_hazard,
+            ra2ce_names=self.ra2ce_names,
+            hazard_aggregate_wl=self._hazard_aggregate_wl,
+        )
+
     def create(self):
         """Overlays the different possible graph and network objects with the hazard data
 
@@ -551,6 +631,10 @@ class HazardOverlay:
                 "Check your network folder."
             )
 
+        _hazard_propagator = (
+            self._get_hazard_propagator() if self._overlay_once else None
+        )
+
         #### Step 1: hazard overlay of the base graph (NetworkX) ###
         if self.graph_files.base_graph.file:
             if self.graph_files.base_graph_hazard.file is None:
@@ -558,36 +642,25 @@ class HazardOverlay:
 
                 # Check if the graph needs to be reprojected
                 hazard_crs = pyproj.CRS.from_user_input(self._hazard_crs)
-                graph_crs = pyproj.CRS.from_user_input(
-                    "EPSG:4326"
-                )  # this is WGS84, TODO: Make flexible by including in the network ini
-
-                if hazard_crs != graph_crs:
+                if _hazard_propagator and _hazard_propagator.can_propagate(graph):
+                    self.graph_files.base_graph_hazard.graph = (
+                        _hazard_propagator.propagate(graph)
+                    )
+                elif hazard_crs != self._graph_crs:
                     # Temporarily reproject the graph to the CRS of the hazard
                     logging.warning(
                         """Hazard crs {} and graph crs {} are inconsistent,
                                                   we try to reproject the graph crs""".format(
-                            hazard_crs, graph_crs
+                            hazard_crs, self._graph_crs
                         )
                     )
-                    graph_reprojected = self.get_reproject_graph(
-                        graph, graph_crs, hazard_crs
-                    )
-
-                    # Do the actual hazard intersect
-                    base_graph_hazard_reprojected = self.hazard_intersect(
-                        graph_reprojected
-                    )
-
-                    # Assign the original geometries to the reprojected raster
-                    self.graph_files.base_graph_hazard.graph = (
-                        self.get_original_geoms_graph(
-                            graph, base_graph_hazard_reprojected
+                    # The hazard is written directly onto the graph, the original geometries are restored afterwards.
+                    with reprojected_edge_geometries(
+                        graph, self._graph_crs, hazard_crs
+                    ) as graph_reprojected:
+                        self.graph_files.base_graph_hazard.graph = (
+                            self.hazard_intersect(graph_reprojected)
                         )
-                    )
-
-                    # Clean up memory
-                    ntu.clean_memory([graph_reprojected, base_graph_hazard_reprojected])
                 else:
                     self.graph_files.base_graph_hazard.graph = self.hazard_intersect(
                         graph
@@ -608,59 +681,43 @@ class HazardOverlay:
 
             # Check if the graph needs to be reprojected
             hazard_crs = pyproj.CRS.from_user_input(self._hazard_crs)
-            graph_crs = pyproj.CRS.from_user_input(
-                "EPSG:4326"
-            )  # this is WGS84, TODO: Make flexible by including in the network ini
-
-            if (
-                hazard_crs != graph_crs
-            ):  # Temporarily reproject the graph to the CRS of the hazard
+            ods_geometry = ods.geometry
+            if ods.crs and hazard_crs != ods.crs:
                 logging.warning(
-                    """Hazard crs {} and graph crs {} are inconsistent,
+                    """Hazard crs {} and OD crs {} are inconsistent,
                                                   we try to reproject the graph crs""".format(
-                        hazard_crs, graph_crs
+                        hazard_crs, ods.crs
                     )
                 )
-                if hazard_crs != ods.crs:
-                    logging.warning(
-                        """Hazard crs {} and OD crs {} are inconsistent,
-                                                      we try to reproject the graph crs""".format(
-                            hazard_crs, ods.crs
-                        )
-                    )
-                    ods_reprojected = ods.to_crs(hazard_crs)
+                ods_geometry = ods_geometry.to_crs(hazard_crs)
 
-                graph_reprojected = self.get_reproject_graph(
-                    graph, graph_crs, hazard_crs
-                )
-
-                # Do the actual hazard intersect
-                (
-                    od_graph_hazard_reprojected,
-                    ods_hazard_reprojected,
-                ) = self.od_hazard_intersect(graph_reprojected, ods_reprojected)
-
-                # Assign the original geometries to the reprojected dataset
+            if _hazard_propagator and _hazard_propagator.can_propagate(graph):
+                ods = self.od_nodes_hazard_intersect(graph, ods, ods_geometry)
                 self.graph_files.origins_destinations_graph_hazard.graph = (
-                    self.get_original_geoms_graph(graph, od_graph_hazard_reprojected)
+                    _hazard_propagator.propagate(graph)
                 )
-                ods = ods_hazard_reprojected.to_crs(ods.crs)
-
-                # Clean up memory
-                ntu.clean_memory(
-                    [
-                        graph_reprojected,
-                        od_graph_hazard_reprojected,
-                        ods_reprojected,
-                        ods_hazard_reprojected,
-                    ]
+            elif (
+                hazard_crs != self._graph_crs
+            ):  # Temporarily reproject the graph to the CRS of the hazard
+                logging.warning(
+                    """Hazard crs {} and graph crs {} are inconsistent,
+                                                  we try to reproject the graph crs""".format(
+                        hazard_crs, self._graph_crs
+                    )
                 )
-
+                # The hazard is written directly onto the graph and the ODs, the original geometries are restored afterwards.
+                with reprojected_edge_geometries(
+                    graph, self._graph_crs, hazard_crs
+                ) as graph_reprojected:
+                    (
+                        self.graph_files.origins_destinations_graph_hazard.graph,
+                        ods,
+                    ) = self.od_hazard_intersect(graph_reprojected, ods, ods_geometry)
             else:
                 (
                     self.graph_files.origins_destinations_graph_hazard.graph,
                     ods,
-                ) = self.od_hazard_intersect(graph, ods)
+                ) = self.od_hazard_intersect(graph, ods, ods_geometry)
 
             # Save graphs/network with hazard
             self._export_network_files(
@@ -688,53 +745,27 @@ class HazardOverlay:
                 logging.info(f"Saved {ods_path.stem} in {ods_path.resolve().parent}.")
 
         #### Step 3: iterate overlay of the GeoPandas Dataframe (if any) ###
+        _skip_base_network_overlay = (
+            self._overlay_base_network_in_analysis
+            and bool(self.hazard_files.tif)
+            and not self._isolation_locations
+            and not self._overlay_once
+        )
+        if _skip_base_network_overlay:
+            logging.info(
+                "The base network is not overlaid with the hazard, this is done by the direct damage analysis."
+            )
+        elif self._overlay_base_network_in_analysis:
+            logging.warning(
+                "The base network is overlaid with the hazard, as deferring it to the analysis is only supported for tif hazard maps without isolated locations."
+            )
         if (
             self.graph_files.base_network.file
             and not self.graph_files.base_network_hazard.file
+            and not _skip_base_network_overlay
+            and self.graph_files.base_network_hazard.graph is None
         ):
-            logging.info("Iterating overlay of GeoPandas Dataframe.")
-            # Check if the graph needs to be reprojected
-            hazard_crs = pyproj.CRS.from_user_input(self._hazard_crs)
-            gdf_crs = pyproj.CRS.from_user_input(
-                self.graph_files.base_network.get_graph().crs
-            )
-
-            if (
-                hazard_crs != gdf_crs
-            ):  # Temporarily reproject the graph to the CRS of the hazard
-                logging.warning(
-                    """Hazard crs {} and gdf crs {} are inconsistent,
-                                                we try to reproject the gdf crs""".format(
-                        hazard_crs, gdf_crs
-                    )
-                )
-                extent_gdf = self.graph_files.base_network.get_graph().total_bounds
-                logging.info("Gdf extent before reprojecting: {}".format(extent_gdf))
-                gdf_reprojected = self.graph_files.base_network.graph.copy().to_crs(
-                    hazard_crs
-                )
-                extent_gdf_reprojected = gdf_reprojected.total_bounds
-                logging.info(
-                    "Gdf extent after reprojecting: {}".format(extent_gdf_reprojected)
-                )
-
-                # Do the actual hazard intersect
-                gdf_reprojected = self.hazard_intersect(gdf_reprojected)
-
-                # Assign the original geometries to the reprojected raster
-                original_geometries = self.graph_files.base_network.get_graph()[
-                    "geometry"
-                ]
-                gdf_reprojected["geometry"] = original_geometries
-                self.graph_files.base_network_hazard.graph = gdf_reprojected.copy()
-                del gdf_reprojected
-            else:
-                # read previously created file
-                logging.info("Setting 'base_network_hazard' graph.")
-                if not self.graph_files.base_network_hazard.file:
-                    self.graph_files.base_network_hazard.graph = self.hazard_intersect(
-                        self.graph_files.base_network.get_graph()
-                    )
+            self._overlay_base_network()
 
         #### Step 4: hazard overlay of the locations that are checked for isolation ###
         if self._isolation_locations:
@@ -0,0 +1,146 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import rasterio
+import shapely
+from geopandas import GeoSeries
+from rasterio.windows import Window
+
+
+class HazardPointSampler:
+    """
+    Samples a hazard raster at many points at once. The raster is opened only once,
+    all point coordinates are converted to row / column indices with the affine
+    transform of the raster and only the raster blocks containing the needed cells
+    are read, each block once (in block order).
+
+    The sampled values equal those of `rasterstats.point_query` (bilinear interpolation
+    between the centers of the 2x2 surrounding cells, falling back to the nearest cell
+    when any of these is nodata or outside the raster).
+    """
+
+    raster_file: Path
+    band: int
+
+    def __init__(self, raster_file: Path, band: int = 1) -> None:
+        self.raster_file = Path(raster_file)
+        self.band = band
+
+    @staticmethod
+    def _read_cells(
+        src: rasterio.DatasetReader, band: int, rows: np.ndarray, cols: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        # Values and validity of the given cells, reading each needed block only once.
+        _values = np.zeros(len(rows), dtype=float)
+        _valid = np.zeros(len(rows), dtype=bool)
+        _inside = np.flatnonzero(
+            (rows >= 0) & (rows < src.height) & (cols >= 0) & (cols < src.width)
+        )
+        if not len(_inside):
+            return _values, _valid
+
+        _block_height, _block_width = src.block_shapes[band - 1]
+        _n_block_cols = -(-src.width // _block_width)
+        _block_ids = (rows[_inside] // _block_height) * _n_block_cols + (
+            cols[_inside] // _block_width
+        )
+        _order = np.argsort(_block_ids, kind="stable")
+        _cells, _block_ids = _inside[_order], _block_ids[_order]
+        _starts = np.flatnonzero(np.diff(_block_ids, prepend=-1))
+        for _start, _end in zip(_starts, np.append(_starts[1:], len(_cells))):
+            _block_row, _block_col = divmod(int(_block_ids[_start]), _n_block_cols)
+            _row_off, _col_off = _block_row * _block_height, _block_col * _block_width
+            _block = src.read(
+                band,
+                window=Window(
+                    _col_off,
+                    _row_off,
+                    min(_block_width, src.width - _col_off),
+                    min(_block_height, src.height - _row_off),
+                ),
+                masked=True,
+            )
+            _block_cells = _cells[_start:_end]
+            _rows, _cols = rows[_block_cells] - _row_off, cols[_block_cells] - _col_off
+            _values[_block_cells] = _block.data[_rows, _cols]
+            _valid[_block_cells] = ~np.ma.getmaskarray(_block)[_rows, _cols]
+        return _values, _valid
+
+    def sample(self, geometries: GeoSeries) -> np.ma.MaskedArray:
+        """
+        Samples the raster at (the first vertex of) every geometry.
+
+        Args:
+            geometries (GeoSeries): Geometries (points) to sample, in the CRS of the raster.
+
+        Returns:
+            np.ma.MaskedArray: Value per geometry, masked where there is no data.
+        """
+        _n_points = len(geometries)
+        _coords, _index = shapely.get_coordinates(
+            np.asarray(geometries.values, dtype=object), return_index=True
+        )
+        _first_vertex = np.flatnonzero(np.diff(_index, prepend=-1))
+        _points = _index[_first_vertex]
+        _x, _y = _coords[_first_vertex, 0], _coords[_first_vertex, 1]
+
+        with rasterio.open(self.raster_file) as src:
+            # (fractional) column and row of each point
+            _inverse = ~src.transform
+            _fcol = _inverse.a * _x + _inverse.b * _y + _inverse.c
+            _frow = _inverse.d * _x + _inverse.e * _y + _inverse.f
+            _row = np.round(_frow).astype(int)
+            _col = np.round(_fcol).astype(int)
+            _unit_x = 0.5 - (_col - _fcol)
+            _unit_y = 0.5 + (_row - _frow)
+
+            # the 2x2 cells around each point: upper left, upper right, lower left, lower right
+            _cell_rows = np.concatenate([_row - 1, _row - 1, _row, _row])
+            _cell_cols = np.concatenate([_col - 1, _col, _col - 1, _col])
+            _cell_values, _cell_valid = self._read_cells(
+                src, self.band, _cell_rows, _cell_cols
+            )
+
+        _cell_values = _cell_values.reshape(4, -1)
+        _cell_valid = _cell_valid.reshape(4, -1)
+        _ulv, _urv, _llv, _lrv = _cell_values
+        _bilinear = (
+            (_llv * (1 - _unit_x) * (1 - _unit_y))
+            + (_lrv * _unit_x * (1 - _unit_y))
+            + (_ulv * (1 - _unit_x) * _unit_y)
+            + (_urv * _unit_x * _unit_y)
+        )
+
+        # nearest cell when not all 4 cells have data
+        _nearest = 2 * np.round(1 - _unit_y).astype(int) + np.round(_unit_x).astype(int)
+        _points_range = np.arange(len(_points))
+        _all_valid = _cell_valid.all(axis=0)
+        _values = np.where(_all_valid, _bilinear, _cell_values[_nearest, _points_range])
+        _valid = _all_valid | _cell_valid[_nearest, _points_range]
+
+        _result = np.ma.masked_all(_n_points, dtype=float)
+        _result[_points] = np.ma.masked_array(_values, mask=~_valid)
+        return _result
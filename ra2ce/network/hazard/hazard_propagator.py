@@ -0,0 +1,229 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+import shapely
+from geopandas import GeoDataFrame, GeoSeries
+from networkx import Graph, set_edge_attributes
+
+from ra2ce.network.hazard.hazard_common_functions import get_edges_geoms
+
+
+class HazardPropagator:
+    """
+    Derives the hazard attributes of the edges of a graph from the hazard overlay of the
+    (complex) network segments they were built from, so every raster is only sampled once.
+
+    The segments of an edge are found through its `rfid_c` link (the complex ids of the
+    simplified edge, also kept by the edges that were split when adding the origins and
+    destinations). Only the part of a segment that lies on the edge geometry counts, its
+    length is the weight of the segment:
+
+    - maximum / minimum: maximum / minimum of the overlapping segments.
+    - mean and fraction: length-weighted mean of the overlapping segments.
+
+    Edges without any valid value get 0, edges without geometry get `nan`, as in a
+    direct overlay of the graph.
+    """
+
+    network_hazard: GeoDataFrame
+    ra2ce_names: list[str]
+    hazard_aggregate_wl: str
+    complex_id: str
+
+    def __init__(
+        self,
+        network_hazard: GeoDataFrame,
+        ra2ce_names: list[str],
+        hazard_aggregate_wl: str,
+        complex_id: str = "rfid_c",
+    ) -> None:
+        """
+        Args:
+            network_hazard (GeoDataFrame): Network segments overlaid with the hazard (in the CRS of the graphs).
+            ra2ce_names (list[str]): Names of the hazard maps (e.g. `EV1`).
+            hazard_aggregate_wl (str): Aggregation of the hazard values: `max`, `min` or `mean`.
+            complex_id (str, optional): Id of the network segments. Defaults to "rfid_c".
+        """
+        self.network_hazard = network_hazard
+        self.ra2ce_names = ra2ce_names
+        self.hazard_aggregate_wl = hazard_aggregate_wl
+        self.complex_id = complex_id
+
+    def _get_value_columns(self) -> dict[str, tuple[str, str]]:
+        # {graph attribute: (network column, aggregation)}
+        _suffix = self.hazard_aggregate_wl[:2]
+        _columns = {}
+        for _rn in self.ra2ce_names:
+            _columns[f"{_rn}_{_suffix}"] = (
+                f"{_rn}_{_suffix}",
+                self.hazard_aggregate_wl,
+            )
+            _columns[f"{_rn}_fr"] = (f"{_rn}_fr", "mean")
+        return _columns
+
+    def can_propagate(self, graph: Graph) -> bool:
+        """
+        Whether all edges (with geometry) of the graph can be linked to the network segments.
+
+        Args:
+            graph (Graph): Graph to propagate the hazard to.
+
+        Returns:
+            bool: True when the hazard can be propagated.
+        """
+        if self.complex_id not in self.network_hazard.columns or any(
+            _column not in self.network_hazard.columns
+            for _column, _ in self._get_value_columns().values()
+        ):
+            return False
+        return all(
+            edata.get(self.complex_id, None) is not None
+            for *_, edata in get_edges_geoms(graph)
+        )
+
+    def _get_edge_segment_weights(
+        self, edge_geoms: GeoSeries, edge_segments: pd.Series
+    ) -> pd.DataFrame:
+        # Table of (edge, segment, weight) with the length of each segment along each edge.
+        _links = edge_segments.explode().dropna()
+        _segment_positions = pd.Series(
+            np.arange(len(self.network_hazard)),
+            index=self.network_hazard[self.complex_id].values,
+        )
+        _segment_positions = _segment_positions[~_segment_positions.index.duplicated()]
+        _links = _links[_links.isin(_segment_positions.index)]
+        _edge_idx = _links.index.to_numpy()
+        _segment_idx = _segment_positions.loc[_links.values].to_numpy()
+
+        _edges = edge_geoms.values[_edge_idx]
+        _segments = self.network_hazard.geometry.values[_segment_idx]
+        # Locate both ends of every segment along the edge, the ends of a segment beyond
+        # the edge (e.g. on the other part of a split edge) are clamped to its ends.
+        _start_points = shapely.get_point(_segments, 0)
+        _end_points = shapely.get_point(_segments, -1)
+        _start = shapely.line_locate_point(_edges, _start_points)
+        _end = shapely.line_locate_point(_edges, _end_points)
+        _weights = np.abs(_end - _start)
+        # A segment only overlaps when it lies on the edge between those locations. The
+        # simplified geometry may only follow the nodes, so the chord of the segment counts too.
+        _middle = shapely.line_interpolate_point(_edges, (_start + _end) / 2)
+        _chords = shapely.linestrings(
+            np.stack(
+                [
+                    shapely.get_coordinates(_start_points),
+                    shapely.get_coordinates(_end_points),
+                ],
+                axis=1,
+            )
+        )
+        _distances = np.minimum(
+            shapely.distance(_segments, _middle), shapely.distance(_chords, _middle)
+        )
+        _tolerance = 1e-6 * np.maximum(shapely.length(_edges), 1e-9)
+        _overlaps = (_weights > 0) & (_distances <= _tolerance)
+        return pd.DataFrame(
+            {
+                "edge": _edge_idx[_overlaps],
+                "segment": _segment_idx[_overlaps],
+                "weight": _weights[_overlaps],
+            }
+        )
+
+    def get_edges_hazard(
+        self, edge_geoms: GeoSeries, edge_segments: pd.Series
+    ) -> pd.DataFrame:
+        """
+        Aggregates the hazard of the network segments to the given edges.
+
+        Args:
+            edge_geoms (GeoSeries): Geometry of the edges (same CRS as the network).
+            edge_segments (pd.Series): Complex id(s) of the segments of each edge.
+
+        Returns:
+            pd.DataFrame: Hazard attributes of the edges (same index as `edge_geoms`).
+        """
+        edge_geoms = edge_geoms.reset_index(drop=True)
+        edge_segments = edge_segments.reset_index(drop=True)
+        _links = self._get_edge_segment_weights(edge_geoms, edge_segments)
+        _edges_hazard = pd.DataFrame(index=pd.RangeIndex(len(edge_geoms)))
+        for _attribute, (_column, _aggregation) in self._get_value_columns().items():
+            _values = pd.to_numeric(
+                self.network_hazard[_column], errors="coerce"
+            ).to_numpy(dtype=float)[_links["segment"].to_numpy()]
+            _valid = _links[~np.isnan(_values)].assign(
+                value=_values[~np.isnan(_values)]
+            )
+            _grouped = _valid.groupby("edge")
+            if _aggregation in ("max", "min"):
+                _aggregated = _grouped["value"].agg(_aggregation)
+            else:
+                _aggregated = (_valid["value"] * _valid["weight"]).groupby(
+                    _valid["edge"]
+                ).sum() / _grouped["weight"].sum()
+            _edges_hazard[_attribute] = _aggregated.reindex(_edges_hazard.index).fillna(
+                0
+            )
+        return _edges_hazard
+
+    def propagate(self, graph: Graph) -> Graph:
+        """
+        Sets the hazard attributes of all edges of the graph.
+
+        Args:
+            graph (Graph): Graph with the `rfid_c` link on its edges (same CRS as the network).
+
+        Returns:
+            Graph: The same graph, with the hazard attributes.
+        """
+        _edges_geoms = get_edges_geoms(graph)
+        _edges_hazard = self.get_edges_hazard(
+            GeoSeries([edata["geometry"] for *_, edata in _edges_geoms]),
+            pd.Series(
+                [edata[self.complex_id] for *_, edata in _edges_geoms], dtype=object
+            ),
+        )
+        _no_geometry = {
+            (u, v, k): dict.fromkeys(_edges_hazard.columns, np.nan)
+            for u, v, k, edata in graph.edges.data(keys=True)
+            if "geometry" not in edata
+        }
+        set_edge_attributes(graph, _no_geometry)
+        set_edge_attributes(
+            graph,
+            dict(
+                zip(
+                    [(u, v, k) for u, v, k, _ in _edges_geoms],
+                    _edges_hazard.to_dict(orient="records"),
+                )
+            ),
+        )
+        logging.info(
+            "Propagated the hazard of %s network segments to %s graph edges.",
+            len(self.network_hazard),
+            len(_edges_geoms),
+        )
+        return graph
@@ -8,6 +8,7 @@ class SourceEnum(Ra2ceEnumBase):
     OSM_DOWNLOAD = 2
     SHAPEFILE = 3
     PICKLE = 4
+    OSM_EXTRACT = 5
     INVALID = 99
 
     @classmethod
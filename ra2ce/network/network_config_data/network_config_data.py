@@ -51,6 +51,12 @@ class NetworkSection:
     network_type: NetworkTypeEnum = field(default_factory=lambda: NetworkTypeEnum.NONE)
     road_types: list[RoadTypeEnum] = field(default_factory=list)
     save_gpkg: bool = False
+    # build the network tile by tile (tile size in the units of the crs of the source), 0 builds it at once
+    tile_size: float = 0.0
+    # the tiles read their source with this overlap, it should exceed the length of the (OSM) segments
+    tile_overlap: float = 0.01
+    # number of processes building the tiles, 0 uses all the cores
+    n_workers: int = 0
 
 
 @dataclass
@@ -82,6 +88,11 @@ class HazardSection:
     aggregate_wl: AggregateWlEnum = field(default_factory=lambda: AggregateWlEnum.NONE)
     hazard_crs: str = ""
     scenario_cost: list[float] = field(default_factory=list)
+    # skip the overlay of the base network, the direct damage analysis overlays it batch by batch
+    # (only valid when the direct damage analysis is the only analysis using the base network)
+    overlay_base_network_in_analysis: bool = False
+    # overlay only the base network, the hazard of the graphs is derived from it
+    overlay_once: bool = False
 
 
 @dataclass
@@ -161,6 +161,15 @@ class NetworkConfigDataReader(ConfigDataReaderProtocol):
         _network_section.save_gpkg = self._parser.getboolean(
             _section, "save_gpkg", fallback=_network_section.save_gpkg
         )
+        _network_section.tile_size = self._parser.getfloat(
+            _section, "tile_size", fallback=_network_section.tile_size
+        )
+        _network_section.tile_overlap = self._parser.getfloat(
+            _section, "tile_overlap", fallback=_network_section.tile_overlap
+        )
+        _network_section.n_workers = self._parser.getint(
+            _section, "n_workers", fallback=_network_section.n_workers
+        )
         _network_section.network_type = NetworkTypeEnum.get_enum(
             self._parser.get(_section, "network_type", fallback=None)
         )
@@ -219,6 +228,14 @@ class NetworkConfigDataReader(ConfigDataReaderProtocol):
                 _section, "scenario_cost", fallback=_hazard_section.scenario_cost
             )
         )
+        _hazard_section.overlay_base_network_in_analysis = self._parser.getboolean(
+            _section,
+            "overlay_base_network_in_analysis",
+            fallback=_hazard_section.overlay_base_network_in_analysis,
+        )
+        _hazard_section.overlay_once = self._parser.getboolean(
+            _section, "overlay_once", fallback=_hazard_section.overlay_once
+        )
         return _hazard_section
 
     def get_cleanup_section(self) -> CleanupSection:
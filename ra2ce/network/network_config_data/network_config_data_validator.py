@@ -58,6 +58,20 @@ class NetworkConfigDataValidator(Ra2ceIoValidator):
             )
         return _shp_report
 
+    def _validate_osm_extract_input(
+        self, network_config: NetworkSection
+    ) -> ValidationReport:
+        """Checks if an OSM extract is configured when using the option to create network from an OSM extract"""
+        _osm_extract_report = ValidationReport()
+        if (
+            network_config.source == SourceEnum.OSM_EXTRACT
+            and not network_config.primary_file
+        ):
+            _osm_extract_report.error(
+                "Not possible to create network - OSM extract used as source, but no primary_file configured in the network.ini file"
+            )
+        return _osm_extract_report
+
     def validate(self) -> ValidationReport:
         """Check if input properties are correct and exist."""
         _report = ValidationReport()
@@ -67,6 +81,7 @@ class NetworkConfigDataValidator(Ra2ceIoValidator):
 
         # check if properties exist in settings.ini file
         _report.merge(self._validate_shp_input(self._config.network))
+        _report.merge(self._validate_osm_extract_input(self._config.network))
         _report.merge(self._validate_sections())
         return _report
 
@@ -34,6 +34,9 @@ from ra2ce.network.network_wrappers.network_wrapper_protocol import (
 from ra2ce.network.network_wrappers.osm_network_wrapper.osm_network_wrapper import (
     OsmNetworkWrapper,
 )
+from ra2ce.network.network_wrappers.partitioned_network_wrapper import (
+    PartitionedNetworkWrapper,
+)
 from ra2ce.network.network_wrappers.shp_network_wrapper import ShpNetworkWrapper
 from ra2ce.network.network_wrappers.trails_network_wrapper import TrailsNetworkWrapper
 from ra2ce.network.network_wrappers.vector_network_wrapper import VectorNetworkWrapper
@@ -52,16 +55,32 @@ class NetworkWrapperFactory(NetworkWrapperProtocol):
             or _cleanup.cut_at_intersections
         )
 
+    def _partitioned_build_enabled(self) -> bool:
+        _network = self._config_data.network
+        if not _network.tile_size or _network.tile_size <= 0:
+            return False
+        if _network.source in PartitionedNetworkWrapper.supported_sources and not (
+            _network.source == SourceEnum.SHAPEFILE and self._any_cleanup_enabled()
+        ):
+            return True
+        logging.warning(
+            "The network of source %s (with cleanup) cannot be built tile by tile, it is built at once.",
+            _network.source,
+        )
+        return False
+
     def get_network(self) -> tuple[MultiGraph, GeoDataFrame]:
         logging.info("Start creating a network from the submitted shapefile.")
         source = self._config_data.network.source
+        if self._partitioned_build_enabled():
+            return PartitionedNetworkWrapper(self._config_data).get_network()
         if source == SourceEnum.SHAPEFILE:
             if self._any_cleanup_enabled():
                 return ShpNetworkWrapper(self._config_data).get_network()
             return VectorNetworkWrapper(self._config_data).get_network()
         elif source == SourceEnum.OSB_BPF:
             return TrailsNetworkWrapper(self._config_data).get_network()
-        elif source == SourceEnum.OSM_DOWNLOAD:
+        elif source in [SourceEnum.OSM_DOWNLOAD, SourceEnum.OSM_EXTRACT]:
             return OsmNetworkWrapper(self._config_data).get_network()
         elif source == SourceEnum.PICKLE:
             logging.info("Start importing a network from pickle")
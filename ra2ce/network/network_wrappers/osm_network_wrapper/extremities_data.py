@@ -19,10 +19,14 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+from __future__ import annotations
+
 from dataclasses import dataclass
 
 from networkx import MultiDiGraph
 
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
+
 
 @dataclass
 class ExtremitiesData:
@@ -40,11 +44,13 @@ class ExtremitiesData:
         sub_graph: MultiDiGraph,
         graph: MultiDiGraph,
         shared_elements: set,
+        node_index: NodeCoordinateIndex | None = None,
     ):
         """Both extremities should be in the unique_graph still makes an edge between similar node to u (the node
         with u coordinates and different id, included in the unique_graph) and v Here, sub_graph is the unique_graph
         and graph is complex_graph Shared elements are shared btw sub_graph and graph, which are elements to include
-        when dropping duplicates"""
+        when dropping duplicates. The node_index (of the sub_graph) is used to resolve nodes by their coordinates,
+        when not provided it is created from the sub_graph."""
         if shared_elements is None or not isinstance(shared_elements, set):
             raise ValueError("unique_elements should be a set")
         if from_node_id in sub_graph.nodes() and to_node_id in sub_graph.nodes():
@@ -55,9 +61,10 @@ class ExtremitiesData:
             graph.nodes[from_node_id]["x"],
             graph.nodes[from_node_id]["y"],
         ) in shared_elements and to_node_id in sub_graph.nodes():
-
+            if node_index is None:
+                node_index = NodeCoordinateIndex.from_graph(sub_graph)
             from_node_id_prime = ExtremitiesData.find_node_id_by_coor(
-                sub_graph,
+                node_index,
                 graph.nodes[from_node_id]["x"],
                 graph.nodes[from_node_id]["y"],
             )
@@ -75,9 +82,10 @@ class ExtremitiesData:
             and (graph.nodes[to_node_id]["x"], graph.nodes[to_node_id]["y"])
             in shared_elements
         ):
-
+            if node_index is None:
+                node_index = NodeCoordinateIndex.from_graph(sub_graph)
             to_node_id_prime = ExtremitiesData.find_node_id_by_coor(
-                sub_graph, graph.nodes[to_node_id]["x"], graph.nodes[to_node_id]["y"]
+                node_index, graph.nodes[to_node_id]["x"], graph.nodes[to_node_id]["y"]
             )
             if from_node_id == to_node_id_prime:
                 return ExtremitiesData()
@@ -110,16 +118,10 @@ class ExtremitiesData:
         )
 
     @staticmethod
-    def find_node_id_by_coor(graph: MultiDiGraph, target_x: float, target_y: float):
+    def find_node_id_by_coor(
+        node_index: NodeCoordinateIndex, target_x: float, target_y: float
+    ):
         """
-        finds the node in unique graph with the same coor
+        finds the node in unique graph (represented by its coordinate index) with the same coor
         """
-        for node, data in graph.nodes(data=True):
-            if (
-                "x" in data
-                and "y" in data
-                and data["x"] == target_x
-                and data["y"] == target_y
-            ):
-                return node
-        return None
+        return node_index.get_node_id(target_x, target_y)
@@ -0,0 +1,360 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import Hashable
+
+import networkx as nx
+import numpy as np
+import pandas as pd
+import shapely
+from networkx import MultiDiGraph
+from osmnx import stats
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
+from shapely.geometry import LineString
+from shapely.ops import substring
+
+
+class NodeConsolidator:
+    """
+    Consolidates the nodes of a graph which lie within a given distance of each other,
+    following the logic of `osmnx.consolidate_intersections(rebuild_graph=True)` but on
+    coordinate arrays: nearby nodes are paired with a KD-tree, clustered at once as the
+    connected components of those pairs and the edges are rewired in bulk.
+
+    The same arrays are used to snap dead-end nodes onto nearby edges.
+    """
+
+    threshold: float
+
+    def __init__(self, threshold: float) -> None:
+        """
+        Args:
+            threshold (float): Buffer distance of every node (in the units of the graph),
+                nodes closer than twice this distance are consolidated.
+        """
+        self.threshold = threshold
+
+    @staticmethod
+    def _get_coordinates(graph: MultiDiGraph, nodes: list[Hashable]) -> np.ndarray:
+        return np.array(
+            [(graph.nodes[_node]["x"], graph.nodes[_node]["y"]) for _node in nodes],
+            dtype=float,
+        ).reshape(-1, 2)
+
+    @staticmethod
+    def _get_edge_geometry(graph: MultiDiGraph, u, v, data: dict) -> LineString:
+        if data.get("geometry", None) is not None:
+            return data["geometry"]
+        return LineString(
+            [
+                (graph.nodes[u]["x"], graph.nodes[u]["y"]),
+                (graph.nodes[v]["x"], graph.nodes[v]["y"]),
+            ]
+        )
+
+    def get_node_clusters(self, coordinates: np.ndarray) -> np.ndarray:
+        """
+        Clusters the given coordinates: all coordinates whose buffers (of radius `threshold`)
+        overlap, directly or through other coordinates, get the same cluster label.
+
+        Args:
+            coordinates (np.ndarray): Coordinates of the nodes, shape (nodes, 2).
+
+        Returns:
+            np.ndarray: Cluster label of every node.
+        """
+        _n_nodes = len(coordinates)
+        if _n_nodes == 0:
+            return np.empty(0, dtype=int)
+        _pairs = cKDTree(coordinates).query_pairs(
+            2 * self.threshold, output_type="ndarray"
+        )
+        return self._get_components(_n_nodes, _pairs[:, 0], _pairs[:, 1])
+
+    @staticmethod
+    def _get_components(
+        n_nodes: int, from_idx: np.ndarray, to_idx: np.ndarray
+    ) -> np.ndarray:
+        _adjacency = coo_matrix(
+            (np.ones(len(from_idx), dtype=bool), (from_idx, to_idx)),
+            shape=(n_nodes, n_nodes),
+        )
+        return connected_components(_adjacency, directed=False)[1]
+
+    @staticmethod
+    def _remove_dead_ends(graph: MultiDiGraph) -> MultiDiGraph:
+        _graph = graph.copy()
+        _graph.remove_nodes_from(
+            [
+                _node
+                for _node, _count in stats.streets_per_node(_graph).items()
+                if _count <= 1
+            ]
+        )
+        return _graph
+
+    def snap_nodes_to_nodes(
+        self, graph: MultiDiGraph, dead_ends: bool = False
+    ) -> MultiDiGraph:
+        """
+        Merges the nodes closer than twice the `threshold` to each other into one node at
+        their centroid and rebuilds the graph. As in `osmnx`, a cluster of nodes which are
+        not (weakly) connected to each other within the cluster is split into its connected
+        parts, nodes get new (integer) ids with their original ids in `osmid_original` and
+        the geometries of the edges of merged nodes are extended to the new node.
+
+        Args:
+            graph (MultiDiGraph): Graph whose nodes need to be consolidated.
+            dead_ends (bool, optional): Whether to keep the dead-end nodes. Defaults to False.
+
+        Returns:
+            MultiDiGraph: The rebuilt graph.
+        """
+        if not dead_ends:
+            graph = self._remove_dead_ends(graph)
+        if not graph or not graph.edges:
+            return graph
+
+        _nodes = list(graph.nodes)
+        _node_idx = {_node: _idx for _idx, _node in enumerate(_nodes)}
+        _coordinates = self._get_coordinates(graph, _nodes)
+        _clusters = self.get_node_clusters(_coordinates)
+
+        # Split the clusters in their weakly connected parts.
+        _edges = list(graph.edges(keys=True, data=True))
+        _u_idx = np.fromiter((_node_idx[_e[0]] for _e in _edges), dtype=int)
+        _v_idx = np.fromiter((_node_idx[_e[1]] for _e in _edges), dtype=int)
+        _is_internal = _clusters[_u_idx] == _clusters[_v_idx]
+        _labels = pd.factorize(
+            self._get_components(
+                len(_nodes), _u_idx[_is_internal], _v_idx[_is_internal]
+            )
+        )[0]
+
+        _sizes = np.bincount(_labels)
+        _centroids = np.column_stack(
+            [
+                np.bincount(_labels, weights=_coordinates[:, 0]) / _sizes,
+                np.bincount(_labels, weights=_coordinates[:, 1]) / _sizes,
+            ]
+        )
+        _members = pd.Series(_nodes).groupby(_labels).agg(list)
+
+        # Like `osmnx`, unsplit clusters of more than two nodes are located at the centroid
+        # of their merged buffers (for two nodes this is the mean of both).
+        _is_split = (
+            pd.Series(_labels).groupby(_clusters).transform("nunique").to_numpy() > 1
+        )
+        _buffered_idx = np.flatnonzero((_sizes[_labels] > 2) & ~_is_split)
+        _buffers = shapely.buffer(
+            shapely.points(_coordinates[_buffered_idx]), self.threshold, quad_segs=16
+        )
+        for _label, _label_buffers in pd.Series(_buffers).groupby(
+            _labels[_buffered_idx]
+        ):
+            _centroid = shapely.union_all(_label_buffers.to_numpy()).centroid
+            _centroids[_label] = (_centroid.x, _centroid.y)
+
+        _new_graph = nx.MultiDiGraph()
+        _new_graph.graph = graph.graph
+        _new_graph.add_nodes_from(
+            (
+                (_label, {"osmid_original": _osmids[0], **graph.nodes[_osmids[0]]})
+                if len(_osmids) == 1
+                else (
+                    _label,
+                    dict(
+                        osmid_original=str(_osmids),
+                        x=_centroids[_label, 0],
+                        y=_centroids[_label, 1],
+                    ),
+                )
+            )
+            for _label, _osmids in _members.items()
+        )
+
+        _u_labels = _labels[_u_idx]
+        _v_labels = _labels[_v_idx]
+        _is_merged = _sizes > 1
+        _new_edges = []
+        for (_u, _v, _, _data), _u_label, _v_label in zip(_edges, _u_labels, _v_labels):
+            if _u_label == _v_label and _u != _v:
+                continue
+            _new_data = dict(_data, u_original=_u, v_original=_v)
+            _new_data["geometry"] = self._get_edge_geometry(graph, _u, _v, _data)
+            _extend_u = _is_merged[_u_label]
+            _extend_v = _is_merged[_v_label] and _u_label != _v_label
+            if _extend_u or _extend_v:
+                _new_coords = list(_new_data["geometry"].coords)
+                if _extend_u:
+                    _new_coords.insert(0, tuple(_centroids[_u_label]))
+                if _extend_v:
+                    _new_coords.append(tuple(_centroids[_v_label]))
+                _new_data["geometry"] = LineString(_new_coords)
+                _new_data["length"] = _new_data["geometry"].length
+            _new_edges.append((_u_label, _v_label, _new_data))
+        _new_graph.add_edges_from(_new_edges)
+
+        _merged_nodes = [_label for _label in _members.index if _is_merged[_label]] + [
+            _n for _n, _sc in _new_graph.nodes(data="street_count") if _sc is None
+        ]
+        nx.set_node_attributes(
+            _new_graph,
+            stats.count_streets_per_node(_new_graph, nodes=set(_merged_nodes)),
+            name="street_count",
+        )
+        return _new_graph
+
+    def snap_nodes_to_edges(self, graph: MultiDiGraph) -> MultiDiGraph:
+        """
+        Snaps the dead-end nodes onto the nearest edge within the `threshold` (not being an
+        edge of another dead-end node). The node is moved to its projection on the edge,
+        which is split there, so the dead end gets connected to the network.
+
+        Args:
+            graph (MultiDiGraph): Graph whose dead-end nodes need to be snapped.
+
+        Returns:
+            MultiDiGraph: A copy of the graph with the snapped nodes and split edges.
+        """
+        _graph = graph.copy()
+        _neighbors = {
+            _node: set(nx.all_neighbors(_graph, _node)) - {_node}
+            for _node in _graph.nodes
+        }
+        _dead_ends = [_node for _node, _nbs in _neighbors.items() if len(_nbs) == 1]
+        if not _dead_ends:
+            return _graph
+        _dead_end_set = set(_dead_ends)
+
+        # Candidate edges, those of dead ends cannot be snapped to.
+        _edge_ids = [
+            (_u, _v, _k)
+            for _u, _v, _k in _graph.edges(keys=True)
+            if _u != _v and _u not in _dead_end_set and _v not in _dead_end_set
+        ]
+        if not _edge_ids:
+            return _graph
+        _edge_geoms = np.array(
+            [
+                self._get_edge_geometry(_graph, _u, _v, _graph.edges[_u, _v, _k])
+                for _u, _v, _k in _edge_ids
+            ],
+            dtype=object,
+        )
+        _points = shapely.points(self._get_coordinates(_graph, _dead_ends))
+        _point_idx, _edge_idx = shapely.STRtree(_edge_geoms).query(
+            _points, predicate="dwithin", distance=self.threshold
+        )
+        if not len(_point_idx):
+            return _graph
+        _distances = shapely.distance(_points[_point_idx], _edge_geoms[_edge_idx])
+
+        # Every dead end snaps to (all the edges between the nodes of) its nearest edge.
+        _candidates = pd.DataFrame(
+            {"point": _point_idx, "edge": _edge_idx, "distance": _distances}
+        )
+        _candidates["pair"] = [
+            frozenset(_edge_ids[_e][:2]) for _e in _candidates["edge"]
+        ]
+        _nearest = _candidates.loc[
+            _candidates.groupby("point")["distance"].idxmin(), ["point", "pair"]
+        ]
+        _candidates = _candidates.merge(_nearest, on=["point", "pair"])
+        _snapped_points = {
+            _row.point: shapely.line_interpolate_point(
+                _edge_geoms[_row.edge],
+                shapely.line_locate_point(_edge_geoms[_row.edge], _points[_row.point]),
+            )
+            for _row in _candidates.loc[
+                _candidates.groupby("point")["distance"].idxmin()
+            ].itertuples()
+        }
+
+        # Move the dead ends and their own edges.
+        for _point, _snapped_point in _snapped_points.items():
+            _node = _dead_ends[_point]
+            _own_edges = [
+                (_u, _v, _data, self._get_edge_geometry(_graph, _u, _v, _data))
+                for _u, _v, _data in chain(
+                    _graph.in_edges(_node, data=True),
+                    _graph.out_edges(_node, data=True),
+                )
+            ]
+            _graph.nodes[_node]["x"] = _snapped_point.x
+            _graph.nodes[_node]["y"] = _snapped_point.y
+            if "geometry" in _graph.nodes[_node]:
+                _graph.nodes[_node]["geometry"] = _snapped_point
+            for _u, _v, _data, _geometry in _own_edges:
+                self._set_edge_geometry(_data, _geometry, _geometry, _graph, _u, _v)
+
+        # Split every snapped edge at its snapped nodes.
+        for _edge, _edge_candidates in _candidates.groupby("edge"):
+            _u, _v, _k = _edge_ids[_edge]
+            _line = _edge_geoms[_edge]
+            _nodes = [_dead_ends[_point] for _point in _edge_candidates["point"]]
+            _offsets = shapely.line_locate_point(
+                _line, shapely.points(self._get_coordinates(_graph, _nodes))
+            )
+            _data = _graph.edges[_u, _v, _k]
+            _graph.remove_edge(_u, _v, _k)
+            _cuts = [0.0] + sorted(_offsets) + [_line.length]
+            _path = [_u] + [_nodes[_i] for _i in np.argsort(_offsets)] + [_v]
+            for _from, _to, _start, _end in zip(_path, _path[1:], _cuts, _cuts[1:]):
+                _part_data = dict(_data)
+                self._set_edge_geometry(
+                    _part_data,
+                    substring(_line, _start, _end),
+                    _line,
+                    _graph,
+                    _from,
+                    _to,
+                )
+                _graph.add_edge(_from, _to, **_part_data)
+        return _graph
+
+    @staticmethod
+    def _set_edge_geometry(
+        data: dict,
+        geometry: LineString,
+        full_geometry: LineString,
+        graph: MultiDiGraph,
+        u,
+        v,
+    ) -> None:
+        # The geometry starts and ends exactly at its (possibly moved) nodes, the length
+        # is scaled from the one of the full geometry of the original edge.
+        _coords = list(geometry.coords)
+        if len(_coords) < 2:
+            _coords = _coords * 2
+        _coords[0] = (graph.nodes[u]["x"], graph.nodes[u]["y"])
+        _coords[-1] = (graph.nodes[v]["x"], graph.nodes[v]["y"])
+        _new_geometry = LineString(_coords)
+        if data.get("length", None) is not None and full_geometry.length > 0:
+            data["length"] = (
+                data["length"] * _new_geometry.length / full_geometry.length
+            )
+        data["geometry"] = _new_geometry
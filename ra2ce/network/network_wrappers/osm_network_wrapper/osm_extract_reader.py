@@ -0,0 +1,412 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import bz2
+import gzip
+import logging
+import math
+import re
+import shutil
+import subprocess
+import tempfile
+from array import array
+from itertools import groupby
+from pathlib import Path
+from typing import IO, Iterator
+from xml.etree.ElementTree import iterparse
+
+import numpy as np
+import shapely
+from networkx import MultiDiGraph
+from osmnx import distance, settings, stats
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
+
+
+def get_network_type_filter(network_type: str) -> str:
+    """
+    Gets the (Overpass) tag filter `osmnx` applies for the given network type (a copy of
+    the filters of `osmnx` 1.x, which are not part of its public API).
+
+    Args:
+        network_type (str): Network type (`drive`, `drive_service`, `walk`, `bike`, `all` or `all_private`).
+
+    Raises:
+        ValueError: When the network type is not known.
+
+    Returns:
+        str: Tag filter of the network type.
+    """
+    _not_in_use = "abandoned|construction|no|planned|platform|proposed|raceway|razed"
+    _filters = {
+        "drive": (
+            f'["highway"]["area"!~"yes"]{settings.default_access}'
+            '["highway"!~"abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|'
+            "escalator|footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|service|"
+            'steps|track"]'
+            '["motor_vehicle"!~"no"]["motorcar"!~"no"]'
+            '["service"!~"alley|driveway|emergency_access|parking|parking_aisle|private"]'
+        ),
+        "drive_service": (
+            f'["highway"]["area"!~"yes"]{settings.default_access}'
+            '["highway"!~"abandoned|bridleway|bus_guideway|construction|corridor|cycleway|elevator|'
+            "escalator|footway|no|path|pedestrian|planned|platform|proposed|raceway|razed|steps|"
+            'track"]'
+            '["motor_vehicle"!~"no"]["motorcar"!~"no"]'
+            '["service"!~"emergency_access|parking|parking_aisle|private"]'
+        ),
+        "walk": (
+            f'["highway"]["area"!~"yes"]{settings.default_access}'
+            '["highway"!~"abandoned|bus_guideway|construction|cycleway|motor|no|planned|platform|'
+            'proposed|raceway|razed"]'
+            '["foot"!~"no"]["service"!~"private"]'
+        ),
+        "bike": (
+            f'["highway"]["area"!~"yes"]{settings.default_access}'
+            '["highway"!~"abandoned|bus_guideway|construction|corridor|elevator|escalator|footway|'
+            'motor|no|planned|platform|proposed|raceway|razed|steps"]'
+            '["bicycle"!~"no"]["service"!~"private"]'
+        ),
+        "all": (
+            f'["highway"]["area"!~"yes"]{settings.default_access}'
+            f'["highway"!~"{_not_in_use}"]'
+            '["service"!~"private"]'
+        ),
+        "all_private": f'["highway"]["area"!~"yes"]["highway"!~"{_not_in_use}"]',
+    }
+    if network_type not in _filters:
+        raise ValueError(f"Unrecognized network_type {network_type!r}")
+    return _filters[network_type]
+
+
+class OsmTagFilter:
+    """
+    Tag filter in the Overpass syntax used by `osmnx`, e.g. `["highway"~"primary|secondary"]["access"!~"private"]`:
+
+    - `["key"]`: the tag is present.
+    - `["key"~"regex"]`: the tag is present and its value matches the regex.
+    - `["key"!~"regex"]`: the tag is absent or its value does not match the regex.
+    """
+
+    _condition_pattern = re.compile(r'\["([^"]+)"(?:(!?~)"([^"]*)")?\]')
+
+    def __init__(self, osm_filter: str) -> None:
+        self.conditions = [
+            (_key, _operator, re.compile(_regex) if _operator else None)
+            for _key, _operator, _regex in self._condition_pattern.findall(osm_filter)
+        ]
+
+    def matches(self, tags: dict[str, str]) -> bool:
+        """
+        Whether the tags of an OSM element pass all the conditions of the filter.
+        """
+        for _key, _operator, _regex in self.conditions:
+            _value = tags.get(_key, None)
+            if _operator == "!~":
+                if _value is not None and _regex.search(_value):
+                    return False
+            elif _value is None or (_regex and not _regex.search(_value)):
+                return False
+        return True
+
+
+class OsmExtractReader:
+    """
+    Builds the (complex, not simplified) graph of a local OSM extract, as `osmnx.graph_from_polygon`
+    does from the Overpass API, without any network access.
+
+    The extract (OSM XML, optionally `.gz` / `.bz2` compressed) is streamed three times, so only
+    the part of the extract within the polygon is kept in memory: first the ids of the nodes
+    referenced by the ways passing the tag filter are collected (in a compact array), then only
+    those nodes within the bounds of the polygon are kept, and finally the edges of the ways are
+    added to the graph as they are streamed. The nodes are tested against the polygon tile by
+    tile (the intersection of the tile and the polygon), which is faster for large (detailed)
+    polygons. OSM PBF and `.o5m` extracts (e.g. as produced by `convert_osm` / `filter_osm`) are
+    first converted to OSM XML with `osmconvert` (which has to be on the `PATH`).
+    """
+
+    osm_file: Path
+    tile_size: float
+
+    _xml_suffixes = [".osm", ".xml"]
+    # Number of nodes filtered at once.
+    _chunk_size = 100_000
+    _converted_suffixes = [".pbf", ".o5m"]
+
+    def __init__(self, osm_file: Path, tile_size: float = 1.0) -> None:
+        """
+        Args:
+            osm_file (Path): Local OSM extract.
+            tile_size (float, optional): Size (in degrees) of the tiles the nodes are tested against the polygon in. Defaults to 1.0.
+        """
+        self.osm_file = Path(osm_file)
+        self.tile_size = tile_size
+
+    def _get_suffix(self) -> str:
+        _suffixes = self.osm_file.suffixes
+        if _suffixes and _suffixes[-1] in [".gz", ".bz2"]:
+            _suffixes = _suffixes[:-1]
+        return _suffixes[-1].lower() if _suffixes else ""
+
+    def _open_xml(self, xml_file: Path) -> IO[bytes]:
+        if xml_file.suffix == ".gz":
+            return gzip.open(xml_file, "rb")
+        if xml_file.suffix == ".bz2":
+            return bz2.open(xml_file, "rb")
+        return open(xml_file, "rb")
+
+    def _iter_elements(self, xml_file: Path, tag: str) -> Iterator[dict]:
+        # Streams the given elements, without keeping the parsed document in memory.
+        with self._open_xml(xml_file) as _xml:
+            _context = iterparse(_xml, events=("start", "end"))
+            _, _root = next(_context)
+            for _event, _element in _context:
+                if _event != "end" or _element.tag not in ["node", "way", "relation"]:
+                    continue
+                if _element.tag == tag:
+                    yield dict(
+                        attributes=_element.attrib,
+                        tags={
+                            _child.get("k"): _child.get("v")
+                            for _child in _element.iter("tag")
+                        },
+                        refs=[int(_child.get("ref")) for _child in _element.iter("nd")],
+                    )
+                _root.clear()
+
+    def _iter_paths(self, xml_file: Path, tag_filter: OsmTagFilter) -> Iterator[dict]:
+        for _way in self._iter_elements(xml_file, "way"):
+            if not tag_filter.matches(_way["tags"]):
+                continue
+            _path = dict(osmid=int(_way["attributes"]["id"]))
+            # remove any consecutive duplicate nodes
+            _path["nodes"] = [_node for _node, _ in groupby(_way["refs"])]
+            _path.update(
+                {
+                    _key: _way["tags"][_key]
+                    for _key in settings.useful_tags_way
+                    if _key in _way["tags"]
+                }
+            )
+            yield _path
+
+    def _read_node_ids(self, xml_file: Path, tag_filter: OsmTagFilter) -> np.ndarray:
+        # Sorted ids of the nodes referenced by the (filtered) ways.
+        _node_ids = array("q")
+        for _path in self._iter_paths(xml_file, tag_filter):
+            _node_ids.extend(_path["nodes"])
+        return np.unique(np.array(_node_ids, dtype=np.int64))
+
+    def _read_nodes(
+        self,
+        xml_file: Path,
+        node_ids: np.ndarray,
+        bounds: tuple[float, float, float, float],
+    ) -> dict[int, dict]:
+        # The given nodes within the bounds, streamed and filtered in chunks.
+        _min_x, _min_y, _max_x, _max_y = bounds
+        _nodes = {}
+        _chunk = []
+
+        def add_chunk_nodes():
+            _ids, _x, _y = map(np.array, zip(*((_n[0], _n[1], _n[2]) for _n in _chunk)))
+            _keep = (_x >= _min_x) & (_x <= _max_x) & (_y >= _min_y) & (_y <= _max_y)
+            _keep[_keep] = np.isin(_ids[_keep], node_ids)
+            for _idx in np.flatnonzero(_keep):
+                _id, _x_node, _y_node, _tags = _chunk[_idx]
+                _nodes[_id] = dict(y=_y_node, x=_x_node)
+                _nodes[_id].update(
+                    {
+                        _key: _tags[_key]
+                        for _key in settings.useful_tags_node
+                        if _key in _tags
+                    }
+                )
+            _chunk.clear()
+
+        for _node in self._iter_elements(xml_file, "node"):
+            _chunk.append(
+                (
+                    int(_node["attributes"]["id"]),
+                    float(_node["attributes"]["lon"]),
+                    float(_node["attributes"]["lat"]),
+                    _node["tags"],
+                )
+            )
+            if len(_chunk) >= self._chunk_size:
+                add_chunk_nodes()
+        if _chunk:
+            add_chunk_nodes()
+        return _nodes
+
+    def _get_xml_file(self, tmp_dir: Path) -> Path:
+        _suffix = self._get_suffix()
+        if _suffix in self._xml_suffixes:
+            return self.osm_file
+        if _suffix not in self._converted_suffixes:
+            raise ValueError(
+                f"OSM extract {self.osm_file} should be an OSM XML, PBF or o5m file."
+            )
+        _osmconvert = shutil.which("osmconvert")
+        if not _osmconvert:
+            raise FileNotFoundError(
+                f"`osmconvert` is required to read OSM extract {self.osm_file}, convert it to OSM XML otherwise."
+            )
+        _xml_file = tmp_dir.joinpath(self.osm_file.name.split(".")[0] + ".osm")
+        try:
+            subprocess.run(
+                [
+                    _osmconvert,
+                    str(self.osm_file),
+                    "--complete-ways",
+                    "--drop-broken-refs",
+                    f"-o={_xml_file}",
+                ],
+                check=True,
+            )
+        except subprocess.CalledProcessError as _error:
+            raise ValueError(
+                f"OSM extract {self.osm_file} could not be converted."
+            ) from _error
+        if not _xml_file.is_file():
+            raise ValueError(f"OSM extract {self.osm_file} could not be converted.")
+        return _xml_file
+
+    def _get_tile_counts(self, polygon: BaseGeometry) -> tuple[int, int]:
+        _min_x, _min_y, _max_x, _max_y = polygon.bounds
+        return (
+            max(math.ceil((_max_x - _min_x) / self.tile_size), 1),
+            max(math.ceil((_max_y - _min_y) / self.tile_size), 1),
+        )
+
+    def _get_tiles(
+        self, polygon: BaseGeometry
+    ) -> Iterator[tuple[int, int, BaseGeometry]]:
+        _min_x, _min_y, _, _ = polygon.bounds
+        _n_x, _n_y = self._get_tile_counts(polygon)
+        for _i in range(_n_x):
+            for _j in range(_n_y):
+                _tile = box(
+                    _min_x + _i * self.tile_size,
+                    _min_y + _j * self.tile_size,
+                    _min_x + (_i + 1) * self.tile_size,
+                    _min_y + (_j + 1) * self.tile_size,
+                ).intersection(polygon)
+                if not _tile.is_empty:
+                    yield _i, _j, _tile
+
+    def _get_nodes_inside(
+        self, nodes: dict[int, dict], polygon: BaseGeometry
+    ) -> set[int]:
+        # Ids of the nodes inside the polygon, tested tile by tile (nodes on a tile border belong to the upper / right tile).
+        _ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+        _x = np.fromiter(
+            (_n["x"] for _n in nodes.values()), dtype=float, count=len(nodes)
+        )
+        _y = np.fromiter(
+            (_n["y"] for _n in nodes.values()), dtype=float, count=len(nodes)
+        )
+        _min_x, _min_y, _, _ = polygon.bounds
+        _n_x, _n_y = self._get_tile_counts(polygon)
+        _tile_i = np.clip(np.floor((_x - _min_x) / self.tile_size), 0, _n_x - 1)
+        _tile_j = np.clip(np.floor((_y - _min_y) / self.tile_size), 0, _n_y - 1)
+        _nodes_inside = set()
+        for _i, _j, _tile in self._get_tiles(polygon):
+            _in_tile = np.flatnonzero((_tile_i == _i) & (_tile_j == _j))
+            shapely.prepare(_tile)
+            _inside = _in_tile[shapely.intersects_xy(_tile, _x[_in_tile], _y[_in_tile])]
+            _nodes_inside.update(_ids[_inside].tolist())
+        return _nodes_inside
+
+    @staticmethod
+    def _get_path_edges(
+        path: dict, bidirectional: bool
+    ) -> Iterator[tuple[int, int, dict]]:
+        # Edges of a path, with the one way logic of `osmnx`.
+        _nodes = path["nodes"]
+        _data = {_key: _value for _key, _value in path.items() if _key != "nodes"}
+        _oneway_values = {"yes", "true", "1", "-1", "reverse", "T", "F"}
+        _reversed_values = {"-1", "reverse", "T"}
+        _is_one_way = not bidirectional and (
+            path.get("oneway", None) in _oneway_values
+            or path.get("junction", None) == "roundabout"
+        )
+        if _is_one_way and path.get("oneway", None) in _reversed_values:
+            _nodes = list(reversed(_nodes))
+        _data["oneway"] = _is_one_way
+        for _u, _v in zip(_nodes[:-1], _nodes[1:]):
+            yield _u, _v, dict(_data, reversed=False)
+            if not _is_one_way:
+                yield _v, _u, dict(_data, reversed=True)
+
+    def read_graph(
+        self, polygon: BaseGeometry, osm_filter: str, bidirectional: bool = False
+    ) -> MultiDiGraph:
+        """
+        Reads the graph of the extract within the polygon.
+
+        Args:
+            polygon (BaseGeometry): Polygon (in EPSG:4326) to read the graph of.
+            osm_filter (str): Tag filter for the ways (Overpass syntax, see `OsmTagFilter`).
+            bidirectional (bool, optional): Whether one way streets get edges in both directions. Defaults to False.
+
+        Returns:
+            MultiDiGraph: Graph with the OSM nodes and the (straight) edges between them.
+        """
+        _tag_filter = OsmTagFilter(osm_filter)
+        _graph = MultiDiGraph(crs=settings.default_crs)
+        with tempfile.TemporaryDirectory() as _tmp_dir:
+            _xml_file = self._get_xml_file(Path(_tmp_dir))
+            _nodes = self._read_nodes(
+                _xml_file,
+                self._read_node_ids(_xml_file, _tag_filter),
+                polygon.bounds,
+            )
+            # Only the nodes inside the polygon are kept.
+            _nodes_inside = self._get_nodes_inside(_nodes, polygon) if _nodes else set()
+            _nodes = {_node: _nodes[_node] for _node in _nodes_inside}
+            logging.info("Read %s OSM nodes from %s.", len(_nodes), self.osm_file)
+
+            # Only edges with both nodes inside the polygon are kept.
+            for _path in self._iter_paths(_xml_file, _tag_filter):
+                for _u, _v, _data in self._get_path_edges(_path, bidirectional):
+                    if _u in _nodes and _v in _nodes:
+                        _graph.add_node(_u, **_nodes[_u])
+                        _graph.add_node(_v, **_nodes[_v])
+                        _graph.add_edge(_u, _v, **_data)
+        # isolated nodes inside the polygon (retain all)
+        _graph.add_nodes_from(
+            (_node, _data) for _node, _data in _nodes.items() if _node not in _graph
+        )
+        logging.info(
+            "Read %s OSM edges from %s.", _graph.number_of_edges(), self.osm_file
+        )
+
+        if _graph.number_of_edges():
+            _graph = distance.add_edge_lengths(_graph)
+        _graph.graph["crs"] = settings.default_crs
+        if _graph.number_of_nodes():
+            _streets_per_node = stats.count_streets_per_node(_graph)
+            for _node, _count in _streets_per_node.items():
+                _graph.nodes[_node]["street_count"] = _count
+        return _graph
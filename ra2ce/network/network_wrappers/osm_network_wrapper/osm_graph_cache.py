@@ -0,0 +1,145 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import pickle
+from pathlib import Path
+from typing import Any, Optional
+
+import shapely
+from shapely.geometry.base import BaseGeometry
+
+
+class OsmGraphCache:
+    """
+    Keeps the cleaned complex graph of an OSM network and its simplified counterpart in a
+    binary (pickle) file per network, named after the checksum of everything the graphs are
+    derived from (normalized polygon, road types, network type, cleaning settings and source).
+    As long as these do not change, the graphs are loaded instead of downloading and cleaning
+    them again. Remove the cache folder to get fresh OSM data.
+    """
+
+    cache_dir: Path
+
+    # Increase when the derivation of the cached graphs changes.
+    version = 2
+
+    def __init__(self, cache_dir: Path) -> None:
+        """
+        Args:
+            cache_dir (Path): Folder to store the cached graphs.
+        """
+        self.cache_dir = Path(cache_dir)
+
+    @classmethod
+    def get_key(
+        cls,
+        polygon: BaseGeometry,
+        road_types: list[str],
+        network_type: Optional[str],
+        snapping_threshold: float,
+        source: Optional[Path] = None,
+    ) -> str:
+        """
+        Gets the (content-addressed) key of a network.
+
+        Args:
+            polygon (BaseGeometry): Polygon of the network.
+            road_types (list[str]): Road types of the network.
+            network_type (Optional[str]): Network type of the network.
+            snapping_threshold (float): Threshold to snap the nodes.
+            source (Optional[Path], optional): Local OSM extract, None when downloaded. Defaults to None.
+
+        Returns:
+            str: Hexadecimal key.
+        """
+        # Equal polygons with another vertex order / start or float noise get the same key.
+        _polygon = shapely.normalize(shapely.set_precision(polygon, 1e-9))
+        _source = None
+        if source:
+            _stat = Path(source).stat()
+            _source = [Path(source).name, _stat.st_size, _stat.st_mtime_ns]
+        _description = json.dumps(
+            dict(
+                version=cls.version,
+                polygon=shapely.to_wkb(_polygon, hex=True),
+                road_types=sorted(road_types),
+                network_type=network_type,
+                snapping_threshold=snapping_threshold,
+                source=_source,
+            ),
+            sort_keys=True,
+        )
+        return hashlib.sha256(_description.encode()).hexdigest()
+
+    def _get_cache_file(self, key: str) -> Path:
+        return self.cache_dir.joinpath(f"{key}.p")
+
+    def read(self, key: str) -> Optional[Any]:
+        """
+        Reads the cached graphs of a network.
+
+        Args:
+            key (str): Key of the network.
+
+        Returns:
+            Optional[Any]: The cached graphs, None when not cached (or unreadable).
+        """
+        _cache_file = self._get_cache_file(key)
+        if not _cache_file.is_file():
+            return None
+        try:
+            with open(_cache_file, "rb") as _cache:
+                _graphs = pickle.load(_cache)
+            logging.info("Loaded the OSM network graphs from cache %s.", _cache_file)
+            return _graphs
+        except Exception as exc:
+            logging.warning(
+                "Could not read OSM network cache %s (%s), it will be rebuilt.",
+                _cache_file,
+                exc,
+            )
+        return None
+
+    def write(self, key: str, graphs: Any) -> None:
+        """
+        Writes the graphs of a network to the cache.
+
+        Args:
+            key (str): Key of the network.
+            graphs (Any): Graphs to cache.
+        """
+        _cache_file = self._get_cache_file(key)
+        _tmp_file = _cache_file.with_suffix(".tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(_tmp_file, "wb") as _cache:
+                pickle.dump(graphs, _cache, protocol=pickle.HIGHEST_PROTOCOL)
+            # Only complete files become visible as cache entry.
+            _tmp_file.replace(_cache_file)
+        except OSError as exc:
+            logging.warning(
+                "Could not write OSM network cache %s (%s).", _cache_file, exc
+            )
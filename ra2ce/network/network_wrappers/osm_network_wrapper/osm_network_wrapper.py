@@ -29,9 +29,11 @@ from networkx import MultiDiGraph, MultiGraph
 from shapely.geometry.base import BaseGeometry
 
 import ra2ce.network.networks_utils as nut
+from ra2ce.network.avg_speed_calculator import AvgSpeedCalculator
 from ra2ce.network.exporters.json_exporter import JsonExporter
 from ra2ce.network.network_config_data.enums.network_type_enum import NetworkTypeEnum
 from ra2ce.network.network_config_data.enums.road_type_enum import RoadTypeEnum
+from ra2ce.network.network_config_data.enums.source_enum import SourceEnum
 from ra2ce.network.network_config_data.network_config_data import NetworkConfigData
 from ra2ce.network.network_wrappers.network_wrapper_protocol import (
     NetworkWrapperProtocol,
@@ -39,6 +41,17 @@ from ra2ce.network.network_wrappers.network_wrapper_protocol import (
 from ra2ce.network.network_wrappers.osm_network_wrapper.extremities_data import (
     ExtremitiesData,
 )
+from ra2ce.network.network_wrappers.osm_network_wrapper.node_consolidator import (
+    NodeConsolidator,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_extract_reader import (
+    OsmExtractReader,
+    get_network_type_filter,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_graph_cache import (
+    OsmGraphCache,
+)
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
 
 
 class OsmNetworkWrapper(NetworkWrapperProtocol):
@@ -46,6 +59,11 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
     polygon_graph: MultiDiGraph
     network_type: NetworkTypeEnum
     road_types: list[RoadTypeEnum]
+    osm_extract: Path | None
+    graph_cache: OsmGraphCache | None
+
+    # Threshold (in degrees) to snap the nodes of the complex graph.
+    snapping_threshold = 0.00005
 
     def __init__(self, config_data: NetworkConfigData) -> None:
         self.output_graph_dir = config_data.output_graph_dir
@@ -54,6 +72,21 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
         # Network
         self.network_type = config_data.network.network_type
         self.road_types = config_data.network.road_types
+        # A local OSM extract (primary file) replaces the download from the Overpass API.
+        self.osm_extract = None
+        if (
+            config_data.network.source == SourceEnum.OSM_EXTRACT
+            and config_data.network.primary_file
+        ):
+            self.osm_extract = config_data.network.primary_file[0]
+        # The cleaned and simplified graphs are cached in the static folder.
+        self.graph_cache = None
+        if config_data.static_path:
+            self.graph_cache = OsmGraphCache(
+                config_data.static_path.joinpath("osm_cache")
+            )
+        self._cache_key = None
+        self._cached_graphs = None
         self.polygon_graph = self._get_clean_graph_from_osm(config_data.network.polygon)
         self.is_directed = config_data.network.directed
 
@@ -128,10 +161,17 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
     def get_network(self) -> tuple[MultiGraph, GeoDataFrame]:
         logging.info("Start downloading a network from OSM.")
 
-        # Create 'graph_simple'
-        graph_simple, graph_complex, link_tables = nut.create_simplified_graph(
-            self.polygon_graph
-        )
+        if self._cached_graphs:
+            graph_simple, graph_complex, link_tables = self._cached_graphs
+        else:
+            # Create 'graph_simple'
+            graph_simple, graph_complex, link_tables = nut.create_simplified_graph(
+                self.polygon_graph
+            )
+            if self.graph_cache and self._cache_key and graph_simple is not None:
+                self.graph_cache.write(
+                    self._cache_key, (graph_simple, graph_complex, link_tables)
+                )
 
         # Create 'edges_complex', convert complex graph to geodataframe
         logging.info("Start converting the graph to a geodataframe")
@@ -149,7 +189,7 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
         graph_simple = self._set_avg_speed_to_graph(graph_simple)
         return graph_simple, edges_complex
 
-    def _get_avg_speeds(self, original_graph: nx.classes.graph.Graph) -> pd.DataFrame:
+    def _get_avg_speeds(self, avg_speed_calculator: AvgSpeedCalculator) -> pd.DataFrame:
         _save_csv = False
         _avg_speed_filepath = None
         if self.output_graph_dir is not None:
@@ -163,11 +203,8 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
                 )
             )
 
-        return nut.calc_avg_speed(
-            original_graph,
-            "highway",
-            save_csv=_save_csv,
-            save_path=_avg_speed_filepath,
+        return avg_speed_calculator.get_avg_speed_per_road_type(
+            save_csv=_save_csv, save_path=_avg_speed_filepath
         )
 
     def _set_avg_speed_to_graph(
@@ -184,17 +221,10 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
         )
         if all(_length_array) and any(_maxspeed_array):
             # Add time weighing - Define and assign average speeds; or take the average speed from an existing CSV
-            _avg_speeds = self._get_avg_speeds(original_graph)
-            original_graph = nut.assign_avg_speed(
-                original_graph, _avg_speeds, "highway"
-            )
-
-            # make a time value of seconds, length of road streches is in meters
-            for u, v, k, edata in original_graph.edges.data(keys=True):
-                hours = (edata["length"] / 1000) / edata["avgspeed"]
-                original_graph[u][v][k]["time"] = round(hours * 3600, 0)
-
-            return original_graph
+            # and make a time value of seconds, length of road streches is in meters
+            _calculator = AvgSpeedCalculator(original_graph, "highway")
+            _avg_speeds = self._get_avg_speeds(_calculator)
+            return _calculator.assign_avg_speed(_avg_speeds, with_time=True)
         logging.info(
             "No attributes found in the graph to estimate average speed per network segment."
         )
@@ -255,6 +285,54 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
 
         if not _available_road_types and not network_type:
             raise ValueError("Either of the link_type or network_type should be known")
+
+        self._cached_graphs = self._read_cached_graphs(
+            polygon, _road_types_as_str, network_type
+        )
+        if self._cached_graphs:
+            # The complex graph of the cache is already cleaned (and linked to the simplified graph).
+            return self._cached_graphs[1]
+
+        _complex_graph = self.download_graph_from_osm(
+            polygon=polygon, road_types=road_types, network_type=network_type
+        )
+        self.get_clean_graph(_complex_graph)
+        return _complex_graph
+
+    def download_graph_from_osm(
+        self,
+        polygon: BaseGeometry,
+        road_types: list[RoadTypeEnum],
+        network_type: NetworkTypeEnum,
+    ) -> MultiDiGraph:
+        """
+        Downloads (or reads from the OSM extract) the graph within the polygon, without
+        cleaning it, so the nodes keep their OSM ids.
+
+        Args:
+            polygon (BaseGeometry): Polygon (in EPSG:4326) to get the graph of.
+            road_types (list[RoadTypeEnum]): Road types to get.
+            network_type (NetworkTypeEnum): Network type to get.
+
+        Returns:
+            MultiDiGraph: Graph with the OSM nodes and the edges between them.
+        """
+        _available_road_types = road_types and any(road_types)
+        _road_types_as_str = (
+            list(map(lambda x: x.config_value, road_types))
+            if _available_road_types
+            else []
+        )
+
+        if not _available_road_types and not network_type:
+            raise ValueError("Either of the link_type or network_type should be known")
+
+        if self.osm_extract:
+            _complex_graph = self._read_graph_from_osm_extract(
+                polygon=polygon,
+                road_types_as_str=_road_types_as_str,
+                network_type=network_type,
+            )
         elif not _available_road_types:
             # The user specified only the network type.
             _complex_graph = osmnx.graph_from_polygon(
@@ -287,9 +365,47 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
         )
         if "crs" not in _complex_graph.graph.keys():
             _complex_graph.graph["crs"] = self.graph_crs
-        self.get_clean_graph(_complex_graph)
         return _complex_graph
 
+    def _read_cached_graphs(
+        self,
+        polygon: BaseGeometry,
+        road_types_as_str: list[str],
+        network_type: NetworkTypeEnum,
+    ) -> tuple[MultiDiGraph, MultiDiGraph, tuple] | None:
+        if not self.graph_cache:
+            return None
+        self._cache_key = OsmGraphCache.get_key(
+            polygon=polygon,
+            road_types=road_types_as_str,
+            network_type=network_type.config_value if network_type else None,
+            snapping_threshold=self.snapping_threshold,
+            source=self.osm_extract,
+        )
+        return self.graph_cache.read(self._cache_key)
+
+    def _read_graph_from_osm_extract(
+        self,
+        polygon: BaseGeometry,
+        road_types_as_str: list[str],
+        network_type: NetworkTypeEnum,
+    ) -> MultiDiGraph:
+        # Same filters as the download: the road types (when given) or else the network type.
+        _network_type = network_type.config_value if network_type else None
+        if road_types_as_str:
+            _osm_filter = f'["highway"~"{"|".join(road_types_as_str)}"]'
+        elif _network_type:
+            _osm_filter = get_network_type_filter(_network_type)
+        else:
+            raise ValueError("Either of the link_type or network_type should be known")
+
+        logging.info("Reading the network from OSM extract %s.", self.osm_extract)
+        return OsmExtractReader(self.osm_extract).read_graph(
+            polygon=polygon,
+            osm_filter=_osm_filter,
+            bidirectional=_network_type in osmnx.settings.bidirectional_network_types,
+        )
+
     @staticmethod
     def get_clean_graph(complex_graph: MultiDiGraph):
         complex_graph = OsmNetworkWrapper.drop_duplicates(complex_graph)
@@ -297,7 +413,7 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
             graph=complex_graph, geom_name="geometry"
         ).to_directed()
         complex_graph = OsmNetworkWrapper.snap_nodes_to_nodes(
-            graph=complex_graph, threshold=0.00005
+            graph=complex_graph, threshold=OsmNetworkWrapper.snapping_threshold
         )
         return complex_graph
 
@@ -306,21 +422,30 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
         unique_elements = (
             set()
         )  # This gets updated during the drop_duplicates_in_nodes and drop_duplicates_in_edges
+        # The node index gets updated during the drop_duplicates_in_nodes
+        node_index = NodeCoordinateIndex()
 
         unique_graph = OsmNetworkWrapper.drop_duplicates_in_nodes(
-            unique_elements=unique_elements, graph=complex_graph
+            unique_elements=unique_elements, graph=complex_graph, node_index=node_index
         )
         unique_graph = OsmNetworkWrapper.drop_duplicates_in_edges(
             unique_elements=unique_elements,
             unique_graph=unique_graph,
             graph=complex_graph,
+            node_index=node_index,
         )
         return unique_graph
 
     @staticmethod
     def drop_duplicates_in_nodes(
-        unique_elements: set, graph: MultiDiGraph
+        unique_elements: set,
+        graph: MultiDiGraph,
+        node_index: NodeCoordinateIndex | None = None,
     ) -> MultiDiGraph:
+        """
+        Creates a graph with only one node per coordinate. When a `node_index` is given,
+        it is kept in sync with the nodes added to the unique graph.
+        """
         if unique_elements is None or not isinstance(unique_elements, set):
             raise ValueError("unique_elements should be a set")
 
@@ -335,7 +460,10 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
             coord = (x, y)
             if coord not in unique_elements:
                 node_attributes = {key: value for key, value in data.items()}
-                unique_graph.add_node(node, **node_attributes)
+                if node_index is None:
+                    unique_graph.add_node(node, **node_attributes)
+                else:
+                    node_index.add_graph_node(unique_graph, node, **node_attributes)
                 unique_elements.add(coord)
         # Copy the graph dictionary from the source one.
         unique_graph.graph = graph.graph
@@ -343,12 +471,16 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
 
     @staticmethod
     def drop_duplicates_in_edges(
-        unique_elements: set, unique_graph: MultiDiGraph, graph: MultiDiGraph
+        unique_elements: set,
+        unique_graph: MultiDiGraph,
+        graph: MultiDiGraph,
+        node_index: NodeCoordinateIndex | None = None,
     ):
         """
         Checks if both extremities are in the unique_graph (u has not the same coor of v, no line from u to itself is
         allowed). Checks if an edge is already made between such extremities with the given id and coordinates before
-        considering it in the unique graph
+        considering it in the unique graph. Nodes of the unique_graph are resolved by coordinates through the
+        `node_index`, which is created from the unique_graph when not provided.
         """
         if (
             not unique_elements
@@ -364,6 +496,8 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
                 """unique_graph cannot be None. Provide a graph with unique nodes or perform the 
         drop_duplicates_in_nodes on the graph to generate a unique_graph"""
             )
+        if node_index is None:
+            node_index = NodeCoordinateIndex.from_graph(unique_graph)
 
         def validity_check(extremities_tuple) -> bool:
             extremities = extremities_tuple[0]
@@ -380,6 +514,7 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
                 sub_graph=unique_graph,
                 graph=graph,
                 shared_elements=unique_elements,
+                node_index=node_index,
             )
 
             return _extremities_data, data
@@ -408,10 +543,15 @@ class OsmNetworkWrapper(NetworkWrapperProtocol):
 
     @staticmethod
     def snap_nodes_to_nodes(graph: MultiDiGraph, threshold: float) -> MultiDiGraph:
-        return osmnx.consolidate_intersections(
-            G=graph, rebuild_graph=True, tolerance=threshold, dead_ends=False
-        )
+        """
+        Consolidates the nodes within `threshold` of each other (without dead ends), as
+        `osmnx.consolidate_intersections(rebuild_graph=True)` does.
+        """
+        return NodeConsolidator(threshold).snap_nodes_to_nodes(graph, dead_ends=False)
 
     @staticmethod
-    def snap_nodes_to_edges(graph: MultiDiGraph, threshold: float):
-        raise NotImplementedError("Next thing to do!")
+    def snap_nodes_to_edges(graph: MultiDiGraph, threshold: float) -> MultiDiGraph:
+        """
+        Snaps the dead-end nodes onto the nearest edge within `threshold`, splitting it.
+        """
+        return NodeConsolidator(threshold).snap_nodes_to_edges(graph)
@@ -0,0 +1,410 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+from copy import deepcopy
+
+import networkx as nx
+import numpy as np
+import pyogrio
+import shapely
+from geopandas import GeoDataFrame
+from networkx import MultiDiGraph, MultiGraph
+from shapely.geometry import box
+from shapely.geometry.base import BaseGeometry
+
+import ra2ce.network.networks_utils as nut
+from ra2ce.network.network_config_data.enums.source_enum import SourceEnum
+from ra2ce.network.network_config_data.network_config_data import NetworkConfigData
+from ra2ce.network.network_wrappers.network_wrapper_protocol import (
+    NetworkWrapperProtocol,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_network_wrapper import (
+    OsmNetworkWrapper,
+)
+from ra2ce.network.network_wrappers.vector_network_wrapper import VectorNetworkWrapper
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
+
+
+class PartitionedNetworkWrapper(NetworkWrapperProtocol):
+    """
+    Builds the network of a (very) large region tile by tile. The extent of the source is
+    split in square tiles, the complex graph of every tile is built in a process pool and
+    the tile graphs are merged into one complex graph, which is simplified at once.
+
+    Every edge (OSM download) or line (shapefile) is built by exactly one tile: the tile
+    containing a point on its geometry. The tiles read their source with an overlap, so
+    the edges crossing a tile border are complete. The border nodes shared by tiles are
+    merged on their (raw) OSM id, or on their (rounded) coordinates for shapefiles, whose
+    nodes get ids in the order of their coordinates. The OSM graph is only cleaned (and
+    its nodes consolidated) once the tiles are merged.
+    """
+
+    supported_sources = [SourceEnum.OSM_DOWNLOAD, SourceEnum.SHAPEFILE]
+
+    tile_size: float
+    tile_overlap: float
+    n_workers: int
+
+    def __init__(self, config_data: NetworkConfigData) -> None:
+        self._config_data = config_data
+        self.source = config_data.network.source
+        if self.source not in self.supported_sources:
+            raise ValueError(f"Source {self.source} cannot be built tile by tile.")
+        self.tile_size = config_data.network.tile_size
+        if not self.tile_size > 0:
+            raise ValueError("A positive tile size is required.")
+        self.tile_overlap = config_data.network.tile_overlap
+        self.n_workers = config_data.network.n_workers
+
+        self._polygon = None
+        if self.source == SourceEnum.OSM_DOWNLOAD:
+            self._polygon = self._get_osm_polygon(config_data)
+            self.bounds = self._polygon.bounds
+        else:
+            self.bounds = self._get_files_bounds(config_data.network.primary_file)
+
+    @staticmethod
+    def _get_osm_polygon(config_data: NetworkConfigData) -> BaseGeometry:
+        _network = config_data.network
+        if not (_network.road_types and any(_network.road_types)) and (
+            not _network.network_type
+        ):
+            raise ValueError("Either of the link_type or network_type should be known")
+        if not _network.polygon or not _network.polygon.is_file():
+            raise ValueError(
+                "A valid network polygon (.geojson) file path needs to be provided."
+            )
+        return nut.get_normalized_geojson_polygon(_network.polygon)
+
+    @staticmethod
+    def _get_files_bounds(files: list) -> tuple[float, float, float, float]:
+        _bounds = np.array(
+            [
+                pyogrio.read_info(_file, force_total_bounds=True)["total_bounds"]
+                for _file in files
+            ],
+            dtype=float,
+        )
+        return (*_bounds[:, :2].min(axis=0), *_bounds[:, 2:].max(axis=0))
+
+    @staticmethod
+    def get_tile_counts(
+        bounds: tuple[float, float, float, float], tile_size: float
+    ) -> tuple[int, int]:
+        """
+        Gets the number of tiles (in x and y direction) covering the bounds.
+
+        Args:
+            bounds (tuple[float, float, float, float]): Bounds (min x, min y, max x, max y) to cover.
+            tile_size (float): Size of the (square) tiles.
+
+        Returns:
+            tuple[int, int]: Number of tiles in x and y direction.
+        """
+        _min_x, _min_y, _max_x, _max_y = bounds
+        return (
+            max(math.ceil((_max_x - _min_x) / tile_size), 1),
+            max(math.ceil((_max_y - _min_y) / tile_size), 1),
+        )
+
+    @staticmethod
+    def get_tiles(
+        bounds: tuple[float, float, float, float], tile_size: float
+    ) -> list[tuple[float, float, float, float]]:
+        """
+        Gets the tiles covering the bounds, column by column.
+
+        Args:
+            bounds (tuple[float, float, float, float]): Bounds (min x, min y, max x, max y) to cover.
+            tile_size (float): Size of the (square) tiles.
+
+        Returns:
+            list[tuple[float, float, float, float]]: Bounds of every tile.
+        """
+        _min_x, _min_y, _, _ = bounds
+        _n_x, _n_y = PartitionedNetworkWrapper.get_tile_counts(bounds, tile_size)
+        return [
+            (
+                _min_x + _i * tile_size,
+                _min_y + _j * tile_size,
+                _min_x + (_i + 1) * tile_size,
+                _min_y + (_j + 1) * tile_size,
+            )
+            for _i in range(_n_x)
+            for _j in range(_n_y)
+        ]
+
+    @staticmethod
+    def get_tile_indices(
+        geometries: np.ndarray,
+        bounds: tuple[float, float, float, float],
+        tile_size: float,
+    ) -> np.ndarray:
+        """
+        Gets the index (in `get_tiles`) of the tile every geometry belongs to, which is the
+        tile containing a point on the geometry. Points on a tile border belong to the
+        upper / right tile, points outside the bounds to the nearest tile.
+
+        Args:
+            geometries (np.ndarray): Geometries to locate.
+            bounds (tuple[float, float, float, float]): Bounds (min x, min y, max x, max y) covered by the tiles.
+            tile_size (float): Size of the (square) tiles.
+
+        Returns:
+            np.ndarray: Tile index of every geometry.
+        """
+        _min_x, _min_y, _, _ = bounds
+        _n_x, _n_y = PartitionedNetworkWrapper.get_tile_counts(bounds, tile_size)
+        _coordinates = shapely.get_coordinates(
+            shapely.point_on_surface(geometries)
+        ).reshape(-1, 2)
+        _i = np.clip(np.floor((_coordinates[:, 0] - _min_x) / tile_size), 0, _n_x - 1)
+        _j = np.clip(np.floor((_coordinates[:, 1] - _min_y) / tile_size), 0, _n_y - 1)
+        return (_i * _n_y + _j).astype(int)
+
+    def _is_in_tile(self, tile_idx: int, geometries: np.ndarray) -> np.ndarray:
+        return (
+            self.get_tile_indices(geometries, self.bounds, self.tile_size) == tile_idx
+        )
+
+    def _get_tile_config(self) -> NetworkConfigData:
+        # The tiles neither build the network of the polygon nor use the static folder (OSM cache).
+        _config_data = deepcopy(self._config_data)
+        _config_data.network.polygon = None
+        _config_data.static_path = None
+        return _config_data
+
+    def _get_overlap_bounds(self, tile_idx: int) -> tuple[float, float, float, float]:
+        _min_x, _min_y, _max_x, _max_y = self.get_tiles(self.bounds, self.tile_size)[
+            tile_idx
+        ]
+        return (
+            _min_x - self.tile_overlap,
+            _min_y - self.tile_overlap,
+            _max_x + self.tile_overlap,
+            _max_y + self.tile_overlap,
+        )
+
+    def _get_osm_tile_graph(self, tile_idx: int) -> MultiDiGraph:
+        _polygon = box(*self._get_overlap_bounds(tile_idx)).intersection(self._polygon)
+        if _polygon.is_empty:
+            return MultiDiGraph()
+        _wrapper = OsmNetworkWrapper(self._get_tile_config())
+        try:
+            # The raw graph, its nodes keep their OSM ids (the same in all tiles).
+            _graph = _wrapper.download_graph_from_osm(
+                polygon=_polygon,
+                road_types=_wrapper.road_types,
+                network_type=_wrapper.network_type,
+            )
+        except ValueError as _error:
+            # No (OSM) data within the tile.
+            logging.warning("No network found in tile %s: %s", tile_idx, _error)
+            return MultiDiGraph()
+
+        # Keep the edges of this tile, and their nodes.
+        _edges = list(_graph.edges(keys=True, data=True))
+        _geometries = np.array(
+            [
+                _data["geometry"]
+                if _data.get("geometry", None) is not None
+                else shapely.linestrings(
+                    [
+                        (_graph.nodes[_u]["x"], _graph.nodes[_u]["y"]),
+                        (_graph.nodes[_v]["x"], _graph.nodes[_v]["y"]),
+                    ]
+                )
+                for _u, _v, _, _data in _edges
+            ],
+            dtype=object,
+        )
+        _in_tile = self._is_in_tile(tile_idx, _geometries)
+        _tile_graph = MultiDiGraph(**_graph.graph)
+        _tile_edges = [_edge for _edge, _in in zip(_edges, _in_tile) if _in]
+        _tile_graph.add_nodes_from(
+            (_node, _graph.nodes[_node])
+            for _u, _v, _, _ in _tile_edges
+            for _node in (_u, _v)
+        )
+        _tile_graph.add_edges_from(_tile_edges)
+        return _tile_graph
+
+    def _get_vector_tile_graph(self, tile_idx: int) -> MultiDiGraph:
+        return VectorNetworkWrapper(self._get_tile_config()).get_tile_complex_graph(
+            bbox=self._get_overlap_bounds(tile_idx),
+            geometry_filter=lambda _geometries: self._is_in_tile(tile_idx, _geometries),
+        )
+
+    def get_tile_graph(self, tile_idx: int) -> MultiDiGraph:
+        """
+        Gets the complex graph of the edges of one tile.
+
+        Args:
+            tile_idx (int): Index of the tile (in `get_tiles`).
+
+        Returns:
+            MultiDiGraph: Complex graph of the tile.
+        """
+        if self.source == SourceEnum.OSM_DOWNLOAD:
+            _graph = self._get_osm_tile_graph(tile_idx)
+        else:
+            _graph = self._get_vector_tile_graph(tile_idx)
+        logging.info(
+            "Built tile %s with %s nodes and %s edges.",
+            tile_idx,
+            _graph.number_of_nodes(),
+            _graph.number_of_edges(),
+        )
+        return _graph
+
+    def _get_tile_indices_to_build(self) -> list[int]:
+        _tiles = self.get_tiles(self.bounds, self.tile_size)
+        if self._polygon is None:
+            return list(range(len(_tiles)))
+        return np.flatnonzero(
+            shapely.intersects(shapely.box(*np.array(_tiles).T), self._polygon)
+        ).tolist()
+
+    def get_tile_graphs(self) -> list[MultiDiGraph]:
+        """
+        Builds the complex graph of every tile, in parallel when more workers are allowed.
+
+        Returns:
+            list[MultiDiGraph]: Complex graphs of the tiles, in the order of the tiles.
+        """
+        _tile_indices = self._get_tile_indices_to_build()
+        logging.info("Building the network in %s tiles.", len(_tile_indices))
+        if self.n_workers == 1 or len(_tile_indices) < 2:
+            return list(map(self.get_tile_graph, _tile_indices))
+        with ProcessPoolExecutor(max_workers=self.n_workers or None) as _executor:
+            return list(_executor.map(self.get_tile_graph, _tile_indices))
+
+    @staticmethod
+    def merge_tile_graphs(
+        tile_graphs: list[MultiDiGraph], keep_node_ids: bool
+    ) -> MultiDiGraph:
+        """
+        Merges the graphs of the tiles. The nodes are merged on their id when these are
+        global (`keep_node_ids`), otherwise on their (rounded) coordinates and renumbered
+        in the order of those coordinates, so the ids do not depend on the tiling. The
+        node ids stored as attributes (`node_fid`, `node_A`, `node_B`, `edge_fid`) are
+        updated accordingly.
+
+        Args:
+            tile_graphs (list[MultiDiGraph]): Graphs of the tiles, with no edges in common.
+            keep_node_ids (bool): Whether the node ids are the same in all tiles.
+
+        Returns:
+            MultiDiGraph: Merged graph.
+        """
+        _tile_graphs = [_graph for _graph in tile_graphs if _graph.number_of_nodes()]
+        _merged_graph = MultiDiGraph()
+        if not _tile_graphs:
+            return _merged_graph
+        _merged_graph.graph.update(_tile_graphs[0].graph)
+        if keep_node_ids:
+            for _graph in _tile_graphs:
+                _merged_graph.add_nodes_from(_graph.nodes(data=True))
+                _merged_graph.add_edges_from(_graph.edges(data=True))
+            return _merged_graph
+
+        _node_index = NodeCoordinateIndex()
+
+        def get_keys(graph: MultiDiGraph) -> dict:
+            return {
+                _node: _node_index.get_key(
+                    *NodeCoordinateIndex.get_node_position(_data)
+                )
+                for _node, _data in graph.nodes(data=True)
+            }
+
+        _tile_keys = list(map(get_keys, _tile_graphs))
+        _new_ids = {
+            _key: _id
+            for _id, _key in enumerate(
+                sorted(set().union(*(_keys.values() for _keys in _tile_keys)))
+            )
+        }
+        for _graph, _keys in zip(_tile_graphs, _tile_keys):
+            _mapping = {_node: _new_ids[_key] for _node, _key in _keys.items()}
+            for _node, _data in _graph.nodes(data=True):
+                _new_id = _mapping[_node]
+                if _new_id in _merged_graph:
+                    continue
+                _new_data = dict(_data)
+                if "node_fid" in _new_data:
+                    _new_data["node_fid"] = _new_id
+                _merged_graph.add_node(_new_id, **_new_data)
+            for _u, _v, _data in _graph.edges(data=True):
+                _new_data = dict(_data)
+                for _attribute in ["node_A", "node_B"]:
+                    if _new_data.get(_attribute, None) in _mapping:
+                        _new_data[_attribute] = _mapping[_new_data[_attribute]]
+                if "edge_fid" in _new_data:
+                    _new_data["edge_fid"] = "{}_{}".format(
+                        _new_data.get("node_A", None), _new_data.get("node_B", None)
+                    )
+                _merged_graph.add_edge(_mapping[_u], _mapping[_v], **_new_data)
+        return _merged_graph
+
+    def get_complex_graph(self) -> MultiDiGraph:
+        """
+        Gets the complex graph of all tiles. The OSM tiles are merged on their (raw) OSM
+        ids and then cleaned at once (`OsmNetworkWrapper.get_clean_graph`), as the
+        consolidation of the nodes renumbers them and may join nodes of different tiles.
+
+        Returns:
+            MultiDiGraph: The merged complex graph.
+        """
+        _is_osm = self.source == SourceEnum.OSM_DOWNLOAD
+        _complex_graph = self.merge_tile_graphs(
+            self.get_tile_graphs(), keep_node_ids=_is_osm
+        )
+        logging.info(
+            "Merged the tiles into a graph with %s nodes and %s edges.",
+            _complex_graph.number_of_nodes(),
+            _complex_graph.number_of_edges(),
+        )
+        if _is_osm and _complex_graph.number_of_edges():
+            _complex_graph = OsmNetworkWrapper.get_clean_graph(_complex_graph)
+        return _complex_graph
+
+    def get_network(self) -> tuple[MultiGraph, GeoDataFrame]:
+        _is_osm = self.source == SourceEnum.OSM_DOWNLOAD
+        _complex_graph = self.get_complex_graph()
+
+        # The merged graph is simplified (and gets its speeds) at once.
+        _config_data = deepcopy(self._config_data)
+        _config_data.network.polygon = None
+        if _is_osm:
+            _wrapper = OsmNetworkWrapper(_config_data)
+            if "crs" not in _complex_graph.graph:
+                _complex_graph.graph["crs"] = _wrapper.graph_crs
+            _wrapper.polygon_graph = _complex_graph
+            return _wrapper.get_network()
+        return VectorNetworkWrapper(_config_data).get_network_from_complex_graph(
+            _complex_graph
+        )
@@ -97,7 +97,7 @@ class TrailsNetworkWrapper(NetworkWrapperProtocol):
             edges_simple_segmented = to_segment.apply_segmentation()
             if edges_simple_segmented.crs is None:  # The CRS might have dissapeared.
                 edges_simple_segmented.crs = edges.crs  # set the right CRS
-                edges_complex = edges_simple_segmented
+            edges_complex = edges_simple_segmented
 
         graph_complex = graph_simple  # NOTE THAT DIFFERENCE
         # BETWEEN SIMPLE AND COMPLEX DOES NOT EXIST WHEN IMPORTING WITH TRAILS
@@ -19,19 +19,23 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import itertools
 import logging
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import geopandas as gpd
 import momepy
 import networkx as nx
+import numpy as np
 import pandas as pd
 import pyproj
+import shapely
 from shapely.geometry import Point
 from tqdm import tqdm
 
 import ra2ce.network.networks_utils as nut
+from ra2ce.network.avg_speed_calculator import AvgSpeedCalculator
 from ra2ce.network.exporters.json_exporter import JsonExporter
 from ra2ce.network.network_config_data.network_config_data import NetworkConfigData
 from ra2ce.network.network_wrappers.network_wrapper_protocol import (
@@ -75,6 +79,18 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
             gpd.GeoDataFrame: GeoDataFrame representing the network.
         """
         gdf = self._read_vector_to_project_region_and_crs()
+        graph_complex = self.get_complex_graph(gdf)
+        return self.get_network_from_complex_graph(graph_complex)
+
+    def get_complex_graph(self, gdf: gpd.GeoDataFrame) -> nx.MultiDiGraph:
+        """Gets the complex (not simplified) graph of the lines of a GeoDataFrame.
+
+        Args:
+            gdf (gpd.GeoDataFrame): Lines of the network.
+
+        Returns:
+            nx.MultiDiGraph: Complex graph with node and edge geometries.
+        """
         gdf = self.clean_vector(gdf)
         if self.directed:
             graph = self._get_direct_graph_from_vector(
@@ -92,7 +108,43 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
         if self.delete_duplicate_nodes:
             graph_complex = self._delete_duplicate_nodes(graph_complex)
             # edges, nodes = self.get_network_edges_and_nodes_from_graph(graph)
+        return graph_complex
+
+    def get_tile_complex_graph(
+        self,
+        bbox: tuple[float, float, float, float],
+        geometry_filter: Callable[[np.ndarray], np.ndarray],
+    ) -> nx.MultiDiGraph:
+        """Gets the complex graph of the lines within a bounding box of the vector files,
+        used to build the network tile by tile.
+
+        Args:
+            bbox (tuple[float, float, float, float]): Bounding box (in the crs of the files) of the lines to read.
+            geometry_filter (Callable[[np.ndarray], np.ndarray]): Returns which of the
+                (read) geometries are part of the tile.
+
+        Returns:
+            nx.MultiDiGraph: Complex graph of the lines of the tile (empty when there are none).
+        """
+        gdf = self._read_vector_to_project_region_and_crs(
+            bbox=bbox, geometry_filter=geometry_filter
+        )
+        if gdf is None or gdf.empty:
+            return nx.MultiDiGraph(crs=self.crs)
+        return self.get_complex_graph(gdf)
+
+    def get_network_from_complex_graph(
+        self, graph_complex: nx.MultiDiGraph
+    ) -> tuple[nx.Graph, gpd.GeoDataFrame]:
+        """Gets the network (simplified graph and complex edges) of a complex graph.
 
+        Args:
+            graph_complex (nx.MultiDiGraph): Complex graph of the network.
+
+        Returns:
+            nx.MultiGraph: MultiGraph representing the graph.
+            gpd.GeoDataFrame: GeoDataFrame representing the network.
+        """
         logging.info("Start converting the complex graph to a simple graph")
         # Create 'graph_simple'
         graph_simple, graph_complex, link_tables = nut.create_simplified_graph(
@@ -117,10 +169,15 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
 
         return graph_simple, edges_complex
 
-        # return graph_complex, edges
-
-    def _read_vector_to_project_region_and_crs(self) -> gpd.GeoDataFrame:
-        gdf = self._read_files(self.primary_files)
+    def _read_vector_to_project_region_and_crs(
+        self,
+        bbox: tuple[float, float, float, float] | None = None,
+        geometry_filter: Callable[[np.ndarray], np.ndarray] | None = None,
+    ) -> gpd.GeoDataFrame:
+        gdf = self._read_files(self.primary_files, bbox=bbox)
+        if geometry_filter is not None:
+            # filter in the crs of the files, as the bounding box
+            gdf = gdf[geometry_filter(gdf.geometry.values)]
         if gdf is None:
             logging.info("no file is read.")
             return None
@@ -147,18 +204,26 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
 
         return gdf
 
-    def _read_files(self, file_list: list[Path]) -> gpd.GeoDataFrame:
+    def _read_files(
+        self,
+        file_list: list[Path],
+        bbox: tuple[float, float, float, float] | None = None,
+    ) -> gpd.GeoDataFrame:
         """Reads a list of files into a GeoDataFrame.
 
         Args:
             file_list (list[Path]): List of file paths.
+            bbox (tuple[float, float, float, float] | None, optional): Only reads the
+                features intersecting this bounding box. Defaults to None.
 
         Returns:
             gpd.GeoDataFrame: GeoDataFrame representing the data.
         """
         # read file
         gdf = gpd.GeoDataFrame(
-            pd.concat([gpd.read_file(_fl, engine="pyogrio") for _fl in file_list])
+            pd.concat(
+                [gpd.read_file(_fl, engine="pyogrio", bbox=bbox) for _fl in file_list]
+            )
         )
         logging.info(
             "Read files {} into a 'GeoDataFrame'.".format(
@@ -260,36 +325,63 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
 
         # to graph
         digraph = nx.DiGraph(crs=gdf.crs, approach="primal")
-        for _, row in gdf.iterrows():
-            link_id = row.get(self.file_id, None)
-            link_type = row.get(self.link_type_column, None)
-
-            from_node = row.geometry.coords[0]
-            to_node = row.geometry.coords[-1]
-            _edge_attributes = {
-                f"{self.file_id}": link_id,
-                f"{self.link_type_column}": link_type,
-                "avgspeed": row.pop("avgspeed") if "avgspeed" in row else None,
-                "geometry": row.pop("geometry"),
+        if gdf.empty:
+            return digraph
+
+        def get_column(column_name: str) -> list:
+            if column_name in gdf.columns:
+                return gdf[column_name].tolist()
+            return [None] * len(gdf)
+
+        _geometries = gdf.geometry.values
+        _has_z = shapely.has_z(_geometries)
+
+        def get_node_ids(points: np.ndarray) -> list[tuple]:
+            _coords = shapely.get_coordinates(points, include_z=True).tolist()
+            return [
+                tuple(_xyz) if _z else tuple(_xyz[:2])
+                for _xyz, _z in zip(_coords, _has_z)
+            ]
+
+        _from_nodes = get_node_ids(shapely.get_point(_geometries, 0))
+        _to_nodes = get_node_ids(shapely.get_point(_geometries, -1))
+
+        # nodes are added in the order in which the edges reference them
+        _node_ids = list(dict.fromkeys(itertools.chain(*zip(_from_nodes, _to_nodes))))
+        digraph.add_nodes_from(
+            (_node_id, {"geometry": Point(_node_id)}) for _node_id in _node_ids
+        )
+
+        # `avgspeed` and `geometry` are always part of the edge attributes,
+        # the other attributes to include are only set when they have a value.
+        _attributes_to_include = [
+            _attribute
+            for _attribute in dict.fromkeys(edge_attributes_to_include)
+            if _attribute in gdf.columns and _attribute not in ["avgspeed", "geometry"]
+        ]
+        _link_ids = get_column(self.file_id)
+        _edge_attributes = (
+            {
+                "link_id": _link_id,
+                f"{self.file_id}": _link_id,
+                f"{self.link_type_column}": _link_type,
+                "avgspeed": _avgspeed,
+                "geometry": _geometry,
+                **{
+                    _attribute: _value
+                    for _attribute, _value in zip(_attributes_to_include, _values)
+                    if _value
+                },
             }
-            digraph.add_node(from_node, geometry=Point(from_node))
-            digraph.add_node(to_node, geometry=Point(to_node))
-            digraph.add_edge(
-                from_node,
-                to_node,
-                link_id=link_id,
-                **_edge_attributes,
+            for _link_id, _link_type, _avgspeed, _geometry, *_values in zip(
+                _link_ids,
+                get_column(self.link_type_column),
+                get_column("avgspeed"),
+                _geometries,
+                *map(get_column, _attributes_to_include),
             )
-            if len(edge_attributes_to_include) > 0:
-                for edge_attribute_to_include in edge_attributes_to_include:
-                    edge_attribute = (
-                        row[edge_attribute_to_include]
-                        if edge_attribute_to_include in row
-                        else None
-                    )
-                    if edge_attribute:
-                        edge_data = digraph[from_node][to_node]
-                        edge_data[edge_attribute_to_include] = edge_attribute
+        )
+        digraph.add_edges_from(zip(_from_nodes, _to_nodes, _edge_attributes))
         return digraph
 
     def _get_indirect_graph_from_vector(
@@ -391,22 +483,16 @@ class VectorNetworkWrapper(NetworkWrapperProtocol):
             ["maxspeed" in e for u, v, e in original_graph.edges.data()]
         ):
             # Add time weighing - Define and assign average speeds; or take the average speed from an existing CSV
+            # and make a time value of seconds, length of road streches is in meters
+            _calculator = AvgSpeedCalculator(original_graph, "highway")
             path_avg_speed = self.output_graph_dir.joinpath("avg_speed.csv")
             if path_avg_speed.is_file():
                 avg_speeds = pd.read_csv(path_avg_speed)
             else:
-                avg_speeds = nut.calc_avg_speed(
-                    original_graph,
-                    "highway",
-                    save_csv=True,
-                    save_path=path_avg_speed,
+                avg_speeds = _calculator.get_avg_speed_per_road_type(
+                    save_csv=True, save_path=path_avg_speed
                 )
-            original_graph = nut.assign_avg_speed(original_graph, avg_speeds, "highway")
-
-            # make a time value of seconds, length of road streches is in meters
-            for u, v, k, edata in original_graph.edges.data(keys=True):
-                hours = (edata["length"] / 1000) / edata["avgspeed"]
-                original_graph[u][v][k]["time"] = round(hours * 3600, 0)
+            original_graph = _calculator.assign_avg_speed(avg_speeds, with_time=True)
 
             return original_graph
         logging.info(
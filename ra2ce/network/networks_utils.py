@@ -35,12 +35,11 @@ import pandas as pd
 import pyproj
 import rasterio
 import rtree
+import shapely
 from geopy import distance
 from numpy.ma import MaskedArray
 from osgeo import gdal
 from osmnx import graph_to_gdfs
-from osmnx._errors import GraphSimplificationError
-from osmnx.simplification import _get_paths_to_simplify, _remove_rings, utils
 from rasterio.features import shapes
 from rasterio.mask import mask
 from shapely.geometry import LineString, MultiLineString, Point, box, shape
@@ -48,6 +47,10 @@ from shapely.geometry.base import BaseGeometry, BaseMultipartGeometry
 from shapely.ops import linemerge, unary_union
 from tqdm import tqdm
 
+from ra2ce.network.avg_speed_calculator import AvgSpeedCalculator
+from ra2ce.network.graph_simplifier import GraphSimplifier
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
+
 
 def convert_unit(unit: str) -> Optional[float]:
     """Converts unit to meters.
@@ -751,6 +754,8 @@ def join_nodes_edges(
     logging.info("Started joining edges and nodes...")
     # list of the edges that are not topographically correct
     incorrect_edges = []
+    # index to resolve the nodes by their position, only created when needed
+    node_index = None
 
     # add node attributes to edges
     gdf = gpd.sjoin(gdf_edges, gdf_nodes, how="left", op="intersects")
@@ -827,44 +832,23 @@ def join_nodes_edges(
                     )
         elif len(node_tuple) < 2:
             # somehow the geopandas sjoin did not find any nodes on this edge, but there are so look for them
-            node_a = [
-                i
-                for i, xy in zip(gdf_nodes.node_fid, gdf_nodes.geometry)
-                if xy.almost_equals(
-                    Point(
-                        list(
-                            gdf_edges.loc[gdf_edges[id_name] == edge]
-                            .iloc[0]
-                            .geometry.coords
-                        )[0]
-                    )
+            if node_index is None:
+                node_index = NodeCoordinateIndex.from_points(
+                    gdf_nodes.node_fid, gdf_nodes.geometry
                 )
-            ]
-            node_b = [
-                i
-                for i, xy in zip(gdf_nodes.node_fid, gdf_nodes.geometry)
-                if xy.almost_equals(
-                    Point(
-                        list(
-                            gdf_edges.loc[gdf_edges[id_name] == edge]
-                            .iloc[0]
-                            .geometry.coords
-                        )[-1]
-                    )
-                )
-            ]
+            edge_coords = (
+                gdf_edges.loc[gdf_edges[id_name] == edge].iloc[0].geometry.coords
+            )
+            node_a = node_index.get_node_id(*edge_coords[0][:2])
+            node_b = node_index.get_node_id(*edge_coords[-1][:2])
             tuples_df = pd.concat(
                 [
                     tuples_df,
                     pd.DataFrame.from_records(
                         [
                             {
-                                "node_A": gdf_nodes.loc[
-                                    gdf_nodes["node_fid"] == node_a[0], "node_fid"
-                                ].iloc[0],
-                                "node_B": gdf_nodes.loc[
-                                    gdf_nodes["node_fid"] == node_b[0], "node_fid"
-                                ].iloc[0],
+                                "node_A": node_a,
+                                "node_B": node_b,
                             },
                         ]
                     ),
@@ -988,20 +972,15 @@ def create_simplified_graph(
     try:
         graph_complex = graph_create_unique_ids(graph_complex, "{}_c".format(new_id))
 
-        # Create simplified graph and add unique ids
-        graph_simple = simplify_graph_count(graph_complex)
-        graph_simple = graph_create_unique_ids(graph_simple, new_id)
-
-        # Create look_up_tables between graphs with unique ids
-        simple_to_complex, complex_to_simple = graph_link_simple_id_to_complex(
-            graph_simple, new_id=new_id
+        # Create simplified graph with unique ids, linked to the complex graph (which gets the simple ids)
+        graph_simple, link_table = GraphSimplifier(
+            strict=True, remove_rings=True, track_merged=False
+        ).simplify_with_link_tables(
+            graph_complex, simple_id=new_id, complex_id="{}_c".format(new_id)
         )
 
-        # Store id table and add simple ids to complex graph
-        id_tables = (simple_to_complex, complex_to_simple)
-        graph_complex = add_simple_id_to_graph_complex(
-            graph_complex, complex_to_simple, new_id
-        )
+        # Store look_up_tables between graphs with unique ids
+        id_tables = GraphSimplifier.get_id_tables(link_table)
         logging.info("Simplified graph succesfully created")
     except Exception as exc:
         graph_simple = None
@@ -1148,12 +1127,9 @@ def simplify_graph(
     graph: nx.Graph, strict: bool, remove_rings: bool, track_merged: bool
 ):
     """
-    This is an OSMNX function with the same name, modified to check if geometry attribute exists in the nodes of each
-    path to simplify.
-
-    !IMPORTANT! This whole method makes us bound to `OSMNX==1.7.1`.
-
-    Check the official OSMNX documentation for more details.
+    Topologically simplifies the graph following the rules of the OSMNX function with the same
+    name, where the geometry of every merged edge is built from the `geometry` (or `x` and `y`)
+    of its nodes. Check `GraphSimplifier` for more details.
 
     Args:
         graph (networkx.MultiDiGraph): input graph
@@ -1169,123 +1145,9 @@ def simplify_graph(
          networkx.MultiDiGraph: topologically simplified graph, with a new `geometry` attribute on
             each simplified edge
     """
-    if "simplified" in graph.graph and graph.graph["simplified"]:  # pragma: no cover
-        msg = "This graph has already been simplified, cannot simplify it again."
-        raise GraphSimplificationError(msg)
-
-    logging.info("Begin topologically simplifying the graph...")
-
-    # define edge segment attributes to sum upon edge simplification
-    attrs_to_sum = {"length", "travel_time"}
-
-    # make a copy to not mutate original graph object caller passed in
-    graph = graph.copy()
-    initial_node_count = len(graph)
-    initial_edge_count = len(graph.edges)
-    all_nodes_to_remove = []
-    all_edges_to_add = []
-
-    # generate each path that needs to be simplified
-    for path in _get_paths_to_simplify(graph, strict):
-        # add the interstitial edges we're removing to a list so we can retain
-        # their spatial geometry
-        merged_edges = []
-        path_attributes = {}
-        for u, v in zip(path[:-1], path[1:]):
-            if track_merged:
-                # keep track of the edges that were merged
-                merged_edges.append((u, v))
-
-            # there should rarely be multiple edges between interstitial nodes
-            # usually happens if OSM has duplicate ways digitized for just one
-            # street... we will keep only one of the edges (see below)
-            edge_count = graph.number_of_edges(u, v)
-            if edge_count != 1:
-                utils.log(
-                    f"Found {edge_count} edges between {u} and {v} when simplifying"
-                )
-
-            # get edge between these nodes: if multiple edges exist between
-            # them (see above), we retain only one in the simplified graph
-            # We can't assume that there exists an edge from u to v
-            # with key=0, so we get a list of all edges from u to v
-            # and just take the first one.
-            edge_data = list(graph.get_edge_data(u, v).values())[0]
-            for attr in edge_data:
-                if attr in path_attributes:
-                    # if this key already exists in the dict, append it to the
-                    # value list
-                    path_attributes[attr].append(edge_data[attr])
-                else:
-                    # if this key doesn't already exist, set the value to a list
-                    # containing the one value
-                    path_attributes[attr] = [edge_data[attr]]
-
-        # consolidate the path's edge segments' attribute values
-        for attr in path_attributes:
-            if attr in attrs_to_sum:
-                # if this attribute must be summed, sum it now
-                path_attributes[attr] = sum(path_attributes[attr])
-            elif attr != "geometry" and len(set(path_attributes[attr])) == 1:
-                # if there's only 1 unique value in this attribute list,
-                # consolidate it to the single value (the zero-th):
-                path_attributes[attr] = path_attributes[attr][0]
-            elif attr != "geometry":
-                # otherwise, if there are multiple values, keep one of each
-                path_attributes[attr] = list(set(path_attributes[attr]))
-
-        # construct the new consolidated edge's geometry for this path
-        if all("geometry" in graph.nodes[node] for node in path):
-            # Check if all nodes in the path have "geometry" attribute
-            # Use existing geometries to create LineString
-            path_attributes["geometry"] = LineString(
-                [graph.nodes[node]["geometry"] for node in path]
-            )
-        elif all(
-            "x" in graph.nodes[node] and "y" in graph.nodes[node] for node in path
-        ):
-            # Create LineString using x and y coordinates
-            path_attributes["geometry"] = LineString(
-                [
-                    Point((graph.nodes[node]["x"], graph.nodes[node]["y"]))
-                    for node in path
-                ]
-            )
-        else:
-            raise ValueError(
-                "All nodes in the path must have 'geometry' or 'x' and 'y' attributes."
-            )
-
-        if track_merged:
-            # add the merged edges as a new attribute of the simplified edge
-            path_attributes["merged_edges"] = merged_edges
-
-        # add the nodes and edge to their lists for processing at the end
-        all_nodes_to_remove.extend(path[1:-1])
-        all_edges_to_add.append(
-            {"origin": path[0], "destination": path[-1], "attr_dict": path_attributes}
-        )
-
-    # for each edge to add in the list we assembled, create a new edge between
-    # the origin and destination
-    for edge in all_edges_to_add:
-        graph.add_edge(edge["origin"], edge["destination"], **edge["attr_dict"])
-
-    # finally remove all the interstitial nodes between the new edges
-    graph.remove_nodes_from(set(all_nodes_to_remove))
-
-    if remove_rings:
-        graph = _remove_rings(graph)
-
-    # mark the graph as having been simplified
-    graph.graph["simplified"] = True
-
-    msg = (
-        f"Simplified graph: {initial_node_count:,} to {len(graph):,} nodes, "
-        f"{initial_edge_count:,} to {len(graph.edges):,} edges"
-    )
-    logging.info(msg)
-    return graph
+    return GraphSimplifier(
+        strict=strict, remove_rings=remove_rings, track_merged=track_merged
+    ).simplify(graph)
 
 
 def graph_from_gdf(
@@ -1295,16 +1157,24 @@ def graph_from_gdf(
     _created_graph = nx.MultiGraph(crs=gdf.crs)
 
     # create nodes on the Graph
-    for index, row in gdf_nodes.iterrows():
-        c = {node_id: row[node_id], "geometry": row.geometry}
-        _created_graph.add_node(row[node_id], **c)
-
-    # create edges on top of the nodes
-    for index, row in gdf.iterrows():
-        dict_row = row.to_dict()
-        _created_graph.add_edge(
-            u_for_edge=dict_row["node_A"], v_for_edge=dict_row["node_B"], **dict_row
-        )
+    _node_ids = gdf_nodes[node_id].tolist()
+    _created_graph.add_nodes_from(
+        (_id, {node_id: _id, "geometry": _geometry})
+        for _id, _geometry in zip(_node_ids, gdf_nodes.geometry.values)
+    )
+
+    # create edges on top of the nodes, each edge keeps all the columns as attributes
+    # (except a `key` column, which is used as edge key)
+    _edge_columns = [
+        gdf["node_A"].tolist(),
+        gdf["node_B"].tolist(),
+    ]
+    if "key" in gdf.columns:
+        _edge_columns.append(gdf["key"].tolist())
+        _edge_columns.append(gdf.drop(columns="key").to_dict(orient="records"))
+    else:
+        _edge_columns.append(gdf.to_dict(orient="records"))
+    _created_graph.add_edges_from(zip(*_edge_columns))
 
     # make a name
     _created_graph.graph["name"] = name
@@ -1312,11 +1182,94 @@ def graph_from_gdf(
     return _created_graph
 
 
+def get_edges_gdf_from_graph(
+    graph: nx.Graph, fill_edge_geometry: bool = True
+) -> gpd.GeoDataFrame:
+    """
+    Creates a GeoDataFrame with (the attributes of) all the edges of a graph, indexed by
+    `u`, `v` (and `key` for multigraphs).
+
+    Args:
+        graph (nx.Graph): Graph whose edges are converted.
+        fill_edge_geometry (bool, optional): Whether to create a straight line for the edges
+            without a geometry from the `x` and `y` attributes of their nodes. Defaults to True.
+
+    Returns:
+        gpd.GeoDataFrame: Edges table with the graph crs (when known).
+    """
+    if not graph.edges:
+        raise ValueError("graph contains no edges")
+
+    if graph.is_multigraph():
+        _index_names = ["u", "v", "key"]
+        _edges = graph.edges(keys=True, data=True)
+    else:
+        _index_names = ["u", "v"]
+        _edges = graph.edges(data=True)
+    *_index_columns, _data = map(list, zip(*_edges))
+
+    _edges_df = pd.DataFrame(_data)
+    _index = pd.MultiIndex.from_arrays(_index_columns, names=_index_names)
+    _edges_df.index = _index
+
+    if "geometry" not in _edges_df.columns:
+        _edges_df["geometry"] = None
+    _geometry = gpd.GeoSeries(_edges_df["geometry"], index=_index)
+    if fill_edge_geometry and _geometry.isna().any():
+        _missing = _geometry.isna().values
+        _node_x = nx.get_node_attributes(graph, "x")
+        _node_y = nx.get_node_attributes(graph, "y")
+        _from_nodes = _index.get_level_values("u")[_missing]
+        _to_nodes = _index.get_level_values("v")[_missing]
+        _coords = np.column_stack(
+            [
+                [_node_x[_u] for _u in _from_nodes],
+                [_node_y[_u] for _u in _from_nodes],
+                [_node_x[_v] for _v in _to_nodes],
+                [_node_y[_v] for _v in _to_nodes],
+            ]
+        ).reshape(-1, 2, 2)
+        _geometry[_missing] = shapely.linestrings(_coords)
+
+    _edges_df["geometry"] = _geometry
+    return gpd.GeoDataFrame(
+        _edges_df, geometry="geometry", crs=graph.graph.get("crs", None)
+    )
+
+
+def get_nodes_gdf_from_graph(
+    graph: nx.Graph, node_geometry: bool = True
+) -> gpd.GeoDataFrame:
+    """
+    Creates a GeoDataFrame with (the attributes of) all the nodes of a graph, indexed by their id (`osmid`).
+
+    Args:
+        graph (nx.Graph): Graph whose nodes are converted.
+        node_geometry (bool, optional): Whether to create the geometry from the `x` and `y`
+            attributes of the nodes (and set the graph crs). Otherwise an existing `geometry`
+            attribute is used as is. Defaults to True.
+
+    Returns:
+        gpd.GeoDataFrame: Nodes table.
+    """
+    if not graph.nodes:
+        raise ValueError("graph contains no nodes")
+
+    _node_ids, _data = map(list, zip(*graph.nodes(data=True)))
+    _nodes_df = pd.DataFrame(_data, index=pd.Index(_node_ids, name="osmid"))
+    if not node_geometry:
+        return gpd.GeoDataFrame(_nodes_df)
+    return gpd.GeoDataFrame(
+        _nodes_df,
+        geometry=gpd.points_from_xy(_nodes_df["x"], _nodes_df["y"]),
+        crs=graph.graph.get("crs", None),
+    )
+
+
 def graph_to_gdf(
     graph_to_convert: nx.classes.graph.Graph,
     save_nodes: bool = False,
     save_edges: bool = True,
-    to_save: bool = False,
 ):
     """Takes in a networkx graph object and returns edges and nodes as geodataframes
     Arguments:
@@ -1329,21 +1282,12 @@ def graph_to_gdf(
 
     nodes, edges = None, None
     if save_nodes and save_edges:
-        nodes, edges = graph_to_gdfs(
-            graph_to_convert, nodes=save_nodes, edges=save_edges, node_geometry=False
-        )
-
-        if to_save:
-            dfs = [edges, nodes]
-            for df in dfs:
-                for col in df.columns:
-                    if df[col].dtype == object and col != df.geometry.name:
-                        df[col] = df[col].astype(str)
-
+        nodes = get_nodes_gdf_from_graph(graph_to_convert, node_geometry=False)
+        edges = get_edges_gdf_from_graph(graph_to_convert)
     elif not save_nodes and save_edges:
-        edges = graph_to_gdfs(graph_to_convert, nodes=save_nodes, edges=save_edges)
+        edges = get_edges_gdf_from_graph(graph_to_convert)
     elif save_nodes and not save_edges:
-        nodes = graph_to_gdfs(graph_to_convert, nodes=save_nodes, edges=save_edges)
+        nodes = get_nodes_gdf_from_graph(graph_to_convert)
 
     return edges, nodes
 
@@ -1746,127 +1690,9 @@ def calc_avg_speed(graph, road_type_col_name, save_csv=False, save_path=None):
     Returns:
         df (Pandas DataFrame): Dataframe with the average road speeds per road type
     """
-    # Create a dataframe of all road types
-    exceptions = list(
-        set(
-            [
-                str(edata[road_type_col_name])
-                for u, v, edata in graph.edges.data()
-                if isinstance(edata[road_type_col_name], list)
-            ]
-        )
+    return AvgSpeedCalculator(graph, road_type_col_name).get_avg_speed_per_road_type(
+        save_csv=save_csv, save_path=save_path
     )
-    types = list(
-        set(
-            [
-                str(edata[road_type_col_name])
-                for u, v, edata in graph.edges.data()
-                if isinstance(edata[road_type_col_name], str)
-            ]
-        )
-    )
-    all_road_types = exceptions + types
-    df = pd.DataFrame({"road_types": all_road_types, "avg_speed": 0})
-
-    # calculate average speed
-    for i in range(len(df)):
-        roadtype = df.road_types[i]
-        all_edges = [
-            (u, v, edata["maxspeed"], edata["length"])
-            for u, v, edata in graph.edges.data()
-            if (str(edata[road_type_col_name]) == roadtype) & ("maxspeed" in edata)
-        ]
-        all_avg = []
-        all_l = []
-        for u, v, s, l in all_edges:
-            if isinstance(s, list):
-                ns = []
-                for ss in s:
-                    if (
-                        not any(c.isalpha() for c in ss)
-                        and (";" not in ss)
-                        and ("|" not in ss)
-                        and ("-" not in ss)
-                    ):
-                        ns.append(int(ss))
-                    elif not any(c.isalpha() for c in ss) and ";" in ss:
-                        ns.extend([int(x) for x in ss.split(";") if x.isnumeric()])
-                    elif not any(c.isalpha() for c in ss) and "|" in ss:
-                        ns.extend([int(x) for x in ss.split("|") if x.isnumeric()])
-                    elif not any(c.isalpha() for c in ss) and "-" in ss:
-                        ns.extend([int(x) for x in ss.split("-") if x.isnumeric()])
-                    elif " mph" in ss:
-                        ns.append(int(ss.split(" mph")[0]) * 1.609344)
-                if len(ns) > 0:
-                    ss = sum(ns) / len(ns)
-                else:
-                    continue
-            elif isinstance(s, str):
-                if (
-                    not any(c.isalpha() for c in s)
-                    and (";" not in s)
-                    and ("|" not in s)
-                    and ("-" not in s)
-                ):
-                    ss = int(s)
-                elif not any(c.isalpha() for c in s) and ";" in s:
-                    ss = mean([int(x) for x in s.split(";") if x.isnumeric()])
-                elif not any(c.isalpha() for c in s) and "|" in s:
-                    ss = mean([int(x) for x in s.split("|") if x.isnumeric()])
-                elif not any(c.isalpha() for c in s) and "-" in s:
-                    ss = mean([int(x) for x in s.split("-") if x.isnumeric()])
-                elif " mph" in s:
-                    ss = int(s.split(" mph")[0]) * 1.609344
-                else:
-                    continue
-            all_avg.append(ss * l)
-            all_l.append(l)
-            df.iloc[i, 1] = sum(all_avg) / sum(all_l)
-
-    # For all types without an average speed, take one that is closest. E.g. for the links take the one of the same type
-    # of the main roads
-    if not df.loc[df["avg_speed"] == 0].empty:
-        logging.info(
-            f"Not all of the edges contain a 'maxspeed' attribute. RA2CE will guess the right average maximum "
-            f"speed per road type that does not contain a 'maxspeed' attribute. Please check the average speed CSV to ensure correct speeds here: {save_path}"
-        )
-        for i in df.loc[df["avg_speed"] == 0].index:
-            if df["road_types"].iloc[i] in exceptions:
-                if any(rt in df["road_types"].iloc[i] for rt in df["road_types"]):
-                    try:
-                        road_type, avg_speed = [
-                            (rt, avg_s)
-                            for rt, avg_s in zip(df["road_types"], df["avg_speed"])
-                            if rt in df["road_types"].iloc[i] and avg_s != 0
-                        ][0]
-                        df["avg_speed"].iloc[i] = avg_speed
-                    except IndexError as e:
-                        logging.warning(
-                            f"Road type '{df['road_types'].iloc[i]}' cannot be assigned any average speed. Please check the average speed CSV ({save_path}), enter the right average speed for this road type, and run RA2CE again."
-                        )
-                        logging.error("Index error: {}".format(e))
-                        df["avg_speed"].iloc[i] = 0
-            else:
-                # if any(rt in df['road_types'].iloc[i] for rt in df['road_types']):
-                if "link" in df["road_types"].iloc[i]:
-                    try:
-                        df["avg_speed"].iloc[i] = df.loc[
-                            df["road_types"]
-                            == df["road_types"].iloc[i].split("_link")[0],
-                            "avg_speed",
-                        ].values[0]
-                    except IndexError as e:
-                        logging.warning(
-                            f"Road type '{df['road_types'].iloc[i]}' cannot be assigned any average speed. Please check the average speed CSV ({save_path}), enter the right average speed for this road type, and run RA2CE again."
-                        )
-                        logging.error("Index error: {}".format(e))
-                        df["avg_speed"].iloc[i] = 0
-
-    if save_csv:
-        df.to_csv(save_path)
-        logging.info("Saved the average speeds per road type to: {}".format(save_path))
-
-    return df
 
 
 def assign_avg_speed(graph, avg_road_speed, road_type_col_name):
@@ -1874,100 +1700,15 @@ def assign_avg_speed(graph, avg_road_speed, road_type_col_name):
 
     Args:
         graph (NetworkX graph): NetworkX graph with road types
-        avg_road_speed (Pandas DataFrame): a Dataframe with columns "road_types" and "maxspeed"
+        avg_road_speed (Pandas DataFrame): a Dataframe with columns "road_types" and "avg_speed"
         road_type_col_name (string): Attribute name of the road type in the NetworkX graph
 
     Returns:
         graph (NetworkX graph): NetworkX graph with an additional attribute 'avgspeed'
     """
-    # make a list of strings instead of just a string of the road types column
-    avg_road_speed["road_types"] = avg_road_speed["road_types"].astype(str)
-
-    # calculate the average maximum speed per edge and assign the ones that don't have a value
-    for u, v, k, edata in graph.edges.data(keys=True):
-        road_type = str(edata[road_type_col_name])
-        if "maxspeed" in edata:
-            max_speed = edata["maxspeed"]
-            if isinstance(max_speed, list):
-                ns = []
-                for ms in max_speed:
-                    if (
-                        not any(c.isalpha() for c in ms)
-                        and (";" not in ms)
-                        and ("|" not in ms)
-                        and ("-" not in ms)
-                    ):
-                        ns.append(int(ms))
-                    elif not any(c.isalpha() for c in ms) and ";" in ms:
-                        ns.extend([int(x) for x in ms.split(";") if x.isnumeric()])
-                    elif not any(c.isalpha() for c in ms) and "|" in ms:
-                        ns.extend([int(x) for x in ms.split("|") if x.isnumeric()])
-                    elif not any(c.isalpha() for c in ms) and "-" in ms:
-                        ns.extend([int(x) for x in ms.split("-") if x.isnumeric()])
-                    elif " mph" in ms:
-                        ns.append(int(ms.split(" mph")[0]) * 1.609344)
-                if len(ns) > 0:
-                    graph[u][v][k]["avgspeed"] = round(sum(ns) / len(ns), 0)
-                else:
-                    graph[u][v][k]["avgspeed"] = round(
-                        avg_road_speed.loc[
-                            avg_road_speed["road_types"] == road_type, "avg_speed"
-                        ].iloc[0],
-                        0,
-                    )
-            elif isinstance(max_speed, str):
-                if (
-                    not any(c.isalpha() for c in max_speed)
-                    and (";" not in max_speed)
-                    and ("|" not in max_speed)
-                    and ("-" not in max_speed)
-                ):
-                    graph[u][v][k]["avgspeed"] = round(int(max_speed), 0)
-                elif not any(c.isalpha() for c in max_speed) and ";" in max_speed:
-                    graph[u][v][k]["avgspeed"] = round(
-                        mean([int(x) for x in max_speed.split(";") if x.isnumeric()]), 0
-                    )
-                elif not any(c.isalpha() for c in max_speed) and "|" in max_speed:
-                    graph[u][v][k]["avgspeed"] = round(
-                        mean([int(x) for x in max_speed.split("|") if x.isnumeric()]), 0
-                    )
-                elif not any(c.isalpha() for c in max_speed) and "-" in max_speed:
-                    graph[u][v][k]["avgspeed"] = round(
-                        mean([int(x) for x in max_speed.split("-") if x.isnumeric()]), 0
-                    )
-                elif " mph" in max_speed:
-                    graph[u][v][k]["avgspeed"] = round(
-                        int(max_speed.split(" mph")[0]) * 1.609344, 0
-                    )
-                else:
-                    graph[u][v][k]["avgspeed"] = round(
-                        avg_road_speed.loc[
-                            avg_road_speed["road_types"] == road_type, "avg_speed"
-                        ].iloc[0],
-                        0,
-                    )
-        else:
-            if "]" in road_type:
-                avg_speed = int(
-                    [
-                        s
-                        for r, s in zip(
-                            avg_road_speed["road_types"], avg_road_speed["avg_speed"]
-                        )
-                        if set(road_type[2:-2].split("', '"))
-                        == set(r[2:-2].split("', '"))
-                    ][0]
-                )
-                graph[u][v][k]["avgspeed"] = round(avg_speed, 0)
-            else:
-                graph[u][v][k]["avgspeed"] = round(
-                    avg_road_speed.loc[
-                        avg_road_speed["road_types"] == road_type, "avg_speed"
-                    ].iloc[0],
-                    0,
-                )
-
-    return graph
+    return AvgSpeedCalculator(graph, road_type_col_name).assign_avg_speed(
+        avg_road_speed
+    )
 
 
 def fraction_flooded(line: LineString, hazard_map: str):
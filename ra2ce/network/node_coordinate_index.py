@@ -0,0 +1,177 @@
+"""
+                    GNU GENERAL PUBLIC LICENSE
+                      Version 3, 29 June 2007
+
+    Risk Assessment and Adaptation for Critical Infrastructure (RA2CE).
+    Copyright (C) 2023 Stichting Deltares
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    This program is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Hashable, Iterable
+
+import networkx as nx
+
+
+class NodeCoordinateIndex:
+    """
+    Hash map from (rounded) node coordinates to node ids, so that resolving a
+    position into a graph node is an O(1) lookup instead of a scan over all nodes.
+
+    The index has to be kept in sync by adding nodes through it (`add_node` or
+    `add_graph_node`). When several nodes share the same position, the first one
+    registered is returned, which matches the behavior of a linear scan.
+    """
+
+    decimals: int
+
+    def __init__(self, decimals: int = 7) -> None:
+        self.decimals = decimals
+        self._index: dict[tuple[float, float], Hashable] = {}
+
+    @classmethod
+    def from_graph(cls, graph: nx.Graph, decimals: int = 7) -> NodeCoordinateIndex:
+        """
+        Creates an index with all the nodes of a graph which have a position.
+        Positions are read from the `x` and `y` attributes, or from the `geometry`
+        attribute when those are not present.
+
+        Args:
+            graph (nx.Graph): Graph whose nodes need to be indexed.
+            decimals (int, optional): Number of decimals used to round the coordinates. Defaults to 7.
+
+        Returns:
+            NodeCoordinateIndex: Index containing all positioned nodes of the graph.
+        """
+        _node_index = cls(decimals)
+        for _node, _data in graph.nodes(data=True):
+            _position = cls.get_node_position(_data)
+            if _position:
+                _node_index.add_node(_node, *_position)
+        return _node_index
+
+    @classmethod
+    def from_points(
+        cls, node_ids: Iterable[Hashable], points: Iterable[Any], decimals: int = 7
+    ) -> NodeCoordinateIndex:
+        """
+        Creates an index from paired collections of node ids and (shapely) points.
+
+        Args:
+            node_ids (Iterable[Hashable]): Node ids.
+            points (Iterable[Any]): Points (with `x` and `y` properties) of each node.
+            decimals (int, optional): Number of decimals used to round the coordinates. Defaults to 7.
+
+        Returns:
+            NodeCoordinateIndex: Index containing all given nodes.
+        """
+        _node_index = cls(decimals)
+        for _node, _point in zip(node_ids, points):
+            _node_index.add_node(_node, _point.x, _point.y)
+        return _node_index
+
+    @staticmethod
+    def get_node_position(node_data: dict) -> tuple[float, float] | None:
+        """
+        Gets the position of a node from its attributes.
+
+        Args:
+            node_data (dict): Attributes of the node.
+
+        Returns:
+            tuple[float, float] | None: The `x` and `y` coordinates when known.
+        """
+        if (
+            node_data.get("x", None) is not None
+            and node_data.get("y", None) is not None
+        ):
+            return node_data["x"], node_data["y"]
+        if node_data.get("geometry", None) is not None:
+            return node_data["geometry"].x, node_data["geometry"].y
+        return None
+
+    def get_key(self, x: float, y: float) -> tuple[float, float]:
+        """
+        Gets the hashable key representing a position in this index.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            tuple[float, float]: Rounded coordinates.
+        """
+        return round(float(x), self.decimals), round(float(y), self.decimals)
+
+    def add_node(self, node_id: Hashable, x: float, y: float) -> None:
+        """
+        Registers a node position. Positions already registered keep their node.
+
+        Args:
+            node_id (Hashable): Id of the node.
+            x (float): X coordinate of the node.
+            y (float): Y coordinate of the node.
+        """
+        self._index.setdefault(self.get_key(x, y), node_id)
+
+    def add_graph_node(self, graph: nx.Graph, node_id: Hashable, **attributes) -> None:
+        """
+        Adds a node to the graph and registers its position in the index.
+
+        Args:
+            graph (nx.Graph): Graph where the node will be added.
+            node_id (Hashable): Id of the new node.
+            attributes: Attributes of the new node, `x` and `y` or `geometry` are
+                required to register its position.
+        """
+        graph.add_node(node_id, **attributes)
+        _position = self.get_node_position(graph.nodes[node_id])
+        if _position:
+            self.add_node(node_id, *_position)
+
+    def get_node_id(self, x: float, y: float) -> Hashable | None:
+        """
+        Gets the id of the node located at the given position.
+
+        Args:
+            x (float): X coordinate.
+            y (float): Y coordinate.
+
+        Returns:
+            Hashable | None: Id of the node when found, `None` otherwise.
+        """
+        return self._index.get(self.get_key(x, y), None)
+
+    def is_at_position(
+        self, position_a: tuple[float, ...], position_b: tuple[float, ...]
+    ) -> bool:
+        """
+        Checks whether two positions resolve to the same key in this index.
+
+        Args:
+            position_a (tuple[float, ...]): First (x, y) position.
+            position_b (tuple[float, ...]): Second (x, y) position.
+
+        Returns:
+            bool: Whether both positions are considered the same.
+        """
+        return self.get_key(*position_a[:2]) == self.get_key(*position_b[:2])
+
+    def __contains__(self, position: tuple[float, ...]) -> bool:
+        return self.get_key(*position[:2]) in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
@@ -33,13 +33,15 @@ import pandas as pd
 import pyproj
 import rasterio
 import rasterio.mask
-import rasterio.transform
+import rasterio.windows
+import shapely
 from rasterio import Affine
 from rasterio.warp import Resampling, calculate_default_transform, reproject
 from shapely.geometry import LineString, Point
 from tqdm import tqdm
 
 from ra2ce.network.networks_utils import cut, line_length
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
 
 """
 TODO: This whole file should be throughouly tested / redesigned.
@@ -192,14 +194,15 @@ def update_edges_with_new_node(
     new_node_id: int,
     graph_crs: pyproj.CRS,
     inverse_vertices_dict: dict,
+    node_index: NodeCoordinateIndex,
 ):
     # Check which line is connected to which node. There can be 8 different combinations and there should be two
-    # edges added to the graph.
+    # edges added to the graph. Positions are compared through the keys of the node index.
     cnt = 0
+    node_a_coords = graph.nodes[node_a]["geometry"].coords[0]
+    node_b_coords = graph.nodes[node_b]["geometry"].coords[0]
 
-    if Point(graph.nodes[node_a]["geometry"].coords[0]).almost_equals(
-        Point(line_b.coords[-1])
-    ):
+    if node_index.is_at_position(node_a_coords, line_b.coords[-1]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_b != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -223,9 +226,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_b]["geometry"].coords[0]).almost_equals(
-        Point(line_b.coords[0])
-    ):
+    if node_index.is_at_position(node_b_coords, line_b.coords[0]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_b != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -251,9 +252,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_a]["geometry"].coords[0]).almost_equals(
-        Point(line_b.coords[0])
-    ):
+    if node_index.is_at_position(node_a_coords, line_b.coords[0]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_b != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -277,9 +276,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_b]["geometry"].coords[0]).almost_equals(
-        Point(line_b.coords[-1])
-    ):
+    if node_index.is_at_position(node_b_coords, line_b.coords[-1]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_b != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -305,9 +302,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_b]["geometry"].coords[0]).almost_equals(
-        Point(line_a.coords[0])
-    ):
+    if node_index.is_at_position(node_b_coords, line_a.coords[0]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_a != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -333,9 +328,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_a]["geometry"].coords[0]).almost_equals(
-        Point(line_a.coords[-1])
-    ):
+    if node_index.is_at_position(node_a_coords, line_a.coords[-1]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_a != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -359,9 +352,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_b]["geometry"].coords[0]).almost_equals(
-        Point(line_a.coords[-1])
-    ):
+    if node_index.is_at_position(node_b_coords, line_a.coords[-1]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_a != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -387,9 +378,7 @@ def update_edges_with_new_node(
 
         cnt += 1
 
-    if Point(graph.nodes[node_a]["geometry"].coords[0]).almost_equals(
-        Point(line_a.coords[0])
-    ):
+    if node_index.is_at_position(node_a_coords, line_a.coords[0]):
         if node_a == node_b and graph.has_edge(*(node_a, new_node_id, 0)):
             if line_a != graph.edges[(node_a, new_node_id, 0)]["geometry"]:
                 k_new = 1
@@ -436,9 +425,9 @@ def add_od_nodes(
     def find_closest_node(
         closest_node_on_road: np.ndarray,
         inverse_vertices_dict: dict,
-        inverse_nodes_dict: dict,
+        node_index: NodeCoordinateIndex,
         graph: Union[nx.classes.Graph, nx.classes.MultiGraph],
-    ) -> dict[tuple[float, float], int]:
+    ) -> NodeCoordinateIndex:
         closest_u_v_k = inverse_vertices_dict.get(
             (closest_node_on_road[0], closest_node_on_road[1]), None
         )
@@ -454,26 +443,18 @@ def add_od_nodes(
                     ]
                 ),
             )
-            closest_node_on_extremities_id = get_node_id_from_position(
-                graph, *closest_node_on_extremities
+            closest_node_on_extremities_id = node_index.get_node_id(
+                *closest_node_on_extremities
             )
-            inverse_nodes_dict[
-                (closest_node_on_road[0], closest_node_on_road[1])
-            ] = closest_node_on_extremities_id
-
-        return inverse_nodes_dict
-
-    def get_node_id_from_position(
-        g: Union[nx.classes.Graph], x: float, y: float
-    ) -> Union[float, None]:
-        nodes = [
-            (node, data)
-            for node, data in g.nodes(data=True)
-            if "geometry" in data
-            and round(data["geometry"].x, 7) == round(x, 7)
-            and round(data["geometry"].y, 7) == round(y, 7)
-        ]
-        return nodes[0][0] if nodes else None
+            if closest_node_on_extremities_id is not None:
+                # Resolve the position on the road to its closest extremity.
+                node_index.add_node(
+                    closest_node_on_extremities_id,
+                    closest_node_on_road[0],
+                    closest_node_on_road[1],
+                )
+
+        return node_index
 
     """Gets from each origin and destination the closest vertex on the graph edge.
     Args:
@@ -507,10 +488,8 @@ def add_od_nodes(
     # Make an array from the list
     all_vertices = np.array(all_vertices)
 
-    # Also create an inverse nodes dict of the node geometries as keys and node ID's as values
-    inverse_nodes_dict = {
-        node[-1]["geometry"].coords[0]: node[0] for node in graph.nodes.data()
-    }
+    # Also create an index of the node coordinates to resolve the node ID's by position
+    node_index = NodeCoordinateIndex.from_graph(graph)
 
     # Get the maximum node id
     max_node_id = max([n for n in graph.nodes()])
@@ -541,10 +520,10 @@ def add_od_nodes(
 
             new_lines = split_line_with_points(match_geom, [match_od])
             if len(new_lines) == 1:
-                inverse_nodes_dict = find_closest_node(
+                node_index = find_closest_node(
                     closest_node_on_road,
                     inverse_vertices_dict,
-                    inverse_nodes_dict,
+                    node_index,
                     graph,
                 )
 
@@ -568,11 +547,8 @@ def add_od_nodes(
                 # and if the current location is a destination (od_data[-1] is not NaN)
                 node_info["category"] = od.iloc[i][category]
 
-            # Add the new node to the graph
-            graph.add_node(new_node_id, **node_info)
-
-            # Update the inverse_nodes_dict with the new node
-            inverse_nodes_dict[match_od.coords[0]] = new_node_id
+            # Add the new node to the graph and the node index
+            node_index.add_graph_node(graph, new_node_id, **node_info)
 
             # Delete the new node from the inverse_vertices_dict as no end-points are included here
             del inverse_vertices_dict[match_od.coords[0]]
@@ -589,14 +565,21 @@ def add_od_nodes(
                 new_node_id,
                 crs,
                 inverse_vertices_dict,
+                node_index,
             )
 
         except (KeyError, AssertionError):
             # If the vertex is at the end of the road it won't be found in the inverse_vertices_dict,
-            # so search in the inverse_nodes_dict.
-            match_node = inverse_nodes_dict[
-                (closest_node_on_road[0], closest_node_on_road[1])
-            ]
+            # so search in the node index.
+            match_node = node_index.get_node_id(
+                closest_node_on_road[0], closest_node_on_road[1]
+            )
+            if match_node is None:
+                raise KeyError(
+                    "No graph node found at ({}, {}) for {}.".format(
+                        closest_node_on_road[0], closest_node_on_road[1], match_name
+                    )
+                )
 
             # Update the node with the OD attribute
             graph = add_data_to_existing_node(graph, match_node, match_name)
@@ -718,37 +701,110 @@ def export_raster_to_geotiff(array, meta, dir_path: Path, filename: str) -> Path
     return cropped_outputfile
 
 
-def generate_points_from_raster(fn, out_fn):
-    # Read raster coordinate centroid
-    with rasterio.open(fn) as src:
-        points = []
-        for col in range(src.width):
-            x_s, y_s = rasterio.transform.xy(
-                src.transform,
-                [row for row in range(src.height)],
-                [col for _ in range(src.height)],
-            )
-            points += [Point(x, y) for x, y in zip(x_s, y_s)]
+def _get_raster_row_windows(src: rasterio.DatasetReader, aggregation_factor: int):
+    """Yields full-width row windows whose height is a multiple of the aggregation factor."""
+    _block_height = src.block_shapes[0][0]
+    _window_height = max(1, _block_height // aggregation_factor) * aggregation_factor
+    for _row_off in range(0, src.height, _window_height):
+        yield rasterio.windows.Window(
+            col_off=0,
+            row_off=_row_off,
+            width=src.width,
+            height=min(_window_height, src.height - _row_off),
+        )
 
-    # Put raster coordinates into geodataframe
-    gdf = gpd.GeoDataFrame()
-    gdf["geometry"] = points
-    gdf["OBJECTID"] = [x for x in range(len(gdf))]
 
-    # Get raster values
-    temp = [gdf["geometry"].x, gdf["geometry"].y]
-    coords = list(map(list, zip(*temp)))
+def _get_populated_cells_in_window(
+    src: rasterio.DatasetReader,
+    window: rasterio.windows.Window,
+    aggregation_factor: int,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Gets the id, cell-center coordinates and value of all the (aggregated) cells
+    with a positive value within a window of the raster.
+    """
+    _values = src.read(1, window=window, masked=True).filled(0)
+    if aggregation_factor > 1:
+        # Sum the positive values of the cells within each coarser cell.
+        _values = np.where(_values > 0, _values, 0).astype(np.float64)
+        _pad_rows = -_values.shape[0] % aggregation_factor
+        _pad_cols = -_values.shape[1] % aggregation_factor
+        _values = np.pad(_values, ((0, _pad_rows), (0, _pad_cols)))
+        _values = _values.reshape(
+            _values.shape[0] // aggregation_factor,
+            aggregation_factor,
+            _values.shape[1] // aggregation_factor,
+            aggregation_factor,
+        ).sum(axis=(1, 3))
+
+    _rows, _cols = np.nonzero(_values > 0)
+    _cell_values = _values[_rows, _cols]
+    _rows = _rows + window.row_off // aggregation_factor
+
+    # Cell centers in pixel space; coarser cells on the edges are clipped.
+    _pixel_x = (
+        _cols * aggregation_factor
+        + np.minimum((_cols + 1) * aggregation_factor, src.width)
+    ) / 2
+    _pixel_y = (
+        _rows * aggregation_factor
+        + np.minimum((_rows + 1) * aggregation_factor, src.height)
+    ) / 2
+    _x, _y = src.transform * (_pixel_x, _pixel_y)
+
+    # Ids are assigned column-major over the (aggregated) grid.
+    _grid_height = -(-src.height // aggregation_factor)
+    _object_ids = _cols.astype(np.int64) * _grid_height + _rows
+    return _object_ids, np.asarray(_x), np.asarray(_y), _cell_values
+
+
+def generate_points_from_raster(fn, out_fn, aggregation_factor: int = 1):
+    """
+    Generates a point at the cell center of every cell with a positive value of a raster.
+    The raster is streamed by windows of rows, so only the populated cells are kept in memory.
+
+    Args:
+        fn (Path): Raster (*.tif) file.
+        out_fn (Path): Output file for the points.
+        aggregation_factor (int, optional): Number of cells (in each direction) summed
+            into a coarser cell before the points are created. Defaults to 1.
+
+    Raises:
+        ValueError: When the aggregation factor is smaller than 1.
+
+    Returns:
+        Path: The output file with the `OBJECTID` and `values` of each point.
+    """
+    if aggregation_factor < 1:
+        raise ValueError(
+            f"The aggregation factor should be at least 1, got {aggregation_factor}."
+        )
     with rasterio.open(fn) as src:
-        gdf.crs = src.crs
-        gdf["values"] = [sample[0] for sample in src.sample(coords)]
+        _crs = src.crs
+        _windows_cells = [
+            _get_populated_cells_in_window(src, _window, aggregation_factor)
+            for _window in _get_raster_row_windows(src, aggregation_factor)
+        ]
+    _object_ids, _x, _y, _values = map(np.concatenate, zip(*_windows_cells))
+    _order = np.argsort(_object_ids, kind="stable")
 
-    # Save non-zero cells
-    gdf.loc[gdf["values"] > 0].to_file(out_fn)
+    # Put raster coordinates into geodataframe
+    gdf = gpd.GeoDataFrame(
+        {
+            "geometry": shapely.points(_x[_order], _y[_order]),
+            "OBJECTID": _object_ids[_order],
+            "values": _values[_order],
+        },
+        crs=_crs,
+    )
+    gdf.to_file(out_fn)
 
     return out_fn
 
 
-def origins_from_raster(output_folder: Path, mask_fn, raster_fn) -> Path:
+def origins_from_raster(
+    output_folder: Path, mask_fn, raster_fn, aggregation_factor: int = 1
+) -> Path:
     """Makes origin points from a population raster."""
     output_fn = output_folder / "origins_raster.tif"
     mask = gpd.read_file(mask_fn[0], engine="pyogrio")
@@ -764,6 +820,6 @@ def origins_from_raster(output_folder: Path, mask_fn, raster_fn) -> Path:
     )
 
     out_fn = output_folder / "origins_points.gpkg"
-    out_fn = generate_points_from_raster(outputfile, out_fn)
+    out_fn = generate_points_from_raster(outputfile, out_fn, aggregation_factor)
 
     return out_fn
@@ -23,6 +23,8 @@ import logging
 from decimal import Decimal
 
 import geopandas as gpd
+import numpy as np
+import shapely
 from shapely.geometry import LineString, MultiLineString, Point
 
 from ra2ce.network.networks_utils import cut as network_cut
@@ -158,33 +160,262 @@ class Segmentation:  # Todo: more naturally, this would be METHOD of the network
 
         return result_list
 
+    def get_numbers_of_segments(
+        self, lengths: np.ndarray, split_length: float
+    ) -> np.ndarray:
+        """Vectorized version of `number_of_segments` for an array of line lengths.
+
+        Args:
+            lengths (np.ndarray): Lengths of the linestrings.
+            split_length (float): The length by which to divide the linestrings.
+
+        Returns:
+            np.ndarray: Integer number of segments for each length.
+        """
+        _quotients = lengths / split_length
+        _n_segments = _quotients.astype(np.int64) + 1
+        # Only the (nearly) exact multiples require the decimal divisibility check.
+        for _idx in np.flatnonzero(np.isclose(_quotients, np.round(_quotients))):
+            if self.check_divisibility(float(lengths[_idx]), split_length):
+                _n_segments[_idx] -= 1
+        return _n_segments
+
+    def get_irregular_linestrings(
+        self, linestrings: np.ndarray, split_length: float
+    ) -> np.ndarray:
+        """Flags the linestrings that can not be split at once with the same result as `split_linestring`.
+        These are the linestrings with a length or a vertex distance (nearly) a multiple of
+        split_length, where float noise decides on a (near) zero-length tail segment or on which
+        segment gets the vertex, and the linestrings with a vertex that does not project on its own
+        position (e.g. closed or self-touching lines), where the projection based cuts of
+        `split_linestring` behave differently.
+
+        Args:
+            linestrings (np.ndarray): Array of LineString objects.
+            split_length (float): Length by which the linestrings will be split.
+
+        Returns:
+            np.ndarray: Boolean mask of the irregular linestrings.
+        """
+        _quotients = shapely.length(linestrings) / split_length
+        _irregular = np.isclose(_quotients, np.round(_quotients), rtol=0.0, atol=1e-9)
+
+        _coords, _vertex_line = shapely.get_coordinates(linestrings, return_index=True)
+        if not _coords.size:
+            return _irregular
+        _steps = np.zeros(len(_coords))
+        _steps[1:] = np.hypot(*(_coords[1:] - _coords[:-1]).T)
+        _first_vertex = np.flatnonzero(np.r_[True, np.diff(_vertex_line) != 0])
+        _steps[_first_vertex] = 0.0
+        _distances = np.cumsum(_steps)
+        _distances -= _distances[_first_vertex][_vertex_line]
+        # Repeated vertices trigger a spurious invalid value warning.
+        with np.errstate(invalid="ignore"):
+            _projected = shapely.line_locate_point(
+                linestrings[_vertex_line], shapely.points(_coords)
+            )
+        _vertex_quotients = _distances / split_length
+        _on_cut = np.isclose(
+            _vertex_quotients, np.round(_vertex_quotients), rtol=0.0, atol=1e-9
+        )
+        _on_cut[_first_vertex] = False
+        _irregular[
+            _vertex_line[
+                ~np.isclose(
+                    _projected / split_length, _vertex_quotients, rtol=0.0, atol=1e-9
+                )
+                | _on_cut
+                | (_steps == 0.0) & ~np.isin(np.arange(len(_coords)), _first_vertex)
+            ]
+        ] = True
+        return _irregular
+
+    def split_linestrings(
+        self, linestrings: np.ndarray, split_length: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Cuts all linestrings in segments of length split_length (and a shorter remainder).
+        Equivalent to calling `split_linestring` for each linestring: the regular linestrings are
+        cut at once, the irregular ones (see `get_irregular_linestrings`) one by one.
+
+        Args:
+            linestrings (np.ndarray): Array of LineString objects.
+            split_length (float): Length by which to split the linestrings into equal segments.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The segments (ordered per linestring) and the number of
+                segments of each linestring.
+        """
+        _irregular = self.get_irregular_linestrings(linestrings, split_length)
+        _n_segments = np.zeros(len(linestrings), dtype=np.int64)
+        _regular_segments, _n_segments[~_irregular] = self._split_regular_linestrings(
+            linestrings[~_irregular], split_length
+        )
+        _irregular_segments = [
+            self.split_linestring(_line, split_length)
+            for _line in linestrings[_irregular]
+        ]
+        _n_segments[_irregular] = list(map(len, _irregular_segments))
+
+        _segment_line = np.repeat(np.arange(len(linestrings)), _n_segments)
+        _segments = np.empty(len(_segment_line), dtype=object)
+        _segments[~_irregular[_segment_line]] = _regular_segments
+        if _irregular_segments:
+            _segments[_irregular[_segment_line]] = [
+                _segment for _line in _irregular_segments for _segment in _line
+            ]
+        return _segments, _n_segments
+
+    def _split_regular_linestrings(
+        self, linestrings: np.ndarray, split_length: float
+    ) -> tuple[np.ndarray, np.ndarray]:
+        _lengths = shapely.length(linestrings)
+        _n_segments = self.get_numbers_of_segments(_lengths, split_length)
+
+        # Cut distances (from the start of each line), cuts beyond the line end are skipped.
+        _n_cuts = np.maximum(_n_segments - 1, 0)
+        _cut_line = np.repeat(np.arange(len(linestrings)), _n_cuts)
+        _cut_k = (
+            np.arange(len(_cut_line))
+            - np.repeat(np.cumsum(_n_cuts) - _n_cuts, _n_cuts)
+            + 1
+        )
+        _cut_distances = _cut_k * split_length
+        _valid_cuts = _cut_distances < _lengths[_cut_line]
+        _cut_line = _cut_line[_valid_cuts]
+        _cut_distances = _cut_distances[_valid_cuts]
+        _n_cuts = np.bincount(_cut_line, minlength=len(linestrings))
+        _n_segments = np.where(_n_segments > 0, _n_cuts + 1, 0)
+
+        _segments = np.empty(_n_segments.sum(), dtype=object)
+        _first_segment = np.cumsum(_n_segments) - _n_segments
+        _unsplit = _n_segments == 1
+        _segments[_first_segment[_unsplit]] = linestrings[_unsplit]
+        _split = np.flatnonzero(_n_segments > 1)
+        if not _split.size:
+            return _segments, _n_segments
+
+        # Boundaries of the segments per split line: start, cut points and end.
+        _coords, _vertex_line = shapely.get_coordinates(
+            linestrings[_split], return_index=True
+        )
+        _line_position = np.full(len(linestrings), -1)
+        _line_position[_split] = np.arange(_split.size)
+        _is_split_cut = _line_position[_cut_line] >= 0
+        _n_boundaries = _n_segments[_split] + 1
+        _first_boundary = np.cumsum(_n_boundaries) - _n_boundaries
+        _first_vertex = np.flatnonzero(np.r_[True, np.diff(_vertex_line) != 0])
+        _last_vertex = np.r_[_first_vertex[1:], len(_coords)] - 1
+        _boundaries = np.empty((_n_boundaries.sum(), 2))
+        _boundaries[_first_boundary] = _coords[_first_vertex]
+        _boundaries[_first_boundary + _n_boundaries - 1] = _coords[_last_vertex]
+        _cut_position = _line_position[_cut_line[_is_split_cut]]
+        _cut_rank = np.arange(_cut_position.size) - np.repeat(
+            np.cumsum(_n_boundaries - 2) - (_n_boundaries - 2), _n_boundaries - 2
+        )
+        _boundaries[
+            _first_boundary[_cut_position] + _cut_rank + 1
+        ] = shapely.get_coordinates(
+            shapely.line_interpolate_point(
+                linestrings[_cut_line[_is_split_cut]], _cut_distances[_is_split_cut]
+            )
+        )
+
+        # Segment (of its line) to which every inner vertex belongs.
+        _steps = np.zeros(len(_coords))
+        _steps[1:] = np.hypot(*(_coords[1:] - _coords[:-1]).T)
+        _steps[_first_vertex] = 0.0
+        _distances = np.cumsum(_steps)
+        # Vertices (almost) on a cut are replaced by the cut point.
+        _tolerance = 4 * np.finfo(float).eps * max(_distances[-1], split_length)
+        _distances -= _distances[_first_vertex][_vertex_line]
+        _line_n_segments = _n_segments[_split][_vertex_line]
+        _vertex_k = np.floor(_distances / split_length).astype(np.int64)
+        _vertex_k = np.where(
+            _vertex_k * split_length > _distances, _vertex_k - 1, _vertex_k
+        )
+        _vertex_k = np.where(
+            (_vertex_k + 1) * split_length <= _distances, _vertex_k + 1, _vertex_k
+        )
+        _vertex_k = np.clip(_vertex_k, 0, _line_n_segments - 1)
+        _is_inner = (_distances > _vertex_k * split_length + _tolerance) & (
+            _distances < (_vertex_k + 1) * split_length - _tolerance
+        )
+        _is_inner[_first_vertex] = False
+        _is_inner[_last_vertex] = False
+
+        # Assemble the coordinates of all segments: start, inner vertices and end.
+        _split_first_segment = np.cumsum(_n_segments[_split]) - _n_segments[_split]
+        _n_split_segments = _n_segments[_split].sum()
+        _segment_line = np.repeat(np.arange(_split.size), _n_segments[_split])
+        _segment_k = np.arange(_n_split_segments) - _split_first_segment[_segment_line]
+        _segment_start = _first_boundary[_segment_line] + _segment_k
+        _segment_ids = np.concatenate(
+            [
+                np.arange(_n_split_segments),
+                _split_first_segment[_vertex_line[_is_inner]] + _vertex_k[_is_inner],
+                np.arange(_n_split_segments),
+            ]
+        )
+        _order = np.concatenate(
+            [
+                np.full(_n_split_segments, -1),
+                np.flatnonzero(_is_inner),
+                np.full(_n_split_segments, len(_coords)),
+            ]
+        )
+        _segment_coords = np.concatenate(
+            [
+                _boundaries[_segment_start],
+                _coords[_is_inner],
+                _boundaries[_segment_start + 1],
+            ]
+        )
+        _sorting = np.lexsort((_order, _segment_ids))
+        _split_segments = shapely.linestrings(
+            _segment_coords[_sorting], indices=_segment_ids[_sorting]
+        )
+        _segments[
+            np.repeat(_first_segment[_split], _n_segments[_split]) + _segment_k
+        ] = _split_segments
+        return _segments, _n_segments
+
     def cut_gdf(self):
         """
-        Cuts every linestring or multilinestring feature in a gdf to equal length segments. Assumes only linestrings for now.
+        Cuts every linestring or multilinestring feature in a gdf to equal length segments.
+        Linestrings are cut all at once, multilinestrings are cut one by one.
 
             *gdf* (GeoDataFrame) : GeoDataFrame to split
             *length* (units of the projection) : Typically in degrees, 0.001 degrees ~ 111 m in Europe
         """
         gdf = self.edges_input.copy()
-        columns = gdf.columns
-
-        data = {"splt_id": []}
-
-        for column in columns:
-            data[column] = []
-
-        count = 0
-        for _, row in gdf.iterrows():
-            geom = row["geometry"]
-            assert type(geom) == LineString or type(geom) == MultiLineString
-            linestrings = self.split_linestring(geom, self.segmentation_length)
-
-            for _, linestring in enumerate(linestrings):
-                for key, value in row.items():
-                    if key == "geometry":
-                        data[key].append(linestring)
-                    else:
-                        data[key].append(value)
-                data["splt_id"].append(count)
-                count += 1
-        self.edges_segmented = gpd.GeoDataFrame(data)
+        _geometries = gdf["geometry"].to_numpy()
+        _geometry_types = shapely.get_type_id(_geometries)
+        assert np.isin(
+            _geometry_types,
+            [shapely.GeometryType.LINESTRING, shapely.GeometryType.MULTILINESTRING],
+        ).all()
+        _is_linestring = _geometry_types == shapely.GeometryType.LINESTRING
+
+        _n_segments = np.zeros(len(gdf), dtype=np.int64)
+        _line_segments, _n_segments[_is_linestring] = self.split_linestrings(
+            _geometries[_is_linestring], self.segmentation_length
+        )
+        _multi_segments = [
+            self.split_linestring(_geom, self.segmentation_length)
+            for _geom in _geometries[~_is_linestring]
+        ]
+        _n_segments[~_is_linestring] = list(map(len, _multi_segments))
+
+        # Repeat the attributes of every row once per segment.
+        _segment_row = np.repeat(np.arange(len(gdf)), _n_segments)
+        _segments = np.empty(len(_segment_row), dtype=object)
+        _segments[_is_linestring[_segment_row]] = _line_segments
+        if _multi_segments:
+            _segments[~_is_linestring[_segment_row]] = [
+                _segment for _row in _multi_segments for _segment in _row
+            ]
+
+        _segmented = gdf.iloc[_segment_row].reset_index(drop=True)
+        _segmented["geometry"] = gpd.GeoSeries(_segments, crs=gdf.crs)
+        _segmented.insert(0, "splt_id", np.arange(len(_segmented)))
+        self.edges_segmented = gpd.GeoDataFrame(_segmented)
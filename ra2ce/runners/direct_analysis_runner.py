@@ -21,18 +21,30 @@
 
 import logging
 import time
+from contextlib import nullcontext
 
 from ra2ce.analysis.analysis_collection import AnalysisCollection
 from ra2ce.analysis.analysis_config_wrapper import AnalysisConfigWrapper
-from ra2ce.analysis.analysis_result_wrapper import AnalysisResultWrapper
-from ra2ce.analysis.analysis_result_wrapper_exporter import (
-    AnalysisResultWrapperExporter,
+from ra2ce.analysis.analysis_result_export_pipeline import (
+    AnalysisResultExportPipeline,
 )
+from ra2ce.analysis.analysis_result_wrapper import AnalysisResultWrapper
 from ra2ce.configuration.config_wrapper import ConfigWrapper
 from ra2ce.runners.analysis_runner_protocol import AnalysisRunner
 
 
 class DirectAnalysisRunner(AnalysisRunner):
+    def __init__(
+        self, export_pipeline: AnalysisResultExportPipeline | None = None
+    ) -> None:
+        """
+        Args:
+            export_pipeline (AnalysisResultExportPipeline | None, optional): Pipeline
+                exporting the results, the caller waits for it. Defaults to None (the
+                runner exports the results and waits for them at the end of `run`).
+        """
+        self.export_pipeline = export_pipeline
+
     def __str__(self) -> str:
         return "Direct Analysis Runner"
 
@@ -58,26 +70,32 @@ class DirectAnalysisRunner(AnalysisRunner):
     ) -> list[AnalysisResultWrapper]:
         _analysis_collection = AnalysisCollection.from_config(analysis_config)
         _results = []
-        for analysis in _analysis_collection.direct_analyses:
-            logging.info(
-                "----------------------------- Started analyzing '%s'  -----------------------------",
-                analysis.analysis.name,
-            )
-            starttime = time.time()
+        # The results are written in the background, while the next analysis runs.
+        with (
+            nullcontext(self.export_pipeline)
+            if self.export_pipeline is not None
+            else AnalysisResultExportPipeline()
+        ) as _export_pipeline:
+            for analysis in _analysis_collection.direct_analyses:
+                logging.info(
+                    "----------------------------- Started analyzing '%s'  -----------------------------",
+                    analysis.analysis.name,
+                )
+                starttime = time.time()
 
-            _result = analysis.execute()
-            _result_wrapper = AnalysisResultWrapper(
-                analysis_result=_result, analysis=analysis
-            )
-            _results.append(_result_wrapper)
+                _result = analysis.execute()
+                _result_wrapper = AnalysisResultWrapper(
+                    analysis_result=_result, analysis=analysis
+                )
+                _results.append(_result_wrapper)
 
-            AnalysisResultWrapperExporter().export_result(_result_wrapper)
+                _export_pipeline.submit(_result_wrapper)
 
-            endtime = time.time()
-            logging.info(
-                "----------------------------- Analysis '%s' finished. "
-                "Time: %ss  -----------------------------",
-                analysis.analysis.name,
-                str(round(endtime - starttime, 2)),
-            )
+                endtime = time.time()
+                logging.info(
+                    "----------------------------- Analysis '%s' finished. "
+                    "Time: %ss  -----------------------------",
+                    analysis.analysis.name,
+                    str(round(endtime - starttime, 2)),
+                )
         return _results
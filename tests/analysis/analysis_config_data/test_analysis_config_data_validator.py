@@ -1,3 +1,5 @@
+import pytest
+
 from ra2ce.analysis.analysis_config_data.analysis_config_data import (
     AnalysisConfigData,
     AnalysisSectionDirect,
@@ -13,6 +15,7 @@ from ra2ce.analysis.analysis_config_data.enums.damage_curve_enum import DamageCu
 from ra2ce.analysis.analysis_config_data.enums.event_type_enum import EventTypeEnum
 from ra2ce.common.validation.ra2ce_validator_protocol import Ra2ceIoValidator
 from ra2ce.common.validation.validation_report import ValidationReport
+from ra2ce.network.network_config_data.network_config_data import HazardSection
 from tests import test_data, test_results
 
 
@@ -90,3 +93,31 @@ class TestAnalysisConfigDataValidator:
         # 3. Verify final expectations.
         assert not _report.is_valid()
         assert len(_report._errors) == 4
+
+    @pytest.mark.parametrize(
+        "analysis, expected",
+        [
+            pytest.param(AnalysisDirectEnum.DIRECT, True, id="Direct damage"),
+            pytest.param(
+                AnalysisDirectEnum.EFFECTIVENESS_MEASURES,
+                False,
+                id="Effectiveness measures",
+            ),
+        ],
+    )
+    def test_validate_overlay_base_network_in_analysis(
+        self, analysis: AnalysisDirectEnum, expected: bool
+    ):
+        # 1. Define test data.
+        _test_config_data = AnalysisConfigData(
+            analyses=[AnalysisSectionDirect(name="test", analysis=analysis)],
+            hazard=HazardSection(overlay_base_network_in_analysis=True),
+        )
+
+        # 2. Run test.
+        _report = AnalysisConfigDataValidator(
+            _test_config_data
+        )._validate_overlay_base_network_in_analysis()
+
+        # 3. Verify expectations.
+        assert _report.is_valid() == expected
@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from ra2ce.analysis.direct.damage.damage_curve_registry import DamageCurveRegistry
+from tests import test_results
+
+
+class TestDamageCurveRegistry:
+    @pytest.fixture
+    def _source_file(self, request: pytest.FixtureRequest) -> Path:
+        _test_dir = test_results.joinpath(request.node.name)
+        _test_dir.mkdir(parents=True, exist_ok=True)
+        _source_file = _test_dir.joinpath("curve.csv")
+        _source_file.write_text("depth,damage\n0,0\n1,1\n")
+        for _cache_file in _test_dir.joinpath("cache").glob("*.npz"):
+            _cache_file.unlink()
+        return _source_file
+
+    def test_get_compiled_without_changes_uses_cache(self, _source_file: Path):
+        # 1. Define test data.
+        _cache_dir = _source_file.with_name("cache")
+        _calls = []
+
+        def compile_func():
+            _calls.append(1)
+            return dict(breakpoints=np.array([0.0, 1.0]), values=np.array([0.0, 1.0]))
+
+        # 2. Run test.
+        _first = DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+        _second = DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+
+        # 3. Verify expectations.
+        assert _cache_dir.joinpath("curve.npz").is_file()
+        assert len(_calls) == 1
+        assert list(_second) == ["breakpoints", "values"]
+        np.testing.assert_array_equal(_first["values"], _second["values"])
+
+    def test_get_compiled_with_changed_source_compiles_again(self, _source_file: Path):
+        # 1. Define test data.
+        _cache_dir = _source_file.with_name("cache")
+        _calls = []
+
+        def compile_func():
+            _calls.append(1)
+            return dict(values=np.array([len(_calls)]))
+
+        DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+        _source_file.write_text("depth,damage\n0,0\n2,1\n")
+
+        # 2. Run test.
+        _result = DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+
+        # 3. Verify expectations.
+        assert _result["values"].tolist() == [2]
+        assert len(_calls) == 2
+
+    def test_get_compiled_with_other_format_version_compiles_again(
+        self, _source_file: Path, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define test data.
+        _cache_dir = _source_file.with_name("cache")
+        _calls = []
+
+        def compile_func():
+            _calls.append(1)
+            return dict(values=np.array([len(_calls)]))
+
+        DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+        monkeypatch.setattr(
+            DamageCurveRegistry,
+            "format_version",
+            DamageCurveRegistry.format_version + 1,
+        )
+
+        # 2. Run test.
+        _result = DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], compile_func
+        )
+
+        # 3. Verify expectations.
+        assert _result["values"].tolist() == [2]
+
+    def test_get_compiled_with_pickled_cache_compiles_again(self, _source_file: Path):
+        # 1. Define test data.
+        _cache_dir = _source_file.with_name("cache")
+        _cache_dir.mkdir(exist_ok=True)
+        np.savez(
+            _cache_dir.joinpath("curve.npz"),
+            checksum=np.array(DamageCurveRegistry.get_checksum([_source_file])),
+            values=np.array([object()], dtype=object),
+        )
+
+        # 2. Run test.
+        _result = DamageCurveRegistry(_cache_dir).get_compiled(
+            "curve", [_source_file], lambda: dict(values=np.array([42]))
+        )
+
+        # 3. Verify expectations.
+        assert _result["values"].tolist() == [42]
+
+    def test_get_compiled_without_cache_dir(self, _source_file: Path):
+        _registry = DamageCurveRegistry()
+        _result = _registry.get_compiled(
+            "curve", [_source_file], lambda: dict(values=np.array([42]))
+        )
+        assert _result["values"].tolist() == [42]
@@ -0,0 +1,61 @@
+import math
+
+import numpy as np
+import pytest
+
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+
+
+class TestPiecewiseLinearCurve:
+    def test_from_points_sorts_breakpoints(self):
+        # 1. Run test.
+        _curve = PiecewiseLinearCurve.from_points([2, 0, 1], [0.8, 0.0, 0.4])
+
+        # 2. Verify expectations.
+        assert list(_curve.breakpoints) == [0.0, 1.0, 2.0]
+        assert list(_curve.values) == [0.0, 0.4, 0.8]
+
+    def test_from_points_with_different_lengths_raises(self):
+        with pytest.raises(ValueError):
+            PiecewiseLinearCurve.from_points([0, 1], [0.0])
+
+    @pytest.mark.parametrize(
+        "x, expected",
+        [
+            pytest.param(0.5, 0.2, id="Interpolated"),
+            pytest.param(-1, 0.0, id="Below range"),
+            pytest.param(10, 0.8, id="Above range"),
+        ],
+    )
+    def test_call_with_scalar(self, x: float, expected: float):
+        _curve = PiecewiseLinearCurve.from_points([0, 1, 2], [0.0, 0.4, 0.8])
+        assert _curve(x) == pytest.approx(expected)
+
+    def test_call_with_matrix_keeps_shape_and_nan(self):
+        # 1. Define test data.
+        _curve = PiecewiseLinearCurve.from_points([0, 1, 2], [0.0, 0.4, 0.8])
+        _events = np.array([[0.5, np.nan], [1.5, 3.0]])
+
+        # 2. Run test.
+        _result = _curve(_events)
+
+        # 3. Verify expectations.
+        assert _result.shape == (2, 2)
+        assert _result[0, 0] == pytest.approx(0.2)
+        assert math.isnan(_result[0, 1])
+        assert _result[1] == pytest.approx([0.6, 0.8])
+
+    def test_evaluate_samples_with_curve_values_equals_call(self):
+        # 1. Define test data.
+        _curve = PiecewiseLinearCurve.from_points([0, 1, 1, 2], [0.0, 0.2, 0.5, 1.0])
+        _x = np.array([[-1.0, 0.5, 1.0], [1.5, 3.0, np.nan]])
+
+        # 2. Run test.
+        _result = _curve.evaluate_samples(
+            _x, np.stack([_curve.values, _curve.values * 2])
+        )
+
+        # 3. Verify expectations.
+        assert _result.shape == (2, 2, 3)
+        np.testing.assert_allclose(_result[0], _curve(_x))
+        np.testing.assert_allclose(_result[1], 2 * _curve(_x))
@@ -1,6 +1,7 @@
 import geopandas as gpd
 import numpy as np
 import pytest
+from shapely.geometry import Point
 
 from ra2ce.analysis.direct.damage_calculation.damage_network_base import (
     DamageNetworkBase,
@@ -60,3 +61,56 @@ class TestDamageNetworkBase:
         assert all(np.isnan(v) for v in _dnb.gdf["dam_abc"].values)
         assert len(_dnb.gdf["dam_cde"].values) == 2
         assert all(np.isnan(v) for v in _dnb.gdf["dam_cde"].values)
+
+    @pytest.mark.parametrize(
+        "parallel_min_size",
+        [
+            pytest.param(np.inf, id="Sequential"),
+            pytest.param(0, id="Concurrent"),
+        ],
+    )
+    def test_calculate_damage_manual_functions(self, parallel_min_size: float):
+        # 1. Define test data.
+        class MockedDamageFunction:
+            def __init__(self, prefix: str, max_damage: float):
+                self.prefix = prefix
+                self.max_damage = max_damage
+
+            def get_max_damages(self, df):
+                return np.full(len(df), self.max_damage)
+
+            def get_damage(self, max_damages, lengths, severity, fraction):
+                return np.round(max_damages * severity * lengths * fraction, 0)
+
+        class MockedManualDamageFunctions:
+            loaded = [MockedDamageFunction("A", 10), MockedDamageFunction("B", 20)]
+
+        _dnb = MockedDNB(None, [])
+        _dnb.parallel_min_size = parallel_min_size
+        _dnb.max_workers = 2
+        _dnb.gdf = gpd.GeoDataFrame(
+            {
+                "length": [1.0, 2.0, 3.0],
+                "F_EV1_me": [0.5, 1.0, 0.0],
+                "F_EV1_fr": [1.0, 1.0, 1.0],
+                "F_EV2_me": [1.0, 0.5, 1.0],
+                "F_EV2_fr": [0.5, 1.0, 1.0],
+                "dam_EV1_A": [-1.0, -1.0, -1.0],
+            },
+            geometry=[Point(0, 0)] * 3,
+            crs="EPSG:4326",
+        )
+        _dnb._gdf_mask = _dnb.gdf.iloc[[0, 1]]
+
+        # 2. Run test.
+        _dnb.calculate_damage_manual_functions(
+            ["EV1", "EV2"], MockedManualDamageFunctions()
+        )
+
+        # 3. Verify expectations.
+        assert isinstance(_dnb.gdf, gpd.GeoDataFrame)
+        assert _dnb.gdf.crs == "EPSG:4326"
+        np.testing.assert_array_equal(_dnb.gdf["dam_EV1_A"], [5.0, 20.0, np.nan])
+        np.testing.assert_array_equal(_dnb.gdf["dam_EV2_A"], [5.0, 10.0, np.nan])
+        np.testing.assert_array_equal(_dnb.gdf["dam_EV1_B"], [10.0, 40.0, np.nan])
+        np.testing.assert_array_equal(_dnb.gdf["dam_EV2_B"], [10.0, 20.0, np.nan])
@@ -1,8 +1,13 @@
+import warnings
+
 import numpy as np
 import pandas as pd
 import pytest
 
 from ra2ce.analysis.analysis_config_data.enums.damage_curve_enum import DamageCurveEnum
+from ra2ce.analysis.analysis_config_data.enums.risk_calculation_mode_enum import (
+    RiskCalculationModeEnum,
+)
 from ra2ce.analysis.direct.damage_calculation.damage_network_base import (
     DamageNetworkBase,
 )
@@ -70,3 +75,133 @@ class TestDamageNetworkReturnPeriods:
 
         # 3. Verify expectations.
         assert np.array_equal(res, np.array([7.5, 3.75]))
+
+    def test_get_damage_columns_per_curve(self):
+        # 1. Define test data.
+        _dam_cols = [
+            "dam_RP100_HZ",
+            "dam_C1_RP10_0",
+            "dam_C1_RP100_0",
+            "dam_C1_RP10_25",
+        ]
+
+        # 2. Run test.
+        _result = DamageNetworkReturnPeriods.get_damage_columns_per_curve(_dam_cols)
+
+        # 3. Verify expectations.
+        assert _result == {
+            "HZ": {100.0: "dam_RP100_HZ"},
+            "C1_0": {10.0: "dam_C1_RP10_0", 100.0: "dam_C1_RP100_0"},
+            "C1_25": {10.0: "dam_C1_RP10_25"},
+        }
+
+    def test_control_risk_calculation_per_osdamage_percentile(self):
+        # 1. Define test data.
+        _road_gdf = pd.DataFrame(
+            {
+                "F_RP100_me": [1.0],
+                "dam_C1_RP100_0": [1000.0],
+                "dam_C1_RP200_0": [2000.0],
+                "dam_C1_RP100_100": [500.0],
+                "dam_C1_RP200_100": [1000.0],
+            }
+        )
+        _damage = DamageNetworkReturnPeriods(_road_gdf, ["F_RP100_me"])
+
+        # 2. Run test.
+        _damage.control_risk_calculation(mode=RiskCalculationModeEnum.DEFAULT)
+
+        # 3. Verify expectations.
+        assert "risk" not in _damage.gdf.columns
+        assert _damage.gdf["risk_C1_0"][0] == pytest.approx(7.5 + 2000 / 200)
+        assert _damage.gdf["risk_C1_100"][0] == pytest.approx(3.75 + 1000 / 200)
+
+    def test_integrate_df_trapezoidal_with_limits(self):
+        # 1. Define test data.
+        data = np.array(([[1000, 2000, 2000], [500, 1000, 1000]]))
+        rps = [100, 200, float("inf")]
+        df = pd.DataFrame(data, columns=rps)
+
+        # 2. Run test.
+        res = DamageNetworkReturnPeriods.integrate_df_trapezoidal(df, limits=[100, 200])
+
+        # 3. Verify expectations.
+        assert res.shape == (2, 2)
+        assert res[:, 0] == pytest.approx([17.5, 8.75])
+        assert res[:, 1] == pytest.approx([10.0, 5.0])
+
+    @pytest.mark.parametrize(
+        "mode, years, mode_name",
+        [
+            pytest.param(
+                RiskCalculationModeEnum.CUT_FROM_YEAR,
+                [15, 25, 200],
+                "cut",
+                id="Cut from",
+            ),
+            pytest.param(
+                RiskCalculationModeEnum.TRIANGLE_TO_NULL_YEAR,
+                [2, 8],
+                "triangle",
+                id="Triangle to null",
+            ),
+        ],
+    )
+    def test_control_risk_calculation_sweep_equals_single_years(
+        self, mode: RiskCalculationModeEnum, years: list[int], mode_name: str
+    ):
+        # 1. Define test data.
+        _road_gdf = pd.DataFrame(
+            {
+                "F_RP10_me": [1.0, 1.0, 1.0],
+                "dam_RP10_HZ": [2000.0, np.nan, 100.0],
+                "dam_RP20_HZ": [3000.0, 500.0, np.nan],
+                "dam_RP50_HZ": [4000.0, 800.0, 300.0],
+                "dam_RP100_HZ": [5000.0, 900.0, np.nan],
+            }
+        )
+        _damage = DamageNetworkReturnPeriods(_road_gdf.copy(), ["F_RP10_me"])
+
+        # 2. Run test.
+        _damage.control_risk_calculation_sweep(mode=mode, years=years)
+
+        # 3. Verify expectations.
+        for _year in years:
+            _single = DamageNetworkReturnPeriods(_road_gdf.copy(), ["F_RP10_me"])
+            _single.control_risk_calculation(mode=mode, year=_year)
+            assert list(_damage.gdf[f"risk_{mode_name}_{_year}"]) == pytest.approx(
+                list(_single.gdf["risk"])
+            )
+
+    def test_control_risk_calculation_sweep_with_default_mode_raises(self):
+        # 1. Define test data.
+        _road_gdf = pd.DataFrame({"F_RP10_me": [1.0], "dam_RP10_HZ": [2000.0]})
+        _damage = DamageNetworkReturnPeriods(_road_gdf, ["F_RP10_me"])
+
+        # 2. Run test.
+        with pytest.raises(ValueError):
+            _damage.control_risk_calculation_sweep(
+                mode=RiskCalculationModeEnum.DEFAULT, years=[100]
+            )
+
+    def test_rework_damage_data_cut_from_years_does_not_warn(self):
+        # 1. Define test data.
+        _to_integrate = pd.DataFrame(
+            {100: [5000.0, 900.0], 50: [4000.0, 800.0], 10: [2000.0, 0.0]}
+        )
+
+        # 2. Run test.
+        with warnings.catch_warnings():
+            warnings.simplefilter("error", pd.errors.SettingWithCopyWarning)
+            (
+                _result,
+                _cutoff_damages,
+            ) = DamageNetworkReturnPeriods.rework_damage_data_cut_from_years(
+                _to_integrate, [20, 200]
+            )
+
+        # 3. Verify expectations.
+        assert list(_result.columns) == [100, 50, 10, float("inf")]
+        assert list(_result[float("inf")]) == [5000.0, 900.0]
+        assert list(_cutoff_damages[200]) == [5000.0, 900.0]
+        assert list(_to_integrate.columns) == [100, 50, 10]
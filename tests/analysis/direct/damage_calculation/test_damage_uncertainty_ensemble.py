@@ -0,0 +1,178 @@
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ra2ce.analysis.analysis_config_data.enums.damage_curve_enum import DamageCurveEnum
+from ra2ce.analysis.analysis_config_data.enums.risk_calculation_mode_enum import (
+    RiskCalculationModeEnum,
+)
+from ra2ce.analysis.direct.damage.piecewise_linear_curve import PiecewiseLinearCurve
+from ra2ce.analysis.direct.damage_calculation.damage_network_return_periods import (
+    DamageNetworkReturnPeriods,
+)
+from ra2ce.analysis.direct.damage_calculation.damage_uncertainty_ensemble import (
+    DamageUncertaintyEnsemble,
+)
+
+
+class TestDamageUncertaintyEnsemble:
+    def test_initialize_without_samples_raises(self):
+        with pytest.raises(ValueError):
+            DamageUncertaintyEnsemble(n_samples=0)
+
+    def test_get_damages_without_variation(self):
+        # 1. Define test data.
+        _ensemble = DamageUncertaintyEnsemble(n_samples=3)
+        _curve = PiecewiseLinearCurve.from_points([0, 2], [0.0, 1.0])
+
+        # 2. Run test.
+        _damages = _ensemble.get_damages(
+            _curve,
+            max_damage=np.array([100.0, 200.0]),
+            severity=np.array([[1.0, 2.0], [0.0, np.nan]]),
+            fraction=np.array([[1.0, 0.5], [1.0, 1.0]]),
+            length=np.array([10.0, 10.0]),
+        )
+
+        # 3. Verify expectations.
+        assert _damages.shape == (3, 2, 2)
+        np.testing.assert_allclose(
+            _damages[2], np.array([[500.0, 1000.0], [0.0, np.nan]])
+        )
+
+    def test_get_damages_quantiles_enclose_median(self):
+        # 1. Define test data.
+        _ensemble = DamageUncertaintyEnsemble(
+            n_samples=200, max_damage_cv=0.3, curve_cv=0.2, seed=1
+        )
+        _curve = PiecewiseLinearCurve.from_points([0, 2], [0.0, 1.0])
+
+        # 2. Run test.
+        _quantiles = _ensemble.get_quantiles(
+            _ensemble.get_damages(
+                _curve,
+                np.array([100.0]),
+                np.array([[1.0]]),
+                np.array([[1.0]]),
+                np.array([10.0]),
+            )
+        )
+
+        # 3. Verify expectations.
+        assert _quantiles.shape == (3, 1, 1)
+        assert _quantiles[0, 0, 0] < 500 < _quantiles[2, 0, 0]
+
+    def test_initialize_without_chunk_size_raises(self):
+        with pytest.raises(ValueError):
+            DamageUncertaintyEnsemble(n_samples=1, chunk_size=0)
+
+    def test_get_damage_quantiles_in_chunks_equals_at_once(self):
+        # 1. Define test data.
+        _curve = PiecewiseLinearCurve.from_points([0, 2], [0.0, 1.0])
+        _rng = np.random.default_rng(2)
+        _max_damage = _rng.uniform(100.0, 200.0, 7)
+        _severity = _rng.uniform(0.0, 2.0, (2, 7))
+        _fraction = _rng.uniform(0.0, 1.0, (2, 7))
+        _length = _rng.uniform(10.0, 100.0, 7)
+        _ensemble = DamageUncertaintyEnsemble(
+            n_samples=50, max_damage_cv=0.3, curve_cv=0.2, seed=1, chunk_size=3
+        )
+        _reference = DamageUncertaintyEnsemble(
+            n_samples=50, max_damage_cv=0.3, curve_cv=0.2, seed=1
+        )
+        _damages = _reference.get_damages(
+            _curve, _max_damage, _severity, _fraction, _length
+        )
+
+        # 2. Run test.
+        with patch.object(
+            DamageUncertaintyEnsemble,
+            "get_damages",
+            autospec=True,
+            side_effect=DamageUncertaintyEnsemble.get_damages,
+        ) as _get_damages:
+            _damage_quantiles, _risk_quantiles = _ensemble.get_damage_quantiles(
+                _curve, _max_damage, _severity, _fraction, _length, [10.0, 100.0]
+            )
+
+        # 3. Verify expectations.
+        assert [len(_call.args[5]) for _call in _get_damages.call_args_list] == [
+            3,
+            3,
+            1,
+        ]
+        np.testing.assert_allclose(
+            _damage_quantiles, _reference.get_quantiles(_damages)
+        )
+        np.testing.assert_allclose(
+            _risk_quantiles,
+            _reference.get_quantiles(_reference.get_risks(_damages, [10.0, 100.0])),
+        )
+
+    def test_get_damage_quantiles_without_return_periods(self):
+        # 1. Define test data.
+        _ensemble = DamageUncertaintyEnsemble(n_samples=3)
+        _curve = PiecewiseLinearCurve.from_points([0, 2], [0.0, 1.0])
+
+        # 2. Run test.
+        _damage_quantiles, _risk_quantiles = _ensemble.get_damage_quantiles(
+            _curve,
+            np.array([100.0]),
+            np.array([[1.0]]),
+            np.array([[1.0]]),
+            np.array([10.0]),
+        )
+
+        # 3. Verify expectations.
+        assert _damage_quantiles.shape == (3, 1, 1)
+        assert _risk_quantiles is None
+
+    def test_get_risks_equals_default_risk_calculation(self):
+        # 1. Define test data.
+        _damages = np.array([[[1000.0, np.nan], [2000.0, 300.0]]])  # (1, rps, segments)
+        _expected = DamageNetworkReturnPeriods.integrate_df_trapezoidal(
+            DamageNetworkReturnPeriods.rework_damage_data_default(
+                pd.DataFrame(_damages[0].T, columns=[100.0, 200.0])
+            )
+        )
+
+        # 2. Run test.
+        _risks = DamageUncertaintyEnsemble.get_risks(_damages, [100.0, 200.0])
+
+        # 3. Verify expectations.
+        np.testing.assert_allclose(_risks[0], _expected)
+
+    def test_return_periods_main_with_uncertainty(self):
+        # 1. Define test data.
+        _road_gdf = pd.DataFrame(
+            {
+                "highway": ["motorway", "primary"],
+                "lanes": [2, 1],
+                "length": [100.0, 200.0],
+                "F_RP10_me": [0.5, np.nan],
+                "F_RP10_fr": [1.0, 0.0],
+                "F_RP100_me": [1.0, 0.5],
+                "F_RP100_fr": [1.0, 1.0],
+            }
+        )
+        _damage = DamageNetworkReturnPeriods(
+            _road_gdf, ["F_RP10_me", "F_RP10_fr", "F_RP100_me", "F_RP100_fr"]
+        )
+        _damage.uncertainty = DamageUncertaintyEnsemble(n_samples=5, seed=1)
+
+        # 2. Run test.
+        _damage.main(DamageCurveEnum.HZ, None)
+        _damage.control_risk_calculation(mode=RiskCalculationModeEnum.DEFAULT)
+
+        # 3. Verify expectations.
+        for _quantile in ["q5", "q50", "q95"]:
+            np.testing.assert_allclose(
+                _damage.gdf[f"unc_dam_RP100_HZ_{_quantile}"],
+                _damage.gdf["dam_RP100_HZ"],
+                atol=0.01,
+            )
+            np.testing.assert_allclose(
+                _damage.gdf[f"unc_risk_{_quantile}"], _damage.gdf["risk"], atol=0.01
+            )
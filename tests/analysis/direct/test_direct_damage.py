@@ -1,12 +1,25 @@
 from pathlib import Path
 
+import geopandas as gpd
+import numpy as np
 import pandas as pd
 import pytest
+import rasterio
+from rasterio.transform import from_origin
+from shapely.geometry import LineString
 
+from ra2ce.analysis.analysis_config_data.analysis_config_data import (
+    AnalysisSectionDirect,
+)
+from ra2ce.analysis.analysis_config_data.enums.analysis_direct_enum import (
+    AnalysisDirectEnum,
+)
 from ra2ce.analysis.analysis_config_data.enums.damage_curve_enum import DamageCurveEnum
+from ra2ce.analysis.analysis_config_data.enums.event_type_enum import EventTypeEnum
 from ra2ce.analysis.analysis_config_data.enums.risk_calculation_mode_enum import (
     RiskCalculationModeEnum,
 )
+from ra2ce.analysis.analysis_input_wrapper import AnalysisInputWrapper
 from ra2ce.analysis.direct.damage.manual_damage_functions import ManualDamageFunctions
 from ra2ce.analysis.direct.damage_calculation.damage_network_events import (
     DamageNetworkEvents,
@@ -14,7 +27,12 @@ from ra2ce.analysis.direct.damage_calculation.damage_network_events import (
 from ra2ce.analysis.direct.damage_calculation.damage_network_return_periods import (
     DamageNetworkReturnPeriods,
 )
-from tests import test_data
+from ra2ce.analysis.direct.direct_damage import DirectDamage
+from ra2ce.network.graph_files.network_file import NetworkFile
+from ra2ce.network.hazard.hazard_names import HazardNames
+from ra2ce.network.network_config_data.enums.aggregate_wl_enum import AggregateWlEnum
+from ra2ce.network.network_config_data.network_config_data import HazardSection
+from tests import test_data, test_results
 
 direct_damage_test_data = test_data / "direct_damage"
 
@@ -189,10 +207,7 @@ class TestDirectDamage:
         # LOOP OVER THE OSdaMage functions
         for curve in ["C1", "C2", "C3", "C4", "C5", "C6"]:
             # Check lower boundary of the reconstruction/max damage costs
-            ra2ce_results_lower = df["dam_{}_EV1".format(curve)].apply(
-                lambda x: x[0] if isinstance(x, tuple) else x
-            )
-            ra2ce_results_lower = ra2ce_results_lower.fillna(0)
+            ra2ce_results_lower = df["dam_{}_EV1_0".format(curve)].fillna(0)
             reference_results_lower = df["ref_{}_LOWEST".format(curve)]
 
             # EVALUATE THE RESULT OF THE TEST USING PANDAS BUILT-IN FUNCTIONALITY
@@ -403,3 +418,222 @@ class TestDirectDamage:
                 0,
             )
             assert test_result == reference_result
+
+
+class TestDirectDamageInBatches:
+    @pytest.fixture
+    def direct_damage_input(
+        self, request: pytest.FixtureRequest
+    ) -> AnalysisInputWrapper:
+        _test_dir = test_results.joinpath(request.node.name)
+        _test_dir.mkdir(parents=True, exist_ok=True)
+        _road_types = ["motorway", "primary", "secondary", "residential"] * 5
+        _lanes = {"motorway": "3", "primary": "2", "secondary": "2", "residential": "1"}
+        gpd.GeoDataFrame(
+            {
+                "highway": _road_types,
+                # some missing lanes, to be filled in from the lanes of the whole network
+                "lanes": [
+                    None if i % 6 == 0 else _lanes[_road_type]
+                    for i, _road_type in enumerate(_road_types)
+                ],
+                "length": [100.0 + 10 * i for i in range(20)],
+                "RP10_me": [0.1 * (i % 4) for i in range(20)],
+                "RP10_fr": [0.5] * 20,
+                "RP100_me": [0.2 * (i % 5) for i in range(20)],
+                "RP100_fr": [1.0] * 20,
+            },
+            geometry=[LineString([(i, 0), (i, 1)]) for i in range(20)],
+            crs="EPSG:4326",
+        ).to_feather(_test_dir.joinpath("base_network_hazard.feather"))
+
+        return AnalysisInputWrapper(
+            analysis=AnalysisSectionDirect(
+                name="direct damage batches",
+                analysis=AnalysisDirectEnum.DIRECT,
+                event_type=EventTypeEnum.RETURN_PERIOD,
+                damage_curve=DamageCurveEnum.HZ,
+                risk_calculation_mode=RiskCalculationModeEnum.DEFAULT,
+            ),
+            graph_file=None,
+            graph_file_hazard=NetworkFile(
+                name="base_network_hazard.feather", folder=_test_dir
+            ),
+            input_path=_test_dir,
+            static_path=_test_dir,
+            output_path=_test_dir.joinpath("output"),
+            hazard_names=None,
+            origins_destinations=None,
+            file_id=None,
+        )
+
+    def test_execute_in_batches_equals_execute(
+        self, direct_damage_input: AnalysisInputWrapper
+    ):
+        # 1. Define test data.
+        _expected = DirectDamage(direct_damage_input).execute()
+        direct_damage_input.graph_file_hazard.graph = None
+
+        # 2. Run test.
+        _export_path = DirectDamage(direct_damage_input).execute_in_batches(6)
+
+        # 3. Verify expectations.
+        assert _export_path.is_file()
+        _result = gpd.read_parquet(_export_path)
+        assert list(_result.columns) == list(_expected.columns)
+        for _col in ["lanes", "dam_RP10_HZ", "dam_RP100_HZ", "risk"]:
+            pd.testing.assert_series_equal(
+                _result[_col], _expected[_col], check_dtype=False
+            )
+
+    def test_execute_with_chunk_size_exports_requested_formats(
+        self, direct_damage_input: AnalysisInputWrapper
+    ):
+        # 1. Define test data.
+        direct_damage_input.analysis.chunk_size = 6
+        direct_damage_input.analysis.save_gpkg = True
+        direct_damage_input.analysis.save_csv = True
+        direct_damage_input.analysis.save_feather = True
+        _output_dir = direct_damage_input.output_path.joinpath("direct")
+
+        # 2. Run test.
+        _result = DirectDamage(direct_damage_input).execute()
+
+        # 3. Verify expectations.
+        assert _result is None
+        _expected = gpd.read_parquet(
+            _output_dir.joinpath("direct_damage_batches.parquet")
+        )
+        _gpkg = gpd.read_file(_output_dir.joinpath("direct_damage_batches.gpkg"))
+        _csv = pd.read_csv(_output_dir.joinpath("direct_damage_batches.csv"))
+        _feather = gpd.read_feather(
+            _output_dir.joinpath("direct_damage_batches.feather")
+        )
+        assert len(_expected) == 20
+        for _exported in [_gpkg, _csv, _feather]:
+            pd.testing.assert_series_equal(
+                _exported["risk"], _expected["risk"], check_dtype=False
+            )
+        assert "geometry" not in _csv.columns
+        assert _gpkg.geometry.equals(_expected.geometry)
+
+
+class TestDirectDamageWithHazardOverlay:
+    @pytest.fixture
+    def direct_damage_input(
+        self, request: pytest.FixtureRequest
+    ) -> AnalysisInputWrapper:
+        _test_dir = test_results.joinpath(request.node.name)
+        _test_dir.mkdir(parents=True, exist_ok=True)
+
+        # Hazard maps with a water depth increasing along the x-axis.
+        _hazard_files = []
+        for _rp, _factor in [(10, 0.5), (100, 1.0)]:
+            _hazard_file = _test_dir.joinpath(f"flood_RP_{_rp}.tif")
+            _depths = np.tile(_factor * np.arange(20, dtype="float32") / 10, (4, 1))
+            with rasterio.open(
+                _hazard_file,
+                "w",
+                driver="GTiff",
+                height=4,
+                width=20,
+                count=1,
+                dtype="float32",
+                crs="EPSG:4326",
+                transform=from_origin(-0.5, 2.5, 1.0, 1.0),
+                nodata=-9999,
+            ) as _dst:
+                _dst.write(_depths, 1)
+            _hazard_files.append(_hazard_file)
+
+        _road_types = ["motorway", "primary", "secondary", "residential"] * 5
+        gpd.GeoDataFrame(
+            {
+                "highway": _road_types,
+                "lanes": ["2"] * 20,
+                "length": [100.0 + 10 * i for i in range(20)],
+            },
+            geometry=[LineString([(i, 0.5), (i, 1.5)]) for i in range(20)],
+            crs="EPSG:4326",
+        ).to_feather(_test_dir.joinpath("base_network.feather"))
+
+        return AnalysisInputWrapper(
+            analysis=AnalysisSectionDirect(
+                name="direct damage overlay",
+                analysis=AnalysisDirectEnum.DIRECT,
+                event_type=EventTypeEnum.RETURN_PERIOD,
+                damage_curve=DamageCurveEnum.HZ,
+                risk_calculation_mode=RiskCalculationModeEnum.DEFAULT,
+                chunk_size=6,
+            ),
+            graph_file=NetworkFile(name="base_network.feather", folder=_test_dir),
+            graph_file_hazard=NetworkFile(
+                name="base_network_hazard.feather", folder=_test_dir
+            ),
+            input_path=_test_dir,
+            static_path=_test_dir,
+            output_path=_test_dir.joinpath("output"),
+            hazard_names=HazardNames(
+                names_df=pd.DataFrame(
+                    {
+                        "File name": [
+                            _f.stem for _f in _hazard_files for _ in range(2)
+                        ],
+                        "RA2CE name": ["RP10_me", "RP10_fr", "RP100_me", "RP100_fr"],
+                    }
+                )
+            ),
+            origins_destinations=None,
+            file_id=None,
+            hazard=HazardSection(
+                hazard_map=_hazard_files,
+                aggregate_wl=AggregateWlEnum.MEAN,
+                hazard_crs="EPSG:4326",
+                overlay_base_network_in_analysis=True,
+            ),
+        )
+
+    def test_execute_with_hazard_overlay_equals_execute(
+        self, direct_damage_input: AnalysisInputWrapper
+    ):
+        # 1. Define test data.
+        _direct_damage = DirectDamage(direct_damage_input)
+        _base_network_hazard = (
+            _direct_damage._get_hazard_intersect_builder().get_intersection(
+                direct_damage_input.graph_file.get_graph().copy()
+            )
+        )
+        _base_network_hazard.to_feather(direct_damage_input.graph_file_hazard.file)
+        _expected = DirectDamage(direct_damage_input).execute_in_batches(20)
+        _expected_gdf = gpd.read_parquet(_expected)
+        direct_damage_input.graph_file_hazard.graph = None
+        direct_damage_input.graph_file_hazard.file.unlink()
+
+        # 2. Run test.
+        _result = DirectDamage(direct_damage_input).execute()
+
+        # 3. Verify expectations.
+        assert _result is None
+        assert not direct_damage_input.graph_file_hazard.file.exists()
+        # the overlaid batches are ordered spatially, the rows are compared by length
+        _result_gdf = gpd.read_parquet(_expected).sort_values("length")
+        _result_gdf.index = _expected_gdf.index
+        assert list(_result_gdf.columns) == list(_expected_gdf.columns)
+        assert _result_gdf["dam_RP100_HZ"].gt(0).any()
+        for _col in ["F_RP10_me", "F_RP100_me", "dam_RP10_HZ", "dam_RP100_HZ", "risk"]:
+            pd.testing.assert_series_equal(
+                _result_gdf[_col], _expected_gdf[_col], check_dtype=False
+            )
+        assert _result_gdf.geometry.equals(_expected_gdf.geometry)
+
+    def test_execute_with_hazard_network_does_not_overlay(
+        self, direct_damage_input: AnalysisInputWrapper
+    ):
+        # 1. Define test data.
+        direct_damage_input.graph_file_hazard.graph = gpd.GeoDataFrame()
+
+        # 2. Run test.
+        _overlays_hazard = DirectDamage(direct_damage_input)._overlays_hazard()
+
+        # 3. Verify expectations.
+        assert not _overlays_hazard
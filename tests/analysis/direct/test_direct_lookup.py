@@ -1,6 +1,13 @@
 from collections import OrderedDict
 
-from ra2ce.analysis.direct.direct_lookup import CreateLookupTables, LookUp
+import pandas as pd
+import pytest
+
+from ra2ce.analysis.direct.direct_lookup import (
+    CreateLookupTables,
+    LookUp,
+    RoadTypeLanesLookUp,
+)
 from tests import test_data
 
 _lookup_keys = [
@@ -39,6 +46,75 @@ class TestDirectLookUp:
             list(sorted(_v.keys())) == _sorted_keys for _v in _max_damages.values()
         )
 
+    @pytest.mark.parametrize(
+        "get_max_damages, outer_key, inner_key",
+        [
+            pytest.param(LookUp.get_max_damages_osd, "Lower", "motorway", id="OSd"),
+            pytest.param(LookUp.get_max_damages_huizinga, "motorway", 1, id="Huizinga"),
+        ],
+    )
+    def test_get_max_damages_returns_copy_of_cached_table(
+        self, get_max_damages, outer_key, inner_key
+    ):
+        # 1. Define test data.
+        _expected_value = get_max_damages()[outer_key][inner_key]
+
+        # 2. Run test.
+        _max_damages = get_max_damages()
+        _max_damages[outer_key][inner_key] = -1
+        _max_damages.pop(outer_key)
+
+        # 3. Verify expectations.
+        assert get_max_damages()[outer_key][inner_key] == _expected_value
+        assert get_max_damages() is not get_max_damages()
+
+
+class TestRoadTypeLanesLookUp:
+    def test_get_values(self):
+        # 1. Define test data.
+        _lookup = RoadTypeLanesLookUp(LookUp.get_max_damages_huizinga())
+
+        # 2. Run test.
+        _values = _lookup.get_values(
+            pd.Series(["motorway", "track", "motorway"]), pd.Series([1, 2, 6.0])
+        )
+
+        # 3. Verify expectations.
+        assert list(_values) == [175, 150, 750]
+
+    def test_from_dataframe(self):
+        # 1. Define test data.
+        _lookup_df = pd.DataFrame({1: [10.0, 20.0], 2: [30.0, 40.0]}, index=["a", "b"])
+
+        # 2. Run test.
+        _lookup = RoadTypeLanesLookUp.from_dataframe(_lookup_df)
+
+        # 3. Verify expectations.
+        assert list(_lookup.get_values(["b", "a"], [1, 2])) == [20.0, 30.0]
+
+    def test_get_values_with_unknown_combination_raises(self):
+        # 1. Define test data.
+        _lookup = RoadTypeLanesLookUp({"motorway": {1: 1.0}})
+
+        # 2. Run test.
+        with pytest.raises(KeyError) as exc_err:
+            _lookup.get_values(["motorway", "track"], [1, 1])
+
+        # 3. Verify expectations.
+        assert "('track', 1)" in str(exc_err.value)
+
+    def test_get_values_with_nan_value_raises(self):
+        # 1. Define test data.
+        _lookup_df = pd.DataFrame({1: [10.0, None], 2: [30.0, 40.0]}, index=["a", "b"])
+        _lookup = RoadTypeLanesLookUp.from_dataframe(_lookup_df)
+
+        # 2. Run test.
+        with pytest.raises(KeyError) as exc_err:
+            _lookup.get_values(["a", "b", "b"], [1, 1, 2])
+
+        # 3. Verify expectations.
+        assert "('b', 1)" in str(exc_err.value)
+
 
 class TestCreateLookupTables:
     def test_create(self):
@@ -10,6 +10,7 @@ from ra2ce.analysis.direct.direct_utils import (
     clean_lane_data,
     create_summary_statistics,
     lane_cleaner,
+    scale_damage_using_lanes,
 )
 
 
@@ -64,6 +65,39 @@ class TestDirectUtils:
         assert _result_data[0] == 42
         assert _result_data[1] == 24
 
+    def test_clean_lane_data_with_mixed_values(self):
+        # 1. Define test data.
+        _test_lane = pd.Series(
+            ["2", 3, None, "2", ["1", "2"], "1;4"], index=list("abcdef")
+        )
+
+        # 2. Run test.
+        _result_data = clean_lane_data(_test_lane)
+
+        # 3. Verify expectations.
+        assert list(_result_data.index) == list("abcdef")
+        np.testing.assert_array_equal(
+            _result_data.values, [2.0, 3.0, np.nan, 2.0, np.nan, 4.0]
+        )
+
+    def test_scale_damage_using_lanes(self):
+        # 1. Define test data.
+        _lane_scale_factors = {"motorway": {1: 0.5, 2: 1.0}, "track": {1: 2.0}}
+        _df = pd.DataFrame(
+            {
+                "road_type": ["motorway", "track", "motorway"],
+                "lanes": [2.0, 1.0, 1.0],
+                "damage": [10.0, 10.0, 10.0],
+            }
+        )
+
+        # 2. Run test.
+        _result = scale_damage_using_lanes(_lane_scale_factors, _df, ["damage"])
+
+        # 3. Verify expectations.
+        assert list(_result.columns) == ["road_type", "lanes", "damage"]
+        assert list(_result["damage"]) == [10.0, 20.0, 5.0]
+
     def test_create_summary_statistics(self):
         # 1. Define test data.
         _left_line = LineString([[0, 0], [1, 0], [2, 0]])
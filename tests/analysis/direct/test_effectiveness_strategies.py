@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ra2ce.analysis.direct.effectiveness_strategies import (
+    EFFECTIVENESS_COLUMNS,
+    STANDARD_COLUMNS,
+    EffectivenessStrategies,
+)
+
+
+class TestEffectivenessStrategies:
+    @pytest.fixture
+    def effectiveness_dict(self) -> dict:
+        return {
+            "no_effect": {_col: 0.0 for _col in EFFECTIVENESS_COLUMNS},
+            "half": {_col: 0.5 for _col in EFFECTIVENESS_COLUMNS},
+        }
+
+    @pytest.fixture
+    def features(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "LinkNr": [2, 1, 2],
+                "length": [10.0, 20.0, 30.0],
+                "dichtbij_m": [4.0, 0.0, 2.0],
+                "ver_hoger_m": [6.0, 2.0, 0.0],
+                "hwa_afw_ho_m": [0.0, 8.0, 0.0],
+                "gw_hwa_m": [0.0, 0.0, 10.0],
+                "slope_0015_m": [12.0, 0.0, 0.0],
+                "slope_001_m": [0.0, 2.0, 0.0],
+            }
+        )
+
+    def test_get_effectiveness(self, effectiveness_dict: dict, features: pd.DataFrame):
+        # 1. Run test.
+        _result = EffectivenessStrategies(effectiveness_dict).get_effectiveness(
+            features
+        )
+
+        # 2. Verify expectations.
+        assert set(STANDARD_COLUMNS) < set(_result.columns)
+        assert list(_result["LinkNr"]) == [1, 2]
+        assert list(_result["length"]) == [20, 40]
+        assert list(_result["verweg_max"]) == [8, 16]
+        assert list(_result["verkant_max"]) == [2, 6]
+        assert list(_result["standard_gevoelig_max"]) == [8, 16]
+        assert list(_result["standard_gevoelig_sum"]) == [10, 28]
+        # a strategy without effect equals the standard situation
+        assert list(_result["no_effect_gevoelig_sum"]) == [10, 28]
+        assert list(_result["half_gevoelig_max"]) == [4, 8]
+        assert list(_result["half_gevoelig_sum"]) == [5, 14]
+
+    def test_get_cost_reduction(self, effectiveness_dict: dict):
+        # 1. Define test data.
+        _links = pd.DataFrame(
+            {
+                "coefficient": [1.0, 0.5],
+                "blockage_costs": [100.0, 100.0],
+                "standard_gevoelig_max": [10.0, 20.0],
+                "standard_gevoelig_sum": [20.0, 40.0],
+                "no_effect_gevoelig_max": [10.0, 20.0],
+                "no_effect_gevoelig_sum": [20.0, 40.0],
+                "half_gevoelig_max": [5.0, 10.0],
+                "half_gevoelig_sum": [10.0, 20.0],
+            }
+        )
+
+        # 2. Run test.
+        _result = EffectivenessStrategies(effectiveness_dict).get_cost_reduction(
+            _links, return_period=10, repair_costs=2
+        )
+
+        # 3. Verify expectations.
+        assert list(_result["return_period"]) == [10, 5]
+        assert list(_result["total_costs_standard"]) == [12, 28]
+        assert list(_result["reduction_costs_no_effect"]) == [0, 0]
+        assert list(_result["max_effectiveness_half"]) == [0.5, 0.5]
+        assert list(_result["total_costs_half"]) == [6, 14]
+        assert list(_result["effectiveness_half"]) == [0.5, 0.5]
+
+    def test_get_yearly_investments(self):
+        # 1. Run test.
+        _investments = EffectivenessStrategies.get_yearly_investments(
+            np.array([-10.0, -20.0]), np.array([2, 3]), 6
+        )
+
+        # 2. Verify expectations.
+        assert _investments.tolist() == [
+            [0, -10, 0, -10, 0, -10],
+            [0, 0, -20, 0, 0, -20],
+        ]
+
+    @pytest.mark.parametrize(
+        "interest_rate, expected",
+        [
+            pytest.param(0.0, 25.0, id="Without interest"),
+            pytest.param(0.05, 28.201183, id="With interest"),
+        ],
+    )
+    def test_get_payments(self, interest_rate: float, expected: float):
+        # 1. Run test.
+        _payments = EffectivenessStrategies.get_payments(
+            interest_rate, np.array([4]), np.array([-100.0])
+        )
+
+        # 2. Verify expectations.
+        assert _payments[0] == pytest.approx(expected)
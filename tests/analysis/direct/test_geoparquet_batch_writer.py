@@ -0,0 +1,84 @@
+import geopandas as gpd
+import pandas as pd
+import pytest
+from shapely.geometry import Point
+
+from ra2ce.analysis.direct.geoparquet_batch_writer import GeoParquetBatchWriter
+from tests import test_results
+
+
+class TestGeoParquetBatchWriter:
+    def test_write_batches(self, request: pytest.FixtureRequest):
+        # 1. Define test data.
+        _export_path = test_results.joinpath(request.node.name, "result.parquet")
+
+        def get_batch(start: int) -> gpd.GeoDataFrame:
+            return gpd.GeoDataFrame(
+                {
+                    "name": [f"road_{i}" for i in range(start, start + 3)],
+                    "damage": [float(i) for i in range(start, start + 3)],
+                },
+                geometry=[Point(i, i) for i in range(start, start + 3)],
+                crs="EPSG:4326",
+            )
+
+        # 2. Run test.
+        with GeoParquetBatchWriter(_export_path) as _writer:
+            _writer.write(get_batch(0))
+            _writer.write(get_batch(3))
+
+        # 3. Verify expectations.
+        _result = gpd.read_parquet(_export_path)
+        assert len(_result) == 6
+        assert _result.crs == "EPSG:4326"
+        assert list(_result["damage"]) == [0.0, 1.0, 2.0, 3.0, 4.0, 5.0]
+        assert _result.geometry.iloc[-1].equals(Point(5, 5))
+
+    @pytest.mark.parametrize(
+        "first_values, second_values, expected",
+        [
+            pytest.param(
+                [float("nan")] * 2,
+                ["high", "low"],
+                [None, None, "high", "low"],
+                id="Empty floats then text",
+            ),
+            pytest.param(
+                [1, 2],
+                [0.5, float("nan")],
+                [1.0, 2.0, 0.5, None],
+                id="Integers then floats",
+            ),
+            pytest.param(
+                [1.5, 2.5], [1, 2], [1.5, 2.5, 1.0, 2.0], id="Floats then integers"
+            ),
+        ],
+    )
+    def test_write_batches_promotes_types(
+        self,
+        first_values: list,
+        second_values: list,
+        expected: list,
+        request: pytest.FixtureRequest,
+    ):
+        # 1. Define test data.
+        _export_path = test_results.joinpath(request.node.name, "result.parquet")
+
+        def get_batch(values: list) -> gpd.GeoDataFrame:
+            return gpd.GeoDataFrame(
+                {"value": values},
+                geometry=[Point(i, i) for i in range(len(values))],
+                crs="EPSG:4326",
+            )
+
+        # 2. Run test.
+        with GeoParquetBatchWriter(_export_path) as _writer:
+            _writer.write(get_batch(first_values))
+            _writer.write(get_batch(second_values))
+
+        # 3. Verify expectations.
+        _result = gpd.read_parquet(_export_path)
+        assert len(_result) == 4
+        assert _result.crs == "EPSG:4326"
+        assert [None if pd.isna(_v) else _v for _v in _result["value"]] == expected
+        assert not any(_export_path.parent.glob("tmp*"))
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from ra2ce.analysis.direct.lane_normalizer import LaneNormalizer
+
+
+class TestLaneNormalizer:
+    def test_parse(self):
+        # 1. Define test data.
+        _lanes = pd.Series(
+            ["2", 3, None, "2;3", "4,1", "1;x", "two", ["1", "2"], 4.5],
+            index=list("abcdefghi"),
+            name="lanes",
+        )
+
+        # 2. Run test.
+        _parsed = LaneNormalizer.parse(_lanes)
+
+        # 3. Verify expectations.
+        assert list(_parsed.index) == list("abcdefghi")
+        assert _parsed.name == "lanes"
+        np.testing.assert_array_equal(
+            _parsed.values, [2, 3, np.nan, 3, 4, np.nan, np.nan, np.nan, 4.5]
+        )
+
+    def test_parse_logs_aggregated_warnings(self, caplog: pytest.LogCaptureFixture):
+        # 1. Run test.
+        LaneNormalizer.parse(pd.Series(["2;3", "x"] * 100))
+
+        # 2. Verify expectations.
+        assert len(caplog.records) == 2
+
+    def test_get_lane_statistics_with_ties_takes_smallest(self):
+        # 1. Define test data.
+        _road_types = pd.Series(["primary", "primary", "secondary", "track"])
+        _lanes = pd.Series([3.0, 2.0, 4.0, np.nan])
+
+        # 2. Run test.
+        _lane_stats = LaneNormalizer.get_lane_statistics(_road_types, _lanes)
+
+        # 3. Verify expectations.
+        assert _lane_stats == {"primary": 2.0, "secondary": 4.0, "track": 3.0}
+
+    def test_impute(self):
+        # 1. Define test data.
+        _road_types = pd.Series(["primary", "secondary", "primary"])
+        _lanes = pd.Series([np.nan, 1.0, 3.0])
+
+        # 2. Run test.
+        _imputed = LaneNormalizer.impute(
+            _road_types, _lanes, {"primary": 2.0, "secondary": 4.0}
+        )
+
+        # 3. Verify expectations.
+        assert list(_imputed) == [2.0, 1.0, 3.0]
+
+    def test_clip(self):
+        assert list(LaneNormalizer.clip(pd.Series([-1, 0.5, 3, 8]))) == [1, 1, 3, 6]
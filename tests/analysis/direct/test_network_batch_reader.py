@@ -0,0 +1,146 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import geopandas as gpd
+import numpy as np
+import pyarrow as pa
+import pyarrow.feather as feather
+import pytest
+from shapely.geometry import LineString
+
+from ra2ce.analysis.direct.network_batch_reader import NetworkBatchReader
+from ra2ce.network.graph_files.network_file import NetworkFile
+from tests import test_results
+
+
+class TestNetworkBatchReader:
+    @pytest.fixture
+    def network_file(self, request: pytest.FixtureRequest) -> Path:
+        _test_dir = test_results.joinpath(request.node.name)
+        _test_dir.mkdir(parents=True, exist_ok=True)
+        _network_file = _test_dir.joinpath("network.feather")
+        gpd.GeoDataFrame(
+            {"highway": ["primary"] * 10, "lanes": list(range(10))},
+            geometry=[LineString([(i, 0), (i, 1)]) for i in range(10)],
+            crs="EPSG:4326",
+        ).to_feather(_network_file)
+        return _network_file
+
+    def test_initialize_with_invalid_batch_size_raises(self, network_file: Path):
+        with pytest.raises(ValueError):
+            NetworkBatchReader(network_file, 0)
+
+    def test_iterate_batches(self, network_file: Path):
+        # 1. Run test.
+        _batches = list(NetworkBatchReader(network_file, 4))
+
+        # 2. Verify expectations.
+        assert [len(_batch) for _batch in _batches] == [4, 4, 2]
+        assert all(isinstance(_batch, gpd.GeoDataFrame) for _batch in _batches)
+        assert all(_batch.crs == "EPSG:4326" for _batch in _batches)
+        assert list(_batches[-1].index) == [8, 9]
+        assert list(_batches[-1]["lanes"]) == [8, 9]
+        assert _batches[-1].geometry.iloc[-1].equals(LineString([(9, 0), (9, 1)]))
+
+    def test_read_columns(self, network_file: Path):
+        # 1. Define test data.
+        _reader = NetworkBatchReader(network_file, 4)
+
+        # 2. Run test.
+        _columns = _reader.read_columns(["lanes"])
+
+        # 3. Verify expectations.
+        assert _reader.column_names == ["highway", "lanes", "geometry"]
+        assert list(_columns.columns) == ["lanes"]
+        assert len(_columns) == 10
+
+    def test_initialize_without_network_raises(self):
+        with pytest.raises(ValueError):
+            NetworkBatchReader(None, 4)
+
+    def test_from_network_file_without_file_uses_graph(self, network_file: Path):
+        # 1. Define test data.
+        _network = gpd.read_feather(network_file)
+        _network_file = NetworkFile(name="missing.feather", folder=network_file.parent)
+        _network_file.graph = _network
+
+        # 2. Run test.
+        _reader = NetworkBatchReader.from_network_file(_network_file, 4)
+        _batches = list(_reader)
+
+        # 3. Verify expectations.
+        assert _reader.network_file is None
+        assert [len(_batch) for _batch in _batches] == [4, 4, 2]
+        assert list(_batches[-1].index) == [8, 9]
+        assert list(_reader.read_columns(["lanes"])["lanes"]) == list(range(10))
+        # the batches are copies, the network in memory is not modified.
+        _batches[0]["lanes"] = -1
+        assert _network["lanes"].iloc[0] == 0
+
+    @pytest.mark.parametrize(
+        "from_file",
+        [pytest.param(True, id="From file"), pytest.param(False, id="From memory")],
+    )
+    def test_iterate_spatially_ordered_batches(
+        self, network_file: Path, from_file: bool
+    ):
+        # 1. Define test data.
+        _network = gpd.GeoDataFrame(
+            {"lanes": list(range(4))},
+            geometry=[
+                LineString([(0, 0), (1, 1)]),
+                LineString([(10, 10), (11, 11)]),
+                LineString([(0, 1), (1, 2)]),
+                LineString([(10, 11), (11, 12)]),
+            ],
+            crs="EPSG:4326",
+        )
+        _network.to_feather(network_file)
+
+        # 2. Run test.
+        _reader = NetworkBatchReader(
+            network_file if from_file else None,
+            2,
+            network=None if from_file else _network,
+            spatially_ordered=True,
+        )
+        _batches = list(_reader)
+
+        # 3. Verify expectations.
+        assert [sorted(_batch.index) for _batch in _batches] == [[0, 2], [1, 3]]
+        assert all(_batch.crs == "EPSG:4326" for _batch in _batches)
+        for _batch in _batches:
+            assert list(_batch["lanes"]) == list(_batch.index)
+
+    def test_iterate_spatially_ordered_batches_reads_record_batches(
+        self, network_file: Path
+    ):
+        # 1. Define test data.
+        _n_rows = 2000
+        _x = np.random.default_rng(1).uniform(0, 100, _n_rows)
+        gpd.GeoDataFrame(
+            {"lanes": list(range(_n_rows)), "highway": ["primary"] * _n_rows},
+            geometry=[LineString([(_xi, 0), (_xi, 1)]) for _xi in _x],
+            crs="EPSG:4326",
+        ).to_feather(network_file, chunksize=100)
+        _table_size = feather.read_table(network_file).nbytes
+        _allocated_bytes = pa.total_allocated_bytes()
+        _max_allocated_bytes = 0
+        _rows = []
+
+        # 2. Run test.
+        with patch.object(
+            feather, "read_table", side_effect=AssertionError("Reads the whole file.")
+        ):
+            for _batch in NetworkBatchReader(network_file, 50, spatially_ordered=True):
+                _max_allocated_bytes = max(
+                    _max_allocated_bytes,
+                    pa.total_allocated_bytes() - _allocated_bytes,
+                )
+                _rows.extend(_batch.index)
+                assert list(_batch["lanes"]) == list(_batch.index)
+
+        # 3. Verify expectations.
+        assert sorted(_rows) == list(range(_n_rows))
+        assert _max_allocated_bytes < _table_size / 4
+        assert not list(network_file.parent.glob("tmp*"))
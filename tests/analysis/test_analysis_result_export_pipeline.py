@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from ra2ce.analysis.analysis_result_export_pipeline import (
+    AnalysisResultExportPipeline,
+)
+from ra2ce.analysis.analysis_result_wrapper import AnalysisResultWrapper
+from ra2ce.analysis.analysis_result_wrapper_exporter import (
+    AnalysisResultWrapperExporter,
+)
+
+
+class MockedExporter(AnalysisResultWrapperExporter):
+    def __init__(self, failing_results: list[str] = None) -> None:
+        self.exported = []
+        self.failing_results = failing_results or []
+        self.threads = set()
+
+    def export_result(self, result_wrapper: AnalysisResultWrapper):
+        self.threads.add(threading.current_thread())
+        if result_wrapper.analysis_result in self.failing_results:
+            raise ValueError(f"Export of {result_wrapper.analysis_result} failed.")
+        self.exported.append(result_wrapper.analysis_result)
+
+
+class TestAnalysisResultExportPipeline:
+    @staticmethod
+    def _get_result_wrapper(name: str) -> AnalysisResultWrapper:
+        return AnalysisResultWrapper(analysis_result=name, analysis=None)
+
+    def test_submitted_results_are_exported_in_background(self):
+        # 1. Define test data.
+        _exporter = MockedExporter()
+        _names = [f"result_{_i}" for _i in range(5)]
+
+        # 2. Run test.
+        with AnalysisResultExportPipeline(_exporter, max_pending=2) as _pipeline:
+            for _name in _names:
+                _pipeline.submit(self._get_result_wrapper(_name))
+
+        # 3. Verify expectations.
+        assert _exporter.exported == _names
+        assert threading.current_thread() not in _exporter.threads
+
+    def test_wait_raises_export_failure_after_all_exports(self):
+        # 1. Define test data.
+        _exporter = MockedExporter(failing_results=["result_0"])
+        _pipeline = AnalysisResultExportPipeline(_exporter)
+        _pipeline.submit(self._get_result_wrapper("result_0"))
+        _pipeline.submit(self._get_result_wrapper("result_1"))
+
+        # 2. Run test.
+        with pytest.raises(ValueError, match="result_0"):
+            _pipeline.wait()
+
+        # 3. Verify expectations.
+        assert _exporter.exported == ["result_1"]
+
+    def test_submit_to_closed_pipeline_raises(self):
+        # 1. Define test data.
+        _pipeline = AnalysisResultExportPipeline(MockedExporter())
+        _pipeline.wait()
+
+        # 2. Run test.
+        with pytest.raises(ValueError):
+            _pipeline.submit(self._get_result_wrapper("result_0"))
+
+    def test_error_within_context_is_not_hidden_by_export_failure(self):
+        # 1. Define test data.
+        _exporter = MockedExporter(failing_results=["result_0"])
+
+        # 2. Run test.
+        with pytest.raises(KeyError):
+            with AnalysisResultExportPipeline(_exporter) as _pipeline:
+                _pipeline.submit(self._get_result_wrapper("result_0"))
+                raise KeyError("Analysis failed.")
@@ -1,4 +1,6 @@
 import shutil
+from pathlib import Path
+from typing import Callable
 
 import geopandas as gpd
 import pytest
@@ -88,3 +90,37 @@ class TestAnalysisResultWrapperExporter:
         # 1. Define test data.
         valid_result_wrapper.analysis.analysis.save_csv = True
         self._export_valid_result_to_expected_format(valid_result_wrapper, "csv")
+
+    @pytest.mark.parametrize(
+        "save_option, extension, read_columnar",
+        [
+            pytest.param("save_parquet", "parquet", gpd.read_parquet, id="GeoParquet"),
+            pytest.param("save_feather", "feather", gpd.read_feather, id="Feather"),
+        ],
+    )
+    def test_given_valid_result_export_columnar_keeps_lists(
+        self,
+        valid_result_wrapper: AnalysisResultWrapper,
+        save_option: str,
+        extension: str,
+        read_columnar: Callable[[Path], gpd.GeoDataFrame],
+    ):
+        # 1. Define test data.
+        setattr(valid_result_wrapper.analysis.analysis, save_option, True)
+        valid_result_wrapper.analysis.analysis.save_gpkg = True
+        _result = valid_result_wrapper.analysis_result
+        _result["opt_path"] = [[1, 2, 3], None]
+        _result["mixed_column"] = [[1, 2], "text"]
+
+        # 2. Run test.
+        self._export_valid_result_to_expected_format(valid_result_wrapper, extension)
+
+        # 3. Verify expectations.
+        _exported = read_columnar(
+            next(valid_result_wrapper.analysis.output_path.rglob(f"*.{extension}"))
+        )
+        assert list(_exported["opt_path"][0]) == [1, 2, 3]
+        assert _exported["opt_path"][1] is None
+        assert _exported["mixed_column"].tolist() == ["[1, 2]", "text"]
+        assert _exported.geometry.equals(_result.geometry)
+        assert _result["opt_path"][0] == [1, 2, 3]
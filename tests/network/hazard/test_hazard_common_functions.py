@@ -0,0 +1,31 @@
+import geopandas as gpd
+import networkx as nx
+import pyproj
+from shapely.geometry import LineString
+
+from ra2ce.network.hazard.hazard_common_functions import reprojected_edge_geometries
+
+
+class TestHazardCommonFunctions:
+    def test_reprojected_edge_geometries(self):
+        # 1. Define test data.
+        _graph = nx.MultiDiGraph()
+        _line = LineString([(4.0, 52.0), (4.1, 52.1), (4.2, 52.0)])
+        _graph.add_edge(1, 2, geometry=_line)
+        _graph.add_edge(2, 3)
+        _crs_in = pyproj.CRS.from_user_input("EPSG:4326")
+        _crs_out = pyproj.CRS.from_user_input("EPSG:3857")
+        _expected = gpd.GeoSeries([_line], crs=_crs_in).to_crs(_crs_out)[0]
+
+        # 2. Run test.
+        with reprojected_edge_geometries(_graph, _crs_in, _crs_out) as _reprojected:
+            _reprojected_line = _reprojected.edges[1, 2, 0]["geometry"]
+            nx.set_edge_attributes(_reprojected, {(1, 2, 0): {"EV1_ma": 0.5}})
+
+        # 3. Verify expectations.
+        assert _reprojected is _graph
+        assert _reprojected_line.equals_exact(_expected, 1e-6)
+        # the original geometries are restored, the new attributes are kept.
+        assert _graph.edges[1, 2, 0]["geometry"] is _line
+        assert _graph.edges[1, 2, 0]["EV1_ma"] == 0.5
+        assert "geometry" not in _graph.edges[2, 3, 0]
@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+from rasterstats import point_query
+from shapely.geometry import LineString, Point
+
+from ra2ce.network.hazard.hazard_point_sampler import HazardPointSampler
+from tests import test_results
+
+
+class TestHazardPointSampler:
+    @pytest.fixture(
+        params=[
+            pytest.param(False, id="Striped raster"),
+            pytest.param(True, id="Tiled raster"),
+        ]
+    )
+    def hazard_file(self, request: pytest.FixtureRequest) -> Path:
+        _test_dir = test_results.joinpath(request.node.name)
+        _test_dir.mkdir(parents=True, exist_ok=True)
+        _hazard_file = _test_dir.joinpath("hazard.tif")
+        _values = np.random.default_rng(42).uniform(0, 2, (40, 50)).astype("float32")
+        _values[::7, ::3] = -9999
+        _tiling = (
+            dict(tiled=True, blockxsize=16, blockysize=16) if request.param else {}
+        )
+        with rasterio.open(
+            _hazard_file,
+            "w",
+            driver="GTiff",
+            height=40,
+            width=50,
+            count=1,
+            dtype="float32",
+            crs="EPSG:4326",
+            transform=from_origin(0, 4, 0.1, 0.1),
+            nodata=-9999,
+            **_tiling,
+        ) as _dst:
+            _dst.write(_values, 1)
+        return _hazard_file
+
+    def test_sample_equals_point_query(self, hazard_file: Path):
+        # 1. Define test data.
+        _rng = np.random.default_rng(0)
+        _points = gpd.GeoSeries(
+            [
+                Point(_x, _y)
+                for _x, _y in zip(
+                    _rng.uniform(-0.1, 5.1, 500), _rng.uniform(-0.1, 4.1, 500)
+                )
+            ]
+            + [Point(0, 4), Point(0.05, 3.95), LineString([(1, 1), (2, 2)])]
+        )
+
+        # 2. Run test.
+        _sampled = HazardPointSampler(hazard_file).sample(_points)
+
+        # 3. Verify expectations.
+        def first_value(point_query_result: list):
+            # the value at the first vertex of the (only) geometry
+            _value = point_query_result[0]
+            return _value[0] if isinstance(_value, list) else _value
+
+        _expected = [
+            first_value(point_query(_point, str(hazard_file))) for _point in _points
+        ]
+        assert [
+            None if _value is np.ma.masked else _value for _value in _sampled
+        ] == _expected
+        assert _sampled.mask.any()
@@ -0,0 +1,95 @@
+import math
+
+import geopandas as gpd
+import networkx as nx
+import pytest
+from shapely.geometry import LineString
+
+from ra2ce.network.hazard.hazard_propagator import HazardPropagator
+
+
+class TestHazardPropagator:
+    @pytest.fixture
+    def network_hazard(self) -> gpd.GeoDataFrame:
+        # Two segments of 1 and 3 long, a third one without hazard data.
+        return gpd.GeoDataFrame(
+            {
+                "rfid_c": [1, 2, 3],
+                "EV1_mi": [0.2, 0.1, None],
+                "EV1_ma": [1.0, 0.5, None],
+                "EV1_me": [0.6, 0.2, None],
+                "EV1_fr": [1.0, 0.2, None],
+            },
+            geometry=[
+                LineString([(0, 0), (1, 0)]),
+                LineString([(1, 0), (4, 0)]),
+                LineString([(4, 0), (4, 1)]),
+            ],
+        )
+
+    @pytest.mark.parametrize(
+        "aggregate_wl, expected",
+        [
+            pytest.param("max", 1.0, id="Maximum"),
+            pytest.param("min", 0.1, id="Minimum"),
+            pytest.param("mean", (0.6 + 3 * 0.2) / 4, id="Length-weighted mean"),
+        ],
+    )
+    def test_propagate_simplified_edges(
+        self, network_hazard: gpd.GeoDataFrame, aggregate_wl: str, expected: float
+    ):
+        # 1. Define test data.
+        _graph = nx.MultiGraph()
+        _graph.add_edge(
+            "a", "b", geometry=LineString([(0, 0), (1, 0), (4, 0)]), rfid_c=[1, 2]
+        )
+        _graph.add_edge("b", "c", geometry=LineString([(4, 0), (4, 1)]), rfid_c=3)
+        _graph.add_edge("c", "a", rfid_c=4)
+        _propagator = HazardPropagator(network_hazard, ["EV1"], aggregate_wl)
+
+        # 2. Run test.
+        assert _propagator.can_propagate(_graph)
+        _result = _propagator.propagate(_graph)
+
+        # 3. Verify expectations.
+        _attribute = "EV1_" + aggregate_wl[:2]
+        assert _result.edges["a", "b", 0][_attribute] == pytest.approx(expected)
+        assert _result.edges["a", "b", 0]["EV1_fr"] == pytest.approx(
+            (1.0 + 3 * 0.2) / 4
+        )
+        assert _result.edges["b", "c", 0][_attribute] == 0
+        assert _result.edges["b", "c", 0]["EV1_fr"] == 0
+        assert math.isnan(_result.edges["c", "a", 0][_attribute])
+
+    def test_propagate_split_edges(self, network_hazard: gpd.GeoDataFrame):
+        # 1. Define test data.
+        _graph = nx.MultiGraph()
+        # Both parts of an edge split (at x=2) to add an origin / destination node.
+        _graph.add_edge(
+            "a", "od", geometry=LineString([(0, 0), (1, 0), (2, 0)]), rfid_c=[1, 2]
+        )
+        _graph.add_edge("od", "b", geometry=LineString([(4, 0), (2, 0)]), rfid_c=[1, 2])
+
+        # 2. Run test.
+        _result = HazardPropagator(network_hazard, ["EV1"], "max").propagate(_graph)
+
+        # 3. Verify expectations.
+        assert _result.edges["a", "od", 0]["EV1_ma"] == pytest.approx(1.0)
+        assert _result.edges["a", "od", 0]["EV1_fr"] == pytest.approx(0.6)
+        assert _result.edges["od", "b", 0]["EV1_ma"] == pytest.approx(0.5)
+        assert _result.edges["od", "b", 0]["EV1_fr"] == pytest.approx(0.2)
+
+    def test_can_propagate_without_link_returns_false(
+        self, network_hazard: gpd.GeoDataFrame
+    ):
+        # 1. Define test data.
+        _graph = nx.MultiGraph()
+        _graph.add_edge("a", "b", geometry=LineString([(0, 0), (1, 0)]))
+
+        # 2. Run test.
+        _can_propagate = HazardPropagator(network_hazard, ["EV1"], "max").can_propagate(
+            _graph
+        )
+
+        # 3. Verify expectations.
+        assert not _can_propagate
@@ -0,0 +1,151 @@
+import networkx as nx
+import numpy as np
+import osmnx
+import pytest
+from networkx import MultiDiGraph
+from shapely.geometry import LineString
+
+from ra2ce.network.network_wrappers.osm_network_wrapper.node_consolidator import (
+    NodeConsolidator,
+)
+
+
+class TestNodeConsolidator:
+    def test_get_node_clusters(self):
+        # 1. Define test data.
+        _coordinates = np.array([(0, 0), (1.5, 0), (3, 0), (10, 0), (10, 2.5)])
+
+        # 2. Run test.
+        _clusters = NodeConsolidator(1).get_node_clusters(_coordinates)
+
+        # 3. Verify expectations.
+        assert _clusters[0] == _clusters[1] == _clusters[2]
+        assert len(set(_clusters)) == 3
+
+    @pytest.fixture
+    def _graph_fixture(self) -> MultiDiGraph:
+        # A divided road (1-2, 3-4) crossing a road (5-6, 6-7) with nearby nodes 2, 3 and 6.
+        _graph = nx.MultiDiGraph(crs="EPSG:4326")
+        _nodes = {
+            1: (0, 0),
+            2: (5, 0),
+            3: (5.5, 0.5),
+            4: (10, 1),
+            5: (5, -6),
+            6: (5.2, 0.3),
+            7: (5, 6),
+            8: (20, 0),
+            9: (20.4, 0),
+        }
+        for _node, (_x, _y) in _nodes.items():
+            _graph.add_node(_node, x=_x, y=_y)
+        for _u, _v in [
+            (1, 2),
+            (2, 1),
+            (3, 4),
+            (4, 3),
+            (5, 6),
+            (6, 7),
+            (2, 6),
+            (6, 3),
+            (4, 8),
+            (8, 9),
+            (9, 1),
+            (1, 5),
+            (7, 4),
+        ]:
+            _graph.add_edge(
+                _u,
+                _v,
+                geometry=LineString([_nodes[_u], _nodes[_v]]),
+                length=1.0,
+            )
+        nx.set_node_attributes(
+            _graph, osmnx.stats.count_streets_per_node(_graph), "street_count"
+        )
+        return _graph
+
+    def test_snap_nodes_to_nodes_matches_osmnx(self, _graph_fixture: MultiDiGraph):
+        # 1. Define test data.
+        _threshold = 0.5
+        _expected_graph = osmnx.consolidate_intersections(
+            _graph_fixture, tolerance=_threshold, rebuild_graph=True, dead_ends=False
+        )
+
+        # 2. Run test.
+        _result_graph = NodeConsolidator(_threshold).snap_nodes_to_nodes(_graph_fixture)
+
+        # 3. Verify expectations.
+        assert isinstance(_result_graph, MultiDiGraph)
+        assert dict(_result_graph.nodes(data="osmid_original")) == dict(
+            _expected_graph.nodes(data="osmid_original")
+        )
+        for _node, _data in _expected_graph.nodes(data=True):
+            assert _result_graph.nodes[_node]["x"] == pytest.approx(_data["x"])
+            assert _result_graph.nodes[_node]["y"] == pytest.approx(_data["y"])
+
+        def get_edges(graph: MultiDiGraph) -> list:
+            return sorted(
+                (_u, _v, _k, _data["u_original"], _data["v_original"])
+                for _u, _v, _k, _data in graph.edges(keys=True, data=True)
+            )
+
+        assert get_edges(_result_graph) == get_edges(_expected_graph)
+        for _u, _v, _k, _data in _expected_graph.edges(keys=True, data=True):
+            _result_data = _result_graph.edges[_u, _v, _k]
+            assert _result_data["geometry"].equals_exact(_data["geometry"], 1e-9)
+            assert _result_data["length"] == pytest.approx(_data["length"])
+
+    def test_snap_nodes_to_nodes_without_edges_returns_graph(self):
+        # 1. Define test data.
+        _graph = nx.MultiDiGraph()
+        _graph.add_node(1, x=0, y=0)
+
+        # 2. Run test.
+        _result_graph = NodeConsolidator(1).snap_nodes_to_nodes(_graph, dead_ends=True)
+
+        # 3. Verify expectations.
+        assert list(_result_graph.nodes) == [1]
+
+    def test_snap_nodes_to_edges(self):
+        # 1. Define test data.
+        _graph = nx.MultiDiGraph()
+        for _node, (_x, _y) in {
+            1: (0, 0),
+            2: (10, 0),
+            3: (5, -10),
+            4: (4, 0.5),
+            5: (4, 5),
+        }.items():
+            _graph.add_node(_node, x=_x, y=_y)
+        for _u, _v in [(1, 2), (2, 1), (2, 3), (3, 1), (5, 4)]:
+            _graph.add_edge(_u, _v, length=10.0)
+
+        # 2. Run test.
+        _result_graph = NodeConsolidator(1).snap_nodes_to_edges(_graph)
+
+        # 3. Verify expectations.
+        assert (_result_graph.nodes[4]["x"], _result_graph.nodes[4]["y"]) == (4, 0)
+        assert not _result_graph.has_edge(1, 2)
+        assert not _result_graph.has_edge(2, 1)
+        for _u, _v, _expected_length in [(1, 4, 4), (4, 2, 6), (2, 4, 6), (4, 1, 4)]:
+            _data = _result_graph.edges[_u, _v, 0]
+            assert _data["length"] == pytest.approx(_expected_length)
+            assert _data["geometry"].length == pytest.approx(_expected_length)
+        assert _result_graph.edges[5, 4, 0]["geometry"].coords[-1] == (4, 0)
+        assert _graph.nodes[4]["y"] == 0.5
+
+    def test_snap_nodes_to_edges_beyond_threshold(self):
+        # 1. Define test data.
+        _graph = nx.MultiDiGraph()
+        for _node, (_x, _y) in {1: (0, 0), 2: (10, 0), 3: (4, 2), 4: (4, 5)}.items():
+            _graph.add_node(_node, x=_x, y=_y)
+        _graph.add_edge(1, 2)
+        _graph.add_edge(2, 1)
+        _graph.add_edge(4, 3)
+
+        # 2. Run test.
+        _result_graph = NodeConsolidator(1).snap_nodes_to_edges(_graph)
+
+        # 3. Verify expectations.
+        assert nx.utils.edges_equal(_result_graph.edges, _graph.edges)
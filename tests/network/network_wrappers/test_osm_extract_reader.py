@@ -0,0 +1,215 @@
+import gzip
+import os
+import shutil
+from pathlib import Path
+
+import pytest
+from networkx import MultiDiGraph
+from shapely.geometry import box
+
+from ra2ce.network.network_config_data.enums.network_type_enum import NetworkTypeEnum
+from ra2ce.network.network_config_data.enums.road_type_enum import RoadTypeEnum
+from ra2ce.network.network_config_data.enums.source_enum import SourceEnum
+from ra2ce.network.network_config_data.network_config_data import (
+    NetworkConfigData,
+    NetworkSection,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_extract_reader import (
+    OsmExtractReader,
+    OsmTagFilter,
+    get_network_type_filter,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_network_wrapper import (
+    OsmNetworkWrapper,
+)
+from tests import test_data, test_results
+
+_extract_file = test_data.joinpath("graph", "test_osm_extract_reader", "extract.osm")
+_polygon = box(4.0, 52.0, 4.1, 52.1)
+
+
+class TestOsmTagFilter:
+    @pytest.mark.parametrize(
+        "tags, expected",
+        [
+            pytest.param({"highway": "primary"}, True, id="Matching value"),
+            pytest.param({"highway": "primary_link"}, True, id="Partial match"),
+            pytest.param({"highway": "footway"}, False, id="Not matching value"),
+            pytest.param({"name": "Main road"}, False, id="Missing tag"),
+            pytest.param(
+                {"highway": "primary", "access": "private"}, False, id="Excluded value"
+            ),
+        ],
+    )
+    def test_matches(self, tags: dict, expected: bool):
+        _filter = OsmTagFilter('["highway"~"primary|secondary"]["access"!~"private"]')
+        assert _filter.matches(tags) == expected
+
+
+def test_get_network_type_filter_with_unknown_type_raises():
+    with pytest.raises(ValueError):
+        get_network_type_filter("boat")
+
+
+class TestOsmExtractReader:
+    def test_read_graph_with_network_type(self):
+        # 1. Run test.
+        _graph = OsmExtractReader(_extract_file).read_graph(
+            _polygon, get_network_type_filter("drive")
+        )
+
+        # 2. Verify expectations.
+        assert isinstance(_graph, MultiDiGraph)
+        # Node 8 is outside the polygon, the footway and private road are filtered.
+        assert set(_graph.nodes) == {1, 2, 3, 4, 5, 6}
+        assert set(_graph.edges()) == {(1, 2), (2, 1), (2, 3), (3, 2), (3, 4), (6, 5)}
+        assert _graph.edges[1, 2, 0]["osmid"] == 100
+        assert _graph.edges[1, 2, 0]["name"] == "Main road"
+        assert _graph.edges[1, 2, 0]["length"] > 0
+        assert not _graph.edges[1, 2, 0]["reversed"]
+        assert _graph.edges[2, 1, 0]["reversed"]
+        assert _graph.edges[3, 4, 0]["oneway"]
+        assert _graph.nodes[3]["highway"] == "traffic_signals"
+        assert _graph.nodes[3]["street_count"] == 2
+        assert _graph.graph["crs"] == "epsg:4326"
+
+    def test_read_graph_with_road_types(self):
+        # 1. Run test.
+        _graph = OsmExtractReader(_extract_file).read_graph(
+            _polygon, '["highway"~"primary"]'
+        )
+
+        # 2. Verify expectations.
+        assert set(_graph.edges()) == {
+            (1, 2),
+            (2, 1),
+            (2, 3),
+            (3, 2),
+            (6, 5),
+            (6, 7),
+            (7, 6),
+        }
+
+    @pytest.mark.parametrize(
+        "tile_size",
+        [pytest.param(0.01, id="Many tiles"), pytest.param(0.05, id="Four tiles")],
+    )
+    def test_read_graph_tiles_are_stitched(self, tile_size: float):
+        # 1. Define test data.
+        _expected = OsmExtractReader(_extract_file, tile_size=1).read_graph(
+            _polygon, get_network_type_filter("drive")
+        )
+
+        # 2. Run test.
+        _graph = OsmExtractReader(_extract_file, tile_size=tile_size).read_graph(
+            _polygon, get_network_type_filter("drive")
+        )
+
+        # 3. Verify expectations.
+        assert set(_graph.nodes) == set(_expected.nodes)
+        assert set(_graph.edges(keys=True)) == set(_expected.edges(keys=True))
+
+    def test_read_nodes_keeps_referenced_nodes_within_bounds(self):
+        # 1. Define test data.
+        _reader = OsmExtractReader(_extract_file)
+        _reader._chunk_size = 2
+        _node_ids = _reader._read_node_ids(
+            _extract_file, OsmTagFilter(get_network_type_filter("all_private"))
+        )
+
+        # 2. Run test.
+        _nodes = _reader._read_nodes(_extract_file, _node_ids, (4.0, 52.0, 4.05, 52.1))
+
+        # 3. Verify expectations.
+        # Node 9 is not referenced by any way, the other nodes are out of bounds.
+        assert _node_ids.tolist() == [1, 2, 3, 4, 5, 6, 7, 8]
+        assert set(_nodes) == {1, 2, 4}
+        assert _nodes[1] == dict(y=52.01, x=4.01)
+
+    def test_read_graph_from_compressed_extract(self):
+        # 1. Define test data.
+        _output_dir = test_results.joinpath("test_osm_extract_reader")
+        _output_dir.mkdir(parents=True, exist_ok=True)
+        _compressed_file = _output_dir.joinpath("extract.osm.gz")
+        with open(_extract_file, "rb") as _source, gzip.open(
+            _compressed_file, "wb"
+        ) as _target:
+            shutil.copyfileobj(_source, _target)
+
+        # 2. Run test.
+        _graph = OsmExtractReader(_compressed_file).read_graph(
+            _polygon, get_network_type_filter("drive")
+        )
+
+        # 3. Verify expectations.
+        assert set(_graph.nodes) == {1, 2, 3, 4, 5, 6}
+
+    @pytest.fixture
+    def _fake_osmconvert(
+        self, request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch
+    ) -> Path:
+        # An `osmconvert` on the `PATH` which logs its arguments and "converts" to the test extract.
+        _bin_dir = test_results.joinpath(request.node.name, "bin")
+        if _bin_dir.exists():
+            shutil.rmtree(_bin_dir)
+        _bin_dir.mkdir(parents=True)
+        _arguments_file = _bin_dir.joinpath("arguments.txt")
+        _osmconvert = _bin_dir.joinpath("osmconvert")
+        _osmconvert.write_text(
+            "#!/bin/sh\n"
+            f'printf "%s\\n" "$@" > "{_arguments_file}"\n'
+            'for _arg in "$@"; do\n'
+            '  case "$_arg" in\n'
+            f'    -o=*) cp "{_extract_file}" "${{_arg#-o=}}" ;;\n'
+            "  esac\n"
+            "done\n"
+        )
+        _osmconvert.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{_bin_dir}{os.pathsep}{os.environ['PATH']}")
+        return _arguments_file
+
+    @pytest.mark.skipif(os.name == "nt", reason="Uses a shell script as osmconvert.")
+    def test_read_graph_from_pbf_extract(self, _fake_osmconvert: Path):
+        # 1. Define test data.
+        _pbf_file = _fake_osmconvert.parent.joinpath("my extract.osm.pbf")
+        _pbf_file.write_bytes(b"")
+
+        # 2. Run test.
+        _graph = OsmExtractReader(_pbf_file).read_graph(
+            _polygon, get_network_type_filter("drive")
+        )
+
+        # 3. Verify expectations.
+        assert set(_graph.nodes) == {1, 2, 3, 4, 5, 6}
+        _arguments = _fake_osmconvert.read_text().splitlines()
+        assert _arguments[:3] == [
+            str(_pbf_file),
+            "--complete-ways",
+            "--drop-broken-refs",
+        ]
+        assert _arguments[3].startswith("-o=") and _arguments[3].endswith(
+            "my extract.osm"
+        )
+
+    def test_read_graph_with_unsupported_extract_raises(self):
+        with pytest.raises(ValueError):
+            OsmExtractReader(Path("extract.shp")).read_graph(
+                _polygon, get_network_type_filter("drive")
+            )
+
+    def test_osm_network_wrapper_with_osm_extract(self):
+        # 1. Define test data.
+        _network_section = NetworkSection(
+            source=SourceEnum.OSM_EXTRACT,
+            primary_file=[_extract_file],
+            network_type=NetworkTypeEnum.DRIVE,
+            road_types=[RoadTypeEnum.PRIMARY, RoadTypeEnum.SECONDARY],
+        )
+
+        # 2. Run test.
+        _wrapper = OsmNetworkWrapper.with_polygon(
+            NetworkConfigData(network=_network_section), _polygon
+        )
+
+        # 3. Verify expectations.
+        assert set(_wrapper.polygon_graph.nodes) == {1, 2, 3, 4, 5, 6, 7}
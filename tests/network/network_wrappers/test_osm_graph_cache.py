@@ -0,0 +1,106 @@
+import shutil
+
+import pytest
+from shapely.geometry import Polygon, box
+
+from ra2ce.network.network_config_data.enums.network_type_enum import NetworkTypeEnum
+from ra2ce.network.network_config_data.enums.road_type_enum import RoadTypeEnum
+from ra2ce.network.network_config_data.enums.source_enum import SourceEnum
+from ra2ce.network.network_config_data.network_config_data import (
+    NetworkConfigData,
+    NetworkSection,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_extract_reader import (
+    OsmExtractReader,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_graph_cache import (
+    OsmGraphCache,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_network_wrapper import (
+    OsmNetworkWrapper,
+)
+from tests import test_data, test_results
+
+
+class TestOsmGraphCache:
+    def test_get_key_with_equal_polygons(self):
+        # 1. Define test data.
+        _polygon = Polygon([(0, 0), (1, 0), (1, 1), (0, 1)])
+        _reordered_polygon = Polygon([(1, 1), (0, 1), (0, 0), (1, 0)])
+
+        # 2. Run test.
+        _keys = [
+            OsmGraphCache.get_key(_p, ["primary", "secondary"], "drive", 0.1)
+            for _p in [_polygon, _reordered_polygon]
+        ]
+
+        # 3. Verify expectations.
+        assert _keys[0] == _keys[1]
+        assert _keys[0] == OsmGraphCache.get_key(
+            _polygon, ["secondary", "primary"], "drive", 0.1
+        )
+
+    @pytest.mark.parametrize(
+        "road_types, network_type, snapping_threshold",
+        [
+            pytest.param(["primary"], "drive", 0.1, id="Other road types"),
+            pytest.param(
+                ["primary", "secondary"], "walk", 0.1, id="Other network type"
+            ),
+            pytest.param(["primary", "secondary"], "drive", 0.2, id="Other threshold"),
+        ],
+    )
+    def test_get_key_with_other_settings(
+        self, road_types: list[str], network_type: str, snapping_threshold: float
+    ):
+        _polygon = box(0, 0, 1, 1)
+        assert OsmGraphCache.get_key(
+            _polygon, ["primary", "secondary"], "drive", 0.1
+        ) != OsmGraphCache.get_key(
+            _polygon, road_types, network_type, snapping_threshold
+        )
+
+    def test_read_without_cache_returns_none(self):
+        _cache_dir = test_results.joinpath("test_osm_graph_cache", "no_cache")
+        assert OsmGraphCache(_cache_dir).read("missing") is None
+
+    def test_osm_network_wrapper_reuses_cached_graphs(
+        self, monkeypatch: pytest.MonkeyPatch
+    ):
+        # 1. Define test data.
+        _static_path = test_results.joinpath("test_osm_graph_cache", "static")
+        if _static_path.exists():
+            shutil.rmtree(_static_path)
+        _config_data = NetworkConfigData(
+            static_path=_static_path,
+            network=NetworkSection(
+                source=SourceEnum.OSM_EXTRACT,
+                primary_file=[
+                    test_data.joinpath(
+                        "graph", "test_osm_extract_reader", "extract.osm"
+                    )
+                ],
+                network_type=NetworkTypeEnum.DRIVE,
+                road_types=[RoadTypeEnum.PRIMARY, RoadTypeEnum.SECONDARY],
+                directed=True,
+            ),
+        )
+        _polygon = box(4.0, 52.0, 4.1, 52.1)
+        _graph, _edges = OsmNetworkWrapper.get_network_from_polygon(
+            _config_data, _polygon
+        )
+        assert any(_static_path.joinpath("osm_cache").glob("*.p"))
+
+        def read_graph_not_expected(*args, **kwargs):
+            raise AssertionError("The OSM extract should not be read again.")
+
+        monkeypatch.setattr(OsmExtractReader, "read_graph", read_graph_not_expected)
+
+        # 2. Run test.
+        _cached_graph, _cached_edges = OsmNetworkWrapper.get_network_from_polygon(
+            _config_data, _polygon
+        )
+
+        # 3. Verify expectations.
+        assert set(_cached_graph.edges(keys=True)) == set(_graph.edges(keys=True))
+        assert list(_cached_edges["rfid_c"]) == list(_edges["rfid_c"])
@@ -0,0 +1,270 @@
+import json
+import shutil
+from pathlib import Path
+from unittest import mock
+
+import geopandas as gpd
+import networkx as nx
+import numpy as np
+import pytest
+from shapely.geometry import LineString, Point, box, mapping
+
+from ra2ce.network.network_config_data.enums.network_type_enum import NetworkTypeEnum
+from ra2ce.network.network_config_data.enums.source_enum import SourceEnum
+from ra2ce.network.network_config_data.network_config_data import NetworkConfigData
+from ra2ce.network.network_wrappers.network_wrapper_factory import (
+    NetworkWrapperFactory,
+)
+from ra2ce.network.network_wrappers.network_wrapper_protocol import (
+    NetworkWrapperProtocol,
+)
+from ra2ce.network.network_wrappers.osm_network_wrapper.osm_network_wrapper import (
+    OsmNetworkWrapper,
+)
+from ra2ce.network.network_wrappers.partitioned_network_wrapper import (
+    PartitionedNetworkWrapper,
+)
+from tests import test_results
+
+
+class TestPartitionedNetworkWrapper:
+    @pytest.fixture
+    def _config_fixture(self, request: pytest.FixtureRequest) -> NetworkConfigData:
+        _output_dir = test_results.joinpath(request.node.name)
+        if _output_dir.exists():
+            shutil.rmtree(_output_dir)
+        _output_dir.joinpath("output_graph").mkdir(parents=True)
+
+        # A grid of 10 x 10 cells of lines.
+        _lines = [
+            LineString([(_i, _j), (_i + _di, _j + _dj)])
+            for _i in range(11)
+            for _j in range(11)
+            for _di, _dj in [(1, 0), (0, 1)]
+            if _i + _di <= 10 and _j + _dj <= 10
+        ]
+        _primary_file = _output_dir.joinpath("grid.gpkg")
+        gpd.GeoDataFrame(
+            {"link_id": range(len(_lines))}, geometry=_lines, crs=3857
+        ).to_file(_primary_file)
+
+        _config_data = NetworkConfigData(static_path=_output_dir)
+        _config_data.crs = 3857
+        _config_data.network.source = SourceEnum.SHAPEFILE
+        _config_data.network.primary_file = [_primary_file]
+        _config_data.network.file_id = "link_id"
+        _config_data.network.tile_size = 3
+        _config_data.network.tile_overlap = 0.1
+        return _config_data
+
+    def test_initialize(self, _config_fixture: NetworkConfigData):
+        # 1. Run test.
+        _wrapper = PartitionedNetworkWrapper(_config_fixture)
+
+        # 2. Verify expectations.
+        assert isinstance(_wrapper, PartitionedNetworkWrapper)
+        assert isinstance(_wrapper, NetworkWrapperProtocol)
+        assert _wrapper.bounds == pytest.approx((0, 0, 10, 10))
+
+    def test_initialize_unsupported_source_raises(self):
+        # 1. Define test data.
+        _config_data = NetworkConfigData()
+        _config_data.network.source = SourceEnum.OSB_BPF
+        _config_data.network.tile_size = 1
+
+        # 2. Run test.
+        with pytest.raises(ValueError):
+            PartitionedNetworkWrapper(_config_data)
+
+    def test_get_tiles(self):
+        # 1. Run test.
+        _tiles = PartitionedNetworkWrapper.get_tiles((0, 0, 5, 2), 2)
+
+        # 2. Verify expectations.
+        assert _tiles == [
+            (0, 0, 2, 2),
+            (2, 0, 4, 2),
+            (4, 0, 6, 2),
+        ]
+
+    def test_get_tile_indices(self):
+        # 1. Define test data.
+        _geometries = np.array(
+            [
+                Point(1, 1),
+                Point(2, 0.5),
+                Point(-1, 3),
+                LineString([(0, 1), (3, 1), (10, 1)]),
+            ]
+        )
+
+        # 2. Run test.
+        _tile_indices = PartitionedNetworkWrapper.get_tile_indices(
+            _geometries, (0, 0, 4, 4), 2
+        )
+
+        # 3. Verify expectations.
+        assert _tile_indices.tolist() == [0, 2, 1, 2]
+
+    def test_merge_tile_graphs_on_coordinates(self):
+        # 1. Define test data.
+        def get_tile_graph(points: list[tuple]) -> nx.MultiDiGraph:
+            _graph = nx.MultiDiGraph(crs=3857)
+            for _node, _point in enumerate(points):
+                _graph.add_node(_node, node_fid=_node, geometry=Point(_point))
+            _graph.add_edge(0, 1, node_A=0, node_B=1, edge_fid="0_1")
+            return _graph
+
+        _tile_graphs = [
+            get_tile_graph([(2, 0), (1, 0)]),
+            nx.MultiDiGraph(),
+            get_tile_graph([(2, 0), (3, 0)]),
+        ]
+
+        # 2. Run test.
+        _merged_graph = PartitionedNetworkWrapper.merge_tile_graphs(
+            _tile_graphs, keep_node_ids=False
+        )
+
+        # 3. Verify expectations.
+        assert _merged_graph.graph["crs"] == 3857
+        assert dict(_merged_graph.nodes(data="node_fid")) == {0: 0, 1: 1, 2: 2}
+        assert _merged_graph.nodes[0]["geometry"].equals(Point(1, 0))
+        assert sorted(_merged_graph.edges(data="edge_fid")) == [
+            (1, 0, "1_0"),
+            (1, 2, "1_2"),
+        ]
+
+    def test_merge_tile_graphs_on_node_ids(self):
+        # 1. Define test data.
+        _tile_graphs = [nx.MultiDiGraph(), nx.MultiDiGraph()]
+        _tile_graphs[0].add_edge(10, 20)
+        _tile_graphs[1].add_edge(20, 30)
+
+        # 2. Run test.
+        _merged_graph = PartitionedNetworkWrapper.merge_tile_graphs(
+            _tile_graphs, keep_node_ids=True
+        )
+
+        # 3. Verify expectations.
+        assert list(_merged_graph.nodes) == [10, 20, 30]
+        assert list(_merged_graph.edges()) == [(10, 20), (20, 30)]
+
+    @pytest.mark.parametrize("n_workers", [1, 2])
+    @pytest.mark.parametrize("directed", [True, False])
+    def test_get_network_matches_network_built_at_once(
+        self, _config_fixture: NetworkConfigData, directed: bool, n_workers: int
+    ):
+        # 1. Define test data.
+        _config_fixture.network.directed = directed
+        _config_fixture.network.n_workers = n_workers
+        _expected_graph, _expected_edges = NetworkWrapperFactory(
+            NetworkConfigData(
+                static_path=_config_fixture.static_path,
+                crs=_config_fixture.crs,
+                network=type(_config_fixture.network)(
+                    source=SourceEnum.SHAPEFILE,
+                    primary_file=_config_fixture.network.primary_file,
+                    file_id="link_id",
+                    directed=directed,
+                ),
+            )
+        ).get_network()
+
+        # 2. Run test.
+        _graph, _edges = NetworkWrapperFactory(_config_fixture).get_network()
+
+        # 3. Verify expectations.
+        assert _graph.number_of_nodes() == _expected_graph.number_of_nodes()
+        assert _graph.number_of_edges() == _expected_graph.number_of_edges()
+        assert sorted(_edges["link_id"]) == sorted(_expected_edges["link_id"])
+
+        def get_node_points(graph: nx.Graph) -> set:
+            return {
+                (_data["geometry"].x, _data["geometry"].y)
+                for _, _data in graph.nodes(data=True)
+            }
+
+        assert get_node_points(_graph) == get_node_points(_expected_graph)
+
+    @pytest.fixture
+    def _osm_graph_fixture(self) -> nx.MultiDiGraph:
+        # A two-way grid of 6 x 2 OSM nodes, with (large) OSM ids.
+        _graph = nx.MultiDiGraph(crs="epsg:4326")
+        for _i in range(6):
+            for _j in range(2):
+                _graph.add_node(1000 + 10 * _i + _j, x=float(_i), y=float(_j))
+        for _u, _data in list(_graph.nodes(data=True)):
+            for _v, _v_data in list(_graph.nodes(data=True)):
+                if abs(_data["x"] - _v_data["x"]) + abs(_data["y"] - _v_data["y"]) == 1:
+                    _graph.add_edge(_u, _v, osmid=_u, highway="residential")
+        return _graph
+
+    @pytest.fixture
+    def _osm_config_fixture(self, request: pytest.FixtureRequest) -> NetworkConfigData:
+        _output_dir = test_results.joinpath(request.node.name)
+        if _output_dir.exists():
+            shutil.rmtree(_output_dir)
+        _output_dir.mkdir(parents=True)
+        _polygon_file = _output_dir.joinpath("polygon.geojson")
+        _polygon_file.write_text(
+            json.dumps(
+                {
+                    "type": "FeatureCollection",
+                    "features": [
+                        {
+                            "type": "Feature",
+                            "properties": {},
+                            "geometry": mapping(box(-0.5, -0.5, 5.5, 1.5)),
+                        }
+                    ],
+                }
+            )
+        )
+
+        _config_data = NetworkConfigData()
+        _config_data.network.source = SourceEnum.OSM_DOWNLOAD
+        _config_data.network.polygon = _polygon_file
+        _config_data.network.network_type = NetworkTypeEnum.DRIVE
+        _config_data.network.tile_size = 3
+        _config_data.network.tile_overlap = 1.5
+        _config_data.network.n_workers = 1
+        return _config_data
+
+    def test_get_complex_graph_merges_osm_tiles_before_cleaning(
+        self,
+        _osm_config_fixture: NetworkConfigData,
+        _osm_graph_fixture: nx.MultiDiGraph,
+    ):
+        # 1. Define test data.
+        def download_graph(polygon, **kwargs) -> nx.MultiDiGraph:
+            _nodes = [
+                _node
+                for _node, _data in _osm_graph_fixture.nodes(data=True)
+                if polygon.intersects(Point(_data["x"], _data["y"]))
+            ]
+            return _osm_graph_fixture.subgraph(_nodes).copy()
+
+        _expected_graph = OsmNetworkWrapper.get_clean_graph(_osm_graph_fixture.copy())
+
+        # 2. Run test.
+        with mock.patch.object(
+            OsmNetworkWrapper, "download_graph_from_osm", side_effect=download_graph
+        ):
+            _wrapper = PartitionedNetworkWrapper(_osm_config_fixture)
+            _tile_graphs = _wrapper.get_tile_graphs()
+            _complex_graph = _wrapper.get_complex_graph()
+
+        # 3. Verify expectations.
+        assert len(_tile_graphs) == 2
+        _merged_graph = PartitionedNetworkWrapper.merge_tile_graphs(
+            _tile_graphs, keep_node_ids=True
+        )
+        assert set(_merged_graph.nodes) == set(_osm_graph_fixture.nodes)
+        assert _merged_graph.number_of_edges() == _osm_graph_fixture.number_of_edges()
+
+        def get_nodes(graph: nx.MultiDiGraph) -> list:
+            return sorted(graph.nodes(data="osmid_original"))
+
+        assert get_nodes(_complex_graph) == get_nodes(_expected_graph)
+        assert _complex_graph.number_of_edges() == _expected_graph.number_of_edges()
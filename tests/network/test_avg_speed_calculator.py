@@ -0,0 +1,96 @@
+import math
+
+import networkx as nx
+import pandas as pd
+import pytest
+
+from ra2ce.network.avg_speed_calculator import AvgSpeedCalculator
+
+
+class TestAvgSpeedCalculator:
+    @pytest.mark.parametrize(
+        "maxspeed, expected",
+        [
+            pytest.param("50", 50, id="Integer text"),
+            pytest.param("30;50", 40, id="Semicolon separated"),
+            pytest.param("30|70", 50, id="Pipe separated"),
+            pytest.param("20-40", 30, id="Dash separated"),
+            pytest.param("10 mph", 16.09344, id="Miles per hour"),
+            pytest.param(["50", "30;70"], 50, id="List of texts"),
+        ],
+    )
+    def test_parse_maxspeed(self, maxspeed, expected: float):
+        assert AvgSpeedCalculator.parse_maxspeed(maxspeed) == pytest.approx(expected)
+
+    @pytest.mark.parametrize(
+        "maxspeed",
+        [
+            pytest.param("signals", id="Unparsable text"),
+            pytest.param(";", id="Only separators"),
+            pytest.param(["none"], id="Unparsable list"),
+            pytest.param(None, id="No value"),
+        ],
+    )
+    def test_parse_maxspeed_without_speed_returns_nan(self, maxspeed):
+        assert math.isnan(AvgSpeedCalculator.parse_maxspeed(maxspeed))
+
+    @pytest.fixture
+    def _graph_fixture(self) -> nx.MultiDiGraph:
+        _graph = nx.MultiDiGraph()
+        _graph.add_edge(1, 2, highway="primary", maxspeed="50", length=1000)
+        _graph.add_edge(2, 3, highway="primary", maxspeed="100", length=3000)
+        _graph.add_edge(3, 4, highway="primary", maxspeed="signals", length=500)
+        _graph.add_edge(4, 5, highway="primary", length=2000)
+        _graph.add_edge(5, 6, highway="primary_link", length=1000)
+        _graph.add_edge(
+            6, 7, highway=["secondary", "primary"], maxspeed="60", length=1000
+        )
+        _graph.add_edge(7, 8, highway=["primary", "secondary"], length=1000)
+        return _graph
+
+    def test_get_avg_speed_per_road_type(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _avg_speeds = AvgSpeedCalculator(
+            _graph_fixture, "highway"
+        ).get_avg_speed_per_road_type()
+
+        # 2. Verify expectations.
+        _avg_speed_dict = dict(zip(_avg_speeds["road_types"], _avg_speeds["avg_speed"]))
+        assert _avg_speed_dict == {
+            "['secondary', 'primary']": 60,
+            "['primary', 'secondary']": 87.5,
+            "primary": 87.5,
+            "primary_link": 87.5,
+        }
+
+    def test_assign_avg_speed_with_time(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Define test data.
+        _avg_road_speed = pd.DataFrame(
+            {
+                "road_types": [
+                    "primary",
+                    "primary_link",
+                    "['secondary', 'primary']",
+                ],
+                "avg_speed": [87.5, 40.0, 60.7],
+            }
+        )
+
+        # 2. Run test.
+        _graph = AvgSpeedCalculator(_graph_fixture, "highway").assign_avg_speed(
+            _avg_road_speed, with_time=True
+        )
+
+        # 3. Verify expectations.
+        _avg_speeds = nx.get_edge_attributes(_graph, "avgspeed")
+        assert _avg_speeds == {
+            (1, 2, 0): 50,
+            (2, 3, 0): 100,
+            (3, 4, 0): 88,
+            (4, 5, 0): 88,
+            (5, 6, 0): 40,
+            (6, 7, 0): 60,
+            (7, 8, 0): 60,
+        }
+        assert _graph.edges[1, 2, 0]["time"] == 72
+        assert _graph.edges[5, 6, 0]["time"] == 90
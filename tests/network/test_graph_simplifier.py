@@ -0,0 +1,142 @@
+import networkx as nx
+import numpy as np
+import pytest
+from shapely.geometry import LineString
+
+import ra2ce.network.networks_utils as nu
+from ra2ce.network.graph_simplifier import GraphSimplifier
+
+
+class TestGraphSimplifier:
+    @pytest.fixture
+    def _graph_fixture(self) -> nx.MultiDiGraph:
+        # A two-way road 1-2-3-4 and a one-way road 4-5-6-1, nodes 2, 3 and 5 are interstitial.
+        _graph = nx.MultiDiGraph()
+        for _node in range(1, 8):
+            _graph.add_node(_node, x=float(_node), y=float(_node % 2))
+        _edges = [(1, 2), (2, 3), (3, 4), (4, 5), (5, 6), (6, 1), (6, 7)]
+        for _rfid_c, (_u, _v) in enumerate(_edges, start=1):
+            _graph.add_edge(_u, _v, length=1.0, osmid=1, rfid_c=_rfid_c)
+        for _rfid_c, (_u, _v) in enumerate(_edges[:3], start=len(_edges) + 1):
+            _graph.add_edge(_v, _u, length=1.0, osmid=1, rfid_c=_rfid_c)
+        return _graph
+
+    def test_get_endpoints(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Define test data.
+        _u_idx, _v_idx = map(
+            np.array, zip(*[(_u - 1, _v - 1) for _u, _v in _graph_fixture.edges()])
+        )
+
+        # 2. Run test.
+        _endpoints = GraphSimplifier().get_endpoints(7, _u_idx, _v_idx)
+
+        # 3. Verify expectations.
+        assert list(np.flatnonzero(_endpoints) + 1) == [1, 4, 6, 7]
+
+    def test_simplify(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _simple_graph = GraphSimplifier().simplify(_graph_fixture)
+
+        # 2. Verify expectations.
+        assert list(_simple_graph.nodes) == [1, 4, 6, 7]
+        assert sorted(_simple_graph.edges()) == [(1, 4), (4, 1), (4, 6), (6, 1), (6, 7)]
+        _edge_data = _simple_graph.edges[1, 4, 0]
+        assert _edge_data["length"] == 3
+        assert _edge_data["osmid"] == 1
+        assert _edge_data["rfid_c"] == [1, 2, 3]
+        assert _edge_data["geometry"].equals(
+            LineString([(1, 1), (2, 0), (3, 1), (4, 0)])
+        )
+        assert _simple_graph.graph["simplified"]
+        assert len(_graph_fixture.nodes) == 7
+
+    def test_simplify_not_strict_keeps_nodes_between_osmids(
+        self, _graph_fixture: nx.MultiDiGraph
+    ):
+        # 1. Define test data.
+        _graph_fixture.edges[5, 6, 0]["osmid"] = 2
+
+        # 2. Run test.
+        _simple_graph = GraphSimplifier(strict=False).simplify(_graph_fixture)
+
+        # 3. Verify expectations.
+        assert list(_simple_graph.nodes) == [1, 4, 5, 6, 7]
+
+    def test_simplify_with_track_merged(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _simple_graph = GraphSimplifier(track_merged=True).simplify(_graph_fixture)
+
+        # 2. Verify expectations.
+        assert _simple_graph.edges[4, 6, 0]["merged_edges"] == [(4, 5), (5, 6)]
+
+    @pytest.mark.parametrize(
+        "remove_rings, expected_nodes",
+        [
+            pytest.param(True, [1, 2], id="Remove rings"),
+            pytest.param(False, [1, 2, 10, 11, 12], id="Keep rings"),
+        ],
+    )
+    def test_simplify_rings(self, remove_rings: bool, expected_nodes: list[int]):
+        # 1. Define test data.
+        _graph = nx.MultiDiGraph()
+        _graph.add_edge(1, 2)
+        nx.add_cycle(_graph, [10, 11, 12])
+
+        # 2. Run test.
+        _simple_graph = GraphSimplifier(remove_rings=remove_rings).simplify(_graph)
+
+        # 3. Verify expectations.
+        assert list(_simple_graph.nodes) == expected_nodes
+
+    def test_simplify_simplified_graph_raises(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Define test data.
+        _simple_graph = GraphSimplifier().simplify(_graph_fixture)
+
+        # 2. Run test.
+        with pytest.raises(ValueError):
+            GraphSimplifier().simplify(_simple_graph)
+
+    def test_simplify_with_link_tables(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _simple_graph, _link_table = GraphSimplifier().simplify_with_link_tables(
+            _graph_fixture
+        )
+
+        # 2. Verify expectations.
+        _simple_ids = nx.get_edge_attributes(_simple_graph, "rfid")
+        assert sorted(_simple_ids.values()) == [1, 2, 3, 4, 5]
+        _simple_id = _simple_ids[(1, 4, 0)]
+        assert [
+            _link[1] for _link in _link_table.tolist() if _link[0] == _simple_id
+        ] == [1, 2, 3]
+        for _u, _v, _data in _graph_fixture.edges(data=True):
+            assert _data["rfid"] in _simple_ids.values()
+        assert _graph_fixture.edges[2, 3, 0]["rfid"] == _simple_id
+
+    def test_get_id_tables(self):
+        # 1. Define test data.
+        _link_table = np.array([[1, 4], [1, 5], [2, 6]])
+
+        # 2. Run test.
+        _simple_to_complex, _complex_to_simple = GraphSimplifier.get_id_tables(
+            _link_table
+        )
+
+        # 3. Verify expectations.
+        assert _simple_to_complex == {1: [4, 5], 2: 6}
+        assert _complex_to_simple == {4: 1, 5: 1, 6: 2}
+
+    def test_create_simplified_graph(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _simple_graph, _complex_graph, _id_tables = nu.create_simplified_graph(
+            _graph_fixture
+        )
+
+        # 2. Verify expectations.
+        assert _simple_graph.number_of_edges() == 5
+        _simple_to_complex, _complex_to_simple = _id_tables
+        assert sorted(_complex_to_simple) == list(range(1, 11))
+        for _u, _v, _data in _simple_graph.edges(data=True):
+            assert _simple_to_complex[_data["rfid"]] == _data["rfid_c"]
+        for _u, _v, _data in _complex_graph.edges(data=True):
+            assert _complex_to_simple[_data["rfid_c"]] == _data["rfid"]
@@ -405,3 +405,54 @@ class TestAddMissingGeomsGraph:
         _data = _items[0][-1]
         assert isinstance(_data, dict)
         assert isinstance(_data[_geom_name], LineString)
+
+
+class TestGraphGdfConversion:
+    @pytest.fixture
+    def _graph_fixture(self) -> nx.MultiGraph:
+        _graph = nx.MultiGraph(crs=CRS.from_epsg(4326))
+        _graph.add_node(1, x=0.0, y=0.0, geometry=Point(0, 0))
+        _graph.add_node(2, x=1.0, y=1.0, geometry=Point(1, 1))
+        _graph.add_edge(
+            1, 2, node_A=1, node_B=2, length=10.0, geometry=LineString([(0, 0), (1, 1)])
+        )
+        _graph.add_edge(1, 2, node_A=1, node_B=2, highway=["primary", "secondary"])
+        return _graph
+
+    def test_get_edges_gdf_from_graph(self, _graph_fixture: nx.MultiGraph):
+        # 1. Run test.
+        _edges = nu.get_edges_gdf_from_graph(_graph_fixture)
+
+        # 2. Verify expectations.
+        assert isinstance(_edges, gpd.GeoDataFrame)
+        assert list(_edges.index) == [(1, 2, 0), (1, 2, 1)]
+        assert _edges.crs == _graph_fixture.graph["crs"]
+        assert isinstance(_edges.geometry, gpd.GeoSeries)
+        assert _edges.geometry.iloc[1].equals(LineString([(0, 0), (1, 1)]))
+        assert _edges["highway"].iloc[1] == ["primary", "secondary"]
+        assert math.isnan(_edges["length"].iloc[1])
+
+    def test_get_nodes_gdf_from_graph(self, _graph_fixture: nx.MultiGraph):
+        # 1. Run test.
+        _nodes = nu.get_nodes_gdf_from_graph(_graph_fixture)
+
+        # 2. Verify expectations.
+        assert list(_nodes.index) == [1, 2]
+        assert _nodes.index.name == "osmid"
+        assert _nodes.geometry.iloc[1].equals(Point(1, 1))
+
+    def test_graph_from_gdf_round_trip(self, _graph_fixture: nx.MultiGraph):
+        # 1. Define test data.
+        _edges, _nodes = nu.graph_to_gdf(_graph_fixture, save_nodes=True)
+        _nodes["ID"] = _nodes.index
+
+        # 2. Run test.
+        _graph = nu.graph_from_gdf(_edges.reset_index(drop=True), _nodes)
+
+        # 3. Verify expectations.
+        assert isinstance(_graph, nx.MultiGraph)
+        assert _graph.graph["name"] == "network"
+        assert list(_graph.nodes) == [1, 2]
+        assert _graph.number_of_edges(1, 2) == 2
+        assert _graph.edges[1, 2, 0]["length"] == 10.0
+        assert _graph.edges[1, 2, 1]["highway"] == ["primary", "secondary"]
@@ -0,0 +1,91 @@
+import networkx as nx
+import pytest
+from shapely.geometry import Point
+
+from ra2ce.network.node_coordinate_index import NodeCoordinateIndex
+
+
+class TestNodeCoordinateIndex:
+    def test_initialize(self):
+        # 1. Run test.
+        _node_index = NodeCoordinateIndex()
+
+        # 2. Verify expectations.
+        assert isinstance(_node_index, NodeCoordinateIndex)
+        assert _node_index.decimals == 7
+        assert len(_node_index) == 0
+
+    @pytest.fixture
+    def _graph_fixture(self) -> nx.MultiDiGraph:
+        _graph = nx.MultiDiGraph()
+        _graph.add_node(1, x=1.0, y=10.0)
+        _graph.add_node(2, geometry=Point(2.0, 20.0))
+        _graph.add_node(3, x=1.0, y=10.0)
+        _graph.add_node(4)
+        return _graph
+
+    def test_from_graph(self, _graph_fixture: nx.MultiDiGraph):
+        # 1. Run test.
+        _node_index = NodeCoordinateIndex.from_graph(_graph_fixture)
+
+        # 2. Verify expectations.
+        assert len(_node_index) == 2
+        assert _node_index.get_node_id(1.0, 10.0) == 1
+        assert _node_index.get_node_id(2.0, 20.0) == 2
+        assert _node_index.get_node_id(4.0, 40.0) is None
+
+    def test_from_points(self):
+        # 1. Define test data.
+        _points = [Point(0.1, 0.2), Point(0.3, 0.4)]
+
+        # 2. Run test.
+        _node_index = NodeCoordinateIndex.from_points(["a", "b"], _points)
+
+        # 3. Verify expectations.
+        assert _node_index.get_node_id(0.1, 0.2) == "a"
+        assert _node_index.get_node_id(0.3, 0.4) == "b"
+
+    def test_get_node_id_with_rounding_differences(self):
+        # 1. Define test data.
+        _node_index = NodeCoordinateIndex()
+        _node_index.add_node(42, 4.123456789, 51.987654321)
+
+        # 2. Run test.
+        _node_id = _node_index.get_node_id(4.1234568, 51.9876543)
+
+        # 3. Verify expectations.
+        assert _node_id == 42
+        assert (4.12345679, 51.98765430) in _node_index
+        assert (4.1234, 51.9876) not in _node_index
+
+    def test_add_node_keeps_first_node(self):
+        # 1. Define test data.
+        _node_index = NodeCoordinateIndex()
+        _node_index.add_node(1, 0.0, 0.0)
+
+        # 2. Run test.
+        _node_index.add_node(2, 0.0, 0.0)
+
+        # 3. Verify expectations.
+        assert _node_index.get_node_id(0.0, 0.0) == 1
+        assert len(_node_index) == 1
+
+    def test_add_graph_node(self):
+        # 1. Define test data.
+        _graph = nx.MultiGraph()
+        _node_index = NodeCoordinateIndex.from_graph(_graph)
+
+        # 2. Run test.
+        _node_index.add_graph_node(_graph, 7, x=3.0, y=4.0, geometry=Point(3.0, 4.0))
+
+        # 3. Verify expectations.
+        assert 7 in _graph.nodes
+        assert _node_index.get_node_id(3.0, 4.0) == 7
+
+    def test_is_at_position(self):
+        # 1. Define test data.
+        _node_index = NodeCoordinateIndex()
+
+        # 2. Run test & verify expectations.
+        assert _node_index.is_at_position((1.0, 2.0), (1.00000001, 2.0, 0.0))
+        assert not _node_index.is_at_position((1.0, 2.0), (1.0001, 2.0))
@@ -1,6 +1,20 @@
+import shutil
+from pathlib import Path
+
+import geopandas as gpd
+import networkx as nx
 import numpy as np
+import pytest
+import rasterio
+from rasterio.transform import from_origin
+from shapely.geometry import LineString, Point
 
-from ra2ce.network.origins_destinations import closest_node
+from ra2ce.network.origins_destinations import (
+    add_od_nodes,
+    closest_node,
+    generate_points_from_raster,
+)
+from tests import test_results
 
 
 class TestOriginsDestinations:
@@ -15,3 +29,104 @@ class TestOriginsDestinations:
         # 3. Verify final expectations.
         assert len(_result) == 4
         assert list(_result) == [0, 1, 2, 3]
+
+    def test_add_od_nodes_without_node_at_road_end_raises(self):
+        # 1. Define test data.
+        _graph = nx.MultiGraph()
+        _graph.add_node(1, x=0.0, y=0.0)
+        _graph.add_node(2, x=1.0, y=0.0)
+        # the end of the road geometry is not at a node
+        _graph.add_edge(1, 2, geometry=LineString([(0, 0), (2, 0)]))
+        _od = gpd.GeoDataFrame(
+            {"o_id": ["O_0"], "d_id": [np.nan]}, geometry=[Point(2.1, 0)]
+        )
+
+        # 2. Run test.
+        with pytest.raises(KeyError) as exc_err:
+            add_od_nodes(_od, _graph, "epsg:4326")
+
+        # 3. Verify final expectations.
+        assert "(2.0, 0.0)" in str(exc_err.value)
+
+    @pytest.fixture
+    def _population_raster_fixture(self, request: pytest.FixtureRequest) -> Path:
+        _output_dir = test_results.joinpath(request.node.name)
+        if _output_dir.exists():
+            shutil.rmtree(_output_dir)
+        _output_dir.mkdir(parents=True)
+
+        _values = np.zeros((5, 4), dtype="float32")
+        _values[0, 0] = 10
+        _values[1, 2] = 3
+        _values[4, 3] = 7
+        _values[3, 1] = -9999
+        _raster_path = _output_dir.joinpath("population.tif")
+        with rasterio.open(
+            _raster_path,
+            "w",
+            driver="GTiff",
+            height=_values.shape[0],
+            width=_values.shape[1],
+            count=1,
+            dtype=_values.dtype,
+            crs="EPSG:4326",
+            transform=from_origin(4.0, 52.0, 0.5, 0.5),
+            nodata=-9999,
+        ) as _dst:
+            _dst.write(_values, 1)
+        yield _raster_path
+
+    def test_generate_points_from_raster(self, _population_raster_fixture: Path):
+        # 1. Define test data.
+        _out_fn = _population_raster_fixture.with_name("origins_points.gpkg")
+
+        # 2. Run test.
+        _result = generate_points_from_raster(_population_raster_fixture, _out_fn)
+
+        # 3. Verify final expectations.
+        assert _result == _out_fn
+        _points = gpd.read_file(_result)
+        # Ids are column-major: col * height + row.
+        assert _points["OBJECTID"].tolist() == [0, 11, 19]
+        assert _points["values"].tolist() == [10, 3, 7]
+        assert _points.geometry.x.tolist() == [4.25, 5.25, 5.75]
+        assert _points.geometry.y.tolist() == [51.75, 51.25, 49.75]
+
+    def test_generate_points_from_raster_with_aggregation(
+        self, _population_raster_fixture: Path
+    ):
+        # 1. Define test data.
+        _out_fn = _population_raster_fixture.with_name("origins_points.gpkg")
+
+        # 2. Run test.
+        _result = generate_points_from_raster(
+            _population_raster_fixture, _out_fn, aggregation_factor=2
+        )
+
+        # 3. Verify final expectations.
+        _points = gpd.read_file(_result)
+        assert _points["OBJECTID"].tolist() == [0, 3, 5]
+        assert _points["values"].tolist() == [10, 3, 7]
+        assert _points.geometry.x.tolist() == [4.5, 5.5, 5.5]
+        assert _points.geometry.y.tolist() == [51.5, 51.5, 49.75]
+
+    @pytest.mark.parametrize(
+        "aggregation_factor",
+        [pytest.param(0, id="Zero"), pytest.param(-2, id="Negative")],
+    )
+    def test_generate_points_from_raster_with_invalid_aggregation_raises(
+        self, _population_raster_fixture: Path, aggregation_factor: int
+    ):
+        # 1. Define test data.
+        _out_fn = _population_raster_fixture.with_name("origins_points.gpkg")
+
+        # 2. Run test.
+        with pytest.raises(ValueError) as exc_err:
+            generate_points_from_raster(
+                _population_raster_fixture, _out_fn, aggregation_factor
+            )
+
+        # 3. Verify final expectations.
+        assert str(exc_err.value) == (
+            f"The aggregation factor should be at least 1, got {aggregation_factor}."
+        )
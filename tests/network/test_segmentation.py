@@ -1,7 +1,9 @@
 import math
 
+import geopandas as gpd
+import numpy as np
 import pytest
-from shapely.geometry import LineString
+from shapely.geometry import LineString, MultiLineString
 
 from ra2ce.network.segmentation import Segmentation
 
@@ -90,3 +92,133 @@ class TestSegmentation:
 
         # 3. Verify expectations
         assert _return_value == [_line]
+
+    def test_get_numbers_of_segments(self):
+        # 1. Define test data.
+        _segmentation = Segmentation(None, None, False)
+        _lengths = np.array([0.0, 0.3, 0.35, 1.0, 0.1])
+
+        # 2. Run test.
+        _return_value = _segmentation.get_numbers_of_segments(_lengths, 0.1)
+
+        # 3. Verify expectations
+        assert _return_value.tolist() == [
+            _segmentation.number_of_segments(LineString([[0, 0], [_l, 0]]), 0.1)
+            for _l in _lengths
+        ]
+
+    def test_split_linestrings_matches_split_linestring(self):
+        # 1. Define test data.
+        _segmentation = Segmentation(None, None, False)
+        _lines = np.array(
+            [
+                LineString([[0, 0], [1, 0], [2, 0]]),
+                LineString([[0, 0], [0.5, 0.5], [0.5, 2.5], [1.5, 2.5]]),
+                LineString([[0, 0], [0.25, 0]]),
+            ]
+        )
+        _split_length = 0.4
+
+        # 2. Run test.
+        _segments, _n_segments = _segmentation.split_linestrings(_lines, _split_length)
+
+        # 3. Verify expectations
+        _expected = [
+            _segmentation.split_linestring(_line, _split_length) for _line in _lines
+        ]
+        assert _n_segments.tolist() == list(map(len, _expected))
+        for _segment, _expected_segment in zip(
+            _segments, [_s for _e in _expected for _s in _e]
+        ):
+            assert _segment.equals_exact(_expected_segment, 1e-9)
+
+    @pytest.mark.parametrize(
+        "line, split_length, n_segments",
+        [
+            pytest.param(
+                LineString([[0, 0], [0.1 + 0.2, 0]]), 0.1, 4, id="Near multiple"
+            ),
+            pytest.param(
+                LineString([[0, 0], [0.1 + 0.2, 0]]), 0.3, 2, id="Near split length"
+            ),
+            pytest.param(
+                LineString([[0, 0], [0.1, 0], [0.1 + 0.2, 0], [0.4, 0]]),
+                0.3,
+                2,
+                id="Vertex near cut",
+            ),
+            pytest.param(
+                LineString([[0.1, 0], [0, 0], [0, -0.1], [0, 0]]),
+                0.3,
+                0,
+                id="Self-touching",
+            ),
+            pytest.param(
+                LineString([[0, 0], [1, 0], [1, 1], [0, 0]]), 0.4, 9, id="Closed"
+            ),
+            pytest.param(
+                LineString([[0, 0], [0, 0], [0.5, 0]]), 0.2, 3, id="Repeated vertex"
+            ),
+        ],
+    )
+    def test_split_linestrings_irregular_matches_split_linestring(
+        self, line: LineString, split_length: float, n_segments: int
+    ):
+        # 1. Define test data.
+        _segmentation = Segmentation(None, None, False)
+        _lines = np.array([LineString([[0, 0], [1, 0]]), line, line.reverse()])
+
+        # 2. Run test.
+        _segments, _n_segments = _segmentation.split_linestrings(_lines, split_length)
+
+        # 3. Verify expectations
+        _expected = [
+            _segmentation.split_linestring(_line, split_length) for _line in _lines
+        ]
+        assert _n_segments[1] == n_segments
+        assert _n_segments.tolist() == list(map(len, _expected))
+        for _segment, _expected_segment in zip(
+            _segments, [_s for _e in _expected for _s in _e]
+        ):
+            assert _segment.equals_exact(_expected_segment, 0.0)
+
+    def test_get_irregular_linestrings(self):
+        # 1. Define test data.
+        _segmentation = Segmentation(None, None, False)
+        _lines = np.array(
+            [
+                LineString([[0, 0], [0.25, 0]]),
+                LineString([[0, 0], [0.1 + 0.2, 0]]),
+                LineString([[0.1, 0], [0, 0], [0, -0.1], [0, 0]]),
+            ]
+        )
+
+        # 2. Run test.
+        _return_value = _segmentation.get_irregular_linestrings(_lines, 0.1)
+
+        # 3. Verify expectations
+        assert _return_value.tolist() == [False, True, True]
+
+    def test_cut_gdf(self):
+        # 1. Define test data.
+        _gdf = gpd.GeoDataFrame(
+            {
+                "name": ["a", "b"],
+                "geometry": [
+                    LineString([[0, 0], [1, 0], [2, 0]]),
+                    MultiLineString([[[0, 0], [0, 1.5]], [[1, 1], [1, 2]]]),
+                ],
+            },
+            crs="EPSG:4326",
+        )
+        _segmentation = Segmentation(_gdf, 1.0)
+
+        # 2. Run test.
+        _result = _segmentation.apply_segmentation()
+
+        # 3. Verify expectations
+        assert isinstance(_result, gpd.GeoDataFrame)
+        assert list(_result.columns) == ["splt_id", "name", "geometry"]
+        assert _result["splt_id"].tolist() == [0, 1, 2, 3]
+        assert _result["name"].tolist() == ["a", "a", "b", "b"]
+        assert _result.geometry.length.tolist() == pytest.approx([1, 1, 1, 0.5])
@@ -6,6 +6,9 @@ from ra2ce.analysis.analysis_config_data.analysis_config_data import (
 from ra2ce.analysis.analysis_config_data.enums.analysis_indirect_enum import (
     AnalysisIndirectEnum,
 )
+from ra2ce.analysis.analysis_result_export_pipeline import (
+    AnalysisResultExportPipeline,
+)
 from ra2ce.configuration.config_wrapper import ConfigWrapper
 from ra2ce.runners.indirect_analysis_runner import IndirectAnalysisRunner
 from tests.runners.dummy_classes import DummyRa2ceInput
@@ -15,6 +18,18 @@ class TestIndirectAnalysisRunner:
     def test_init_direct_analysis_runner(self):
         _runner = IndirectAnalysisRunner()
         assert str(_runner) == "Indirect Analysis Runner"
+        assert _runner.export_pipeline is None
+
+    def test_init_with_export_pipeline(self):
+        # 1. Define test data.
+        _export_pipeline = AnalysisResultExportPipeline()
+
+        # 2. Run test.
+        _runner = IndirectAnalysisRunner(_export_pipeline)
+
+        # 3. Verify expectations.
+        assert _runner.export_pipeline is _export_pipeline
+        _export_pipeline.wait()
 
     @pytest.fixture
     def dummy_ra2ce_input(self):